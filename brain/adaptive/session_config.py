@@ -97,6 +97,10 @@ def save_session_config(
     )
     conn.commit()
 
+    from tutor_turn_state import bump_session_revision
+
+    bump_session_revision(session_id)
+
 
 def load_session_config(
     conn: sqlite3.Connection, session_id: str
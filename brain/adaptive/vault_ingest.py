@@ -2,13 +2,19 @@
 
 Phase 1: scan files, parse YAML frontmatter, extract links, build alias table.
 Operates on disk (not the Obsidian REST API) for batch processing.
+
+Re-ingest is change-detected: each doc stores the file's (mtime_ns, size)
+stamp and unchanged files are skipped before they are read. Changed files are
+read and parsed once, and their links/aliases are replaced in bulk.
 """
 from __future__ import annotations
 
 import hashlib
+import json
 import os
 import re
 import sqlite3
+import time
 import urllib.parse
 from dataclasses import dataclass, field
 from typing import List, Optional
@@ -118,7 +124,11 @@ def parse_note(path: str) -> ParsedNote:
     """Parse a single Obsidian note: extract YAML frontmatter and body."""
     with open(path, "r", encoding="utf-8") as f:
         content = f.read()
+    return parse_note_content(path, content)
+
 
+def parse_note_content(path: str, content: str) -> ParsedNote:
+    """Parse note text already read from ``path``."""
     checksum = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
 
     match = _FRONTMATTER_RE.match(content)
@@ -158,7 +168,11 @@ def extract_links(path: str) -> list[NoteLink]:
     """Extract wikilinks and markdown internal links from a note file."""
     with open(path, "r", encoding="utf-8") as f:
         content = f.read()
+    return extract_links_from_content(path, content)
+
 
+def extract_links_from_content(path: str, content: str) -> list[NoteLink]:
+    """Extract links from note text already read from ``path``."""
     links: list[NoteLink] = []
 
     # Wikilinks: [[Target]] or [[Target|display text]]
@@ -221,6 +235,13 @@ def create_vault_tables(conn: sqlite3.Connection) -> None:
         )
     """)
 
+    # Change-detection stamp (added after the table shipped).
+    cur.execute("PRAGMA table_info(vault_docs)")
+    doc_cols = {col[1] for col in cur.fetchall()}
+    for col_name in ("mtime_ns", "size_bytes"):
+        if col_name not in doc_cols:
+            cur.execute(f"ALTER TABLE vault_docs ADD COLUMN {col_name} INTEGER")
+
     cur.execute("""
         CREATE INDEX IF NOT EXISTS idx_vault_docs_path ON vault_docs(path)
     """)
@@ -230,6 +251,9 @@ def create_vault_tables(conn: sqlite3.Connection) -> None:
     cur.execute("""
         CREATE INDEX IF NOT EXISTS idx_obsidian_links_source ON obsidian_links(source_path)
     """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_entity_aliases_source ON entity_aliases(source_path)
+    """)
     conn.commit()
 
 
@@ -238,86 +262,129 @@ def _note_title_from_path(path: str) -> str:
     return os.path.splitext(os.path.basename(path))[0]
 
 
+# A stamp this close to "now" may predate a same-size edit made within the
+# filesystem's timestamp granularity, so such files are re-read and compared
+# by checksum instead of trusted.
+_STAMP_SETTLE_NS = 2_000_000_000
+
+
 def ingest_vault(vault_path: str, conn: sqlite3.Connection) -> dict:
     """Ingest all vault notes into the DB. Incremental: skips unchanged files.
 
+    Files whose (mtime, size) matches the stored stamp are skipped without
+    being read; the rest are read once and compared by checksum.
+
     Returns summary dict with inserted/updated/skipped counts.
     """
-    import json
-
     files = scan_vault(vault_path)
     cur = conn.cursor()
 
-    # Load existing checksums for incremental comparison
-    cur.execute("SELECT path, checksum FROM vault_docs")
-    existing = {r[0]: r[1] for r in cur.fetchall()}
+    # Load existing stamps and checksums for incremental comparison
+    cur.execute("SELECT path, checksum, mtime_ns, size_bytes FROM vault_docs")
+    existing = {r[0]: (r[1], r[2], r[3]) for r in cur.fetchall()}
+    settled_before = time.time_ns() - _STAMP_SETTLE_NS
 
     inserted = 0
     updated = 0
     skipped = 0
+    changed: list[tuple[str, ParsedNote, list[NoteLink], str]] = []
+    restamped: list[tuple[int, int, str]] = []
 
     for fpath in files:
-        parsed = parse_note(fpath)
+        try:
+            stat = os.stat(fpath)
+        except OSError:
+            continue
+        previous = existing.get(fpath)
+        if (
+            previous is not None
+            and previous[1] == stat.st_mtime_ns
+            and previous[2] == stat.st_size
+            and stat.st_mtime_ns < settled_before
+        ):
+            skipped += 1
+            continue
+
+        with open(fpath, "r", encoding="utf-8") as f:
+            content = f.read()
+        parsed = parse_note_content(fpath, content)
+
+        if previous is not None and previous[0] == parsed.checksum:
+            # Touched but not edited: remember the new stamp.
+            restamped.append((stat.st_mtime_ns, stat.st_size, fpath))
+            skipped += 1
+            continue
+
         title = _note_title_from_path(fpath)
         fm_json = json.dumps(parsed.frontmatter) if parsed.frontmatter else None
-
-        if fpath in existing:
-            if existing[fpath] == parsed.checksum:
-                skipped += 1
-                continue
+        if previous is not None:
             # Changed — update
             cur.execute(
                 """UPDATE vault_docs
                    SET checksum = ?, content = ?, frontmatter_json = ?,
-                       title = ?, updated_at = CURRENT_TIMESTAMP
+                       title = ?, mtime_ns = ?, size_bytes = ?,
+                       updated_at = CURRENT_TIMESTAMP
                    WHERE path = ?""",
-                (parsed.checksum, parsed.body, fm_json, title, fpath),
+                (
+                    parsed.checksum, parsed.body, fm_json, title,
+                    stat.st_mtime_ns, stat.st_size, fpath,
+                ),
             )
-            # Refresh links and aliases for this file
-            _refresh_links_and_aliases(cur, fpath, parsed, title)
             updated += 1
         else:
             # New file — insert
             cur.execute(
-                """INSERT INTO vault_docs (path, title, source, checksum, content, frontmatter_json)
-                   VALUES (?, ?, 'obsidian', ?, ?, ?)""",
-                (fpath, title, parsed.checksum, parsed.body, fm_json),
+                """INSERT INTO vault_docs
+                   (path, title, source, checksum, content, frontmatter_json,
+                    mtime_ns, size_bytes)
+                   VALUES (?, ?, 'obsidian', ?, ?, ?, ?, ?)""",
+                (
+                    fpath, title, parsed.checksum, parsed.body, fm_json,
+                    stat.st_mtime_ns, stat.st_size,
+                ),
             )
-            _refresh_links_and_aliases(cur, fpath, parsed, title)
             inserted += 1
+        changed.append((fpath, parsed, extract_links_from_content(fpath, content), title))
 
+    if restamped:
+        cur.executemany(
+            "UPDATE vault_docs SET mtime_ns = ?, size_bytes = ? WHERE path = ?",
+            restamped,
+        )
+    _refresh_links_and_aliases(cur, changed)
     conn.commit()
     return {"inserted": inserted, "updated": updated, "skipped": skipped}
 
 
 def _refresh_links_and_aliases(
     cur: sqlite3.Cursor,
-    fpath: str,
-    parsed: ParsedNote,
-    title: str,
+    changed: list[tuple[str, ParsedNote, list[NoteLink], str]],
 ) -> None:
-    """Replace links and aliases for a single note."""
-    # Clear old data for this path
-    cur.execute("DELETE FROM obsidian_links WHERE source_path = ?", (fpath,))
-    cur.execute("DELETE FROM entity_aliases WHERE source_path = ?", (fpath,))
-
-    # Insert links
-    links = extract_links(fpath)
-    for lnk in links:
-        cur.execute(
-            "INSERT INTO obsidian_links (source_path, target, link_text) VALUES (?, ?, ?)",
-            (lnk.source_path, lnk.target, lnk.link_text),
-        )
-
-    # Insert aliases from frontmatter
-    aliases = parsed.frontmatter.get("aliases", [])
-    if isinstance(aliases, list):
-        for alias in aliases:
-            if alias:
-                cur.execute(
-                    "INSERT INTO entity_aliases (alias, canonical, source_path) VALUES (?, ?, ?)",
-                    (alias, title, fpath),
-                )
+    """Replace links and aliases for the changed notes in bulk."""
+    if not changed:
+        return
+    paths = [(fpath,) for fpath, _parsed, _links, _title in changed]
+    # Clear old data for these paths
+    cur.executemany("DELETE FROM obsidian_links WHERE source_path = ?", paths)
+    cur.executemany("DELETE FROM entity_aliases WHERE source_path = ?", paths)
+
+    link_rows: list[tuple[str, str, str]] = []
+    alias_rows: list[tuple[str, str, str]] = []
+    for fpath, parsed, links, title in changed:
+        link_rows.extend((lnk.source_path, lnk.target, lnk.link_text) for lnk in links)
+        # Aliases from frontmatter
+        aliases = parsed.frontmatter.get("aliases", [])
+        if isinstance(aliases, list):
+            alias_rows.extend((alias, title, fpath) for alias in aliases if alias)
+
+    cur.executemany(
+        "INSERT INTO obsidian_links (source_path, target, link_text) VALUES (?, ?, ?)",
+        link_rows,
+    )
+    cur.executemany(
+        "INSERT INTO entity_aliases (alias, canonical, source_path) VALUES (?, ?, ?)",
+        alias_rows,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,163 @@
+"""Local concept linking against vault note titles and aliases.
+
+``ConceptMatcher`` compiles the titles and aliases into a word-level trie
+and finds linkable terms in one left-to-right pass over the content, taking
+the longest term at each position. Matching is case-insensitive on whole
+words. Frontmatter, headings, code and text that is already a link or URL
+are left alone.
+
+``get_concept_matcher`` keeps the last compiled matcher and rebuilds it only
+when the title/alias set changes.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+MIN_TERM_LENGTH = 3
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_PROTECTED_RE = re.compile(
+    r"\A---\r?\n.*?\r?\n---[ \t]*(?:\r?\n|\Z)"  # frontmatter
+    r"|^[ \t]*(```|~~~).*?(?:^[ \t]*\1[^\n]*$|\Z)"  # fenced code
+    r"|^#{1,6}[ \t][^\n]*"  # headings
+    r"|`[^`\n]*`"  # inline code
+    r"|!?\[\[[^\]\n]*\]\]"  # wikilinks and embeds
+    r"|!?\[[^\]\n]*\]\([^)\n]*\)"  # markdown links
+    r"|<https?://[^>\s]*>|https?://\S+",  # URLs
+    re.DOTALL | re.MULTILINE,
+)
+_WIKILINK_TARGET_RE = re.compile(r"\[\[([^\]|#\n]+)")
+_END = ""  # trie key marking a complete term
+
+
+@dataclass(frozen=True)
+class ConceptMatch:
+    start: int
+    end: int
+    text: str  # as written in the content
+    target: str  # note title the text links to
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+class ConceptMatcher:
+    """Word-level trie over note titles and aliases."""
+
+    def __init__(self, titles: Iterable[str], aliases: Optional[dict[str, list[str]]] = None) -> None:
+        self._root: dict = {}
+        self.term_count = 0
+        # Titles win over aliases for the same surface form.
+        for title in titles:
+            self._add(title, title)
+        for title, names in (aliases or {}).items():
+            for alias in names or []:
+                self._add(alias, title)
+
+    def _add(self, term: str, target: str) -> None:
+        term = str(term or "").strip()
+        if len(term) < MIN_TERM_LENGTH or not any(ch.isalpha() for ch in term):
+            return
+        tokens = _tokens(term)
+        if not tokens or not tokens[0][0].isalnum():
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            node[_END] = target
+            self.term_count += 1
+
+    def find(self, content: str) -> list[ConceptMatch]:
+        """Non-overlapping, longest-first matches outside protected text."""
+        matches: list[ConceptMatch] = []
+        pos = 0
+        for protected in _PROTECTED_RE.finditer(content):
+            self._scan(content, pos, protected.start(), matches)
+            pos = protected.end()
+        self._scan(content, pos, len(content), matches)
+        return matches
+
+    def _scan(self, content: str, start: int, end: int, out: list[ConceptMatch]) -> None:
+        if start >= end:
+            return
+        spans = [(m.start(), m.end()) for m in _TOKEN_RE.finditer(content, start, end)]
+        words = [content[s:e].casefold() for s, e in spans]
+        root = self._root
+        idx = 0
+        while idx < len(words):
+            node = root.get(words[idx])
+            if node is None:
+                idx += 1
+                continue
+            best: Optional[tuple[int, str]] = None
+            probe = idx
+            while node is not None:
+                if _END in node:
+                    best = (probe, node[_END])
+                probe += 1
+                node = node.get(words[probe]) if probe < len(words) else None
+            if best is None:
+                idx += 1
+                continue
+            last, target = best
+            match_start, match_end = spans[idx][0], spans[last][1]
+            # Whole words only: "\w+" tokens already end on word boundaries,
+            # but a term ending in punctuation must not run into a word.
+            if (
+                match_end < len(content)
+                and not content[match_end - 1].isalnum()
+                and content[match_end].isalnum()
+            ):
+                idx += 1
+                continue
+            out.append(ConceptMatch(match_start, match_end, content[match_start:match_end], target))
+            idx = last + 1
+
+
+def link_concepts(content: str, matcher: ConceptMatcher, keep: Optional[set[str]] = None) -> str:
+    """Wrap every match in a wikilink, skipping notes the content already links.
+
+    ``keep`` restricts linking to those target titles (case-insensitive).
+    Matches on a title become ``[[text]]``; matches on an alias become
+    ``[[Title|text]]``.
+    """
+    linked = {target.strip().casefold() for target in _WIKILINK_TARGET_RE.findall(content)}
+    parts: list[str] = []
+    pos = 0
+    for match in matcher.find(content):
+        target_key = match.target.casefold()
+        if target_key in linked or (keep is not None and target_key not in keep):
+            continue
+        parts.append(content[pos : match.start])
+        if match.text.casefold() == match.target.casefold():
+            parts.append(f"[[{match.text}]]")
+        else:
+            parts.append(f"[[{match.target}|{match.text}]]")
+        pos = match.end
+    parts.append(content[pos:])
+    return "".join(parts)
+
+
+_MATCHER_LOCK = threading.Lock()
+_MATCHER_CACHE: dict = {"key": None, "matcher": None}
+
+
+def get_concept_matcher(
+    titles: Iterable[str], aliases: Optional[dict[str, list[str]]] = None
+) -> ConceptMatcher:
+    """The compiled matcher for this title/alias set, reused until it changes."""
+    key = (
+        tuple(titles),
+        tuple(sorted((title, tuple(names or ())) for title, names in (aliases or {}).items())),
+    )
+    with _MATCHER_LOCK:
+        if _MATCHER_CACHE["key"] != key:
+            _MATCHER_CACHE["matcher"] = ConceptMatcher(key[0], dict(key[1]))
+            _MATCHER_CACHE["key"] = key
+        return _MATCHER_CACHE["matcher"]
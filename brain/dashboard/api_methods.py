@@ -20,6 +20,7 @@ from typing import Any
 
 from flask import Blueprint, jsonify, request
 from db_setup import get_connection, ensure_method_library_seeded
+from tutor_turn_state import bump_chain_revision
 
 methods_bp = Blueprint("methods", __name__, url_prefix="/api")
 _METHOD_BLOCK_COLS_ENSURED = False
@@ -570,6 +571,7 @@ def update_method(method_id: int):
             values,
         )
         conn.commit()
+        bump_chain_revision()
         if cursor.rowcount == 0:
             return jsonify({"error": "Method not found"}), 404
         return jsonify({"id": method_id, "updated": True})
@@ -584,6 +586,7 @@ def delete_method(method_id: int):
         cursor = conn.cursor()
         cursor.execute("DELETE FROM method_blocks WHERE id = ?", (method_id,))
         conn.commit()
+        bump_chain_revision()
         deleted = cursor.rowcount > 0
         if not deleted:
             return jsonify({"error": "Method not found"}), 404
@@ -788,6 +791,7 @@ def update_chain(chain_id: int):
             values,
         )
         conn.commit()
+        bump_chain_revision()
         if cursor.rowcount == 0:
             return jsonify({"error": "Chain not found"}), 404
         return jsonify({"id": chain_id, "updated": True})
@@ -802,6 +806,7 @@ def delete_chain(chain_id: int):
         cursor = conn.cursor()
         cursor.execute("DELETE FROM method_chains WHERE id = ?", (chain_id,))
         conn.commit()
+        bump_chain_revision()
         deleted = cursor.rowcount > 0
         if not deleted:
             return jsonify({"error": "Chain not found"}), 404
@@ -1199,6 +1204,7 @@ def attach_ruleset_to_chain(chain_id: int):
             (ruleset_id, chain_id),
         )
         conn.commit()
+        bump_chain_revision()
         if cursor.rowcount == 0:
             return jsonify({"error": "Chain not found"}), 404
         return jsonify({"chain_id": chain_id, "ruleset_id": ruleset_id})
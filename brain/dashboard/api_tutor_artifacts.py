@@ -25,6 +25,7 @@ from datetime import datetime
 from flask import jsonify, request
 
 from db_setup import get_connection
+from tutor_turn_state import bump_session_revision
 
 from dashboard.api_tutor_utils import (
     _prime_assessment_violations,
@@ -323,6 +324,7 @@ def create_artifact(session_id: str):
     )
     conn.commit()
     conn.close()
+    bump_session_revision(session_id)
 
     return jsonify(result), 201
 
@@ -549,6 +551,7 @@ def delete_artifacts(session_id: str):
     )
     conn.commit()
     conn.close()
+    bump_session_revision(session_id)
 
     applied_count = len(valid_indexes)
     _LOG.info(
@@ -6,6 +6,9 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -18,12 +21,38 @@ from dashboard.api_tutor_utils import _ensure_selector_columns
 
 _MEMORY_SCHEMA_ENSURED = False
 RECENCY_TAIL_K = 8
+# Recent turns kept in memory per session; covers RECENCY_TAIL_K tutor turns
+# and the 20-turn uncompacted history in the common case.
+TURN_RING_CAPACITY = 32
+_TURN_RING_MAX_SESSIONS = 64
+# Background compaction starts once the turns not yet folded into a working
+# summary are estimated at this many prompt tokens (teach sessions only).
+COMPACTION_TOKEN_THRESHOLD = 6000
+# Newest uncovered tutor turns fed to one summary call.
+SUMMARY_MAX_TURNS = 24
+# Prompt tokens of turns after a working summary's coverage sent as the
+# recency tail. Compaction normally keeps these near the threshold; past
+# this (compaction behind) the oldest uncovered turns are dropped.
+HISTORY_TAIL_TOKEN_BUDGET = 2 * COMPACTION_TOKEN_THRESHOLD
+_CHARS_PER_TOKEN = 4
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def estimate_tokens(text: Any) -> int:
+    """Cheap prompt-token estimate (~4 chars per token); no tokenizer pass."""
+    if not text:
+        return 0
+    return (len(str(text)) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def estimate_turn_tokens(question: Any, answer: Any) -> int:
+    """Tokens a turn adds to the prompt history (question + answer)."""
+    return estimate_tokens(question) + estimate_tokens(answer)
+
+
 def _ensure_tutor_memory_schema(conn: sqlite3.Connection) -> None:
     global _MEMORY_SCHEMA_ENSURED
     _ensure_selector_columns(conn)
@@ -48,6 +77,12 @@ def _ensure_tutor_memory_schema(conn: sqlite3.Connection) -> None:
         """CREATE INDEX IF NOT EXISTS idx_tutor_working_summaries_session
            ON tutor_working_summaries (tutor_session_id, version DESC)"""
     )
+    cur.execute("PRAGMA table_info(tutor_working_summaries)")
+    ws_cols = {row[1] for row in cur.fetchall()}
+    if "covered_turn_number" not in ws_cols:
+        cur.execute(
+            "ALTER TABLE tutor_working_summaries ADD COLUMN covered_turn_number INTEGER"
+        )
     cur.execute(
         """CREATE TABLE IF NOT EXISTS tutor_polish_drafts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -155,11 +190,201 @@ def _get_session_turns_filtered(
     return [dict(row) for row in cur.fetchall()]
 
 
+_TAIL_TURN_COLUMNS = "id, turn_number, question, answer, interaction_mode, created_at"
+
+
+@dataclass
+class _TurnRing:
+    """Last turns of one session, valid while tutor_sessions.turn_count matches."""
+
+    turn_count: int
+    turns: deque = field(default_factory=lambda: deque(maxlen=TURN_RING_CAPACITY))
+    # True when the ring holds every turn the session has.
+    complete: bool = False
+
+
+_TURN_RINGS: "OrderedDict[str, _TurnRing]" = OrderedDict()
+_TURN_RINGS_LOCK = threading.Lock()
+_TURN_RING_STATS = {"hits": 0, "misses": 0}
+
+
+def _turn_mode(turn: dict[str, Any]) -> str:
+    return str(turn.get("interaction_mode") or "tutor")
+
+
+def _query_recent_turns(
+    conn: sqlite3.Connection,
+    session_id: str,
+    *,
+    limit: int,
+    mode: str | None = None,
+) -> list[dict[str, Any]]:
+    """Last ``limit`` turns in id order, mode filter and limit applied in SQL."""
+    conn.row_factory = sqlite3.Row
+    sql = f"SELECT {_TAIL_TURN_COLUMNS} FROM tutor_turns WHERE tutor_session_id = ?"
+    params: list[Any] = [session_id]
+    if mode in ("general", "tutor"):
+        sql += " AND COALESCE(interaction_mode, 'tutor') = ?"
+        params.append(mode)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(int(limit))
+    rows = conn.execute(sql, params).fetchall()
+    return [dict(row) for row in reversed(rows)]
+
+
+def _tail_from_ring(
+    ring: _TurnRing, *, limit: int, mode: str | None
+) -> list[dict[str, Any]] | None:
+    turns = [t for t in ring.turns if mode is None or _turn_mode(t) == mode]
+    if len(turns) >= limit or ring.complete:
+        return [dict(t) for t in turns[-limit:]]
+    return None
+
+
+def _turns_after_from_ring(
+    ring: _TurnRing, *, after: int, mode: str | None
+) -> list[dict[str, Any]] | None:
+    """Turns numbered after ``after``, or None when the ring may not hold them all."""
+    oldest = int(ring.turns[0].get("turn_number") or 0) if ring.turns else None
+    if not ring.complete and (oldest is None or oldest > after + 1):
+        return None
+    return [
+        dict(t)
+        for t in ring.turns
+        if int(t.get("turn_number") or 0) > after
+        and (mode is None or _turn_mode(t) == mode)
+    ]
+
+
+def _reload_ring(
+    conn: sqlite3.Connection, session_id: str, *, turn_count: int
+) -> _TurnRing:
+    rows = _query_recent_turns(conn, session_id, limit=TURN_RING_CAPACITY)
+    ring = _TurnRing(
+        turn_count=turn_count,
+        turns=deque(rows, maxlen=TURN_RING_CAPACITY),
+        complete=len(rows) < TURN_RING_CAPACITY,
+    )
+    with _TURN_RINGS_LOCK:
+        _TURN_RINGS[session_id] = ring
+        _TURN_RINGS.move_to_end(session_id)
+        while len(_TURN_RINGS) > _TURN_RING_MAX_SESSIONS:
+            _TURN_RINGS.popitem(last=False)
+    return ring
+
+
+def load_recent_turns(
+    conn: sqlite3.Connection,
+    session_id: str,
+    *,
+    limit: int,
+    mode: str | None = None,
+    turn_count: int | None = None,
+) -> list[dict[str, Any]]:
+    """Return the session's last ``limit`` turns (oldest first).
+
+    With ``turn_count`` (the session row's current value) the per-session
+    ring buffer answers without touching the DB; a different count means
+    another writer got there first, so the ring is reloaded.
+    """
+    if limit <= 0:
+        return []
+    if turn_count is None:
+        return _query_recent_turns(conn, session_id, limit=limit, mode=mode)
+
+    with _TURN_RINGS_LOCK:
+        ring = _TURN_RINGS.get(session_id)
+        if ring is not None and ring.turn_count == turn_count:
+            tail = _tail_from_ring(ring, limit=limit, mode=mode)
+            if tail is not None:
+                _TURN_RINGS.move_to_end(session_id)
+                _TURN_RING_STATS["hits"] += 1
+                return tail
+        _TURN_RING_STATS["misses"] += 1
+
+    ring = _reload_ring(conn, session_id, turn_count=turn_count)
+    tail = _tail_from_ring(ring, limit=limit, mode=mode)
+    if tail is not None:
+        return tail
+    return _query_recent_turns(conn, session_id, limit=limit, mode=mode)
+
+
+def load_turns_after(
+    conn: sqlite3.Connection,
+    session_id: str,
+    *,
+    after: int,
+    mode: str | None = None,
+    turn_count: int | None = None,
+) -> list[dict[str, Any]]:
+    """Return the session's turns numbered after ``after`` (oldest first).
+
+    Like ``load_recent_turns``, the ring answers whenever it holds the
+    whole range; only a range older than the ring goes to SQL.
+    """
+    if turn_count is not None:
+        with _TURN_RINGS_LOCK:
+            ring = _TURN_RINGS.get(session_id)
+            if ring is not None and ring.turn_count == turn_count:
+                turns = _turns_after_from_ring(ring, after=after, mode=mode)
+                if turns is not None:
+                    _TURN_RINGS.move_to_end(session_id)
+                    _TURN_RING_STATS["hits"] += 1
+                    return turns
+            _TURN_RING_STATS["misses"] += 1
+        ring = _reload_ring(conn, session_id, turn_count=turn_count)
+        turns = _turns_after_from_ring(ring, after=after, mode=mode)
+        if turns is not None:
+            return turns
+
+    conn.row_factory = sqlite3.Row
+    sql = (
+        f"SELECT {_TAIL_TURN_COLUMNS} FROM tutor_turns "
+        "WHERE tutor_session_id = ? AND turn_number > ?"
+    )
+    params: list[Any] = [session_id, int(after)]
+    if mode in ("general", "tutor"):
+        sql += " AND COALESCE(interaction_mode, 'tutor') = ?"
+        params.append(mode)
+    sql += " ORDER BY id"
+    return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
+def remember_turn(session_id: str, turn: dict[str, Any], *, turn_count: int) -> None:
+    """Write-through a committed turn so the next history read stays in memory."""
+    with _TURN_RINGS_LOCK:
+        ring = _TURN_RINGS.get(session_id)
+        if ring is None:
+            return
+        if ring.turn_count != turn_count - 1:
+            del _TURN_RINGS[session_id]
+            return
+        if len(ring.turns) == ring.turns.maxlen:
+            ring.complete = False
+        ring.turns.append({key: turn.get(key) for key in _TAIL_TURN_COLUMNS.split(", ")})
+        ring.turn_count = turn_count
+
+
+def forget_session_turns(session_id: str) -> None:
+    """Drop the cached turns for a session (deletes and out-of-band writes)."""
+    with _TURN_RINGS_LOCK:
+        _TURN_RINGS.pop(session_id, None)
+
+
+def turn_ring_stats() -> dict[str, int]:
+    with _TURN_RINGS_LOCK:
+        return {**_TURN_RING_STATS, "sessions": len(_TURN_RINGS)}
+
+
 def _latest_working_summary(conn: sqlite3.Connection, session_id: str) -> dict[str, Any] | None:
+    """Newest completed summary; a compaction still running has no row yet."""
+    if not _MEMORY_SCHEMA_ENSURED:
+        _ensure_tutor_memory_schema(conn)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
     cur.execute(
-        """SELECT id, tutor_session_id, version, summary_text, trigger_source, created_at
+        """SELECT id, tutor_session_id, version, summary_text, trigger_source,
+                  covered_turn_number, created_at
            FROM tutor_working_summaries
            WHERE tutor_session_id = ?
            ORDER BY version DESC
@@ -170,13 +395,21 @@ def _latest_working_summary(conn: sqlite3.Connection, session_id: str) -> dict[s
     return dict(row) if row else None
 
 
-def _generate_working_summary_text(tutor_turns: list[dict[str, Any]]) -> str:
-    """Build working summary from tutor-tagged turns (LLM when available)."""
+def _generate_working_summary_text(
+    tutor_turns: list[dict[str, Any]],
+    *,
+    previous_summary: str | None = None,
+) -> str:
+    """Build working summary from tutor-tagged turns (LLM when available).
+
+    With ``previous_summary`` the new turns are folded into it, so repeated
+    compactions keep what older turns established.
+    """
     if not tutor_turns:
-        return "No tutor-tagged turns to summarize yet."
+        return previous_summary or "No tutor-tagged turns to summarize yet."
 
     lines: list[str] = []
-    for turn in tutor_turns[-12:]:
+    for turn in tutor_turns[-SUMMARY_MAX_TURNS:]:
         question = str(turn.get("question") or "").strip()
         answer = str(turn.get("answer") or "").strip()
         if question:
@@ -185,7 +418,12 @@ def _generate_working_summary_text(tutor_turns: list[dict[str, Any]]) -> str:
             lines.append(f"A: {answer[:1200]}")
     transcript = "\n".join(lines).strip()
     if not transcript:
-        return "Teach leg summary (empty transcript)."
+        return previous_summary or "Teach leg summary (empty transcript)."
+    if previous_summary:
+        transcript = (
+            f"Previous working summary:\n{previous_summary}\n\n"
+            f"New turns since that summary:\n{transcript}"
+        )
 
     try:
         import llm_provider
@@ -194,12 +432,8 @@ def _generate_working_summary_text(tutor_turns: list[dict[str, Any]]) -> str:
             "Summarize this tutor teach-leg transcript for continuing instruction. "
             "Preserve objectives, misconceptions, and next steps. Under 800 words."
         )
-        result = llm_provider.chat_completion(
-            system_prompt=system_prompt,
-            user_prompt=transcript,
-            model_hint="fast",
-        )
-        text = str(result or "").strip()
+        result = llm_provider.call_llm(system_prompt, transcript)
+        text = str(result.get("content") or "").strip() if result.get("success") else ""
         if text:
             return text
     except Exception:
@@ -214,15 +448,41 @@ def compact_tutor_session(
     *,
     trigger_source: str = "manual",
 ) -> dict[str, Any]:
+    """Fold the turns after the newest summary into a new summary version.
+
+    The summary model call happens before any write, so a slow call never
+    holds the write lock. Turns saved meanwhile stay uncovered, and their
+    token estimate remains on the session for the next compaction.
+    """
     from dashboard.api_tutor_turns import _get_tutor_session
+    from tutor_turn_state import bump_session_revision
 
     session = _get_tutor_session(conn, session_id)
     if not session:
         raise ValueError("Session not found")
 
-    tutor_turns = _get_session_turns_filtered(conn, session_id, mode="tutor")
-    all_turn_count = len(_get_session_turns_filtered(conn, session_id))
-    summary_text = _generate_working_summary_text(tutor_turns)
+    previous = _latest_working_summary(conn, session_id)
+    covered_before = int((previous or {}).get("covered_turn_number") or 0)
+    counts = conn.execute(
+        """SELECT COUNT(*),
+                  SUM(CASE WHEN COALESCE(interaction_mode, 'tutor') = 'tutor'
+                      THEN 1 ELSE 0 END),
+                  COALESCE(MAX(turn_number), 0)
+           FROM tutor_turns WHERE tutor_session_id = ?""",
+        (session_id,),
+    ).fetchone()
+    all_turn_count = int(counts[0] or 0)
+    tutor_turn_count = int(counts[1] or 0)
+    covered_turn_number = int(counts[2] or 0)
+    new_turns = [
+        turn
+        for turn in _get_session_turns_filtered(conn, session_id, mode="tutor")
+        if int(turn.get("turn_number") or 0) > covered_before
+    ]
+    summary_text = _generate_working_summary_text(
+        new_turns,
+        previous_summary=(previous or {}).get("summary_text"),
+    )
 
     cur = conn.cursor()
     cur.execute(
@@ -233,9 +493,17 @@ def compact_tutor_session(
     created_at = _now_iso()
     cur.execute(
         """INSERT INTO tutor_working_summaries
-           (tutor_session_id, version, summary_text, trigger_source, created_at)
-           VALUES (?, ?, ?, ?, ?)""",
-        (session_id, next_version, summary_text, trigger_source, created_at),
+           (tutor_session_id, version, summary_text, trigger_source,
+            covered_turn_number, created_at)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (
+            session_id,
+            next_version,
+            summary_text,
+            trigger_source,
+            covered_turn_number,
+            created_at,
+        ),
     )
     summary_row = {
         "id": cur.lastrowid,
@@ -243,8 +511,23 @@ def compact_tutor_session(
         "version": next_version,
         "summary_text": summary_text,
         "trigger_source": trigger_source,
+        "covered_turn_number": covered_turn_number,
         "created_at": created_at,
     }
+    # The insert holds the write lock, so no turn lands between this read
+    # and the reset.
+    uncovered_tokens = sum(
+        estimate_turn_tokens(row[0], row[1])
+        for row in conn.execute(
+            """SELECT question, answer FROM tutor_turns
+               WHERE tutor_session_id = ? AND turn_number > ?""",
+            (session_id, covered_turn_number),
+        ).fetchall()
+    )
+    cur.execute(
+        "UPDATE tutor_sessions SET history_token_estimate = ? WHERE session_id = ?",
+        (uncovered_tokens, session_id),
+    )
 
     workflow_id = session.get("workflow_id")
     draft = None
@@ -259,14 +542,23 @@ def compact_tutor_session(
         )
 
     conn.commit()
+    bump_session_revision(session_id)
     return {
         "working_summary": summary_row,
-        "tutor_turn_count": len(tutor_turns),
+        "tutor_turn_count": tutor_turn_count,
         "transcript_turn_count": all_turn_count,
+        "summarized_turn_count": len(new_turns),
         "polish_draft": draft,
     }
 
 
+def should_compact(session: dict[str, Any], history_tokens: int) -> bool:
+    """Token-aware trigger for background compaction after a saved turn."""
+    return bool(session.get("method_chain_id")) and (
+        history_tokens >= COMPACTION_TOKEN_THRESHOLD
+    )
+
+
 def _upsert_polish_draft(
     conn: sqlite3.Connection,
     *,
@@ -382,13 +674,21 @@ def build_prompt_turn_history(
     session_id: str,
     *,
     tail_k: int = RECENCY_TAIL_K,
+    turn_count: int | None = None,
 ) -> tuple[list[dict[str, str]], dict[str, Any] | None]:
-    """Return (history_messages, working_summary_meta) for send_turn."""
+    """Return (history_messages, working_summary_meta) for send_turn.
+
+    With a working summary, the tail is every tutor turn after the summary's
+    ``covered_turn_number``, newest first up to ``HISTORY_TAIL_TOKEN_BUDGET``,
+    so no turn falls between the summary and the tail. Summaries with no
+    recorded coverage fall back to the last ``tail_k`` tutor turns.
+
+    Pass the session's ``turn_count`` to serve the tail from the in-memory
+    ring buffer (see ``load_recent_turns``).
+    """
     summary = _latest_working_summary(conn, session_id)
     if not summary:
-        from dashboard.api_tutor_turns import _get_session_turns
-
-        turns = _get_session_turns(conn, session_id, limit=20)
+        turns = load_recent_turns(conn, session_id, limit=20, turn_count=turn_count)
         history = []
         for turn in turns:
             if turn.get("question"):
@@ -397,9 +697,15 @@ def build_prompt_turn_history(
                 history.append({"role": "assistant", "content": turn["answer"]})
         return history, None
 
-    tail_turns = _get_session_turns_filtered(conn, session_id, mode="tutor", limit=None)
-    if len(tail_turns) > tail_k:
-        tail_turns = tail_turns[-tail_k:]
+    covered = summary.get("covered_turn_number")
+    if covered is None:
+        tail_turns = load_recent_turns(
+            conn, session_id, limit=tail_k, mode="tutor", turn_count=turn_count
+        )
+    else:
+        tail_turns = _uncovered_tail(
+            conn, session_id, covered=int(covered), turn_count=turn_count
+        )
 
     history = [
         {
@@ -418,6 +724,29 @@ def build_prompt_turn_history(
     return history, summary
 
 
+def _uncovered_tail(
+    conn: sqlite3.Connection,
+    session_id: str,
+    *,
+    covered: int,
+    turn_count: int | None,
+) -> list[dict[str, Any]]:
+    """Tutor turns after ``covered`` (oldest first), trimmed to the tail budget."""
+    uncovered = load_turns_after(
+        conn, session_id, after=covered, mode="tutor", turn_count=turn_count
+    )
+    tail: list[dict[str, Any]] = []
+    used = 0
+    for turn in reversed(uncovered):
+        cost = estimate_turn_tokens(turn.get("question"), turn.get("answer"))
+        if tail and used + cost > HISTORY_TAIL_TOKEN_BUDGET:
+            break
+        tail.append(turn)
+        used += cost
+    tail.reverse()
+    return tail
+
+
 @tutor_bp.route("/workflows/<workflow_id>/teach-legs", methods=["GET"])
 def list_workflow_teach_legs(workflow_id: str):
     conn = get_connection()
@@ -39,6 +39,7 @@ from course_wheel_sync import ensure_course_in_wheel
 from product_ops import DEFAULT_WORKSPACE_ID, log_product_event
 from scholar_strategy import build_tutor_strategy_snapshot
 from tutor_accuracy_profiles import normalize_accuracy_profile
+from tutor_turn_state import bump_session_revision
 
 from dashboard.api_tutor_utils import (
     PREFLIGHT_CACHE,
@@ -1128,6 +1129,7 @@ def save_strategy_feedback(session_id: str):
     )
     conn.commit()
     conn.close()
+    bump_session_revision(session_id)
     return jsonify({"session_id": session_id, "strategy_feedback": feedback})
 
 
@@ -1274,6 +1276,7 @@ def end_session(session_id: str):
         workspace_id=DEFAULT_WORKSPACE_ID,
     )
     conn.commit()
+    bump_session_revision(session_id)
 
     # --- Compute summary data ---
     conn.row_factory = sqlite3.Row
@@ -1645,6 +1648,7 @@ def resume_session(session_id: str):
         (session_id,),
     )
     conn.commit()
+    bump_session_revision(session_id)
     conn.close()
 
     _LOG.info(
@@ -2001,6 +2005,7 @@ def link_archive(session_id: str):
     )
     conn.commit()
     conn.close()
+    bump_session_revision(session_id)
 
     return jsonify(
         {
@@ -2186,6 +2191,10 @@ def delete_session(session_id: str):
         )
         cur.execute("DELETE FROM tutor_sessions WHERE session_id = ?", (session_id,))
         conn.commit()
+        from dashboard.api_tutor_memory import forget_session_turns
+
+        forget_session_turns(session_id)
+        bump_session_revision(session_id)
     except Exception:
         conn.rollback()
         conn.close()
@@ -27,6 +27,7 @@ from typing import Any, Optional
 
 from flask import Response, current_app, jsonify, request
 
+from dashboard.asgi import SERVER_HEARTBEATS_ENVIRON_KEY
 from db_setup import get_connection, ensure_method_library_seeded
 from tutor_behavior_directives import get_directive
 from tutor_verdict import (
@@ -45,8 +46,18 @@ from tutor_teach_back import (
 )
 from tutor_accuracy_profiles import (
     normalize_accuracy_profile,
+    resolve_latency_budget,
 )
+from tutor_latency_budget import TurnBudget
 from scholar_strategy import render_strategy_prompt
+from tutor_post_turn import (
+    enqueue_post_turn_job,
+    notify_post_turn_workers,
+    run_pending_post_turn_jobs,
+    submit_post_turn_job,
+)
+from tutor_tracing import slowest_traces, start_trace, trace_record
+from tutor_turn_state import bump_session_revision, read_session_stamp, session_state
 
 from dashboard.api_tutor_utils import (
     _safe_json_dict,
@@ -109,6 +120,65 @@ def _build_compaction_telemetry(usage: Any) -> dict[str, Any] | None:
     }
 
 
+def _usage_cached_tokens(usage: Any) -> tuple[int, int]:
+    """Return ``(input_tokens, cached_tokens)`` from a Responses API usage block."""
+    if not isinstance(usage, dict):
+        return 0, 0
+    raw_input_tokens = usage.get("input_tokens")
+    details = usage.get("input_tokens_details")
+    raw_cached_tokens = details.get("cached_tokens") if isinstance(details, dict) else None
+    input_tokens = (
+        max(0, int(raw_input_tokens))
+        if isinstance(raw_input_tokens, (int, float))
+        else 0
+    )
+    cached_tokens = (
+        max(0, int(raw_cached_tokens))
+        if isinstance(raw_cached_tokens, (int, float))
+        else 0
+    )
+    return input_tokens, min(cached_tokens, input_tokens)
+
+
+def _build_prompt_cache_telemetry(
+    prompt_layout: Optional[dict[str, Any]],
+    usages: list[Any],
+    *,
+    previous_prefix_hash: Optional[str] = None,
+) -> dict[str, Any] | None:
+    """Summarize how much of this turn's prompt the provider served from cache.
+
+    ``usages`` holds one usage block per model round (tool rounds re-send the
+    prompt), so token counts are summed across the turn.
+    """
+    if not isinstance(prompt_layout, dict):
+        return None
+
+    input_tokens = 0
+    cached_tokens = 0
+    for usage in usages:
+        round_input, round_cached = _usage_cached_tokens(usage)
+        input_tokens += round_input
+        cached_tokens += round_cached
+
+    prefix_hash = prompt_layout.get("prefix_hash")
+    return {
+        "prefix_hash": prefix_hash,
+        "prefix_chars": prompt_layout.get("prefix_chars", 0),
+        "total_chars": prompt_layout.get("total_chars", 0),
+        "tier_chars": prompt_layout.get("tier_chars", {}),
+        "prefix_reused": (
+            prefix_hash == previous_prefix_hash if previous_prefix_hash else None
+        ),
+        "model_rounds": len(usages),
+        "input_tokens": input_tokens,
+        "cached_tokens": cached_tokens,
+        "cached_ratio": (
+            round(cached_tokens / input_tokens, 4) if input_tokens > 0 else 0.0
+        ),
+    }
+
+
 def _coerce_string_list(value: Any, *, limit: int | None = None) -> list[str]:
     if not isinstance(value, list):
         return []
@@ -557,6 +627,25 @@ def _get_session_turns(conn, session_id: str, limit: int | None = None) -> list[
     return [dict(r) for r in cur.fetchall()]
 
 
+def _previous_prompt_prefix_hash(conn, session_id: str) -> Optional[str]:
+    """Return the system-prompt prefix hash recorded on the session's last turn."""
+    row = conn.execute(
+        """SELECT artifacts_json FROM tutor_turns
+           WHERE tutor_session_id = ?
+           ORDER BY id DESC
+           LIMIT 1""",
+        (session_id,),
+    ).fetchone()
+    if not row:
+        return None
+    artifacts = _safe_json_dict(row[0])
+    prompt_cache = artifacts.get("prompt_cache")
+    if not isinstance(prompt_cache, dict):
+        return None
+    prefix_hash = prompt_cache.get("prefix_hash")
+    return str(prefix_hash) if prefix_hash else None
+
+
 def _is_first_session_for_course(conn, course_id) -> bool:
     """Return True if no previous tutor sessions exist for this course."""
     if course_id is None:
@@ -574,7 +663,14 @@ def _should_skip_block(conn, block: dict, session: dict) -> bool:
     """Evaluate gate: calibrate_skip_if_first_session for M-CAL-001."""
     method_id = str(block.get("method_id") or "").strip()
     if method_id == "M-CAL-001":
-        return _is_first_session_for_course(conn, session.get("course_id"))
+        course_id = session.get("course_id")
+        if not session.get("session_id"):
+            return _is_first_session_for_course(conn, course_id)
+        return session_state(str(session["session_id"])).get(
+            "first_session_for_course",
+            lambda: _is_first_session_for_course(conn, course_id),
+            fingerprint=course_id,
+        )
     return False
 
 
@@ -807,6 +903,22 @@ def _active_control_stage_for_session(
     (M-ELB-001 / M-ENC-008 / M-GEN-007 -> TEACH) as their runtime
     equivalent rather than as their literal vault declaration.
     """
+    chain_id = session_row.get("method_chain_id")
+    if not chain_id:
+        return ""
+    session_id = session_row.get("session_id")
+    if not session_id:
+        return _resolve_active_control_stage(conn, session_row)
+    return session_state(str(session_id)).get(
+        "active_control_stage",
+        lambda: _resolve_active_control_stage(conn, session_row),
+        fingerprint=(chain_id, session_row.get("current_block_index")),
+    )
+
+
+def _resolve_active_control_stage(
+    conn: sqlite3.Connection, session_row: dict[str, Any]
+) -> str:
     chain_id = session_row.get("method_chain_id")
     if not chain_id:
         return ""
@@ -828,6 +940,150 @@ def _active_control_stage_for_session(
     return _runtime_stage(method_id, raw)
 
 
+def _is_first_turn_in_active_block(conn, session_id: str) -> bool:
+    """True when the open block transition has not seen a turn yet."""
+    try:
+        transition_row = conn.execute(
+            """SELECT turn_count
+               FROM tutor_block_transitions
+               WHERE tutor_session_id = ? AND ended_at IS NULL
+               ORDER BY id DESC
+               LIMIT 1""",
+            (session_id,),
+        ).fetchone()
+    except Exception as exc:
+        _LOG.debug(
+            "Could not read active block turn_count for session %s: %s",
+            session_id,
+            exc,
+        )
+        return False
+    if transition_row is None:
+        return False
+    raw_turn_count = transition_row["turn_count"]
+    try:
+        active_block_turn_count = int(raw_turn_count) if raw_turn_count is not None else 0
+    except (TypeError, ValueError):
+        active_block_turn_count = 0
+    return active_block_turn_count <= 0
+
+
+def _derive_active_block_state(conn, session: dict) -> dict[str, Any]:
+    """Resolve the active block for a turn and check it against its method contract.
+
+    Returns block_info/chain_info (contract gaps filled from YAML), the raw
+    and runtime stage, the method contract, drift events, and ``error`` --
+    a ``(payload, status)`` pair when the turn must be refused.
+    """
+    block_info = None
+    chain_info = None
+    if session.get("method_chain_id"):
+        current_idx = session.get("current_block_index", 0) or 0
+        block_info, chain_info = _build_chain_info(
+            conn, session["method_chain_id"], current_idx
+        )
+    raw_active_stage = str(
+        (block_info or {}).get("control_stage")
+        or (block_info or {}).get("category")
+        or ""
+    ).upper()
+    # Collapse vault-hardened stages (EXPLAIN/ELABORATE/INTERLEAVE/
+    # CONSOLIDATE/ORIENT/PLAN) and per-method runtime pins (M-ELB-001/M-ENC-008/
+    # M-GEN-007 -> TEACH) onto the legacy 7-stage runtime vocabulary so
+    # downstream TEACH/PRIME guardrails fire correctly. The raw stage is
+    # preserved for error payloads and trace logging, but every behavior
+    # gate (assessment block, TEACH guardrail injection, PRIME first-turn
+    # detection, payload tagging) keys on the runtime equivalent.
+    active_method_id = str((block_info or {}).get("method_id") or "").strip()
+    active_stage = (
+        _runtime_stage(active_method_id, raw_active_stage)
+        if raw_active_stage
+        else raw_active_stage
+    )
+    method_contract = (
+        _load_method_contracts().get(active_method_id, {}) if active_method_id else {}
+    )
+    state: dict[str, Any] = {
+        "block_info": block_info,
+        "chain_info": chain_info,
+        "raw_active_stage": raw_active_stage,
+        "active_stage": active_stage,
+        "active_method_id": active_method_id,
+        "method_contract": method_contract,
+        "runtime_drift_events": [],
+        "error": None,
+    }
+    if not (block_info and active_method_id):
+        return state
+
+    runtime_drift_events = state["runtime_drift_events"]
+    expected_stage = str(method_contract.get("control_stage") or "").strip().upper()
+    # active_stage is already normalized to the runtime equivalent
+    # above; collapse expected_stage the same way before comparing.
+    if (
+        expected_stage
+        and active_stage
+        and _runtime_stage(active_method_id, expected_stage) != active_stage
+    ):
+        state["error"] = (
+            {
+                "error": "Active block stage does not match canonical method contract.",
+                "code": "METHOD_STAGE_MISMATCH_RUNTIME",
+                "active_stage": raw_active_stage,
+                "method_id": active_method_id,
+                "expected_stage": expected_stage,
+            },
+            409,
+        )
+        return state
+
+    prompt_db = str(block_info.get("facilitation_prompt") or "").strip()
+    prompt_contract = str(method_contract.get("facilitation_prompt") or "").strip()
+    if not prompt_db and prompt_contract:
+        block_info["facilitation_prompt"] = prompt_contract
+        runtime_drift_events.append(
+            {
+                "severity": "warning",
+                "code": "MISSING_METHOD_PROMPT_FILLED",
+                "method_id": active_method_id,
+                "source": "yaml_contract",
+            }
+        )
+        prompt_db = prompt_contract
+
+    artifact_db = str(block_info.get("artifact_type") or "").strip()
+    artifact_contract = str(method_contract.get("artifact_type") or "").strip()
+    if not artifact_db and artifact_contract:
+        block_info["artifact_type"] = artifact_contract
+        runtime_drift_events.append(
+            {
+                "severity": "warning",
+                "code": "MISSING_ARTIFACT_CONTRACT_FILLED",
+                "method_id": active_method_id,
+                "source": "yaml_contract",
+            }
+        )
+        artifact_db = artifact_contract
+
+    critical_issues: list[str] = []
+    if not prompt_db:
+        critical_issues.append("missing_method_prompt")
+    if not artifact_db:
+        critical_issues.append("missing_artifact_contract")
+    if critical_issues:
+        state["error"] = (
+            {
+                "error": "Critical method contract drift detected for active block.",
+                "code": "METHOD_CONTRACT_DRIFT",
+                "active_stage": active_stage,
+                "method_id": active_method_id,
+                "critical_issues": critical_issues,
+            },
+            409,
+        )
+    return state
+
+
 # ---------------------------------------------------------------------------
 # Route handlers — registered on tutor_bp from the main api_tutor module.
 # ---------------------------------------------------------------------------
@@ -835,6 +1091,111 @@ def _active_control_stage_for_session(
 from dashboard.api_tutor import tutor_bp  # noqa: E402
 
 
+def _context_request_kwargs(session: dict, data: dict) -> dict[str, Any]:
+    """``build_context`` kwargs for a turn request, derived like send_turn does."""
+    from dashboard.api_tutor_materials import (
+        _normalize_force_full_docs,
+        _normalize_material_ids,
+        _resolve_material_retrieval_k,
+    )
+
+    content_filter = _parse_content_filter_json(
+        session.get("content_filter_json"), session_id=session.get("id")
+    )
+    incoming_filter = data.get("content_filter")
+    if isinstance(incoming_filter, dict):
+        content_filter = {**content_filter, **incoming_filter}
+    module_prefix = (
+        str(content_filter.get("module_prefix") or "").strip().replace("\\", "/")
+    )
+    accuracy_profile = normalize_accuracy_profile(content_filter.get("accuracy_profile"))
+    material_ids = None
+    if "material_ids" in content_filter:
+        material_ids = _normalize_material_ids(content_filter.get("material_ids"))
+    force_full_docs = _normalize_force_full_docs(
+        content_filter.get("force_full_docs"),
+        material_ids=material_ids,
+    )
+
+    mode_provided = "mode" in data
+    mode = data.get("mode") or {}
+    materials_on = bool(mode.get("materials", not mode_provided))
+    obsidian_on = bool(mode.get("obsidian", not mode_provided))
+    depth = "none"
+    if materials_on and obsidian_on:
+        depth = "auto"
+    elif materials_on:
+        depth = "materials"
+    elif obsidian_on:
+        depth = "notes"
+
+    return {
+        "depth": depth,
+        "course_id": None if material_ids else session.get("course_id"),
+        "material_ids": material_ids,
+        "module_prefix": module_prefix or None,
+        "k_materials": _resolve_material_retrieval_k(material_ids, accuracy_profile),
+        "force_full_docs": force_full_docs,
+    }
+
+
+# ---------------------------------------------------------------------------
+# POST /api/tutor/session/<id>/prefetch — Warm turn context for a draft
+# ---------------------------------------------------------------------------
+
+
+@tutor_bp.route("/session/<session_id>/prefetch", methods=["POST"])
+def prefetch_turn_context(session_id: str):
+    """Start retrieval for the learner's draft; the next turn may reuse it."""
+    from dashboard.api_tutor import _ensure_selector_columns
+    from tutor_prefetch import schedule_prefetch
+
+    data = request.get_json(silent=True) or {}
+    draft = str(data.get("message") or "").strip()
+
+    conn = get_connection()
+    _ensure_selector_columns(conn)
+    session = _get_tutor_session(conn, session_id)
+    conn.close()
+    if not session:
+        return jsonify({"error": "Session not found"}), 404
+    if session["status"] != "active":
+        return jsonify({"error": "Session is not active"}), 400
+
+    if draft:
+        schedule_prefetch(session_id, draft, **_context_request_kwargs(session, data))
+    return "", 204
+
+
+@tutor_bp.route("/prefetch/stats", methods=["GET"])
+def prefetch_stats_route():
+    from tutor_prefetch import prefetch_stats
+
+    return jsonify(prefetch_stats())
+
+
+# ---------------------------------------------------------------------------
+# GET /api/tutor/traces/slowest — Slowest recorded turns with span trees
+# ---------------------------------------------------------------------------
+
+
+@tutor_bp.route("/traces/slowest", methods=["GET"])
+def slowest_turn_traces():
+    try:
+        limit = int(request.args.get("limit", 10))
+    except (TypeError, ValueError):
+        limit = 10
+    limit = max(1, min(limit, 100))
+    session_filter = (request.args.get("session_id") or "").strip() or None
+
+    conn = get_connection()
+    try:
+        traces = slowest_traces(conn, limit=limit, session_id=session_filter)
+    finally:
+        conn.close()
+    return jsonify({"traces": traces, "count": len(traces)})
+
+
 # ---------------------------------------------------------------------------
 # POST /api/tutor/session/<id>/turn — Send a message, SSE stream response
 # ---------------------------------------------------------------------------
@@ -856,10 +1217,7 @@ def send_turn(session_id: str):
         _load_selected_materials,
         _material_scope_labels,
         _normalize_default_mode,
-        _normalize_force_full_docs,
-        _normalize_material_ids,
         _recommended_mode_flags,
-        _resolve_material_retrieval_k,
     )
     from dashboard.api_tutor_vault import (
         _session_has_real_objectives,
@@ -875,9 +1233,20 @@ def send_turn(session_id: str):
     if not question:
         return jsonify({"error": "message is required"}), 400
 
+    turn_trace = start_trace("tutor.turn", session_id=session_id)
+    prepare_span = turn_trace.start_span("turn.prepare")
+
     conn = get_connection()
     _ensure_selector_columns(conn)
-    session = _get_tutor_session(conn, session_id)
+    # Session-derived state is reused across turns until something writes
+    # to the session (see tutor_turn_state). The stamp catches writes made
+    # by other server workers.
+    turn_state = session_state(
+        session_id, stamp=read_session_stamp(conn, session_id)
+    )
+    session = turn_state.get(
+        "session", lambda: _get_tutor_session(conn, session_id), cache_none=False
+    )
     if not session:
         conn.close()
         return jsonify({"error": "Session not found"}), 404
@@ -900,138 +1269,46 @@ def send_turn(session_id: str):
         )
 
     # Load previous turns for chat history (summary + recency tail when compacted)
-    from dashboard.api_tutor_memory import build_prompt_turn_history
+    from dashboard.api_tutor_memory import (
+        build_prompt_turn_history,
+        estimate_turn_tokens,
+        load_recent_turns,
+        remember_turn,
+        should_compact,
+    )
 
-    prompt_history, working_summary_meta = build_prompt_turn_history(conn, session_id)
-    turns = _get_session_turns(conn, session_id, limit=20)
+    prompt_history, working_summary_meta = build_prompt_turn_history(
+        conn, session_id, turn_count=session["turn_count"]
+    )
+    turns = load_recent_turns(
+        conn, session_id, limit=20, turn_count=session["turn_count"]
+    )
+    previous_prefix_hash = turn_state.get(
+        "previous_prefix_hash", lambda: _previous_prompt_prefix_hash(conn, session_id)
+    )
 
     # Build chain/block context if method chain is active
-    block_info = None
-    chain_info = None
-    if session.get("method_chain_id"):
-        current_idx = session.get("current_block_index", 0) or 0
-        block_info, chain_info = _build_chain_info(
-            conn, session["method_chain_id"], current_idx
-        )
-    raw_active_stage = str(
-        (block_info or {}).get("control_stage")
-        or (block_info or {}).get("category")
-        or ""
-    ).upper()
-    # Collapse vault-hardened stages (EXPLAIN/ELABORATE/INTERLEAVE/
-    # CONSOLIDATE/ORIENT/PLAN) and per-method runtime pins (M-ELB-001/M-ENC-008/
-    # M-GEN-007 -> TEACH) onto the legacy 7-stage runtime vocabulary so
-    # downstream TEACH/PRIME guardrails fire correctly. The raw stage is
-    # preserved for error payloads and trace logging, but every behavior
-    # gate (assessment block, TEACH guardrail injection, PRIME first-turn
-    # detection, payload tagging) keys on the runtime equivalent.
-    _active_method_id_for_stage = str((block_info or {}).get("method_id") or "").strip()
-    active_stage = (
-        _runtime_stage(_active_method_id_for_stage, raw_active_stage)
-        if raw_active_stage
-        else raw_active_stage
+    block_state = turn_state.get(
+        "active_block", lambda: _derive_active_block_state(conn, session)
     )
+    if block_state["error"] is not None:
+        conn.close()
+        error_payload, error_status = block_state["error"]
+        return jsonify(error_payload), error_status
+    block_info = block_state["block_info"]
+    chain_info = block_state["chain_info"]
+    raw_active_stage = block_state["raw_active_stage"]
+    active_stage = block_state["active_stage"]
+    active_method_id = block_state["active_method_id"]
+    method_contract = block_state["method_contract"]
+    runtime_drift_events: list[dict[str, Any]] = block_state["runtime_drift_events"]
+
     is_first_turn_in_active_block = False
     if session.get("method_chain_id"):
-        try:
-            transition_row = conn.execute(
-                """SELECT turn_count
-                   FROM tutor_block_transitions
-                   WHERE tutor_session_id = ? AND ended_at IS NULL
-                   ORDER BY id DESC
-                   LIMIT 1""",
-                (session_id,),
-            ).fetchone()
-            if transition_row is not None:
-                raw_turn_count = transition_row["turn_count"]
-                try:
-                    active_block_turn_count = (
-                        int(raw_turn_count) if raw_turn_count is not None else 0
-                    )
-                except (TypeError, ValueError):
-                    active_block_turn_count = 0
-                is_first_turn_in_active_block = active_block_turn_count <= 0
-        except Exception as exc:
-            _LOG.debug(
-                "Could not read active block turn_count for session %s: %s",
-                session_id,
-                exc,
-            )
-    active_method_id = str((block_info or {}).get("method_id") or "").strip()
-    method_contract = (
-        _load_method_contracts().get(active_method_id, {}) if active_method_id else {}
-    )
-    runtime_drift_events: list[dict[str, Any]] = []
-    if block_info and active_method_id:
-        expected_stage = str(method_contract.get("control_stage") or "").strip().upper()
-        # active_stage is already normalized to the runtime equivalent
-        # above; collapse expected_stage the same way before comparing.
-        if (
-            expected_stage
-            and active_stage
-            and _runtime_stage(active_method_id, expected_stage) != active_stage
-        ):
-            conn.close()
-            return (
-                jsonify(
-                    {
-                        "error": "Active block stage does not match canonical method contract.",
-                        "code": "METHOD_STAGE_MISMATCH_RUNTIME",
-                        "active_stage": raw_active_stage,
-                        "method_id": active_method_id,
-                        "expected_stage": expected_stage,
-                    }
-                ),
-                409,
-            )
-
-        prompt_db = str(block_info.get("facilitation_prompt") or "").strip()
-        prompt_contract = str(method_contract.get("facilitation_prompt") or "").strip()
-        if not prompt_db and prompt_contract:
-            block_info["facilitation_prompt"] = prompt_contract
-            runtime_drift_events.append(
-                {
-                    "severity": "warning",
-                    "code": "MISSING_METHOD_PROMPT_FILLED",
-                    "method_id": active_method_id,
-                    "source": "yaml_contract",
-                }
-            )
-            prompt_db = prompt_contract
-
-        artifact_db = str(block_info.get("artifact_type") or "").strip()
-        artifact_contract = str(method_contract.get("artifact_type") or "").strip()
-        if not artifact_db and artifact_contract:
-            block_info["artifact_type"] = artifact_contract
-            runtime_drift_events.append(
-                {
-                    "severity": "warning",
-                    "code": "MISSING_ARTIFACT_CONTRACT_FILLED",
-                    "method_id": active_method_id,
-                    "source": "yaml_contract",
-                }
-            )
-            artifact_db = artifact_contract
-
-        critical_issues: list[str] = []
-        if not prompt_db:
-            critical_issues.append("missing_method_prompt")
-        if not artifact_db:
-            critical_issues.append("missing_artifact_contract")
-        if critical_issues:
-            conn.close()
-            return (
-                jsonify(
-                    {
-                        "error": "Critical method contract drift detected for active block.",
-                        "code": "METHOD_CONTRACT_DRIFT",
-                        "active_stage": active_stage,
-                        "method_id": active_method_id,
-                        "critical_issues": critical_issues,
-                    }
-                ),
-                409,
-            )
+        is_first_turn_in_active_block = turn_state.get(
+            "first_turn_in_block",
+            lambda: _is_first_turn_in_active_block(conn, session_id),
+        )
 
     behavior_override_norm = str(behavior_override or "").strip().lower()
     if active_stage in _NON_ASSESSMENT_STAGES and behavior_override_norm in {"evaluate", "teach_back"}:
@@ -1155,19 +1432,18 @@ def send_turn(session_id: str):
     )
     content_filter["accuracy_profile"] = accuracy_profile
 
+    # Retrieval scope comes from the same helper the draft prefetch uses, so
+    # a prefetch for an unchanged draft matches this turn's request.
+    context_kwargs = _context_request_kwargs(session, data)
     # Extract material_ids from content filter (new dual-library approach)
-    material_ids = None
+    material_ids = context_kwargs["material_ids"]
     if "material_ids" in content_filter:
-        material_ids = _normalize_material_ids(content_filter.get("material_ids"))
         content_filter["material_ids"] = material_ids or []
-    force_full_docs = _normalize_force_full_docs(
-        content_filter.get("force_full_docs"),
-        material_ids=material_ids,
-    )
+    force_full_docs = context_kwargs["force_full_docs"]
     content_filter["force_full_docs"] = force_full_docs
-    material_k = _resolve_material_retrieval_k(material_ids, accuracy_profile)
+    material_k = context_kwargs["k_materials"]
     # Explicit material selection should override course scoping.
-    retrieval_course_id = None if material_ids else session.get("course_id")
+    retrieval_course_id = context_kwargs["course_id"]
     selected_material_count, selected_material_labels = _material_scope_labels(
         material_ids
     )
@@ -1191,8 +1467,6 @@ def send_turn(session_id: str):
     # --- Mode flags (controls pipeline stages and model tier) ---
     _mode_provided = "mode" in data
     _mode = data.get("mode", {})
-    _materials_on = bool(_mode.get("materials", not _mode_provided))
-    _obsidian_on = bool(_mode.get("obsidian", not _mode_provided))
     _web_search_on = bool(_mode.get("web_search", not _mode_provided))
     _deep_think_on = bool(_mode.get("deep_think", False))
     _gemini_vision_on = bool(_mode.get("gemini_vision", False))
@@ -1208,16 +1482,44 @@ def send_turn(session_id: str):
     is_prime_first_block_turn = active_stage == "PRIME" and (
         is_first_turn_in_active_block or turn_number == 1
     )
-    teach_context = _build_teach_context(
-        session=session,
-        block_info=block_info,
-        chain_info=chain_info,
-        content_filter=content_filter,
-        map_of_contents=map_of_contents,
-        objective_scope=objective_scope,
-        focus_objective_id=focus_objective_id,
-        selected_material_labels=selected_material_labels,
-        active_stage_runtime=active_stage,
+    # block_info/chain_info are part of the same cached state, so only the
+    # per-turn inputs go into the fingerprint.
+    teach_context_fingerprint = json.dumps(
+        [
+            session.get("topic"),
+            session.get("unknowns"),
+            content_filter,
+            map_of_contents,
+            objective_scope,
+            focus_objective_id,
+            selected_material_labels,
+            active_stage,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    teach_context = turn_state.get(
+        "teach_context",
+        lambda: _build_teach_context(
+            session=session,
+            block_info=block_info,
+            chain_info=chain_info,
+            content_filter=content_filter,
+            map_of_contents=map_of_contents,
+            objective_scope=objective_scope,
+            focus_objective_id=focus_objective_id,
+            selected_material_labels=selected_material_labels,
+            active_stage_runtime=active_stage,
+        ),
+        fingerprint=teach_context_fingerprint,
+    )
+    turn_trace.turn_number = turn_number
+    # Synchronous baseline: run the post-turn jobs before the stream closes.
+    post_turn_inline = bool(current_app.config.get("TUTOR_POST_TURN_INLINE"))
+    turn_trace.end_span(
+        prepare_span,
+        state_cache_hits=turn_state.hits,
+        state_cache_misses=turn_state.misses,
     )
 
     def generate():
@@ -1227,8 +1529,12 @@ def send_turn(session_id: str):
             session["turn_count"] + 1,
         )
         turn_started_at = time.perf_counter()
+        turn_budget = TurnBudget(
+            resolve_latency_budget(accuracy_profile), profile=accuracy_profile
+        )
         retrieval_completed_at: float | None = None
         first_visible_chunk_at: float | None = None
+        prefetch_saved_ms: int | None = None
         full_response = ""
         citations = []
         parsed_verdict = None
@@ -1236,7 +1542,11 @@ def send_turn(session_id: str):
         latest_response_id = None
         latest_thread_id = None
         compaction_telemetry = None
+        prompt_cache_telemetry = None
+        model_usages: list[Any] = []
         used_scope_shortcut = False
+        trace_status = "ok"
+        turn_persisted = False
 
         from tutor_streaming import (
             format_sse_chunk,
@@ -1266,15 +1576,243 @@ def send_turn(session_id: str):
                     0,
                     int(round((first_visible_chunk_at - turn_started_at) * 1000)),
                 )
+            if prefetch_saved_ms is not None:
+                payload["prefetch_saved_ms"] = int(prefetch_saved_ms)
+            payload["state_cache_hits"] = turn_state.hits
+            payload["state_cache_misses"] = turn_state.misses
+            payload["first_token_budget_ms"] = turn_budget.first_token_ms
             return payload
 
+        def _persist_turn(vault_artifacts: list[dict] | None = None) -> None:
+            """Save the turn (and its queued vault writes) before ``done``."""
+            nonlocal turn_persisted
+            turn_persisted = True
+            history_tokens: int | None = None
+            compaction_queued = False
+            persist_span = turn_trace.start_span("turn.persist")
+            try:
+                db_conn = get_connection()
+                cur = db_conn.cursor()
+                now = datetime.now().isoformat()
+
+                # Build rich artifacts payload for session restore (Gap 4).
+                # Stores citations, verdict, toolActions, and retrieval_debug
+                # so the frontend can fully reconstruct the turn on restore.
+                _rich_artifacts: dict[str, Any] = {}
+                if artifact_cmd:
+                    _rich_artifacts["command"] = artifact_cmd
+                if citations:
+                    _rich_artifacts["citations"] = citations
+                if parsed_verdict:
+                    _rich_artifacts["verdict"] = parsed_verdict
+                if prompt_cache_telemetry:
+                    _rich_artifacts["prompt_cache"] = prompt_cache_telemetry
+                try:
+                    if retrieval_debug_payload:
+                        _rich_artifacts["retrieval_debug"] = retrieval_debug_payload
+                except NameError:
+                    pass
+                try:
+                    if parsed_teach_back:
+                        _rich_artifacts["teach_back_rubric"] = parsed_teach_back
+                except NameError:
+                    pass
+
+                cur.execute(
+                    """INSERT INTO tutor_turns
+                       (session_id, tutor_session_id, course_id, turn_number,
+                        question, answer, citations_json, response_id, model_id,
+                        phase, artifacts_json, behavior_override, evaluation_json,
+                        strategy_snapshot_json, interaction_mode, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        session_id,
+                        session_id,
+                        session.get("course_id"),
+                        turn_number,
+                        question,
+                        full_response,
+                        json.dumps(citations) if citations else None,
+                        None if used_scope_shortcut else latest_response_id,
+                        api_model,
+                        session.get("phase"),
+                        json.dumps(_rich_artifacts) if _rich_artifacts else None,
+                        behavior_override,
+                        json.dumps(parsed_verdict) if parsed_verdict else None,
+                        json.dumps(scholar_strategy) if scholar_strategy else None,
+                        interaction_mode,
+                        now,
+                    ),
+                )
+                saved_turn_id = cur.lastrowid
+
+                cur.execute(
+                    """UPDATE tutor_sessions
+                       SET turn_count = ?, last_response_id = ?, codex_thread_id = COALESCE(?, codex_thread_id), content_filter_json = ?,
+                           history_token_estimate = COALESCE(history_token_estimate, 0) + ?
+                       WHERE session_id = ?""",
+                    (
+                        turn_number,
+                        latest_response_id,
+                        latest_thread_id,
+                        json.dumps(content_filter) if content_filter is not None else None,
+                        estimate_turn_tokens(question, full_response),
+                        session_id,
+                    ),
+                )
+                # Running estimate of the turns no working summary covers yet;
+                # compaction resets it, so history is never re-tokenized here.
+                history_tokens = int(
+                    cur.execute(
+                        "SELECT history_token_estimate FROM tutor_sessions WHERE session_id = ?",
+                        (session_id,),
+                    ).fetchone()[0]
+                    or 0
+                )
+                compaction_queued = should_compact(session, history_tokens)
+                if compaction_queued:
+                    enqueue_post_turn_job(
+                        db_conn,
+                        "compact_session",
+                        {"session_id": session_id},
+                        ordering_key=f"{session_id}:compact",
+                        turn_number=turn_number,
+                        dedupe=True,
+                    )
+
+                if session.get("method_chain_id"):
+                    cur.execute(
+                        """UPDATE tutor_block_transitions
+                           SET turn_count = turn_count + 1
+                           WHERE tutor_session_id = ? AND ended_at IS NULL""",
+                        (session_id,),
+                    )
+
+                # Gap 9: Log retrieval accuracy data for feedback loop
+                try:
+                    _acc_confidence = None
+                    _acc_source_count = 0
+                    _acc_chunk_count = 0
+                    try:
+                        _rd = retrieval_debug_payload
+                        if isinstance(_rd, dict):
+                            _acc_confidence = _rd.get(
+                                "retrieval_confidence_tier"
+                            )
+                            _acc_source_count = int(
+                                _rd.get("retrieved_material_unique_sources", 0)
+                            )
+                            _acc_chunk_count = int(
+                                _rd.get("retrieved_material_chunks", 0)
+                            )
+                    except NameError:
+                        pass
+
+                    cur.execute(
+                        """INSERT INTO tutor_accuracy_log
+                           (session_id, turn_number, topic,
+                            retrieval_confidence, source_count,
+                            chunk_count, created_at)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                        (
+                            session_id,
+                            turn_number,
+                            session.get("topic"),
+                            _acc_confidence,
+                            _acc_source_count,
+                            _acc_chunk_count,
+                            now,
+                        ),
+                    )
+                except Exception as _acc_exc:
+                    # Audit B6: upgrade to WARNING — accuracy-log failures were
+                    # invisible at DEBUG and silently eroded the feedback loop.
+                    _LOG.warning("Accuracy log insert failed: %s", _acc_exc)
+
+                # Deferred vault writes commit with the turn, so a crash after
+                # the done event cannot drop them (see tutor_post_turn). One
+                # job per turn lets the batch coalesce edits to the same note.
+                if vault_artifacts:
+                    enqueue_post_turn_job(
+                        db_conn,
+                        "vault_artifact",
+                        {"artifacts": vault_artifacts},
+                        ordering_key=session_id,
+                        turn_number=turn_number,
+                    )
+
+                db_conn.commit()
+                db_conn.close()
+                if (vault_artifacts or compaction_queued) and not post_turn_inline:
+                    notify_post_turn_workers()
+                saved_prompt_cache = _rich_artifacts.get("prompt_cache")
+                saved_prefix_hash = (
+                    saved_prompt_cache.get("prefix_hash")
+                    if isinstance(saved_prompt_cache, dict)
+                    else None
+                )
+                turn_state_values: dict[str, Any] = {
+                    "previous_prefix_hash": str(saved_prefix_hash) if saved_prefix_hash else None,
+                }
+                if session.get("method_chain_id"):
+                    turn_state_values["first_turn_in_block"] = False
+                turn_state.record_turn_saved(
+                    session_updates={
+                        "turn_count": turn_number,
+                        "history_token_estimate": history_tokens,
+                        "last_response_id": latest_response_id,
+                        "codex_thread_id": latest_thread_id or session.get("codex_thread_id"),
+                        "content_filter_json": (
+                            json.dumps(content_filter) if content_filter is not None else None
+                        ),
+                    },
+                    values=turn_state_values,
+                )
+                remember_turn(
+                    session_id,
+                    {
+                        "id": saved_turn_id,
+                        "turn_number": turn_number,
+                        "question": question,
+                        "answer": full_response,
+                        "interaction_mode": interaction_mode,
+                        "created_at": now,
+                    },
+                    turn_count=turn_number,
+                )
+            except Exception as _persist_exc:
+                # Audit B2: previously swallowed silently. Persistence failure
+                # here means the turn rendered but never made it to
+                # tutor_turns — surface it to the server log so operators can
+                # triage instead of discovering the gap days later.
+                _LOG.warning(
+                    "Failed to persist tutor turn for session %s: %s",
+                    session_id,
+                    _persist_exc,
+                    exc_info=True,
+                )
+                persist_span.status = "error"
+            turn_trace.end_span(
+                persist_span,
+                history_tokens=history_tokens,
+                compaction_queued=compaction_queued,
+            )
+
         # Pre-initialise adaptive_conn so the finally-block never hits an
         # UnboundLocalError if build_context / prompt building raises before
         # the real connection is opened (audit B3).
         adaptive_conn = None
         try:
             from llm_provider import call_codex_json
-            from tutor_prompt_builder import build_prompt_with_contexts
+            from tutor_prompt_builder import (
+                PROMPT_TIER_BLOCK,
+                PROMPT_TIER_SESSION,
+                PROMPT_TIER_STATIC,
+                PROMPT_TIER_TURN,
+                PROMPT_TOKEN_BUDGET,
+                build_prompt_assembly,
+            )
+            from tutor_tokens import count_tokens
 
             requested_accuracy_profile = accuracy_profile
             effective_accuracy_profile = requested_accuracy_profile
@@ -1285,26 +1823,58 @@ def send_turn(session_id: str):
 
             # --- Unified context retrieval ---
             from tutor_context import build_context
-
-            _depth = "none"
-            if _materials_on and _obsidian_on:
-                _depth = "auto"
-            elif _materials_on:
-                _depth = "materials"
-            elif _obsidian_on:
-                _depth = "notes"
-
-            ctx = build_context(
-                question,
-                depth=_depth,
-                course_id=retrieval_course_id,
-                material_ids=material_ids,
-                module_prefix=module_prefix or None,
-                k_materials=effective_material_k,
-                force_full_docs=force_full_docs,
-            )
+            from tutor_prefetch import take_prefetched_context
+
+            _depth = context_kwargs["depth"]
+            # Reuse context the chat UI prefetched for the draft when the
+            # final message and retrieval scope still match. Waiting on the
+            # prefetch and building inline share the retrieval allowance;
+            # the wait is capped so an inline build keeps part of it.
+            with turn_trace.span("context.retrieve", depth=_depth) as retrieve_span:
+                retrieve_started = time.perf_counter()
+                ctx, prefetch_info = take_prefetched_context(
+                    session_id,
+                    question,
+                    max_wait_seconds=turn_budget.prefetch_wait(),
+                    **context_kwargs,
+                )
+                retrieve_span.set(prefetch=prefetch_info.get("status"))
+                if ctx is None:
+                    turn_budget.spend(
+                        "retrieval", time.perf_counter() - retrieve_started
+                    )
+                    retrieve_started = time.perf_counter()
+                    deadline_seconds, source_deadlines = (
+                        turn_budget.context_deadlines()
+                    )
+                    ctx = build_context(
+                        question,
+                        **context_kwargs,
+                        deadline_seconds=deadline_seconds,
+                        source_deadlines=source_deadlines,
+                    )
+                else:
+                    prefetch_saved_ms = prefetch_info.get("saved_ms")
+                timed_out_sources = ctx["debug"].get("timed_out_sources") or []
+                turn_budget.spend(
+                    "retrieval",
+                    time.perf_counter() - retrieve_started,
+                    status="timeout" if "materials" in timed_out_sources else "ok",
+                )
+                if _depth in ("auto", "notes"):
+                    turn_budget.spend(
+                        "notes",
+                        0.0,
+                        status=(
+                            "timeout"
+                            if {"notes", "vault_state"} & set(timed_out_sources)
+                            else "ok"
+                        ),
+                    )
             retrieval_completed_at = time.perf_counter()
             rag_debug = ctx["debug"]
+            if prefetch_info.get("status") != "none":
+                rag_debug["prefetch"] = prefetch_info
 
             material_text = ctx["materials"]
             notes_context_text = ctx["notes"]
@@ -1333,9 +1903,17 @@ def send_turn(session_id: str):
                     "Tell the student: Gemini Vision was requested but isn't available for these materials."
                 )
             elif _gemini_vision_on and material_ids:
-                gemini_video_context, gemini_diag = _build_gemini_vision_context(
-                    material_ids, topic=question
-                )
+                with turn_trace.span("context.gemini_vision"):
+                    gemini_video_context, gemini_diag = turn_budget.run(
+                        "vision",
+                        lambda: _build_gemini_vision_context(
+                            material_ids, topic=question
+                        ),
+                        default=(
+                            "",
+                            "Gemini Vision did not finish within this turn's latency budget.",
+                        ),
+                    )
                 if gemini_video_context:
                     material_text = (
                         f"{material_text}\n\n## Gemini Video Vision Context\n"
@@ -1358,14 +1936,26 @@ def send_turn(session_id: str):
             try:
                 from adaptive.knowledge_graph import hybrid_retrieve
 
-                graph_result = hybrid_retrieve(question, adaptive_conn)
+                def _graph_lookup() -> dict[str, Any]:
+                    # Runs on the budget pool; sqlite connections are per-thread.
+                    graph_conn = get_connection()
+                    try:
+                        return hybrid_retrieve(question, graph_conn)
+                    finally:
+                        graph_conn.close()
+
+                with turn_trace.span("context.graph"):
+                    graph_result = turn_budget.run("graph", _graph_lookup, default={})
                 if graph_result.get("context_text"):
                     graph_context_text = graph_result["context_text"]
             except (ImportError, Exception) as _kg_exc:
                 _LOG.debug("GraphRAG skipped: %s", _kg_exc)
 
-            # Materials go in system prompt (not user prompt)
-            system_prompt = build_prompt_with_contexts(
+            # Materials go in system prompt (not user prompt). Sections are
+            # tiered stable -> volatile so the cacheable prefix survives
+            # across turns; see tutor_prompt_builder.PromptAssembly.
+            prompt_span = turn_trace.start_span("prompt.assemble")
+            prompt_assembly = build_prompt_assembly(
                 current_block=block_info,
                 chain_info=chain_info,
                 course_id=session.get("course_id"),
@@ -1380,27 +1970,31 @@ def send_turn(session_id: str):
                 content_filter.get("session_rules")
             )
             if session_rules:
-                system_prompt += (
-                    f"\n\n## Session Rules (Current Session Only)\n{session_rules}"
+                prompt_assembly.add(
+                    PROMPT_TIER_SESSION,
+                    f"## Session Rules (Current Session Only)\n{session_rules}",
                 )
             packet_context = (content_filter.get("packet_context") or "").strip()
             if packet_context:
-                system_prompt += (
-                    f"\n\n## Student's Study Packet\n{packet_context}"
+                prompt_assembly.add(
+                    PROMPT_TIER_SESSION,
+                    f"## Student's Study Packet\n{packet_context}",
                 )
             memory_capsule_context = (
                 content_filter.get("memory_capsule_context") or ""
             ).strip()
             if memory_capsule_context:
-                system_prompt += (
-                    f"\n\n## Active Memory Capsule\n{memory_capsule_context}"
+                prompt_assembly.add(
+                    PROMPT_TIER_TURN,
+                    f"## Active Memory Capsule\n{memory_capsule_context}",
                 )
-            strategy_prompt = render_strategy_prompt(scholar_strategy)
-            if strategy_prompt:
-                system_prompt += f"\n\n{strategy_prompt}"
-            system_prompt += (
-                "\n\n## Retrieval Tuning\n"
-                f"{_accuracy_profile_prompt_guidance(effective_accuracy_profile)}"
+            prompt_assembly.add(
+                PROMPT_TIER_SESSION, render_strategy_prompt(scholar_strategy)
+            )
+            prompt_assembly.add(
+                PROMPT_TIER_TURN,
+                "## Retrieval Tuning\n"
+                f"{_accuracy_profile_prompt_guidance(effective_accuracy_profile)}",
             )
             _needs_lo_save = False
             _lo_save_called = False
@@ -1413,21 +2007,23 @@ def send_turn(session_id: str):
                 )
                 if not objective_lines:
                     objective_lines = "- (no mapped objectives yet)"
-                system_prompt += (
-                    "\n\n## Map of Contents Context\n"
+                prompt_assembly.add(
+                    PROMPT_TIER_SESSION,
+                    "## Map of Contents Context\n"
                     f"- Module: {map_of_contents.get('module_name') or 'General Module'}\n"
                     f"- File: {map_of_contents.get('path') or '(missing)'}\n"
                     f"- Status: {map_of_contents.get('status') or 'unknown'}\n"
                     "- Objectives in scope:\n"
-                    f"{objective_lines}"
+                    f"{objective_lines}",
                 )
                 _needs_lo_save = (
                     not _session_has_real_objectives(map_of_contents)
                     and turn_number <= 5
                 )
                 if _needs_lo_save:
-                    system_prompt += (
-                        "\n\n## Missing Learning Objectives\n"
+                    prompt_assembly.add(
+                        PROMPT_TIER_TURN,
+                        "## Missing Learning Objectives\n"
                         "No learning objectives are set for this module yet. "
                         "You MUST resolve this before teaching content.\n"
                         "1. Ask the student: \"I don't have learning objectives for this module yet. "
@@ -1445,60 +2041,65 @@ def send_turn(session_id: str):
                         'Pass `objectives` (array with `id` like "OBJ-1" and `description`) '
                         "and `save_folder` (the vault path the student provided). "
                         "If the student says 'default' or doesn't care, omit save_folder. "
-                        "Do NOT skip this step or say you cannot save them."
+                        "Do NOT skip this step or say you cannot save them.",
                     )
             if enforce_reference_bounds and reference_targets:
                 bounded_targets = "\n".join(f"- {t}" for t in reference_targets[:20])
-                system_prompt += (
-                    "\n\n## Active Reference Bounds\n"
+                prompt_assembly.add(
+                    PROMPT_TIER_TURN,
+                    "## Active Reference Bounds\n"
                     "- Only answer inside these targets for this turn.\n"
                     "- If a question is outside bounds, ask to add it as a follow-up target first.\n"
                     "Targets:\n"
-                    f"{bounded_targets}"
+                    f"{bounded_targets}",
                 )
             # Gate on the normalized runtime stage so vault-hardened
             # ORIENT/PLAN methods inherit PRIME hard guardrails, not just
             # methods whose YAML declares PRIME literally.
             if block_info and active_stage == "PRIME":
-                system_prompt += (
-                    "\n\n## PRIME Stage Guardrails (Hard)\n"
+                prompt_assembly.add(
+                    PROMPT_TIER_BLOCK,
+                    "## PRIME Stage Guardrails (Hard)\n"
                     "- PRIME is orientation only.\n"
                     "- Do not run scored checks, retrieval grading, or confidence scoring.\n"
-                    "- Use PRIME outputs to prepare downstream CALIBRATE/ENCODE work.\n"
+                    "- Use PRIME outputs to prepare downstream CALIBRATE/ENCODE work.\n",
                 )
                 block_name_l = str(block_info.get("name") or "").strip().lower()
                 if block_name_l == "structural extraction":
-                    system_prompt += (
-                        "\n## M-PRE-008 Contract\n"
+                    prompt_assembly.add(
+                        PROMPT_TIER_BLOCK,
+                        "## M-PRE-008 Contract\n"
                         "- Build a compact structural spine of high-signal nodes.\n"
                         "- Link every node to at least one objective.\n"
                         "- Include UnknownNodeList and PriorityNodes.\n"
-                        "- Exclude trivia and avoid deep content teaching in this method.\n"
+                        "- Exclude trivia and avoid deep content teaching in this method.\n",
                     )
                 if is_prime_first_block_turn:
-                    system_prompt += (
-                        "\n## PRIME Learning Objective Extraction\n"
+                    prompt_assembly.add(
+                        PROMPT_TIER_TURN,
+                        "## PRIME Learning Objective Extraction\n"
                         "This is a PRIME block. As you engage with the student, identify and extract the key learning objectives from the loaded materials. "
-                        "Use the save_learning_objectives tool to save them. Extract 3-7 specific, measurable learning objectives.\n"
+                        "Use the save_learning_objectives tool to save them. Extract 3-7 specific, measurable learning objectives.\n",
                     )
             # Gate on the normalized runtime stage so vault EXPLAIN
             # methods and runtime-pinned M-ELB-001 / M-ENC-008 / M-GEN-007
             # still inherit TEACH hard guardrails.
             if block_info and active_stage == "TEACH":
-                system_prompt += (
-                    "\n\n## TEACH Stage Guardrails (Hard)\n"
+                prompt_assembly.add(
+                    PROMPT_TIER_BLOCK,
+                    "## TEACH Stage Guardrails (Hard)\n"
                     "- TEACH is explanation-first, not assessment-first.\n"
                     "- Do not run scored checks, confidence tagging, teach-back grading, or retrieval gating inside TEACH.\n"
                     "- Teach one chunk at a time using: Source Facts -> Plain Interpretation -> Bridge Move -> Application -> Anchor Artifact.\n"
                     "- Function before structure. Meaning first, bridge second, anchor third.\n"
                     "- If you use an analogy or story, state where it breaks and return to the real concept before moving on.\n"
-                    "- Hand off based on Tutor judgment when the learner has a usable L2 grasp and one anchor artifact or application link.\n"
+                    "- Hand off based on Tutor judgment when the learner has a usable L2 grasp and one anchor artifact or application link.\n",
                 )
-            system_prompt += (
-                f"\n\n## PRIME Objective Scope\n- Active scope: {objective_scope}\n"
+            objective_scope_section = (
+                f"## PRIME Objective Scope\n- Active scope: {objective_scope}\n"
             )
             if objective_scope == "module_all":
-                system_prompt += "- Use module-level big-picture orientation first, then ask learner to choose one focus objective.\n"
+                objective_scope_section += "- Use module-level big-picture orientation first, then ask learner to choose one focus objective.\n"
             else:
                 focus_code = _strip_wikilink(focus_objective_id)
                 focus_link = (
@@ -1506,16 +2107,18 @@ def send_turn(session_id: str):
                     if focus_code
                     else ""
                 )
-                system_prompt += (
+                objective_scope_section += (
                     "- Stay on one focus objective for this turn.\n"
                     f"- Focus objective: {focus_link or 'None selected'}\n"
                 )
+            prompt_assembly.add(PROMPT_TIER_TURN, objective_scope_section)
             if selected_material_count > 0:
                 selected_list = "\n".join(
                     f"- {name}" for name in selected_material_labels
                 )
-                system_prompt += (
-                    "\n\n## Selected Material Scope\n"
+                prompt_assembly.add(
+                    PROMPT_TIER_TURN,
+                    "## Selected Material Scope\n"
                     f"- Student selected materials for this turn: {selected_material_count}\n"
                     f"- Retrieval target depth this turn: {effective_material_k}\n"
                     "- Retrieved excerpts can be fewer than selected files because retrieval is relevance-based.\n"
@@ -1523,19 +2126,21 @@ def send_turn(session_id: str):
                     "- Only mention retrieved/cited file count if they explicitly ask for retrieved/cited count.\n"
                     "- Do not frame selected-scope questions as 'I am using N retrieved files'.\n"
                     "Selected files:\n"
-                    f"{selected_list}"
+                    f"{selected_list}",
                 )
             if profile_escalated:
-                system_prompt += (
-                    "\n\n## Retrieval Escalation\n"
+                prompt_assembly.add(
+                    PROMPT_TIER_TURN,
+                    "## Retrieval Escalation\n"
                     f"- Requested profile: {requested_accuracy_profile}\n"
                     f"- Escalated profile: {effective_accuracy_profile}\n"
-                    f"- Escalation reason(s): {', '.join(profile_escalation_reasons) or 'weak_retrieval_signals'}\n"
+                    f"- Escalation reason(s): {', '.join(profile_escalation_reasons) or 'weak_retrieval_signals'}\n",
                 )
 
             effective_model = codex_model or _model
-            system_prompt += (
-                "\n\n## Tooling\n"
+            prompt_assembly.add(
+                PROMPT_TIER_STATIC,
+                "## Tooling\n"
                 "Do not run shell commands or attempt to read local files.\n"
                 "You have access to the following tools. Use them ONLY when the student "
                 "explicitly asks or when it clearly benefits the learning session:\n"
@@ -1552,19 +2157,23 @@ def send_turn(session_id: str):
                 "with id/label and edges with from/to. May not be available if "
                 "Figma Desktop is not running.\n"
                 "Do NOT use tools for casual questions or general conversation. "
-                "When you use a tool, briefly confirm what you did.\n\n"
+                "When you use a tool, briefly confirm what you did.",
+            )
+            # The model can be overridden per turn, so identity is turn-tier.
+            prompt_assembly.add(
+                PROMPT_TIER_TURN,
                 f"## Identity\n"
                 f"You are powered by OpenAI model **{effective_model}**. "
-                f"If asked what model you are, state this exactly."
+                f"If asked what model you are, state this exactly.",
             )
 
             # Append structured output contracts for behavior overrides
             if behavior_override == "evaluate":
-                system_prompt += VERDICT_PROMPT_SUFFIX
+                prompt_assembly.add(PROMPT_TIER_TURN, VERDICT_PROMPT_SUFFIX)
             elif behavior_override == "concept_map":
-                system_prompt += CONCEPT_MAP_PROMPT_SUFFIX
+                prompt_assembly.add(PROMPT_TIER_TURN, CONCEPT_MAP_PROMPT_SUFFIX)
             elif behavior_override == "teach_back":
-                system_prompt += TEACH_BACK_PROMPT_SUFFIX
+                prompt_assembly.add(PROMPT_TIER_TURN, TEACH_BACK_PROMPT_SUFFIX)
 
             # M8: Adaptive scaffolding based on mastery level
             try:
@@ -1576,7 +2185,7 @@ def send_turn(session_id: str):
                 if topic_skill:
                     eff = _get_eff_mastery(adaptive_conn, "default", topic_skill, _MC())
                     scaffold_directive = get_scaffolding_directive(eff)
-                    system_prompt += f"\n\n{scaffold_directive}"
+                    prompt_assembly.add(PROMPT_TIER_TURN, scaffold_directive)
             except (ImportError, Exception) as _sc_exc:
                 _LOG.debug("Scaffolding skipped: %s", _sc_exc)
 
@@ -1595,11 +2204,12 @@ def send_turn(session_id: str):
                     recs = _get_recs(**rec_kw)
                     if recs:
                         rec_lines = [f"- {r['name']}" for r in recs[:3]]
-                        system_prompt += (
-                            "\n\n## Scholar-Recommended Methods\n"
+                        prompt_assembly.add(
+                            PROMPT_TIER_TURN,
+                            "## Scholar-Recommended Methods\n"
                             "Based on past session ratings, these chains work well "
                             "for this context:\n" + "\n".join(rec_lines) + "\n"
-                            "Mention these if the student asks which method to try next."
+                            "Mention these if the student asks which method to try next.",
                         )
             except Exception:
                 pass  # Best-effort
@@ -1633,6 +2243,18 @@ def send_turn(session_id: str):
                             ans = ans[:800] + "..."
                         history_lines.append(f"Assistant: {ans}")
             history_text = "\n".join(history_lines).strip() or "(no prior turns)"
+            # History and question come out of the prompt budget first; the
+            # budgeted turn sections (materials, graph, vault) get the rest.
+            history_tokens = sum(count_tokens(line) for line in history_lines)
+            question_tokens = count_tokens(question)
+            prompt_assembly.token_budget = max(
+                0, PROMPT_TOKEN_BUDGET - history_tokens - question_tokens
+            )
+            system_prompt = prompt_assembly.render()
+            prompt_layout = prompt_assembly.layout()
+            prompt_token_usage = prompt_assembly.token_usage()
+            prompt_token_usage["history"] = history_tokens
+            prompt_token_usage["question"] = question_tokens
 
             directive = get_directive(behavior_override)
             user_prompt = f"""{directive + chr(10) if directive else ""}## Chat History
@@ -1640,6 +2262,13 @@ def send_turn(session_id: str):
 
 ## Current Question
 {question}"""
+            turn_trace.end_span(
+                prompt_span,
+                system_chars=len(system_prompt),
+                user_chars=len(user_prompt),
+                system_tokens=prompt_token_usage["total"],
+                budget_dropped=len(prompt_token_usage["dropped"]),
+            )
 
             api_model = codex_model or _model
             prev_response_id: str | None = session.get("last_response_id")
@@ -1669,6 +2298,8 @@ def send_turn(session_id: str):
                 payload["active_method_id"] = active_method_id
                 if runtime_drift_events:
                     payload["runtime_drift_events"] = runtime_drift_events
+                payload["latency_budget"] = turn_budget.summary()
+                payload["token_usage"] = prompt_token_usage
                 return payload
 
             if selected_material_count > 0 and _is_material_count_question(question):
@@ -1702,6 +2333,7 @@ def send_turn(session_id: str):
                 )
                 _mark_first_visible_chunk()
                 yield format_sse_chunk(full_response)
+                _persist_turn()
                 yield format_sse_done(
                     citations=citations,
                     model=api_model,
@@ -1745,6 +2377,7 @@ def send_turn(session_id: str):
                 )
                 _mark_first_visible_chunk()
                 yield format_sse_chunk(full_response)
+                _persist_turn()
                 yield format_sse_done(
                     citations=citations,
                     model=api_model,
@@ -1787,6 +2420,7 @@ def send_turn(session_id: str):
                 )
                 _mark_first_visible_chunk()
                 yield format_sse_chunk(full_response)
+                _persist_turn()
                 yield format_sse_done(
                     citations=citations,
                     model=api_model,
@@ -1796,7 +2430,9 @@ def send_turn(session_id: str):
                 )
             else:
                 from tutor_tools import (
+                    ARTIFACT_WRITE_TOOLS,
                     SAVE_LEARNING_OBJECTIVES_SCHEMA,
+                    WRITE_TOOLS,
                     execute_tool,
                     get_tool_schemas,
                 )
@@ -1836,6 +2472,7 @@ def send_turn(session_id: str):
                         "web_search": _web_search_on,
                         "tools": tool_schemas,
                         "reasoning_effort": _reasoning_effort,
+                        "prompt_cache_key": f"tutor-{session_id}",
                     }
                     if _needs_lo_save and turn_number >= 2:
                         stream_kwargs["tool_choice"] = "required"
@@ -1862,10 +2499,14 @@ def send_turn(session_id: str):
                             else:
                                 stream_kwargs.pop("previous_response_id", None)
 
-                        for chunk in _llm_provider.stream_chatgpt_responses(
-                            system_prompt,
-                            user_prompt,
-                            **stream_kwargs,
+                        for chunk in turn_trace.iterate(
+                            "llm.stream",
+                            _llm_provider.stream_chatgpt_responses(
+                                system_prompt,
+                                user_prompt,
+                                **stream_kwargs,
+                            ),
+                            round=tool_round,
                         ):
                             if chunk.get("type") == "delta":
                                 full_response += chunk.get("text", "")
@@ -1887,6 +2528,7 @@ def send_turn(session_id: str):
                                 compaction_telemetry = _build_compaction_telemetry(
                                     chunk.get("usage")
                                 )
+                                model_usages.append(chunk.get("usage"))
                                 prev_response_id = (
                                     chunk.get("response_id") or prev_response_id
                                 )
@@ -1966,9 +2608,30 @@ def send_turn(session_id: str):
                                 chunk_type="tool_call",
                             )
 
-                            tool_result = execute_tool(
-                                tool_name, args, session_id=session_id
+                            tool_stage = (
+                                "artifacts"
+                                if tool_name in ARTIFACT_WRITE_TOOLS
+                                else "tools"
                             )
+                            with turn_trace.activate():
+                                # Writes run to completion: an abandoned
+                                # write still lands, and the model retries it.
+                                tool_result = turn_budget.run(
+                                    tool_stage,
+                                    lambda: execute_tool(
+                                        tool_name, args, session_id=session_id
+                                    ),
+                                    abandon=tool_name not in WRITE_TOOLS,
+                                )
+                            if tool_result is None:
+                                tool_result = {
+                                    "success": False,
+                                    "error": (
+                                        f"{tool_name} did not finish within this "
+                                        "turn's latency budget and was abandoned."
+                                    ),
+                                    "budget_exceeded": True,
+                                }
 
                             _mark_first_visible_chunk()
                             yield format_sse_chunk(
@@ -2012,13 +2675,14 @@ def send_turn(session_id: str):
 
                 except Exception as stream_err:
                     if not full_response:
-                        result = call_codex_json(
-                            system_prompt,
-                            user_prompt,
-                            model=codex_model,
-                            timeout=llm_timeout_seconds,
-                            isolated=True,
-                        )
+                        with turn_trace.activate():
+                            result = call_codex_json(
+                                system_prompt,
+                                user_prompt,
+                                model=codex_model,
+                                timeout=llm_timeout_seconds,
+                                isolated=True,
+                            )
                         if not result.get("success"):
                             raise RuntimeError(result.get("error") or "Codex failed")
                         full_response = (result.get("content") or "").strip()
@@ -2040,10 +2704,13 @@ def send_turn(session_id: str):
                         )
                         from tutor_tools import execute_save_learning_objectives
 
-                        tool_result = execute_save_learning_objectives(
-                            {"objectives": extracted},
-                            session_id=session_id,
-                        )
+                        with turn_trace.span(
+                            "tool.execute", tool="save_learning_objectives", auto=True
+                        ):
+                            tool_result = execute_save_learning_objectives(
+                                {"objectives": extracted},
+                                session_id=session_id,
+                            )
                         if tool_result.get("success"):
                             _lo_save_called = True
                             try:
@@ -2085,35 +2752,32 @@ def send_turn(session_id: str):
                         )
                 artifact_payload = [artifact_cmd] if artifact_cmd else None
 
-                # --- Vault artifact processing ---
-                vault_artifact_results: list[dict] | None = None
+                # --- Vault artifacts: parsed now, written after the turn commits ---
+                vault_artifacts: list[dict] = []
                 try:
                     from vault_artifact_parser import (
                         parse_vault_artifacts,
                         strip_vault_artifacts,
                     )
-                    from vault_artifact_router import execute_all_artifacts
-                    from obsidian_vault import ObsidianVault
 
                     vault_artifacts = parse_vault_artifacts(full_response)
                     if vault_artifacts:
-                        vault = ObsidianVault()
-                        vault_artifact_results = execute_all_artifacts(
-                            vault, vault_artifacts
-                        )
-                        _LOG.info(
-                            "Vault artifacts executed session=%s results=%s",
-                            session_id,
-                            json.dumps(vault_artifact_results, default=str),
-                        )
                         full_response = strip_vault_artifacts(full_response)
                         if artifact_payload is None:
                             artifact_payload = []
                         artifact_payload.append(
-                            {"vault_artifacts": vault_artifact_results}
+                            {
+                                "vault_artifacts": [
+                                    {
+                                        "operation": vault_artifact.get("operation"),
+                                        "status": "queued",
+                                    }
+                                    for vault_artifact in vault_artifacts
+                                ]
+                            }
                         )
                 except Exception as _vault_exc:
-                    _LOG.warning("Vault artifact processing failed: %s", _vault_exc)
+                    _LOG.warning("Vault artifact parsing failed: %s", _vault_exc)
 
                 retrieval_debug_payload = _attach_profile_debug(
                     _build_retrieval_debug_payload(
@@ -2257,12 +2921,30 @@ def send_turn(session_id: str):
                         except (ImportError, Exception) as _tb_exc:
                             _LOG.debug("Teach-back mastery gate skipped: %s", _tb_exc)
 
+                prompt_cache_telemetry = _build_prompt_cache_telemetry(
+                    prompt_layout,
+                    model_usages,
+                    previous_prefix_hash=previous_prefix_hash,
+                )
+                if prompt_cache_telemetry:
+                    _LOG.info(
+                        "Tutor prompt cache session=%s turn=%s prefix=%s reused=%s cached=%d/%d",
+                        session_id,
+                        turn_number,
+                        prompt_cache_telemetry["prefix_hash"],
+                        prompt_cache_telemetry["prefix_reused"],
+                        prompt_cache_telemetry["cached_tokens"],
+                        prompt_cache_telemetry["input_tokens"],
+                    )
+
+                _persist_turn(vault_artifacts)
                 yield format_sse_done(
                     citations=all_citations,
                     model=api_model,
                     artifacts=artifact_payload,
                     retrieval_debug=retrieval_debug_payload,
                     compaction_telemetry=compaction_telemetry,
+                    prompt_cache=prompt_cache_telemetry,
                     timing=_build_timing_payload(tool_rounds=tool_round),
                     behavior_override=behavior_override,
                     verdict=parsed_verdict,
@@ -2272,6 +2954,7 @@ def send_turn(session_id: str):
                 )
 
         except Exception as e:
+            trace_status = "error"
             yield format_sse_error(str(e))
             full_response = f"[Error: {e}]"
             citations = []
@@ -2283,149 +2966,42 @@ def send_turn(session_id: str):
                 except Exception:
                     pass
 
-        # After streaming completes, log the turn
-        try:
-            db_conn = get_connection()
-            cur = db_conn.cursor()
-            now = datetime.now().isoformat()
-
-            # Build rich artifacts payload for session restore (Gap 4).
-            # Stores citations, verdict, toolActions, and retrieval_debug
-            # so the frontend can fully reconstruct the turn on restore.
-            _rich_artifacts: dict[str, Any] = {}
-            if artifact_cmd:
-                _rich_artifacts["command"] = artifact_cmd
-            if citations:
-                _rich_artifacts["citations"] = citations
-            if parsed_verdict:
-                _rich_artifacts["verdict"] = parsed_verdict
-            try:
-                if retrieval_debug_payload:
-                    _rich_artifacts["retrieval_debug"] = retrieval_debug_payload
-            except NameError:
-                pass
-            try:
-                if parsed_teach_back:
-                    _rich_artifacts["teach_back_rubric"] = parsed_teach_back
-            except NameError:
-                pass
-
-            cur.execute(
-                """INSERT INTO tutor_turns
-                   (session_id, tutor_session_id, course_id, turn_number,
-                    question, answer, citations_json, response_id, model_id,
-                    phase, artifacts_json, behavior_override, evaluation_json,
-                    strategy_snapshot_json, interaction_mode, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    session_id,
-                    session_id,
-                    session.get("course_id"),
-                    turn_number,
-                    question,
-                    full_response,
-                    json.dumps(citations) if citations else None,
-                    None if used_scope_shortcut else latest_response_id,
-                    api_model,
-                    session.get("phase"),
-                    json.dumps(_rich_artifacts) if _rich_artifacts else None,
-                    behavior_override,
-                    json.dumps(parsed_verdict) if parsed_verdict else None,
-                    json.dumps(scholar_strategy) if scholar_strategy else None,
-                    interaction_mode,
-                    now,
-                ),
-            )
+        # Error turns were not persisted before the stream ended.
+        if not turn_persisted:
+            _persist_turn()
 
-            cur.execute(
-                """UPDATE tutor_sessions
-                   SET turn_count = ?, last_response_id = ?, codex_thread_id = COALESCE(?, codex_thread_id), content_filter_json = ?
-                   WHERE session_id = ?""",
-                (
-                    turn_number,
-                    latest_response_id,
-                    latest_thread_id,
-                    json.dumps(content_filter) if content_filter is not None else None,
-                    session_id,
-                ),
+        turn_trace.finish(status=trace_status, **_build_timing_payload())
+        try:
+            submit_post_turn_job(
+                "trace",
+                trace_record(turn_trace),
+                turn_number=turn_number,
+                wake=not post_turn_inline,
             )
-
-            if session.get("method_chain_id"):
-                cur.execute(
-                    """UPDATE tutor_block_transitions
-                       SET turn_count = turn_count + 1
-                       WHERE tutor_session_id = ? AND ended_at IS NULL""",
-                    (session_id,),
-                )
-
-            # Gap 9: Log retrieval accuracy data for feedback loop
-            try:
-                _acc_confidence = None
-                _acc_source_count = 0
-                _acc_chunk_count = 0
-                try:
-                    _rd = retrieval_debug_payload
-                    if isinstance(_rd, dict):
-                        _acc_confidence = _rd.get(
-                            "retrieval_confidence_tier"
-                        )
-                        _acc_source_count = int(
-                            _rd.get("retrieved_material_unique_sources", 0)
-                        )
-                        _acc_chunk_count = int(
-                            _rd.get("retrieved_material_chunks", 0)
-                        )
-                except NameError:
-                    pass
-
-                cur.execute(
-                    """INSERT INTO tutor_accuracy_log
-                       (session_id, turn_number, topic,
-                        retrieval_confidence, source_count,
-                        chunk_count, created_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        session_id,
-                        turn_number,
-                        session.get("topic"),
-                        _acc_confidence,
-                        _acc_source_count,
-                        _acc_chunk_count,
-                        now,
-                    ),
-                )
-            except Exception as _acc_exc:
-                # Audit B6: upgrade to WARNING — accuracy-log failures were
-                # invisible at DEBUG and silently eroded the feedback loop.
-                _LOG.warning("Accuracy log insert failed: %s", _acc_exc)
-
-            db_conn.commit()
-            db_conn.close()
-        except Exception as _persist_exc:
-            # Audit B2: previously swallowed silently. Persistence failure
-            # here means the turn rendered but never made it to
-            # tutor_turns — surface it to the server log so operators can
-            # triage instead of discovering the gap days later.
+        except Exception as _trace_exc:
             _LOG.warning(
-                "Failed to persist tutor turn for session %s: %s",
+                "Failed to queue turn trace for session %s: %s",
                 session_id,
-                _persist_exc,
-                exc_info=True,
+                _trace_exc,
             )
-
-    heartbeat_seconds = current_app.config.get("TUTOR_SSE_HEARTBEAT_SECONDS", 15.0)
-    try:
-        heartbeat_seconds = float(heartbeat_seconds)
-    except (TypeError, ValueError):
-        heartbeat_seconds = 15.0
-    if heartbeat_seconds <= 0:
-        heartbeat_seconds = 15.0
+        if post_turn_inline:
+            run_pending_post_turn_jobs()
+
+    stream = generate()
+    # Under the ASGI serving mode the server emits heartbeats from its event
+    # loop; only the thread-per-request dev server needs the producer thread.
+    if not request.environ.get(SERVER_HEARTBEATS_ENVIRON_KEY):
+        heartbeat_seconds = current_app.config.get("TUTOR_SSE_HEARTBEAT_SECONDS", 15.0)
+        try:
+            heartbeat_seconds = float(heartbeat_seconds)
+        except (TypeError, ValueError):
+            heartbeat_seconds = 15.0
+        if heartbeat_seconds <= 0:
+            heartbeat_seconds = 15.0
+        stream = _stream_with_heartbeats(stream, interval_seconds=heartbeat_seconds)
 
     return Response(
-        _stream_with_heartbeats(
-            generate(),
-            interval_seconds=heartbeat_seconds,
-        ),
+        stream,
         mimetype="text/event-stream",
         headers={
             "Cache-Control": "no-cache, no-store",
@@ -2443,12 +3019,19 @@ def send_turn(session_id: str):
 @tutor_bp.route("/session/<session_id>/chain-status", methods=["GET"])
 def get_chain_status(session_id: str):
     conn = get_connection()
-    session = _get_tutor_session(conn, session_id)
+    turn_state = session_state(
+        session_id, stamp=read_session_stamp(conn, session_id)
+    )
+    session = turn_state.get(
+        "session", lambda: _get_tutor_session(conn, session_id), cache_none=False
+    )
     if not session:
         conn.close()
         return jsonify({"error": "Session not found"}), 404
 
-    status = _get_chain_status(conn, session_id)
+    status = turn_state.get(
+        "chain_status", lambda: _get_chain_status(conn, session_id), cache_none=False
+    )
     conn.close()
     if not status:
         return jsonify({"error": "Session has no method chain"}), 400
@@ -2526,6 +3109,7 @@ def advance_block(session_id: str):
     )
 
     conn.commit()
+    bump_session_revision(session_id)
 
     # --- Vault auto-write (fire-and-forget) ---
     vault_write_status = "skipped"
@@ -298,6 +298,7 @@ def _ensure_selector_columns(conn: sqlite3.Connection) -> None:
         "selector_dependency_fix",
         "codex_thread_id",
         "last_response_id",
+        "history_token_estimate",
     }
     required_tutor_turn_cols = {"response_id", "model_id", "interaction_mode"}
     required_session_cols = {"selector_chain_id", "selector_policy_version"}
@@ -328,6 +329,7 @@ def _ensure_selector_columns(conn: sqlite3.Connection) -> None:
             ("selector_dependency_fix", "INTEGER DEFAULT 0"),
             ("codex_thread_id", "TEXT"),
             ("last_response_id", "TEXT"),
+            ("history_token_estimate", "INTEGER DEFAULT 0"),
         ):
             if col not in ts_cols:
                 cur.execute(f"ALTER TABLE tutor_sessions ADD COLUMN {col} {typedef}")
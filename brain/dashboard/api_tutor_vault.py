@@ -26,6 +26,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 from db_setup import get_connection
+from tutor_turn_state import bump_session_revision
 
 from dashboard.api_tutor_utils import (
     _OBSIDIAN_VAULT,
@@ -1437,6 +1438,7 @@ def save_learning_objectives_from_tool(
             (json.dumps(content_filter), session_id),
         )
         conn.commit()
+        bump_session_revision(session_id)
 
         return {
             "success": True,
@@ -1632,6 +1634,7 @@ def _finalize_structured_notes_for_session(
         ),
     )
     conn.commit()
+    bump_session_revision(session_id)
 
     return (
         {
@@ -1722,6 +1725,7 @@ def _reconcile_obsidian_state(
                 )
             conn.commit()
             conn.close()
+            bump_session_revision(session_id)
         except Exception:
             logging.getLogger(__name__).warning(
                 "reconcile_obsidian_state: failed to persist changes for %s",
@@ -0,0 +1,318 @@
+"""
+ASGI serving mode for the dashboard.
+
+Wraps the Flask app so it can run under an ASGI server (uvicorn) instead of
+Flask's development server:
+
+  - Ordinary requests run on one shared, bounded worker pool rather than a
+    thread per connection.
+  - ``text/event-stream`` responses are pulled one chunk at a time on a
+    thread of their own, so open streams waiting on the model can never
+    starve ordinary requests. Every ``next()`` and the final ``close()`` of
+    a stream run on that one thread, so a generator may keep a SQLite
+    connection open across yields. At most ``stream_workers`` chunks are
+    produced at once. SSE heartbeats are driven by a timer on the event
+    loop.
+
+Routes can tell they are served this way through
+``request.environ[SERVER_HEARTBEATS_ENVIRON_KEY]`` and skip their own
+heartbeat machinery (see ``api_tutor_turns.send_turn``).
+
+Run with ``python dashboard_web.py --server asgi`` or point uvicorn at the
+factory: ``uvicorn dashboard.asgi:create_asgi_app --factory``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+_LOG = logging.getLogger(__name__)
+
+SERVER_HEARTBEATS_ENVIRON_KEY = "pt_study.server_heartbeats"
+DEFAULT_HEARTBEAT_SECONDS = 15.0
+DEFAULT_MAX_WORKERS = 64
+DEFAULT_STREAM_WORKERS = 32
+# Request bodies larger than this spill to a temp file instead of RAM.
+_MAX_IN_MEMORY_BODY = 1024 * 1024
+_HEARTBEAT_FRAME = b":\n\n"
+_END_OF_STREAM = object()
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+def _coerce_heartbeat_seconds(value: Any) -> float:
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_HEARTBEAT_SECONDS
+    return seconds if seconds > 0 else DEFAULT_HEARTBEAT_SECONDS
+
+
+def _env_worker_count(name: str, default: int) -> int:
+    raw = os.environ.get(name, "")
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+class FlaskASGIAdapter:
+    """Serve a WSGI (Flask) app over ASGI with event-loop SSE heartbeats."""
+
+    def __init__(
+        self,
+        wsgi_app: Callable[..., Iterable[bytes]],
+        *,
+        heartbeat_seconds: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        stream_workers: Optional[int] = None,
+    ) -> None:
+        self.wsgi_app = wsgi_app
+        config = getattr(wsgi_app, "config", None)
+        if heartbeat_seconds is None and isinstance(config, dict):
+            heartbeat_seconds = config.get(
+                "TUTOR_SSE_HEARTBEAT_SECONDS", DEFAULT_HEARTBEAT_SECONDS
+            )
+        self.heartbeat_seconds = _coerce_heartbeat_seconds(heartbeat_seconds)
+        self.max_workers = max_workers or _env_worker_count(
+            "PT_BRAIN_ASGI_WORKER_THREADS", DEFAULT_MAX_WORKERS
+        )
+        self.stream_workers = stream_workers or _env_worker_count(
+            "PT_BRAIN_ASGI_STREAM_THREADS", DEFAULT_STREAM_WORKERS
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="pt-asgi-worker",
+        )
+        # SSE chunks block for the whole model wait; past this many in flight
+        # further streams queue (still heartbeating) instead of taking
+        # request threads.
+        self._stream_slots = asyncio.Semaphore(self.stream_workers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']}")
+        await self._handle_http(scope, receive, send)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        loop = asyncio.get_running_loop()
+        body = await self._read_body(receive)
+        environ = self._build_environ(scope, body)
+        response_start: dict[str, Any] = {}
+        # Data passed to the legacy ``write()`` callable precedes the iterable.
+        written: list[bytes] = []
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info=None):
+            if exc_info and response_start:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_start["status"] = status
+            response_start["headers"] = headers
+            return written.append
+
+        try:
+            iterable = await loop.run_in_executor(
+                self._executor, self.wsgi_app, environ, start_response
+            )
+        finally:
+            body.close()
+
+        # A stream's chunks and its close all run on this one thread.
+        stream_executor: Optional[ThreadPoolExecutor] = None
+        try:
+            status_code = int(str(response_start.get("status", "500")).split(" ", 1)[0])
+            headers = list(response_start.get("headers") or [])
+            content_type = next(
+                (value for name, value in headers if name.lower() == "content-type"),
+                "",
+            )
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status_code,
+                    "headers": [
+                        (name.lower().encode("latin-1"), str(value).encode("latin-1"))
+                        for name, value in headers
+                    ],
+                }
+            )
+            if content_type.startswith("text/event-stream"):
+                stream_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="pt-asgi-stream"
+                )
+                for chunk in written:
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+                await self._send_event_stream(iterable, receive, send, stream_executor)
+            else:
+                payload = await loop.run_in_executor(
+                    self._executor, lambda: b"".join([*written, *iterable])
+                )
+                await send({"type": "http.response.body", "body": payload})
+        finally:
+            close = getattr(iterable, "close", None)
+            # On the single stream thread the close queues behind any chunk
+            # still being produced instead of racing the running generator.
+            executor = stream_executor or self._executor
+            try:
+                if callable(close):
+                    await loop.run_in_executor(executor, close)
+            finally:
+                if stream_executor is not None:
+                    stream_executor.shutdown(wait=False)
+
+    async def _send_event_stream(
+        self,
+        iterable: Iterable[bytes],
+        receive: Receive,
+        send: Send,
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """Relay SSE chunks, emitting a heartbeat whenever the producer is quiet.
+
+        Each ``next()`` runs on ``executor``, the stream's single thread, and
+        the heartbeat is an ``asyncio.wait`` timeout rather than a thread.
+        """
+        iterator = iter(iterable)
+        disconnect = asyncio.ensure_future(self._wait_for_disconnect(receive))
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(self._next_chunk(executor, iterator))
+                done, _ = await asyncio.wait(
+                    {pending, disconnect},
+                    timeout=self.heartbeat_seconds,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnect in done:
+                    # The generator cannot be closed while it is executing;
+                    # let the in-flight chunk finish before the caller closes it.
+                    await pending
+                    return
+                if not done:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": _HEARTBEAT_FRAME,
+                            "more_body": True,
+                        }
+                    )
+                    continue
+                chunk = pending.result()
+                pending = None
+                if chunk is _END_OF_STREAM:
+                    break
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                if chunk:
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            disconnect.cancel()
+
+    async def _next_chunk(self, executor: ThreadPoolExecutor, iterator) -> Any:
+        async with self._stream_slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, next, iterator, _END_OF_STREAM
+            )
+
+    @staticmethod
+    async def _wait_for_disconnect(receive: Receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+
+    @staticmethod
+    async def _read_body(receive: Receive):
+        body = tempfile.SpooledTemporaryFile(max_size=_MAX_IN_MEMORY_BODY)
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            body.write(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body.seek(0)
+        return body
+
+    @staticmethod
+    def _body_length(body) -> int:
+        body.seek(0, os.SEEK_END)
+        length = body.tell()
+        body.seek(0)
+        return length
+
+    def _build_environ(self, scope: Scope, body) -> dict[str, Any]:
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ: dict[str, Any] = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": str(server[0]),
+            "SERVER_PORT": str(server[1] or 80),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": str(client[0]),
+            "REMOTE_PORT": str(client[1]),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+            SERVER_HEARTBEATS_ENVIRON_KEY: True,
+        }
+        # Chunked uploads arrive without Content-Length; the body is fully
+        # buffered by now, so report its real size to the WSGI app.
+        environ["CONTENT_LENGTH"] = str(self._body_length(body))
+        for raw_name, raw_value in scope.get("headers", []):
+            name = raw_name.decode("latin-1").upper().replace("-", "_")
+            value = raw_value.decode("latin-1")
+            if name == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+                continue
+            if name == "CONTENT_LENGTH":
+                continue
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+
+def create_asgi_app(flask_app=None, **kwargs: Any) -> FlaskASGIAdapter:
+    """Build the ASGI adapter around ``flask_app`` (default: a fresh dashboard app)."""
+    if flask_app is None:
+        from dashboard import create_app
+
+        flask_app = create_app()
+    return FlaskASGIAdapter(flask_app, **kwargs)
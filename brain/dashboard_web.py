@@ -28,6 +28,18 @@ def _default_port() -> int:
         raise ValueError(f"Invalid PT_BRAIN_PORT value: {raw_port}") from exc
 
 
+def _default_server() -> str:
+    return os.environ.get("PT_BRAIN_SERVER", "dev")
+
+
+def _default_workers() -> int:
+    raw_workers = os.environ.get("PT_BRAIN_WORKERS", "1")
+    try:
+        return max(1, int(raw_workers))
+    except ValueError as exc:
+        raise ValueError(f"Invalid PT_BRAIN_WORKERS value: {raw_workers}") from exc
+
+
 def _parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Run the PT Study dashboard server.")
     parser.add_argument("--host", default=_default_host(), help="Host interface to bind.")
@@ -37,10 +49,42 @@ def _parse_args(argv=None):
         default=_default_port(),
         help="Port to bind.",
     )
+    parser.add_argument(
+        "--server",
+        choices=("dev", "asgi"),
+        default=_default_server(),
+        help="dev: Flask development server. asgi: uvicorn with event-loop SSE heartbeats.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=_default_workers(),
+        help="Worker processes for --server asgi.",
+    )
     return parser.parse_args(argv)
 
 
-def run_dashboard(host: str, port: int) -> None:
+def _run_asgi(host: str, port: int, workers: int) -> None:
+    try:
+        import uvicorn
+    except ImportError as exc:
+        raise SystemExit(
+            "--server asgi requires uvicorn (pip install -r brain/requirements.txt)"
+        ) from exc
+    uvicorn.run(
+        "dashboard.asgi:create_asgi_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=max(1, workers),
+        lifespan="on",
+    )
+
+
+def run_dashboard(host: str, port: int, server: str = "dev", workers: int = 1) -> None:
+    if server == "asgi":
+        _run_asgi(host, port, workers)
+        return
     app = create_app()
     # Disable reloader to avoid connection resets during API calls
     app.run(debug=False, use_reloader=False, host=host, port=port)
@@ -48,4 +92,9 @@ def run_dashboard(host: str, port: int) -> None:
 
 if __name__ == "__main__":
     args = _parse_args()
-    run_dashboard(host=args.host, port=args.port)
+    run_dashboard(
+        host=args.host,
+        port=args.port,
+        server=args.server,
+        workers=args.workers,
+    )
@@ -475,6 +475,44 @@ def _migrate_scraped_events(cursor) -> None:
         print("[OK] scraped_events table dropped (all rows already in course_events or empty)")
 
 
+def _backfill_rag_doc_links(cursor: sqlite3.Cursor) -> None:
+    """Mirror video linkage already stored in rag_docs.metadata_json.
+
+    Also drops links left behind by docs deleted before the delete trigger.
+    """
+    cursor.execute(
+        """
+        DELETE FROM rag_doc_links
+        WHERE parent_id NOT IN (SELECT id FROM rag_docs)
+           OR child_id NOT IN (SELECT id FROM rag_docs)
+    """
+    )
+    cursor.execute(
+        """
+        SELECT id, metadata_json FROM rag_docs
+        WHERE metadata_json LIKE '%"video_material_id"%'
+          AND id NOT IN (SELECT child_id FROM rag_doc_links WHERE kind = 'video')
+    """
+    )
+    links = []
+    for doc_id, raw_meta in cursor.fetchall():
+        try:
+            meta = json.loads(raw_meta)
+            parent_id = int(meta["video_material_id"])
+        except (json.JSONDecodeError, TypeError, ValueError, KeyError):
+            continue
+        links.append((parent_id, int(doc_id), "video", datetime.now().isoformat()))
+    if links:
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO rag_doc_links (parent_id, child_id, kind, created_at)
+            VALUES (?, ?, ?, ?)
+        """,
+            links,
+        )
+        print(f"[INFO] Backfilled {len(links)} video links into rag_doc_links")
+
+
 def init_database():
     """
     Initialize the SQLite database with the sessions table (v9.3 schema)
@@ -949,6 +987,20 @@ def init_database():
     """
     )
 
+    # Content sizes of rag_docs, stamped with the doc's checksum and
+    # updated_at, so full-material loading never measures a blob per turn.
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rag_doc_sizes (
+            doc_id INTEGER PRIMARY KEY,
+            checksum TEXT,
+            updated_at TEXT,
+            char_length INTEGER NOT NULL,
+            byte_length INTEGER NOT NULL
+        )
+    """
+    )
+
     # ------------------------------------------------------------------
     # Ingestion tracking table for smart file processing
     # ------------------------------------------------------------------
@@ -1210,6 +1262,41 @@ def init_database():
     """
     )
 
+    # ------------------------------------------------------------------
+    # rag_doc_links: derived-doc linkage (e.g. MP4 material -> transcript /
+    # visual-notes docs), written at ingest so expansion is one indexed query
+    # instead of a scan of every rag_docs.metadata_json.
+    # ------------------------------------------------------------------
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rag_doc_links (
+            parent_id INTEGER NOT NULL,   -- rag_docs.id of the source material
+            child_id INTEGER NOT NULL,    -- rag_docs.id of the derived doc
+            kind TEXT NOT NULL,           -- e.g. 'video'
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (kind, parent_id, child_id)
+        )
+    """
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_rag_doc_links_child
+        ON rag_doc_links(child_id)
+    """
+    )
+    # Links go with either end, whichever path deletes the doc.
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS rag_doc_links_on_doc_delete
+        AFTER DELETE ON rag_docs
+        BEGIN
+            DELETE FROM rag_doc_links
+            WHERE parent_id = OLD.id OR child_id = OLD.id;
+        END;
+    """
+    )
+    _backfill_rag_doc_links(cursor)
+
     # ------------------------------------------------------------------
     # Tutor turns table (tracks individual Q&A within a Tutor session)
     # ------------------------------------------------------------------
@@ -3065,6 +3152,14 @@ def init_database():
             ON tutor_turns(tutor_session_id)
             """
         )
+        # Bounded-tail history reads (ORDER BY id DESC LIMIT k) walk this
+        # index backwards instead of sorting the whole session.
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tutor_turns_session_tail
+            ON tutor_turns(tutor_session_id, id)
+            """
+        )
     except sqlite3.OperationalError:
         pass
 
@@ -3088,6 +3183,8 @@ def init_database():
         ("current_block_index", "INTEGER DEFAULT 0"),
         ("codex_thread_id", "TEXT"),
         ("last_response_id", "TEXT"),
+        # Estimated prompt tokens of turns not yet in a working summary.
+        ("history_token_estimate", "INTEGER DEFAULT 0"),
     ]:
         if col_name not in ts_cols:
             try:
@@ -3248,6 +3345,14 @@ def init_database():
     except ImportError as exc:
         print(f"[WARN] Adaptive tables skipped (import failed): {exc}")
 
+    # Vault duplicate-detection fingerprints (idempotent)
+    try:
+        from vault_fingerprints import create_fingerprint_tables
+
+        create_fingerprint_tables(conn)
+    except ImportError as exc:
+        print(f"[WARN] Vault fingerprint table skipped (import failed): {exc}")
+
     # tutor_sessions: add strategy/profile columns
     cursor.execute("PRAGMA table_info(tutor_sessions)")
     ts_cols_strategy = {col[1] for col in cursor.fetchall()}
@@ -3336,6 +3441,74 @@ def init_database():
         ON tutor_accuracy_log(topic)
     """)
 
+    # Per-turn tracing spans (tutor_tracing); one trace row per turn with its
+    # span tree in tutor_trace_spans.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tutor_traces (
+            trace_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            tutor_session_id TEXT,
+            turn_number INTEGER,
+            status TEXT NOT NULL DEFAULT 'ok',
+            duration_ms REAL NOT NULL,
+            attributes_json TEXT,
+            started_at TEXT NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tutor_traces_duration
+        ON tutor_traces(duration_ms DESC)
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tutor_traces_session
+        ON tutor_traces(tutor_session_id, turn_number)
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tutor_trace_spans (
+            trace_id TEXT NOT NULL,
+            span_id INTEGER NOT NULL,
+            parent_id INTEGER,
+            name TEXT NOT NULL,
+            start_ms REAL NOT NULL,
+            duration_ms REAL,
+            status TEXT NOT NULL DEFAULT 'ok',
+            attributes_json TEXT,
+            PRIMARY KEY (trace_id, span_id)
+        )
+    """)
+
+    # Deferred post-turn work (tutor_post_turn): vault artifact writes and
+    # trace saves that run after the turn's stream has closed.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tutor_post_turn_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            ordering_key TEXT,
+            turn_number INTEGER,
+            payload_json TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            result_json TEXT,
+            created_at TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tutor_post_turn_jobs_status
+        ON tutor_post_turn_jobs(status, next_attempt_at)
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tutor_post_turn_jobs_ordering
+        ON tutor_post_turn_jobs(ordering_key, status, id)
+    """)
+
     conn.commit()
     conn.close()
 
@@ -7,6 +7,7 @@ import subprocess
 import tempfile
 import shutil
 import http.client
+import socket
 import ssl
 import uuid as _uuid
 from pathlib import Path
@@ -14,6 +15,7 @@ from typing import Dict, Any, Optional, List, Union
 
 # Load .env into environment (no-op if not present)
 from config import load_env
+from tutor_tracing import span as trace_span
 
 load_env()
 
@@ -395,12 +397,16 @@ def call_codex_json(
 
 User: {user_prompt}
 """
-    return _codex_exec_json(
-        full_prompt,
-        model=model,
-        timeout=timeout,
-        isolated=isolated,
-    )
+    with trace_span("llm.codex_exec", model=model or "") as span:
+        result = _codex_exec_json(
+            full_prompt,
+            model=model,
+            timeout=timeout,
+            isolated=isolated,
+        )
+        if span is not None:
+            span.set(success=bool(result.get("success")))
+        return result
 
 
 # ---------------------------------------------------------------------------
@@ -653,6 +659,85 @@ def call_chatgpt_responses(
         return {"success": False, "error": f"ChatGPT API error: {e}", "content": None}
 
 
+_SSE_READ_CHUNK = 64 * 1024
+
+
+def _iter_sse_data(
+    resp,
+    *,
+    sock=None,
+    read_idle_timeout: float | None = None,
+    deadline: float | None = None,
+    chunk_size: int = _SSE_READ_CHUNK,
+):
+    """Yield the raw ``data:`` payload (bytes) of each SSE line in ``resp``.
+
+    Reads the body in blocks (``read1`` returns whatever has arrived, up to
+    ``chunk_size``) and splits lines on bytes, so no per-line syscall or
+    decode happens; callers ``json.loads`` the bytes directly. The Responses
+    API frames one JSON event per ``data:`` line.
+
+    ``read_idle_timeout`` bounds the gap between reads; ``deadline`` is an
+    absolute ``time.monotonic()`` bound on the whole stream. Either raises
+    ``TimeoutError`` with a message saying which one fired.
+    """
+    read = getattr(resp, "read1", None) or resp.read
+    if sock is not None and read_idle_timeout is not None:
+        sock.settimeout(read_idle_timeout)
+    pending = b""
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("stream exceeded its overall deadline")
+            if sock is not None:
+                sock.settimeout(
+                    remaining
+                    if read_idle_timeout is None
+                    else min(read_idle_timeout, remaining)
+                )
+        try:
+            chunk = read(chunk_size)
+        except socket.timeout:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("stream exceeded its overall deadline") from None
+            raise TimeoutError(
+                f"no stream data for {read_idle_timeout:g}s (read-idle timeout)"
+            ) from None
+        if not chunk:
+            break
+        if pending:
+            chunk = pending + chunk
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            if chunk.startswith(b"data:", start, end):
+                data = chunk[start + 5 : end].strip()
+                if data:
+                    yield data
+            start = end + 1
+        pending = chunk[start:]
+    if pending.startswith(b"data:"):
+        data = pending[5:].strip()
+        if data:
+            yield data
+
+
+def _stream_error_message(evt: dict) -> str:
+    """Best-effort message for an ``error`` / ``response.failed`` stream event."""
+    err = evt.get("error")
+    if not isinstance(err, dict):
+        response = evt.get("response")
+        err = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(err, dict):
+        err = evt
+    message = err.get("message") or err.get("code") or evt.get("type") or "unknown"
+    code = err.get("code")
+    return f"{code}: {message}" if code and code != message else str(message)
+
+
 def stream_chatgpt_responses(
     system_prompt: str,
     user_prompt: str,
@@ -666,6 +751,9 @@ def stream_chatgpt_responses(
     input_override: list[dict] | None = None,
     reasoning_effort: str | None = None,
     store: bool | None = None,
+    prompt_cache_key: str | None = None,
+    read_idle_timeout: float | None = None,
+    deadline_seconds: float | None = None,
 ):
     """
     Streaming generator for ChatGPT backend API.
@@ -674,7 +762,16 @@ def stream_chatgpt_responses(
     When web_search=True, also yields {"type": "web_search", "status": "searching"|"completed"}.
     When tools are provided, also yields {"type": "tool_call", "name": ..., "arguments": ..., "call_id": ...}.
     URL citations are included in the "done" dict as "url_citations".
+    prompt_cache_key routes requests sharing a prompt prefix to the same
+    provider cache; the "done" usage block reports reuse as
+    usage.input_tokens_details.cached_tokens.
+    ``timeout`` covers connect and response headers; once streaming,
+    ``read_idle_timeout`` (default: ``timeout``) bounds silence between
+    reads and ``deadline_seconds`` (default: none) bounds the whole call.
+    Provider ``error`` / ``response.failed`` events end the stream with an
+    error immediately.
     """
+    started = time.monotonic()
     auth = _load_codex_auth()
     if not auth:
         yield {
@@ -696,6 +793,8 @@ def stream_chatgpt_responses(
         payload["reasoning"] = {"effort": reasoning_effort}
     if previous_response_id:
         payload["previous_response_id"] = previous_response_id
+    if prompt_cache_key:
+        payload["prompt_cache_key"] = prompt_cache_key
 
     all_tools: list[dict] = []
     if web_search:
@@ -729,8 +828,15 @@ def stream_chatgpt_responses(
     try:
         ctx = ssl.create_default_context()
         conn = http.client.HTTPSConnection(_CHATGPT_BASE, context=ctx, timeout=timeout)
-        conn.request("POST", "/backend-api/codex/responses", body=body, headers=headers)
-        resp = conn.getresponse()
+        # Connect + send + response headers; the streamed body is timed by
+        # the caller's span around this generator.
+        with trace_span("llm.request", model=model, request_bytes=len(body)) as span:
+            conn.request("POST", "/backend-api/codex/responses", body=body, headers=headers)
+            # Keep the socket: getresponse() may detach it from the connection.
+            sock = getattr(conn, "sock", None)
+            resp = conn.getresponse()
+            if span is not None:
+                span.set(http_status=resp.status)
 
         if resp.status != 200:
             err_body = resp.read().decode("utf-8", errors="replace")[:500]
@@ -744,19 +850,17 @@ def stream_chatgpt_responses(
         thread_id = ""
         emitted_tool_call_ids: set[str] = set()
 
-        while True:
-            line = resp.readline()
-            if not line:
-                break
-            line = line.decode("utf-8", errors="replace").strip()
-            if not line.startswith("data: "):
-                continue
-            data_str = line[6:]
-            if data_str == "[DONE]":
+        for data in _iter_sse_data(
+            resp,
+            sock=sock,
+            read_idle_timeout=read_idle_timeout if read_idle_timeout is not None else timeout,
+            deadline=started + deadline_seconds if deadline_seconds else None,
+        ):
+            if data == b"[DONE]":
                 break
             try:
-                evt = json.loads(data_str)
-            except json.JSONDecodeError:
+                evt = json.loads(data)
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
 
             evt_type = evt.get("type", "")
@@ -764,6 +868,13 @@ def stream_chatgpt_responses(
                 delta = evt.get("delta", "")
                 if delta:
                     yield {"type": "delta", "text": delta}
+            elif evt_type in ("error", "response.failed"):
+                conn.close()
+                yield {
+                    "type": "error",
+                    "error": f"ChatGPT API stream error: {_stream_error_message(evt)}",
+                }
+                return
             elif evt_type in (
                 "response.web_search_call.in_progress",
                 "response.web_search_call.searching",
@@ -821,5 +932,7 @@ def stream_chatgpt_responses(
             done_payload["thread_id"] = thread_id
         yield done_payload
 
+    except TimeoutError as e:
+        yield {"type": "error", "error": f"ChatGPT API timeout: {e}"}
     except Exception as e:
         yield {"type": "error", "error": f"ChatGPT API error: {e}"}
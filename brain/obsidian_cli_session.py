@@ -0,0 +1,284 @@
+"""Persistent Obsidian CLI session.
+
+``ObsidianVault`` normally spawns one ``obsidian`` process per operation, and
+a single artifact write can take several. When a session helper is
+configured, operations instead go to one long-running process over a
+line-delimited JSON protocol on stdin/stdout:
+
+    -> {"id": 7, "argv": ["vault=Treys School", "read", "file=Note"]}
+    <- {"id": 7, "code": 0, "stdout": "...", "stderr": ""}
+    -> {"id": 8, "op": "ping"}
+    <- {"id": 8, "ok": true}
+
+``argv`` is the CLI argument list without the program name; the reply
+carries what the one-shot process would have exited with and printed. A
+request may carry ``"timeout"`` (seconds), after which the caller stops
+waiting. Requests are not serialized: the helper may answer them in any
+order, and each reply is matched to its request by ``id``.
+
+Set ``PT_OBSIDIAN_CLI_SESSION`` to the helper command line to enable it. The
+helper is pinged when spawned and again before use after
+``HEALTH_CHECK_INTERVAL_SECONDS`` without a reply or after a request timed
+out; a dead, hung or unparseable helper is killed and respawned on the next
+call. After a failed spawn the
+session stays off for ``RESPAWN_BACKOFF_SECONDS`` and callers use one-shot
+subprocesses meanwhile.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+SESSION_ENV = "PT_OBSIDIAN_CLI_SESSION"
+HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+HEALTH_CHECK_TIMEOUT_SECONDS = 5.0
+RESPAWN_BACKOFF_SECONDS = 30.0
+
+
+class CliSessionError(RuntimeError):
+    """The session could not serve a request; fall back to a one-shot process."""
+
+
+class CliSession:
+    """One long-running CLI helper; concurrent requests are matched by ``id``."""
+
+    def __init__(self, command: list[str]) -> None:
+        self.command = list(command)
+        # Guards spawning, health checks and killing; never held while a
+        # request waits for its reply.
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._channel: Optional[_Channel] = None
+        self._last_ok = 0.0
+        self._failed_at: Optional[float] = None
+        self.spawns = 0
+
+    # -- Lifecycle --------------------------------------------------------
+
+    @property
+    def alive(self) -> bool:
+        return self._channel is not None and self._channel.alive
+
+    def _spawn_locked(self) -> None:
+        self._kill_locked()
+        try:
+            proc = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+            )
+        except OSError as exc:
+            raise CliSessionError(f"cannot start CLI session: {exc}") from exc
+        self.spawns += 1
+        channel = _Channel(proc)
+        # Pipes cannot be polled portably (Windows), so a reader thread
+        # hands each reply to the request waiting on its id.
+        threading.Thread(
+            target=channel.pump,
+            name="obsidian-cli-session",
+            daemon=True,
+        ).start()
+        self._channel = channel
+        self._request(channel, {"op": "ping"}, HEALTH_CHECK_TIMEOUT_SECONDS)
+
+    def _kill_locked(self) -> None:
+        channel, self._channel = self._channel, None
+        if channel is not None:
+            channel.kill()
+
+    def close(self) -> None:
+        with self._lock:
+            self._kill_locked()
+
+    # -- Protocol ---------------------------------------------------------
+
+    def _request(self, channel: "_Channel", payload: dict, timeout: float) -> dict:
+        try:
+            reply = channel.request(next(self._ids), payload, timeout)
+        except subprocess.TimeoutExpired:
+            # The helper may just be slow on this one command, or hung; the
+            # next call pings it before trusting it again.
+            self._last_ok = 0.0
+            raise subprocess.TimeoutExpired(self.command, timeout) from None
+        self._last_ok = time.monotonic()
+        return reply
+
+    def _ensure_locked(self) -> "_Channel":
+        channel = self._channel
+        if channel is not None and channel.alive:
+            if time.monotonic() - self._last_ok < HEALTH_CHECK_INTERVAL_SECONDS:
+                return channel
+            try:
+                self._request(channel, {"op": "ping"}, HEALTH_CHECK_TIMEOUT_SECONDS)
+                return channel
+            except (CliSessionError, subprocess.TimeoutExpired):
+                log.info("obsidian CLI session failed its health check, respawning")
+        if self._failed_at is not None and time.monotonic() - self._failed_at < RESPAWN_BACKOFF_SECONDS:
+            raise CliSessionError("CLI session is backing off after a failed start")
+        try:
+            self._spawn_locked()
+        except (CliSessionError, subprocess.TimeoutExpired) as exc:
+            self._failed_at = time.monotonic()
+            self._kill_locked()
+            log.warning("obsidian CLI session unavailable, using one-shot processes: %s", exc)
+            raise CliSessionError(str(exc)) from exc
+        self._failed_at = None
+        return self._channel  # type: ignore[return-value]
+
+    def run(self, argv: list[str], *, timeout: float) -> subprocess.CompletedProcess:
+        """Run one CLI invocation (``argv`` without the program name).
+
+        Requests from different threads are in flight together. Raises
+        ``subprocess.TimeoutExpired`` like ``subprocess.run`` (the helper is
+        pinged before the next request and respawned if it does not answer)
+        and ``CliSessionError`` when the session cannot serve the request.
+        """
+        with self._lock:
+            channel = self._ensure_locked()
+        reply = self._request(channel, {"argv": list(argv), "timeout": timeout}, timeout)
+        return subprocess.CompletedProcess(
+            args=[*self.command, *argv],
+            returncode=int(reply.get("code", 1)),
+            stdout=str(reply.get("stdout") or ""),
+            stderr=str(reply.get("stderr") or ""),
+        )
+
+    def ping(self) -> bool:
+        """True when the helper answers a ping with ``"ok": true``."""
+        with self._lock:
+            try:
+                channel = self._ensure_locked()
+                reply = self._request(channel, {"op": "ping"}, HEALTH_CHECK_TIMEOUT_SECONDS)
+            except (CliSessionError, subprocess.TimeoutExpired):
+                return False
+        return reply.get("ok") is True
+
+
+class _Channel:
+    """One helper process: requests written to stdin, replies routed by id."""
+
+    def __init__(self, proc: subprocess.Popen) -> None:
+        self.proc = proc
+        # Guards ``waiters``, ``closed`` and writes to stdin.
+        self._lock = threading.Lock()
+        self._waiters: "dict[int, queue.Queue[Optional[dict]]]" = {}
+        self._closed = False
+        self._error = "CLI session exited"
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self.proc.poll() is None
+
+    def request(self, request_id: int, payload: dict, timeout: float) -> dict:
+        box: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=1)
+        with self._lock:
+            if self._closed or self.proc.stdin is None:
+                raise CliSessionError("CLI session is not running")
+            self._waiters[request_id] = box
+            try:
+                self.proc.stdin.write(json.dumps({"id": request_id, **payload}) + "\n")
+                self.proc.stdin.flush()
+            except (OSError, ValueError) as exc:
+                self._waiters.pop(request_id, None)
+                self.proc.kill()
+                raise CliSessionError(f"CLI session write failed: {exc}") from exc
+        try:
+            reply = box.get(timeout=timeout)
+        except queue.Empty:
+            # A late reply is dropped by ``pump``.
+            with self._lock:
+                self._waiters.pop(request_id, None)
+            raise subprocess.TimeoutExpired([], timeout) from None
+        if reply is None:
+            raise CliSessionError(self._error)
+        return reply
+
+    def pump(self) -> None:
+        try:
+            for line in self.proc.stdout:  # type: ignore[union-attr]
+                try:
+                    reply = json.loads(line)
+                except json.JSONDecodeError:
+                    self._error = f"CLI session sent a non-JSON line: {line[:200]!r}"
+                    self.proc.kill()
+                    break
+                if not isinstance(reply, dict):
+                    continue
+                with self._lock:
+                    box = self._waiters.pop(reply.get("id"), None)
+                if box is not None:
+                    box.put(reply)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._closed = True
+                waiters, self._waiters = self._waiters, {}
+            for box in waiters.values():
+                box.put(None)
+
+    def kill(self) -> None:
+        proc = self.proc
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+        except OSError:
+            pass
+        if proc.poll() is None:
+            proc.kill()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Shared session
+# ---------------------------------------------------------------------------
+
+_SESSION: Optional[CliSession] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def session_command() -> Optional[list[str]]:
+    raw = str(os.environ.get(SESSION_ENV) or "").strip()
+    if not raw:
+        return None
+    return shlex.split(raw, posix=os.name != "nt")
+
+
+def get_cli_session() -> Optional[CliSession]:
+    """The shared session for the configured helper (None when not configured)."""
+    global _SESSION
+    command = session_command()
+    with _SESSION_LOCK:
+        if command is None:
+            return None
+        if _SESSION is None or _SESSION.command != command:
+            if _SESSION is not None:
+                _SESSION.close()
+            _SESSION = CliSession(command)
+        return _SESSION
+
+
+def close_cli_session() -> None:
+    global _SESSION
+    with _SESSION_LOCK:
+        session, _SESSION = _SESSION, None
+    if session is not None:
+        session.close()
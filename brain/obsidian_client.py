@@ -1,7 +1,8 @@
 """Unified Obsidian Local REST API client.
 
 Replaces transport duplication across obsidian_index.py, api_adapter.py,
-and obsidian_merge.py with a single, testable HTTP client.
+and obsidian_merge.py with a single, testable HTTP client. Requests share
+the pooled keep-alive connections in ``obsidian_http``.
 """
 from __future__ import annotations
 
@@ -9,12 +10,13 @@ import json
 import logging
 import os
 import pathlib
-import ssl
 import urllib.error
 import urllib.parse
 import urllib.request
 from typing import Any, Optional
 
+import obsidian_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,9 +74,6 @@ class ObsidianClient:
             or r"C:\Users\treyt\Desktop\Treys School"
         )
         self.timeout = timeout
-        self._ssl_ctx = ssl.create_default_context()
-        self._ssl_ctx.check_hostname = False
-        self._ssl_ctx.verify_mode = ssl.CERT_NONE
 
     def _request(
         self,
@@ -110,22 +109,20 @@ class ObsidianClient:
                 body = data.encode("utf-8")
                 headers["Content-Type"] = "text/plain"
 
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
         try:
-            with urllib.request.urlopen(
-                req, timeout=self.timeout, context=self._ssl_ctx
-            ) as resp:
-                raw = resp.read().decode("utf-8")
-                resp_ct = resp.headers.get("Content-Type", "")
-                if "application/json" in resp_ct:
-                    return json.loads(raw)
-                return raw
+            resp = obsidian_http.request(
+                method, url, headers=headers, body=body, timeout=self.timeout
+            )
         except urllib.error.HTTPError as e:
             logger.warning("Obsidian API %s %s -> %d", method, path, e.code)
             raise
         except urllib.error.URLError as e:
             logger.warning("Obsidian API unreachable: %s", e.reason)
             raise
+        raw = resp.text()
+        if "application/json" in resp.header("Content-Type"):
+            return json.loads(raw)
+        return raw
 
     def _fs_read(self, note_path: str) -> str:
         """Read a note directly from the vault filesystem. Returns "" on any error."""
@@ -0,0 +1,205 @@
+"""Shared keep-alive HTTP transport for the Obsidian Local REST API.
+
+``urllib.request.urlopen`` opens (and TLS-handshakes) a new connection for
+every request and rebuilds its opener each time. ``request`` instead keeps
+up to ``POOL_SIZE_PER_HOST`` idle connections per (scheme, host, port) and
+reuses them, with one SSL context built for the process.
+
+Idle connections are dropped after ``IDLE_TIMEOUT_SECONDS``, below the
+plugin's Node.js keep-alive timeout (5s), so the server rarely closes one
+under us. If a reused connection turns out to be closed anyway, idempotent
+requests are retried once on a fresh connection.
+
+Errors keep urllib's types so callers' handlers are unchanged:
+``urllib.error.HTTPError`` for 4xx/5xx responses and
+``urllib.error.URLError`` for connection failures. ``http_stats`` reports
+request counts, connection reuse and request timings.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import http.client
+import logging
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+POOL_SIZE_PER_HOST = 8
+IDLE_TIMEOUT_SECONDS = 4.0
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+# Errors that mean a kept-alive connection was closed by the server.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+_LOCK = threading.Lock()
+_IDLE: dict[tuple[str, str, int], list[tuple[http.client.HTTPConnection, float]]] = {}
+_STATS = {"requests": 0, "errors": 0, "connections_opened": 0, "connections_reused": 0, "retried": 0}
+_DURATIONS_MS: "collections.deque[float]" = collections.deque(maxlen=1000)
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: dict[str, str]  # lower-cased names
+    body: bytes
+
+    def header(self, name: str, default: str = "") -> str:
+        return self.headers.get(name.lower(), default)
+
+    def text(self) -> str:
+        return self.body.decode("utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def ssl_context() -> ssl.SSLContext:
+    """The plugin serves a self-signed certificate, so verification is off.
+
+    Built once: loading the default CA store costs ~20ms per call.
+    """
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+def _acquire(key: tuple[str, str, int], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+    now = time.monotonic()
+    with _LOCK:
+        idle = _IDLE.get(key) or []
+        while idle:
+            conn, released_at = idle.pop()
+            if now - released_at < IDLE_TIMEOUT_SECONDS:
+                try:
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                except OSError:
+                    conn.close()
+                    continue
+                conn.timeout = timeout
+                _STATS["connections_reused"] += 1
+                return conn, True
+            conn.close()
+        _STATS["connections_opened"] += 1
+    scheme, host, port = key
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, port, timeout=timeout, context=ssl_context()), False
+    return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+
+def _release(key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+    with _LOCK:
+        idle = _IDLE.setdefault(key, [])
+        if len(idle) < POOL_SIZE_PER_HOST:
+            idle.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+
+def _record(started: float, *, error: bool = False) -> None:
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _LOCK:
+        _STATS["requests"] += 1
+        _STATS["errors"] += int(error)
+        _DURATIONS_MS.append(elapsed_ms)
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    headers: Optional[dict[str, str]] = None,
+    body: Optional[bytes] = None,
+    timeout: float = 10,
+) -> HttpResponse:
+    """Send one request over a pooled connection and read the whole response."""
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise urllib.error.URLError(f"unsupported URL: {url}")
+    key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+    target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+    method = method.upper()
+    started = time.perf_counter()
+
+    for attempt in range(2):
+        conn, reused = _acquire(key, timeout)
+        try:
+            conn.request(method, target, body=body, headers=headers or {})
+            resp = conn.getresponse()
+            data = resp.read()
+        except _STALE_ERRORS as exc:
+            conn.close()
+            if reused and attempt == 0 and method in _IDEMPOTENT_METHODS:
+                with _LOCK:
+                    _STATS["retried"] += 1
+                continue
+            _record(started, error=True)
+            raise urllib.error.URLError(exc) from exc
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            _record(started, error=True)
+            raise urllib.error.URLError(exc) from exc
+        break
+
+    if resp.will_close:
+        conn.close()
+    else:
+        _release(key, conn)
+    response = HttpResponse(
+        status=resp.status,
+        headers={name.lower(): value for name, value in resp.getheaders()},
+        body=data,
+    )
+    _record(started, error=resp.status >= 400)
+    log.debug(
+        "obsidian http %s %s -> %d in %.1fms",
+        method,
+        parts.path,
+        resp.status,
+        (time.perf_counter() - started) * 1000,
+    )
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.msg, None)
+    return response
+
+
+def http_stats() -> dict[str, Any]:
+    """Request and connection counters plus timings of the last 1000 requests."""
+    with _LOCK:
+        stats: dict[str, Any] = dict(_STATS)
+        durations = sorted(_DURATIONS_MS)
+        stats["idle_connections"] = sum(len(idle) for idle in _IDLE.values())
+    if durations:
+        stats["mean_ms"] = round(sum(durations) / len(durations), 2)
+        stats["p50_ms"] = round(durations[len(durations) // 2], 2)
+        stats["p95_ms"] = round(durations[max(int(len(durations) * 0.95) - 1, 0)], 2)
+    return stats
+
+
+def reset_http_stats() -> None:
+    with _LOCK:
+        for key in _STATS:
+            _STATS[key] = 0
+        _DURATIONS_MS.clear()
+
+
+def close_idle_connections() -> None:
+    with _LOCK:
+        pools = list(_IDLE.values())
+        _IDLE.clear()
+    for idle in pools:
+        for conn, _released_at in idle:
+            conn.close()
@@ -1,40 +1,85 @@
-"""Obsidian vault indexing and graph helpers."""
+"""Obsidian vault indexing and graph helpers.
+
+When the vault root is on disk, the file index is built from the filesystem
+and both caches are kept live by the vault change feed (``vault_watcher``):
+events patch the cached index and re-parse only the touched notes for the
+graph, so the caches never expire and callers never need ``force_refresh``.
+Without a vault root (REST API only) the caches fall back to their TTL.
+
+Graph rebuilds read notes on a bounded worker pool (``GRAPH_FETCH_WORKERS``)
+and keep each note's parsed aliases/wikilinks keyed by its (mtime, size)
+stamp, so only notes that changed since the last build are parsed again.
+
+REST requests go through the pooled keep-alive transport in
+``obsidian_http``, and a REST index build lists folders concurrently on
+``FOLDER_SCAN_WORKERS`` threads.
+"""
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
 import os
 import re
-import ssl
-import urllib.error
+import threading
 import urllib.parse
-import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set
 
 import yaml
 
+import obsidian_http
+from vault_watcher import (
+    EVENT_DELETED,
+    EVENT_MOVED,
+    VaultEvent,
+    ensure_vault_watcher,
+    scan_markdown_files,
+    vault_root_path,
+)
+
 _VAULT_INDEX_CACHE: Dict[str, Any] = {
     "data": None,
     "timestamp": None,
     "ttl_seconds": 300,
+    "live": False,
 }
 
 _GRAPH_CACHE: Dict[str, Any] = {
     "data": None,
     "timestamp": None,
     "ttl_seconds": 300,
+    "live": False,
 }
 
+# Per-note graph inputs (aliases + raw wikilink targets; None for an empty
+# note) by vault path. Reused across rebuilds only while the change feed
+# keeps them current.
+_GRAPH_NOTES: Dict[str, Optional[dict[str, list[str]]]] = {}
+# Parsed graph inputs by vault path with the stamp they were parsed at:
+# (mtime_ns, size) on disk, the REST note stat, or a content digest.
+# Unlike _GRAPH_NOTES this survives forced rebuilds.
+_PARSE_CACHE: Dict[str, tuple[tuple, Optional[dict[str, list[str]]]]] = {}
+GRAPH_FETCH_WORKERS = 8
+FOLDER_SCAN_WORKERS = 8
+_LIVE_LOCK = threading.RLock()
+_LIVE_ROOTS: Set[str] = set()
+
 OBSIDIAN_API_URL = os.environ.get("OBSIDIAN_API_URL", "https://127.0.0.1:27124")
 _OBSIDIAN_FALLBACK_URLS = [
     "https://127.0.0.1:27124",
     "https://localhost:27124",
     "https://host.docker.internal:27124",
 ]
+# Base URL that last answered; tried first so fallbacks cost nothing per request.
+_PREFERRED_URL: Dict[str, Optional[str]] = {"url": None}
 
 WIKILINK_RE = re.compile(r"\[\[([^\]|]+)(?:\|[^\]]+)?\]\]")
 _FM_RE = re.compile(r"^---\s*\n(.*?)\n---", re.DOTALL)
+# libyaml's loader when available: frontmatter dominates a cold graph parse.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def _read_env_value(key: str) -> str:
@@ -75,75 +120,110 @@ def _obsidian_api_urls() -> List[str]:
         if url not in seen:
             urls.append(url)
             seen.add(url)
+    preferred = _PREFERRED_URL["url"]
+    if preferred in seen and urls[0] != preferred:
+        urls.remove(preferred)
+        urls.insert(0, preferred)
     return urls
 
 
-def _get_api_key() -> str:
-    return _read_env_value("OBSIDIAN_API_KEY")
+def _api_get(path: str, accept: str) -> Optional[obsidian_http.HttpResponse]:
+    """GET ``path`` from the first base URL that answers, or None."""
+    api_key = _get_api_key()
+    if not api_key:
+        return None
+    headers = {"Authorization": f"Bearer {api_key}", "Accept": accept}
+    for base_url in _obsidian_api_urls():
+        try:
+            resp = obsidian_http.request("GET", f"{base_url}{path}", headers=headers, timeout=10)
+        except Exception:
+            continue
+        _PREFERRED_URL["url"] = base_url
+        return resp
+    return None
 
 
-def _http_context() -> ssl.SSLContext:
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-    return ctx
+def _get_api_key() -> str:
+    return _read_env_value("OBSIDIAN_API_KEY")
 
 
 def _list_folder(folder: str) -> List[dict]:
     """List files/folders in a single Obsidian vault directory."""
-    api_key = _get_api_key()
-    if not api_key:
-        return []
-
     folder_path = "/vault/"
     if folder:
         encoded_folder = urllib.parse.quote(str(folder).strip("/"), safe="/")
         folder_path = f"/vault/{encoded_folder}/"
 
-    for base_url in _obsidian_api_urls():
-        url = f"{base_url}{folder_path}"
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Accept": "application/json",
-            },
-        )
-        try:
-            with urllib.request.urlopen(req, context=_http_context(), timeout=10) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-                if isinstance(data, dict) and "files" in data:
-                    return data["files"]
-                if isinstance(data, list):
-                    return data
-                return []
-        except Exception:
-            continue
+    resp = _api_get(folder_path, "application/json")
+    if resp is None:
+        return []
+    try:
+        data = json.loads(resp.text())
+    except ValueError:
+        return []
+    if isinstance(data, dict) and "files" in data:
+        return data["files"]
+    if isinstance(data, list):
+        return data
     return []
 
 
+def _item_path(item: Any) -> str:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        return item.get("path", item.get("name", ""))
+    return ""
+
+
+def _list_folders_concurrently(root: str) -> Dict[str, list]:
+    """Listings of ``root`` and every folder below it, fetched in parallel."""
+    listings: Dict[str, list] = {}
+    with ThreadPoolExecutor(
+        max_workers=FOLDER_SCAN_WORKERS, thread_name_prefix="vault-scan"
+    ) as pool:
+        pending = {pool.submit(_list_folder, root): root}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder = pending.pop(future)
+                items = future.result()
+                listings[folder] = items
+                for item in items:
+                    path = _item_path(item)
+                    if path.endswith("/"):
+                        sub = path.rstrip("/")
+                        sub = f"{folder}/{sub}" if folder else sub
+                        pending[pool.submit(_list_folder, sub)] = sub
+    return listings
+
+
 def _recursive_scan(
     folder: str,
     notes: Set[str],
     primary_paths: Dict[str, str],
     files: list[dict[str, str]],
     name_paths: Dict[str, list[str]],
+    listings: Optional[Dict[str, list]] = None,
 ) -> None:
-    """Recursively scan vault folders and collect markdown notes."""
-    items = _list_folder(folder)
+    """Recursively scan vault folders and collect markdown notes.
+
+    Folder listings are fetched up front on a bounded pool; the walk over
+    them stays depth-first so notes come out in the same order as before.
+    """
+    if listings is None:
+        listings = _list_folders_concurrently(folder)
+    items = listings.get(folder, [])
 
     for item in items:
-        if isinstance(item, str):
-            path = item
-        elif isinstance(item, dict):
-            path = item.get("path", item.get("name", ""))
-        else:
+        path = _item_path(item)
+        if not path:
             continue
 
         if path.endswith("/"):
             folder_path = path.rstrip("/")
             full_path = f"{folder}/{folder_path}" if folder else folder_path
-            _recursive_scan(full_path, notes, primary_paths, files, name_paths)
+            _recursive_scan(full_path, notes, primary_paths, files, name_paths, listings)
             continue
 
         if not path.endswith(".md"):
@@ -160,10 +240,54 @@ def _recursive_scan(
 def _is_cache_valid(cache: Dict[str, Any]) -> bool:
     if not cache["data"] or not cache["timestamp"]:
         return False
+    if cache.get("live"):
+        return True
     elapsed = (datetime.now() - cache["timestamp"]).total_seconds()
     return elapsed < cache["ttl_seconds"]
 
 
+def _note_name(path: str) -> str:
+    return path.rsplit("/", 1)[-1].replace(".md", "")
+
+
+def _index_result(files: list[dict[str, str]]) -> dict:
+    notes: Set[str] = set()
+    primary_paths: Dict[str, str] = {}
+    name_paths: Dict[str, list[str]] = {}
+    for item in files:
+        name = item["name"]
+        notes.add(name)
+        primary_paths.setdefault(name, item["path"])
+        name_paths.setdefault(name, []).append(item["path"])
+
+    return {
+        "success": True,
+        "notes": sorted(notes),
+        "paths": primary_paths,
+        "files": files,
+        "count": len(files),
+        "uniqueCount": len(notes),
+        "duplicateNames": {
+            name: paths for name, paths in name_paths.items() if len(paths) > 1
+        },
+        "cached": False,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def _ensure_live_updates(root: Any) -> bool:
+    """Subscribe the caches to the vault change feed; False when there is none."""
+    feed = ensure_vault_watcher(root)
+    if feed is None:
+        return False
+    key = str(root)
+    with _LIVE_LOCK:
+        if key not in _LIVE_ROOTS:
+            feed.subscribe(functools.partial(_apply_vault_events, root))
+            _LIVE_ROOTS.add(key)
+    return True
+
+
 def get_vault_index(force_refresh: bool = False) -> dict:
     """
     Get complete vault index with file-level accounting.
@@ -181,38 +305,28 @@ def get_vault_index(force_refresh: bool = False) -> dict:
             "timestamp": str,
         }
     """
+    root = vault_root_path()
+    live = root is not None and _ensure_live_updates(root)
     if not force_refresh and _is_cache_valid(_VAULT_INDEX_CACHE):
         result = dict(_VAULT_INDEX_CACHE["data"])
         result["cached"] = True
         return result
 
     try:
-        notes: Set[str] = set()
-        primary_paths: Dict[str, str] = {}
-        files: list[dict[str, str]] = []
-        name_paths: Dict[str, list[str]] = {}
-        _recursive_scan("", notes, primary_paths, files, name_paths)
-
-        duplicate_names = {
-            name: paths
-            for name, paths in name_paths.items()
-            if len(paths) > 1
-        }
-
-        result = {
-            "success": True,
-            "notes": sorted(notes),
-            "paths": primary_paths,
-            "files": files,
-            "count": len(files),
-            "uniqueCount": len(notes),
-            "duplicateNames": duplicate_names,
-            "cached": False,
-            "timestamp": datetime.now().isoformat(),
-        }
-
-        _VAULT_INDEX_CACHE["data"] = result
-        _VAULT_INDEX_CACHE["timestamp"] = datetime.now()
+        if root is not None:
+            files = [
+                {"name": _note_name(path), "path": path}
+                for path in sorted(scan_markdown_files(root))
+            ]
+        else:
+            files = []
+            _recursive_scan("", set(), {}, files, {})
+
+        result = _index_result(files)
+        with _LIVE_LOCK:
+            _VAULT_INDEX_CACHE["data"] = result
+            _VAULT_INDEX_CACHE["timestamp"] = datetime.now()
+            _VAULT_INDEX_CACHE["live"] = live
         return result
 
     except Exception as exc:
@@ -230,37 +344,76 @@ def get_vault_index(force_refresh: bool = False) -> dict:
         }
 
 
+def get_note_aliases() -> dict[str, list[str]]:
+    """YAML aliases by note name, from notes the link graph has already parsed."""
+    with _LIVE_LOCK:
+        return {
+            _note_name(path): list(record["aliases"])
+            for path, record in _GRAPH_NOTES.items()
+            if record and record["aliases"]
+        }
+
+
 def clear_vault_cache() -> dict:
     """Clear vault index and graph caches."""
-    _VAULT_INDEX_CACHE["data"] = None
-    _VAULT_INDEX_CACHE["timestamp"] = None
-    _GRAPH_CACHE["data"] = None
-    _GRAPH_CACHE["timestamp"] = None
+    with _LIVE_LOCK:
+        _VAULT_INDEX_CACHE["data"] = None
+        _VAULT_INDEX_CACHE["timestamp"] = None
+        _VAULT_INDEX_CACHE["live"] = False
+        _GRAPH_CACHE["data"] = None
+        _GRAPH_CACHE["timestamp"] = None
+        _GRAPH_CACHE["live"] = False
+        _GRAPH_NOTES.clear()
+        _PARSE_CACHE.clear()
     return {"success": True, "message": "Vault index cache cleared"}
 
 
 def _get_note_content(path: str) -> Optional[str]:
     """Fetch a single note's content via the Obsidian REST API."""
-    api_key = _get_api_key()
-    if not api_key:
+    encoded = urllib.parse.quote(path, safe="/")
+    resp = _api_get(f"/vault/{encoded}", "text/markdown")
+    if resp is None:
+        return None
+    try:
+        return resp.text()
+    except UnicodeDecodeError:
         return None
 
+
+def _get_note_with_stat(path: str) -> Optional[tuple[tuple, str, Optional[dict]]]:
+    """Fetch a note as (stamp, content, frontmatter) via the Obsidian REST API.
+
+    Asks for the ``note+json`` representation, which carries the file's
+    mtime/size and parsed frontmatter. Servers that answer with plain
+    markdown get a content-digest stamp and no frontmatter.
+    """
     encoded = urllib.parse.quote(path, safe="/")
-    for base_url in _obsidian_api_urls():
-        url = f"{base_url}/vault/{encoded}"
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Accept": "text/markdown",
-            },
-        )
+    resp = _api_get(f"/vault/{encoded}", "application/vnd.olrapi.note+json")
+    if resp is None:
+        return None
+    try:
+        body = resp.text()
+    except UnicodeDecodeError:
+        return None
+    if "json" in resp.header("Content-Type"):
         try:
-            with urllib.request.urlopen(req, context=_http_context(), timeout=10) as resp:
-                return resp.read().decode("utf-8")
-        except Exception:
-            continue
-    return None
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if isinstance(data, dict) and isinstance(data.get("content"), str):
+            content = data["content"]
+            stat = data.get("stat") if isinstance(data.get("stat"), dict) else {}
+            frontmatter = data.get("frontmatter")
+            if "mtime" in stat and "size" in stat:
+                stamp: tuple = ("stat", stat["mtime"], stat["size"])
+            else:
+                stamp = ("digest", _content_digest(content))
+            return stamp, content, frontmatter if isinstance(frontmatter, dict) else None
+    return ("digest", _content_digest(body)), body, None
+
+
+def _content_digest(content: str) -> bytes:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
 
 
 def _parse_wikilinks(content: str) -> List[str]:
@@ -282,14 +435,17 @@ def _parse_frontmatter(content: str) -> dict[str, Any]:
     if not match:
         return {}
     try:
-        raw = yaml.safe_load(match.group(1))
+        raw = yaml.load(match.group(1), Loader=_YAML_LOADER)
     except yaml.YAMLError:
         return {}
     return raw if isinstance(raw, dict) else {}
 
 
 def _extract_aliases(content: str) -> list[str]:
-    frontmatter = _parse_frontmatter(content)
+    return _aliases_from_frontmatter(_parse_frontmatter(content))
+
+
+def _aliases_from_frontmatter(frontmatter: dict[str, Any]) -> list[str]:
     raw_aliases = frontmatter.get("aliases")
     if isinstance(raw_aliases, list):
         return [str(alias).strip() for alias in raw_aliases if str(alias).strip()]
@@ -306,6 +462,8 @@ def get_vault_graph(force_refresh: bool = False) -> dict:
     anchors are treated as links to the owning note so valid note references
     are not marked as broken when an anchor is present.
     """
+    root = vault_root_path()
+    live = root is not None and _ensure_live_updates(root)
     if not force_refresh and _is_cache_valid(_GRAPH_CACHE):
         result = dict(_GRAPH_CACHE["data"])
         result["cached"] = True
@@ -323,69 +481,34 @@ def get_vault_graph(force_refresh: bool = False) -> dict:
             }
 
         files = list(index.get("files") or [])
-        if not files:
-            return {
-                "success": True,
-                "nodes": [],
-                "links": [],
-                "nodeCount": 0,
-                "linkCount": 0,
-                "cached": False,
-            }
-
-        note_lookup: dict[str, str] = {}
-        alias_lookup: dict[str, str] = {}
-        content_cache: dict[str, str] = {}
-        nodes: list[dict[str, Any]] = []
-
-        for item in files:
-            path = str(item.get("path") or "")
-            name = str(item.get("name") or "")
-            if not path or not name:
-                continue
-
-            folder = path.rsplit("/", 1)[0] if "/" in path else ""
-            nodes.append({"id": path, "name": name, "folder": folder, "path": path})
-            note_lookup.setdefault(name.lower(), path)
-
-            content = _get_note_content(path)
-            if not content:
-                continue
-            content_cache[path] = content
-            for alias in _extract_aliases(content):
-                alias_lookup.setdefault(alias.lower(), path)
-
-        links: list[dict[str, str]] = []
-        seen_links: set[str] = set()
-
-        for item in files:
-            source_path = str(item.get("path") or "")
-            source_name = str(item.get("name") or "")
-            content = content_cache.get(source_path)
-            if not source_path or not source_name or not content:
-                continue
-
-            for raw_target in _parse_wikilinks(content):
-                note_target, _anchor = _split_wikilink_target(raw_target)
-                if not note_target:
-                    continue
-                resolved_path = note_lookup.get(note_target.lower()) or alias_lookup.get(note_target.lower())
-                if resolved_path and resolved_path != source_path:
-                    key = f"{source_path}||{resolved_path}"
-                    if key not in seen_links:
-                        seen_links.add(key)
-                        links.append({"source": source_path, "target": resolved_path})
-
-        result = {
-            "success": True,
-            "nodes": nodes,
-            "links": links,
-            "nodeCount": len(nodes),
-            "linkCount": len(links),
-            "cached": False,
-        }
-        _GRAPH_CACHE["data"] = result
-        _GRAPH_CACHE["timestamp"] = datetime.now()
+        with _LIVE_LOCK:
+            if force_refresh or not live:
+                _GRAPH_NOTES.clear()
+            missing = [
+                path
+                for path in (str(item.get("path") or "") for item in files)
+                if path and path not in _GRAPH_NOTES
+            ]
+        # Notes are read outside the lock so change-feed events are not held
+        # up behind a full rebuild; records an event already refreshed win.
+        records = _load_note_records(missing, root)
+        with _LIVE_LOCK:
+            # The change feed may have moved or deleted notes while they were
+            # read; resolve against the index as it is now and drop records
+            # for paths that are gone.
+            current = _VAULT_INDEX_CACHE["data"]
+            if current is not None and current.get("success"):
+                files = list(current.get("files") or [])
+            present = {str(item.get("path") or "") for item in files}
+            for path, record in zip(missing, records):
+                if path in present:
+                    _GRAPH_NOTES.setdefault(path, record)
+                else:
+                    _PARSE_CACHE.pop(path, None)
+            result = _resolve_graph(files)
+            _GRAPH_CACHE["data"] = result
+            _GRAPH_CACHE["timestamp"] = datetime.now()
+            _GRAPH_CACHE["live"] = live
         return result
 
     except Exception as exc:
@@ -396,3 +519,158 @@ def get_vault_graph(force_refresh: bool = False) -> dict:
             "cached": False,
             "error": str(exc),
         }
+
+
+def _load_note_records(
+    paths: list[str], root: Any = None
+) -> list[Optional[dict[str, list[str]]]]:
+    """Graph records for ``paths``, read on a bounded worker pool."""
+    if len(paths) <= 1 or GRAPH_FETCH_WORKERS <= 1:
+        return [_load_note_record(path, root) for path in paths]
+    loader = functools.partial(_load_note_record, root=root)
+    with ThreadPoolExecutor(
+        max_workers=min(GRAPH_FETCH_WORKERS, len(paths)),
+        thread_name_prefix="vault-graph",
+    ) as pool:
+        return list(pool.map(loader, paths))
+
+
+def _load_note_record(path: str, root: Any = None) -> Optional[dict[str, list[str]]]:
+    """One note's graph record, parsed only when its stamp changed.
+
+    On disk the stamp comes from ``stat`` and unchanged notes are not read
+    at all; over REST the note is fetched with its stat and only the parse
+    is skipped.
+    """
+    frontmatter: Optional[dict] = None
+    content: Optional[str] = None
+    if root is not None:
+        full_path = os.path.join(str(root), path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            _PARSE_CACHE.pop(path, None)
+            return None
+        stamp: tuple = ("disk", stat.st_mtime_ns, stat.st_size)
+    else:
+        fetched = _get_note_with_stat(path)
+        if fetched is None:
+            _PARSE_CACHE.pop(path, None)
+            return None
+        stamp, content, frontmatter = fetched
+
+    cached = _PARSE_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    if root is not None:
+        content = _read_note(path, root)
+    record = _note_record(content, frontmatter)
+    _PARSE_CACHE[path] = (stamp, record)
+    return record
+
+
+def _read_note(path: str, root: Any = None) -> Optional[str]:
+    """Note content from disk when the vault root is known, else the REST API."""
+    if root is None:
+        return _get_note_content(path)
+    try:
+        with open(os.path.join(str(root), path), "r", encoding="utf-8") as handle:
+            return handle.read()
+    except OSError:
+        return None
+
+
+def _note_record(
+    content: Optional[str], frontmatter: Optional[dict] = None
+) -> Optional[dict[str, list[str]]]:
+    if not content:
+        return None
+    aliases = (
+        _aliases_from_frontmatter(frontmatter)
+        if frontmatter is not None
+        else _extract_aliases(content)
+    )
+    return {"aliases": aliases, "targets": _parse_wikilinks(content)}
+
+
+def _resolve_graph(files: list[dict]) -> dict:
+    """Graph nodes and resolved links from the cached per-note records."""
+    note_lookup: dict[str, str] = {}
+    alias_lookup: dict[str, str] = {}
+    nodes: list[dict[str, Any]] = []
+
+    for item in files:
+        path = str(item.get("path") or "")
+        name = str(item.get("name") or "")
+        if not path or not name:
+            continue
+
+        folder = path.rsplit("/", 1)[0] if "/" in path else ""
+        nodes.append({"id": path, "name": name, "folder": folder, "path": path})
+        note_lookup.setdefault(name.lower(), path)
+
+        record = _GRAPH_NOTES.get(path)
+        if not record:
+            continue
+        for alias in record["aliases"]:
+            alias_lookup.setdefault(alias.lower(), path)
+
+    links: list[dict[str, str]] = []
+    seen_links: set[str] = set()
+
+    for item in files:
+        source_path = str(item.get("path") or "")
+        source_name = str(item.get("name") or "")
+        record = _GRAPH_NOTES.get(source_path)
+        if not source_path or not source_name or not record:
+            continue
+
+        for raw_target in record["targets"]:
+            note_target, _anchor = _split_wikilink_target(raw_target)
+            if not note_target:
+                continue
+            resolved_path = note_lookup.get(note_target.lower()) or alias_lookup.get(note_target.lower())
+            if resolved_path and resolved_path != source_path:
+                key = f"{source_path}||{resolved_path}"
+                if key not in seen_links:
+                    seen_links.add(key)
+                    links.append({"source": source_path, "target": resolved_path})
+
+    return {
+        "success": True,
+        "nodes": nodes,
+        "links": links,
+        "nodeCount": len(nodes),
+        "linkCount": len(links),
+        "cached": False,
+    }
+
+
+def _apply_vault_events(root: Any, events: list[VaultEvent]) -> None:
+    """Change-feed listener: patch the live index and graph for ``events``."""
+    with _LIVE_LOCK:
+        index = _VAULT_INDEX_CACHE["data"]
+        if index is None or not _VAULT_INDEX_CACHE.get("live"):
+            return
+        paths = {item["path"] for item in index.get("files") or []}
+        touched: set[str] = set()
+        for event in events:
+            if event.kind in (EVENT_DELETED, EVENT_MOVED):
+                paths.discard(event.path)
+                _GRAPH_NOTES.pop(event.path, None)
+                _PARSE_CACHE.pop(event.path, None)
+            target = event.dest_path if event.kind == EVENT_MOVED else event.path
+            if event.kind != EVENT_DELETED and target:
+                paths.add(target)
+                touched.add(target)
+        files = [{"name": _note_name(path), "path": path} for path in sorted(paths)]
+        _VAULT_INDEX_CACHE["data"] = _index_result(files)
+        _VAULT_INDEX_CACHE["timestamp"] = datetime.now()
+
+        if _GRAPH_CACHE["data"] is None or not _GRAPH_CACHE.get("live"):
+            return
+        for path in touched:
+            _GRAPH_NOTES[path] = _load_note_record(path, root)
+        _GRAPH_CACHE["data"] = _resolve_graph(files)
+        _GRAPH_CACHE["timestamp"] = datetime.now()
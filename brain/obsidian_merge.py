@@ -4,6 +4,7 @@ import os
 from typing import Dict, Optional
 
 import requests
+import yaml
 
 from llm_provider import call_llm
 
@@ -78,62 +79,54 @@ def merge_sections(existing: str, new: str, session_id: Optional[str] = None, va
     return existing.rstrip() + "\n\n" + new_block if existing.strip() else new_block
 
 
-def add_concept_links(content: str, course: Optional[str] = None, vault_index: Optional[list] = None) -> str:
-    """Convert key terms to [[Wiki Links]] using LLM, validated against vault index."""
-    if not content.strip():
+def add_concept_links(
+    content: str,
+    course: Optional[str] = None,
+    vault_index: Optional[list] = None,
+    *,
+    aliases: Optional[Dict[str, list]] = None,
+    disambiguate: bool = False,
+) -> str:
+    """Convert vault note titles (and their aliases) in content to [[Wiki Links]].
+
+    Terms are found locally with ``concept_linker``; with ``disambiguate``
+    the LLM is asked which of the found terms are worth linking.
+    """
+    if not content.strip() or not vault_index:
         return content
 
-    system_prompt = (
-        "Identify key terms that should be linked in Obsidian. "
-        "Return JSON array of terms only. Do not include duplicates."
-    )
-    if vault_index:
-        # Give the LLM ground truth so it only links to existing notes
-        sample = vault_index[:200]
-        notes_str = ", ".join(sample)
-        if len(vault_index) > 200:
-            notes_str += f" ... ({len(vault_index) - 200} more)"
-        system_prompt += (
-            f"\n\nONLY link terms that match one of these existing notes: {notes_str}. "
-            "Do NOT create links for concepts not in this list."
-        )
-
-    user_prompt = f"Content:\n{content}"
+    from concept_linker import get_concept_matcher, link_concepts
+
+    matcher = get_concept_matcher(vault_index, aliases)
+    keep = None
+    if disambiguate:
+        candidates = sorted({match.target for match in matcher.find(content)})
+        if not candidates:
+            return content
+        keep = _disambiguate_concepts(content, candidates)
+    return link_concepts(content, matcher, keep=keep)
+
+
+def _disambiguate_concepts(content: str, candidates: list) -> Optional[set]:
+    """Titles the LLM keeps from ``candidates``; None (keep all) on failure."""
     result = call_llm(
-        system_prompt=system_prompt,
-        user_prompt=user_prompt,
+        system_prompt=(
+            "These vault note titles appear in the content. Return a JSON array "
+            "of the titles that name a key concept worth linking in Obsidian. "
+            "Only use titles from the list."
+        ),
+        user_prompt=f"Titles: {json.dumps(candidates)}\n\nContent:\n{content}",
         timeout=30,
     )
     if not result.get("success"):
-        return content
-
+        return None
     try:
         terms = json.loads(result.get("content", "") or "[]")
     except json.JSONDecodeError:
-        return content
-
+        return None
     if not isinstance(terms, list):
-        return content
-
-    # Validate against vault index if provided
-    if vault_index:
-        vault_lookup = {note.lower(): note for note in vault_index}
-        validated = []
-        for term in terms:
-            if not isinstance(term, str) or not term.strip():
-                continue
-            match = vault_lookup.get(term.strip().lower())
-            if match:
-                validated.append(match)
-        terms = validated
-
-    updated = content
-    for term in sorted({t for t in terms if isinstance(t, str) and t.strip()}, key=len, reverse=True):
-        term_clean = term.strip()
-        if not term_clean:
-            continue
-        updated = _link_term(updated, term_clean)
-    return updated
+        return None
+    return {term.strip().casefold() for term in terms if isinstance(term, str) and term.strip()}
 
 
 def format_obsidian(content: str) -> str:
@@ -142,6 +135,84 @@ def format_obsidian(content: str) -> str:
     return formatted.strip()
 
 
+# In-memory equivalents of the ObsidianVault edit commands, so several edits
+# to one note can be applied to a single read and written back once.
+
+_FRONTMATTER_RE = re.compile(r"\A---\r?\n.*?\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+_HEADING_RE = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t]*$")
+
+
+def append_to_note(note: str, content: str) -> str:
+    """``append``: content on a new line at the end of the note."""
+    if not note:
+        return content
+    return note + ("" if note.endswith("\n") else "\n") + content
+
+
+def prepend_to_note(note: str, content: str) -> str:
+    """``prepend``: content on its own line right after the frontmatter."""
+    match = _FRONTMATTER_RE.match(note)
+    end = match.end() if match else 0
+    head = note[:end]
+    if head and not head.endswith("\n"):
+        head += "\n"
+    return f"{head}{content}\n{note[end:]}"
+
+
+def set_note_property(note: str, key: str, value: str) -> str:
+    """``property:set``: set one top-level frontmatter key, adding frontmatter if needed."""
+    line = yaml.safe_dump({key: value}, allow_unicode=True, sort_keys=False, width=10_000).strip()
+    match = _FRONTMATTER_RE.match(note)
+    if not match:
+        return f"---\n{line}\n---\n{note}"
+
+    fm_lines = note[: match.end()].splitlines()
+    body_lines = fm_lines[1:-1]
+    key_re = re.compile(rf"^{re.escape(key)}[ \t]*:")
+    for idx, existing in enumerate(body_lines):
+        if key_re.match(existing):
+            stop = idx + 1
+            # Drop the old value's continuation lines (nested or list items).
+            while stop < len(body_lines) and body_lines[stop][:1] in (" ", "\t", "-"):
+                stop += 1
+            body_lines[idx:stop] = [line]
+            break
+    else:
+        body_lines.append(line)
+    return "\n".join(["---", *body_lines, "---"]) + "\n" + note[match.end() :]
+
+
+def replace_note_section(note: str, heading: str, content: str) -> str:
+    """``replace-section``: replace the body under ``heading`` up to the next
+    heading of the same or a higher level. Raises ``ValueError`` if absent."""
+    level = heading.count("#")
+    heading_text = heading.lstrip("# ").strip()
+    lines = note.splitlines(keepends=True)
+    start = end = None
+    offset = 0
+    in_fence = False
+    for line in lines:
+        stripped = line.rstrip("\r\n")
+        if stripped.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING_RE.match(stripped)
+        if match:
+            found_level = len(match.group(1))
+            if start is None:
+                if found_level == level and match.group(2) == heading_text:
+                    start = offset + len(line)
+            elif found_level <= level:
+                end = offset
+                break
+        offset += len(line)
+    if start is None:
+        raise ValueError(f"Heading not found: {heading}")
+    if start > len(note) or not note[:start].endswith("\n"):
+        note, start = note + "\n", start + 1
+    after = "" if end is None else note[end:]
+    return f"{note[:start]}\n{content}\n{after}"
+
+
 def _get_obsidian_api_key() -> str:
     from config import load_env
     import os
@@ -227,18 +298,6 @@ def _deterministic_merge(existing_body: str, new_body: str) -> str:
     return f"{existing_body.strip()}\n\n{additions}".strip()
 
 
-def _link_term(content: str, term: str) -> str:
-    pattern = re.compile(rf"(?<!\[)\b{re.escape(term)}\b")
-
-    def replace(match):
-        text = match.group(0)
-        if f"[[{text}]]" in content:
-            return text
-        return f"[[{text}]]"
-
-    return pattern.sub(replace, content)
-
-
 def generate_obsidian_patch(session_id: str, note_path: str, new_content: str, existing_content: Optional[str] = None) -> Optional[str]:
     """
     Generate a diff-based patch for Obsidian note updates.
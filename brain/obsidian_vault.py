@@ -4,6 +4,10 @@ Requires:
 - Obsidian Desktop v1.12+ with CLI enabled
 - Obsidian running (CLI uses IPC)
 - ``obsidian`` command on PATH
+
+Commands go through a persistent CLI session when one is configured
+(``PT_OBSIDIAN_CLI_SESSION``, see ``obsidian_cli_session``) and fall back to
+one subprocess per command otherwise.
 """
 
 from __future__ import annotations
@@ -14,6 +18,8 @@ import subprocess
 import time
 from typing import Any
 
+from obsidian_cli_session import CliSessionError, get_cli_session
+
 log = logging.getLogger(__name__)
 
 _DEFAULT_TIMEOUT = 10
@@ -21,6 +27,32 @@ _EVAL_TIMEOUT = 15
 _RETRY_MAX_ATTEMPTS = 3
 _RETRY_BACKOFF_DELAYS = [1, 2]  # seconds between retries
 _AVAILABILITY_CACHE_TTL = 30  # seconds
+# ``write_note_if_unchanged`` reports this when the note no longer matches.
+NOTE_CHANGED = "note changed since it was read"
+
+# FNV-1a over UTF-16 code units of the trimmed, LF-normalized text; the same
+# function runs in Obsidian, where a synchronous hash is needed inside
+# ``app.vault.process``.
+_JS_NOTE_HASH = (
+    "const noteHash = (text) => {"
+    '  const t = text.replace(/\\r\\n/g, "\\n").trim();'
+    "  let h = 0x811c9dc5;"
+    "  for (let i = 0; i < t.length; i++) {"
+    "    h = Math.imul((h ^ t.charCodeAt(i)) >>> 0, 0x01000193) >>> 0;"
+    "  }"
+    "  return t.length + \":\" + h.toString(16);"
+    "};"
+)
+
+
+def note_content_hash(text: str) -> str:
+    """Hash of a note's text as read, for ``write_note_if_unchanged``."""
+    normalized = text.replace("\r\n", "\n").strip()
+    data = normalized.encode("utf-16-le")
+    value = 0x811C9DC5
+    for idx in range(0, len(data), 2):
+        value = ((value ^ (data[idx] | data[idx + 1] << 8)) * 0x01000193) & 0xFFFFFFFF
+    return f"{len(data) // 2}:{value:x}"
 
 
 class ObsidianVault:
@@ -54,12 +86,7 @@ class ObsidianVault:
 
         for attempt in range(_RETRY_MAX_ATTEMPTS):
             try:
-                proc = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
+                proc = self._exec(cmd, timeout=timeout)
                 if proc.returncode != 0:
                     if attempt < _RETRY_MAX_ATTEMPTS - 1:
                         delay = _RETRY_BACKOFF_DELAYS[attempt]
@@ -108,6 +135,22 @@ class ObsidianVault:
 
         return [] if parse_json else ""
 
+    @staticmethod
+    def _exec(cmd: list[str], *, timeout: int) -> subprocess.CompletedProcess:
+        """Run one CLI command through the session if configured, else a subprocess."""
+        session = get_cli_session()
+        if session is not None:
+            try:
+                return session.run(cmd[1:], timeout=timeout)
+            except CliSessionError as exc:
+                log.debug("obsidian CLI session unavailable, spawning: %s", exc)
+        return subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+
     def _eval(self, code: str, *, timeout: int = _EVAL_TIMEOUT) -> str:
         """Execute JavaScript in the Obsidian app context via ``obsidian eval``."""
         return self._run(["eval", self._kv_arg("code", code)], timeout=timeout)
@@ -117,7 +160,9 @@ class ObsidianVault:
     def is_available(self) -> bool:
         """Check if Obsidian CLI is reachable.
 
-        Result is cached for 30 seconds to avoid repeated subprocess calls.
+        Runs ``obsidian version`` (through the CLI session when one is
+        configured), so a helper that is up while Obsidian is not does not
+        count. Result is cached for 30 seconds to avoid repeated calls.
         """
         now = time.time()
         if (
@@ -127,12 +172,7 @@ class ObsidianVault:
             return self._available_cached
 
         try:
-            proc = subprocess.run(
-                ["obsidian", "version"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            proc = self._exec(["obsidian", "version"], timeout=5)
             result = proc.returncode == 0
         except (FileNotFoundError, subprocess.TimeoutExpired):
             result = False
@@ -195,6 +235,55 @@ class ObsidianVault:
         )
         return self._eval(code)
 
+    def write_note(self, file: str, new_content: str) -> str:
+        """Replace entire file content; ``file`` resolves like a wikilink."""
+        escaped = (
+            new_content.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\r", "\\r")
+            .replace("\n", "\\n")
+        )
+        escaped_file = file.replace("\\", "\\\\").replace('"', '\\"')
+        code = (
+            f'const f = app.metadataCache.getFirstLinkpathDest("{escaped_file}", "")'
+            f' || app.vault.getFileByPath("{escaped_file}");'
+            f'if (!f) throw new Error("File not found: {escaped_file}");'
+            f'await app.vault.modify(f, "{escaped}");'
+        )
+        return self._eval(code)
+
+    def write_note_if_unchanged(
+        self, file: str, expected_hash: str, new_content: str
+    ) -> str:
+        """Replace a note's content only if it still hashes to ``expected_hash``.
+
+        The check and the write happen together inside ``app.vault.process``,
+        so an edit made in Obsidian since the note was read is never
+        overwritten. Returns output containing ``NOTE_CHANGED`` when the
+        note had changed and nothing was written.
+        """
+        escaped = (
+            new_content.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\r", "\\r")
+            .replace("\n", "\\n")
+        )
+        escaped_file = file.replace("\\", "\\\\").replace('"', '\\"')
+        code = (
+            _JS_NOTE_HASH
+            + f'const f = app.metadataCache.getFirstLinkpathDest("{escaped_file}", "")'
+            f' || app.vault.getFileByPath("{escaped_file}");'
+            f'if (!f) throw new Error("File not found: {escaped_file}");'
+            f'let outcome = "{NOTE_CHANGED}";'
+            f"await app.vault.process(f, (data) => {{"
+            f'  if (noteHash(data) !== "{expected_hash}") return data;'
+            f'  outcome = "written";'
+            f'  return "{escaped}";'
+            f"}});"
+            f"outcome;"
+        )
+        return self._eval(code)
+
     def delete_note(self, path: str, *, permanent: bool = False) -> str:
         """Delete a note. Uses trash unless permanent=True."""
         args = ["delete", self._kv_arg("path", path)]
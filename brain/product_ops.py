@@ -7,6 +7,7 @@ from typing import Any
 from uuid import uuid4
 
 from learner_profile import DEFAULT_USER_ID, get_profile_claims, get_profile_summary
+from tutor_turn_state import invalidate_all_session_state
 
 DEFAULT_WORKSPACE_ID = "default"
 
@@ -681,6 +682,8 @@ def reset_personalization(
         )
 
     conn.commit()
+    # Cached tutor session rows still carry the cleared strategy snapshots.
+    invalidate_all_session_state()
 
     event = log_product_event(
         conn,
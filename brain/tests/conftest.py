@@ -44,6 +44,20 @@ def pytest_collection_modifyitems(items):
             item.add_marker(pytest.mark.timeout(30))
 
 
+@pytest.fixture(autouse=True)
+def _drain_post_turn_workers():
+    """Let post-turn jobs a test queued finish before its DB is swapped out.
+
+    The workers connect to whatever ``DB_PATH`` is current, so a pass that
+    outlives its test can race the next module's ``init_database``.
+    """
+    yield
+    for name in ("tutor_post_turn", "brain.tutor_post_turn"):
+        module = sys.modules.get(name)
+        if module is not None:
+            module.wait_for_post_turn_idle()
+
+
 # ---------------------------------------------------------------------------
 # Shared tutor mock fixtures
 # ---------------------------------------------------------------------------
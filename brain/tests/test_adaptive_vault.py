@@ -373,3 +373,35 @@ class TestIncrementalUpdates:
         assert r2["updated"] == 1
         assert r2["inserted"] == 0
         assert r2["skipped"] == 2
+
+    def test_unchanged_stamp_skips_read_and_parse(self, vault_db, rich_vault, monkeypatch):
+        import time
+
+        from brain.adaptive import vault_ingest
+
+        old = time.time_ns() - 3600 * 1_000_000_000
+        for note in rich_vault.glob("*.md"):
+            os.utime(note, ns=(old, old))
+        vault_ingest.ingest_vault(str(rich_vault), vault_db)
+        links_before = vault_db.execute("SELECT COUNT(*) FROM obsidian_links").fetchone()[0]
+
+        parsed: list[str] = []
+        original = vault_ingest.parse_note_content
+        monkeypatch.setattr(
+            vault_ingest,
+            "parse_note_content",
+            lambda path, content: parsed.append(path) or original(path, content),
+        )
+
+        r2 = vault_ingest.ingest_vault(str(rich_vault), vault_db)
+        assert r2 == {"inserted": 0, "updated": 0, "skipped": 3}
+        assert parsed == []
+
+        # Touched without an edit: read once, checksum matches, stamp refreshed
+        touched = rich_vault / "Preload.md"
+        os.utime(touched, ns=(old + 10**9, old + 10**9))
+        r3 = vault_ingest.ingest_vault(str(rich_vault), vault_db)
+        r4 = vault_ingest.ingest_vault(str(rich_vault), vault_db)
+        assert r3["skipped"] == 3 and r4["skipped"] == 3
+        assert parsed == [str(touched)]
+        assert vault_db.execute("SELECT COUNT(*) FROM obsidian_links").fetchone()[0] == links_before
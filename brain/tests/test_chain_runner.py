@@ -436,6 +436,113 @@ class TestFacilitationPromptInjection:
         assert "Additional Custom Instructions" in prompt
         assert "Always reflect the learner's last sentence before teaching." in prompt
 
+    def test_tutor_prompt_builder_orders_sections_stable_to_volatile(self):
+        """Per-turn context never lands inside the cacheable prefix."""
+        from tutor_prompt_builder import (
+            PROMPT_TIER_SESSION,
+            PROMPT_TIER_TURN,
+            build_prompt_assembly,
+        )
+
+        chain_info = {
+            "name": "Teach First",
+            "blocks": ["Brain Dump", "Analogy Bridge"],
+            "current_index": 0,
+            "total": 2,
+            "gates": ["learner_confirms_ready_before_retrieve"],
+        }
+
+        def _assemble(material: str, vault_state: str):
+            prompt = build_prompt_assembly(
+                current_block={"name": "Brain Dump", "facilitation_prompt": "Dump it."},
+                chain_info=chain_info,
+                course_id=1,
+                topic="Week 7",
+                material_context=material,
+                course_map="courses: []",
+                vault_state=vault_state,
+            )
+            prompt.add(PROMPT_TIER_TURN, "## Selected Material Scope\n- 2 files")
+            prompt.add(PROMPT_TIER_SESSION, "## Session Rules (Current Session Only)\nBe brief.")
+            return prompt
+
+        first = _assemble("Preload excerpt.", "- Cardio/Preload.md")
+        second = _assemble("Afterload excerpt.", "- Cardio/Afterload.md")
+
+        assert first.prefix_hash() == second.prefix_hash()
+        text = first.render()
+        assert text.index("## Rules") < text.index("Current session context:")
+        assert text.index("## Session Rules") < text.index("Dump it.")
+        assert text.index("## Chain Guardrails") < text.index("## Study Chain: Teach First")
+        assert text.index("## Study Chain: Teach First") < text.index("## Retrieved Study Materials")
+        assert "Preload excerpt." not in first.prefix_text()
+        assert first.layout()["prefix_chars"] == len(first.prefix_text())
+
+        advanced = dict(chain_info, current_index=1)
+        moved = build_prompt_assembly(chain_info=advanced, course_id=1, topic="Week 7")
+        assert moved.prefix_hash() != first.prefix_hash()
+
+    def test_tutor_prompt_builder_fills_turn_sections_by_token_priority(self):
+        """Materials keep their tokens; vault state is cut first under a budget."""
+        from tutor_prompt_builder import build_prompt_assembly
+        from tutor_tokens import count_tokens
+
+        kwargs = dict(
+            course_id=1,
+            topic="Week 7",
+            material_context="Preload stretches the ventricle. " * 200,
+            graph_context="## Knowledge Graph\n" + "Preload -> stroke volume. " * 200,
+            vault_state="- Cardio/Preload.md\n" * 400,
+        )
+        unbounded = build_prompt_assembly(**kwargs).token_usage()
+        assert unbounded["truncated"] == [] and unbounded["dropped"] == []
+
+        fixed = sum(
+            tokens
+            for name, tokens in unbounded["sections"].items()
+            if name not in {"materials", "graph", "vault_state"}
+        )
+        budget = fixed + unbounded["sections"]["materials"] + 300
+        prompt = build_prompt_assembly(**kwargs, token_budget=budget)
+        usage = prompt.token_usage()
+
+        assert usage["sections"]["materials"] == unbounded["sections"]["materials"]
+        assert usage["truncated"] == ["graph"]
+        assert usage["dropped"] == ["vault_state"]
+        assert usage["total"] <= budget
+        assert "Cardio/Preload.md" not in prompt.render()
+        assert count_tokens(prompt.render()) <= budget + 10
+
+    def test_tutor_prompt_builder_caches_instructions_until_file_changes(
+        self, monkeypatch, tmp_path
+    ):
+        """Custom instructions load once and reload when the file changes."""
+        import tutor_prompt_builder as prompt_builder
+
+        instructions = tmp_path / "tutor_instructions.md"
+        instructions.write_text("Use the whiteboard.", encoding="utf-8")
+        config_loads: list[int] = []
+
+        def _fake_load_api_config():
+            config_loads.append(1)
+            return {}
+
+        monkeypatch.setattr("dashboard.utils.load_api_config", _fake_load_api_config)
+        monkeypatch.setattr(prompt_builder, "_TUTOR_INSTRUCTIONS_PATH", instructions)
+        prompt_builder.clear_prompt_asset_cache()
+
+        first = prompt_builder.build_tutor_system_prompt(topic="Week 7")
+        second = prompt_builder.build_tutor_system_prompt(topic="Week 8")
+        assert "Use the whiteboard." in first
+        assert "Topic: Week 8" in second
+        assert len(config_loads) == 1
+
+        instructions.write_text("Use the whiteboard and the skeleton model.", encoding="utf-8")
+        third = prompt_builder.build_tutor_system_prompt(topic="Week 7")
+        assert "Use the whiteboard and the skeleton model." in third
+        assert len(config_loads) == 2
+        prompt_builder.clear_prompt_asset_cache()
+
     def test_load_chain_includes_facilitation_prompt(self):
         """_load_chain selects facilitation_prompt from DB."""
         conn = get_connection()
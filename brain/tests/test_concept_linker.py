@@ -0,0 +1,64 @@
+"""Tests for local concept linking (concept_linker + obsidian_merge.add_concept_links)."""
+from unittest.mock import patch
+
+
+def test_links_longest_titles_and_aliases_once_per_occurrence():
+    from concept_linker import ConceptMatcher, link_concepts
+
+    matcher = ConceptMatcher(
+        ["Action Potential", "Potential", "Na+/K+ ATPase", "Resting Potential"],
+        aliases={"Action Potential": ["spike"]},
+    )
+    content = (
+        "---\ntitle: Action Potential\n---\n"
+        "# Action Potential\n"
+        "An action potential (a spike) needs the Na+/K+ ATPase.\n"
+        "Already linked: [[Resting Potential]]; resting potential stays plain.\n"
+        "`Potential` in code and [Potential](https://x.test/Potential) stay too.\n"
+    )
+    assert link_concepts(content, matcher) == (
+        "---\ntitle: Action Potential\n---\n"
+        "# Action Potential\n"
+        "An [[action potential]] (a [[Action Potential|spike]]) needs the [[Na+/K+ ATPase]].\n"
+        "Already linked: [[Resting Potential]]; resting potential stays plain.\n"
+        "`Potential` in code and [Potential](https://x.test/Potential) stay too.\n"
+    )
+
+
+def test_whole_words_only():
+    from concept_linker import ConceptMatcher, link_concepts
+
+    matcher = ConceptMatcher(["Cell", "C++"])
+    assert link_concepts("Cells and cell walls; C++x but C++.", matcher) == (
+        "Cells and [[cell]] walls; C++x but [[C++]]."
+    )
+
+
+def test_add_concept_links_reuses_matcher_and_skips_llm():
+    import concept_linker
+    from obsidian_merge import add_concept_links
+
+    titles = ["Action Potential", "Myelin"]
+    with patch("obsidian_merge.call_llm") as mock_llm:
+        first = add_concept_links("Myelin speeds the action potential.", vault_index=titles)
+        matcher = concept_linker._MATCHER_CACHE["matcher"]
+        add_concept_links("Myelin again.", vault_index=list(titles))
+        assert concept_linker._MATCHER_CACHE["matcher"] is matcher
+        mock_llm.assert_not_called()
+    assert first == "[[Myelin]] speeds the [[action potential]]."
+
+
+def test_add_concept_links_disambiguation_filters_terms():
+    from obsidian_merge import add_concept_links
+
+    with patch(
+        "obsidian_merge.call_llm",
+        return_value={"success": True, "content": '["Myelin"]'},
+    ) as mock_llm:
+        result = add_concept_links(
+            "Myelin speeds the action potential.",
+            vault_index=["Action Potential", "Myelin"],
+            disambiguate=True,
+        )
+    assert result == "[[Myelin]] speeds the action potential."
+    assert '"Action Potential"' in mock_llm.call_args.kwargs["user_prompt"]
@@ -0,0 +1,273 @@
+"""Tests for the ASGI serving mode (dashboard/asgi.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from flask import Flask, Response, jsonify, request
+
+from dashboard.asgi import SERVER_HEARTBEATS_ENVIRON_KEY, FlaskASGIAdapter
+
+
+def _make_app() -> Flask:
+    app = Flask(__name__)
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify(
+            {
+                "body": request.get_json(),
+                "query": request.args.get("q"),
+                "server_heartbeats": bool(
+                    request.environ.get(SERVER_HEARTBEATS_ENVIRON_KEY)
+                ),
+            }
+        )
+
+    @app.route("/stream")
+    def stream():
+        def generate():
+            time.sleep(0.12)
+            yield "data: first\n\n"
+            yield "data: [DONE]\n\n"
+
+        return Response(generate(), mimetype="text/event-stream")
+
+    @app.route("/slow-stream")
+    def slow_stream():
+        def generate():
+            time.sleep(0.5)
+            yield "data: [DONE]\n\n"
+
+        return Response(generate(), mimetype="text/event-stream")
+
+    return app
+
+
+def _legacy_write_app(environ, start_response):
+    write = start_response("200 OK", [("Content-Type", "text/plain")])
+    write(b"written ")
+    return [b"returned"]
+
+
+async def _call(
+    adapter,
+    method: str,
+    path: str,
+    *,
+    body: bytes = b"",
+    query: bytes = b"",
+    after=None,
+):
+    sent: list[tuple[float, dict]] = []
+    incoming = [{"type": "http.request", "body": body, "more_body": False}]
+    finished = asyncio.Event()
+
+    async def receive():
+        if incoming:
+            return incoming.pop(0)
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append((time.perf_counter(), message))
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(b"content-type", b"application/json")],
+        "server": ("127.0.0.1", 5000),
+        "client": ("127.0.0.1", 50000),
+    }
+    await adapter(scope, receive, send)
+    finished.set()
+    if after is not None:
+        # Let the stream's own close (on its thread) finish before returning.
+        await asyncio.sleep(after)
+    return sent
+
+
+def test_asgi_adapter_serves_plain_requests_with_server_heartbeat_flag():
+    adapter = FlaskASGIAdapter(_make_app(), heartbeat_seconds=1.0, max_workers=2)
+    try:
+        sent = asyncio.run(
+            _call(adapter, "POST", "/echo", body=b'{"x": 1}', query=b"q=ok")
+        )
+    finally:
+        adapter.close()
+
+    start = sent[0][1]
+    assert start["type"] == "http.response.start"
+    assert start["status"] == 200
+    payload = json.loads(b"".join(m.get("body", b"") for _, m in sent[1:]))
+    assert payload == {"body": {"x": 1}, "query": "ok", "server_heartbeats": True}
+
+
+def test_asgi_adapter_emits_event_loop_heartbeats_without_stream_threads():
+    adapter = FlaskASGIAdapter(
+        _make_app(), heartbeat_seconds=0.03, max_workers=2, stream_workers=1
+    )
+    threads_before = threading.active_count()
+    try:
+        sent = asyncio.run(_call(adapter, "GET", "/stream"))
+    finally:
+        adapter.close()
+
+    bodies = [m["body"] for _, m in sent if m["type"] == "http.response.body"]
+    assert b":\n\n" in bodies
+    assert bodies.index(b":\n\n") < bodies.index(b"data: first\n\n")
+    assert b"data: [DONE]\n\n" in bodies
+    assert bodies[-1] == b""
+    # Only the bounded request pool and the stream's own thread add threads.
+    assert threading.active_count() <= threads_before + 3
+
+
+def test_asgi_adapter_open_streams_do_not_starve_plain_requests():
+    adapter = FlaskASGIAdapter(
+        _make_app(), heartbeat_seconds=1.0, max_workers=1, stream_workers=1
+    )
+
+    async def scenario():
+        streams = [
+            asyncio.ensure_future(_call(adapter, "GET", "/slow-stream"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        plain = await _call(adapter, "POST", "/echo", body=b"{}")
+        elapsed = time.perf_counter() - started
+        await asyncio.gather(*streams)
+        return plain, elapsed
+
+    try:
+        plain, elapsed = asyncio.run(scenario())
+    finally:
+        adapter.close()
+
+    assert plain[0][1]["status"] == 200
+    assert elapsed < 0.4
+
+
+def test_asgi_adapter_keeps_data_from_the_write_callable():
+    adapter = FlaskASGIAdapter(_legacy_write_app, heartbeat_seconds=1.0, max_workers=1)
+    try:
+        sent = asyncio.run(_call(adapter, "GET", "/"))
+    finally:
+        adapter.close()
+
+    assert b"".join(m.get("body", b"") for _, m in sent[1:]) == b"written returned"
+
+
+class _TrackedConnection(sqlite3.Connection):
+    """Records every thread that touched the connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = {threading.get_ident()}
+        self.closed = False
+
+    def execute(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().execute(*args, **kwargs)
+
+    def cursor(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().cursor(*args, **kwargs)
+
+    def close(self):
+        self.threads.add(threading.get_ident())
+        super().close()
+        self.closed = True
+
+
+def test_asgi_adapter_keeps_send_turn_connections_on_one_thread(tmp_path, monkeypatch):
+    import config
+    import db_setup
+    import llm_provider
+    import tutor_context
+    import tutor_tools
+    import dashboard.api_data as api_data
+    import dashboard.api_tutor_turns as api_tutor_turns
+    from dashboard.app import create_app
+
+    db_path = str(tmp_path / "asgi_turn.db")
+    monkeypatch.setenv("PT_STUDY_DB", db_path)
+    for module in (config, db_setup, api_data):
+        monkeypatch.setattr(module, "DB_PATH", db_path)
+    db_setup.init_database()
+    monkeypatch.setattr(db_setup, "_METHOD_LIBRARY_ENSURED", False)
+    app = create_app()
+    app.config["TESTING"] = True
+    app.config["TUTOR_POST_TURN_INLINE"] = True
+
+    client = app.test_client()
+    session_ids = [
+        client.post("/api/tutor/session", json={"mode": "Core", "topic": f"Topic {idx}"}).get_json()[
+            "session_id"
+        ]
+        for idx in range(2)
+    ]
+
+    opened: list[_TrackedConnection] = []
+
+    def tracked_connection():
+        conn = sqlite3.connect(db_path, timeout=30, factory=_TrackedConnection)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(api_tutor_turns, "get_connection", tracked_connection)
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {
+            "materials": "",
+            "notes": "",
+            "vault_state": "",
+            "course_map": "",
+            "debug": {},
+        },
+    )
+    monkeypatch.setattr(tutor_tools, "get_tool_schemas", lambda: [])
+
+    def fake_stream(_system_prompt, _user_prompt, **_kwargs):
+        for word in ("The", " hip", " flexors", " are", " iliopsoas."):
+            time.sleep(0.02)
+            yield {"type": "delta", "text": word}
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-asgi"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+    adapter = FlaskASGIAdapter(app, heartbeat_seconds=5.0, max_workers=2, stream_workers=2)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                _call(
+                    adapter,
+                    "POST",
+                    f"/api/tutor/session/{session_id}/turn",
+                    body=b'{"message": "Explain the hip flexors"}',
+                    after=0.05,
+                )
+                for session_id in session_ids
+            )
+        )
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        adapter.close()
+
+    for sent in results:
+        assert sent[0][1]["status"] == 200
+        body = b"".join(m.get("body", b"") for _, m in sent[1:]).decode("utf-8")
+        assert '"type": "done"' in body or '"type":"done"' in body
+    assert opened
+    for conn in opened:
+        assert len(conn.threads) == 1
+        assert conn.closed
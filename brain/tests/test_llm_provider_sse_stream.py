@@ -0,0 +1,140 @@
+import itertools
+import json
+import socket
+
+import llm_provider
+
+
+class _ChunkedResponse:
+    """HTTP response stand-in whose read1() hands back scripted byte blocks."""
+
+    def __init__(self, blocks):
+        self._blocks = list(blocks)
+        self.status = 200
+
+    def read1(self, _size=-1):
+        if not self._blocks:
+            return b""
+        block = self._blocks.pop(0)
+        if isinstance(block, BaseException):
+            raise block
+        return block
+
+    def read(self, *_a, **_k):
+        return b""
+
+
+class _FakeSock:
+    def __init__(self):
+        self.timeouts = []
+
+    def settimeout(self, value):
+        self.timeouts.append(value)
+
+
+def _patch_connection(monkeypatch, resp):
+    class _Conn:
+        def __init__(self, *_a, **_k):
+            self.sock = _FakeSock()
+
+        def request(self, *_a, **_k):
+            pass
+
+        def getresponse(self):
+            return resp
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(llm_provider.http.client, "HTTPSConnection", _Conn)
+    monkeypatch.setattr(
+        llm_provider,
+        "_load_codex_auth",
+        lambda: {"access_token": "test-token", "account_id": "test-account"},
+    )
+
+
+def _event(obj: dict) -> bytes:
+    return b"event: x\r\ndata: " + json.dumps(obj).encode() + b"\r\n\r\n"
+
+
+def test_iter_sse_data_reassembles_lines_split_across_reads():
+    stream = (
+        b": keepalive\n\n"
+        + _event({"type": "response.output_text.delta", "delta": "Hel"})
+        + _event({"type": "response.output_text.delta", "delta": "lo é"})
+        + b"data: [DONE]"
+    )
+    # Split at awkward offsets, including inside "data:" and inside JSON.
+    blocks = [stream[i : i + 7] for i in range(0, len(stream), 7)]
+
+    payloads = list(llm_provider._iter_sse_data(_ChunkedResponse(blocks)))
+
+    assert [json.loads(p)["delta"] for p in payloads[:2]] == ["Hel", "lo é"]
+    assert payloads[-1] == b"[DONE]"
+
+
+def test_stream_chatgpt_responses_reports_read_idle_timeout(monkeypatch):
+    resp = _ChunkedResponse(
+        [
+            _event({"type": "response.output_text.delta", "delta": "partial"}),
+            socket.timeout("timed out"),
+        ]
+    )
+    _patch_connection(monkeypatch, resp)
+
+    chunks = list(
+        llm_provider.stream_chatgpt_responses(
+            "system", "user", timeout=120, read_idle_timeout=5
+        )
+    )
+
+    assert chunks[0] == {"type": "delta", "text": "partial"}
+    assert chunks[-1]["type"] == "error"
+    assert "read-idle timeout" in chunks[-1]["error"]
+
+
+def test_stream_chatgpt_responses_enforces_overall_deadline(monkeypatch):
+    resp = _ChunkedResponse(
+        [_event({"type": "response.output_text.delta", "delta": "x"})] * 3
+    )
+    _patch_connection(monkeypatch, resp)
+    # Each clock read advances 4s: reads happen at t=4 and t=8, then t=12 is
+    # past the 10s deadline.
+    clock = itertools.count(0.0, 4.0)
+    monkeypatch.setattr(llm_provider.time, "monotonic", lambda: next(clock))
+
+    chunks = list(
+        llm_provider.stream_chatgpt_responses("system", "user", deadline_seconds=10)
+    )
+
+    assert [c["type"] for c in chunks] == ["delta", "delta", "error"]
+    assert "overall deadline" in chunks[-1]["error"]
+
+
+def test_stream_chatgpt_responses_surfaces_provider_error_event(monkeypatch):
+    resp = _ChunkedResponse(
+        [
+            _event({"type": "response.output_text.delta", "delta": "a"}),
+            _event(
+                {
+                    "type": "response.failed",
+                    "response": {
+                        "error": {"code": "server_error", "message": "upstream died"}
+                    },
+                }
+            ),
+            _event({"type": "response.output_text.delta", "delta": "never"}),
+        ]
+    )
+    _patch_connection(monkeypatch, resp)
+
+    chunks = list(llm_provider.stream_chatgpt_responses("system", "user"))
+
+    assert chunks == [
+        {"type": "delta", "text": "a"},
+        {
+            "type": "error",
+            "error": "ChatGPT API stream error: server_error: upstream died",
+        },
+    ]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import obsidian_cli_session
+from obsidian_vault import ObsidianVault
+
+_HELPER = textwrap.dedent(
+    """
+    import json, os, sys, time
+    for line in sys.stdin:
+        req = json.loads(line)
+        if req.get("op") == "ping":
+            reply = {"id": req["id"], "ok": True}
+        else:
+            argv = req["argv"]
+            if argv[1] == "hang":
+                time.sleep(30)
+            if argv[1] == "exit":
+                sys.exit(1)
+            reply = {"id": req["id"], "code": 0, "stdout": f"{os.getpid()}:{' '.join(argv)}", "stderr": ""}
+        sys.stdout.write(json.dumps(reply) + "\\n")
+        sys.stdout.flush()
+    """
+)
+
+
+@pytest.fixture
+def helper(tmp_path, monkeypatch):
+    script = tmp_path / "helper.py"
+    script.write_text(_HELPER, encoding="utf-8")
+    monkeypatch.setenv(obsidian_cli_session.SESSION_ENV, f'"{sys.executable}" "{script}"')
+    obsidian_cli_session.close_cli_session()
+    yield
+    obsidian_cli_session.close_cli_session()
+
+
+def test_vault_commands_share_one_session_process(helper):
+    vault = ObsidianVault(vault_name="Test Vault")
+    with patch("obsidian_vault.subprocess.run", side_effect=AssertionError("spawned")):
+        first = vault.read_note("Note A")
+        second = vault.set_property("Note A", "status", "done")
+
+    pid_a, rest = first.split(":", 1)
+    pid_b, _ = second.split(":", 1)
+    assert rest == "vault=Test Vault read file=Note A"
+    assert pid_a == pid_b
+    assert obsidian_cli_session.get_cli_session().spawns == 1
+
+
+def test_session_respawns_after_exit_and_timeout(helper, monkeypatch):
+    # A timed-out request makes the next call ping the hung helper first.
+    monkeypatch.setattr(obsidian_cli_session, "HEALTH_CHECK_TIMEOUT_SECONDS", 1.0)
+    session = obsidian_cli_session.get_cli_session()
+    first_pid = session.run(["vault=V", "read"], timeout=5).stdout.split(":")[0]
+
+    with pytest.raises(obsidian_cli_session.CliSessionError):
+        session.run(["vault=V", "exit"], timeout=5)
+    second_pid = session.run(["vault=V", "read"], timeout=5).stdout.split(":")[0]
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        session.run(["vault=V", "hang"], timeout=0.5)
+    third_pid = session.run(["vault=V", "read"], timeout=5).stdout.split(":")[0]
+
+    assert len({first_pid, second_pid, third_pid}) == 3
+    assert session.spawns == 3
+
+
+def test_falls_back_to_subprocess_without_session(monkeypatch):
+    monkeypatch.delenv(obsidian_cli_session.SESSION_ENV, raising=False)
+    obsidian_cli_session.close_cli_session()
+    vault = ObsidianVault()
+    with patch("obsidian_vault.subprocess.run") as mock_run:
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="body\n", stderr="")
+        assert vault.read_note("Note") == "body"
+    assert mock_run.call_args.args[0][:2] == ["obsidian", "vault=Treys School"]
+
+
+def _reference_helper_session(tmp_path, monkeypatch, *, version_code: int = 0):
+    helper_script = Path(__file__).resolve().parents[2] / "scripts" / "obsidian_cli_session_helper.py"
+    fake_cli = tmp_path / "fake_obsidian.py"
+    fake_cli.write_text(
+        "import sys, time\n"
+        "if sys.argv[1] == 'version':\n"
+        f"    sys.exit({version_code})\n"
+        "if sys.argv[2] == 'fail':\n"
+        "    sys.stderr.write('no such note')\n"
+        "    sys.exit(3)\n"
+        "if sys.argv[2] == 'slow':\n"
+        "    time.sleep(1.5)\n"
+        "sys.stdout.write(' '.join(sys.argv[1:]))\n",
+        encoding="utf-8",
+    )
+    cli = f"'{sys.executable}' '{fake_cli}'"
+    monkeypatch.setenv(
+        obsidian_cli_session.SESSION_ENV,
+        f'"{sys.executable}" "{helper_script}" --cli "{cli}"',
+    )
+    obsidian_cli_session.close_cli_session()
+    return obsidian_cli_session.get_cli_session()
+
+
+def test_reference_helper_serves_the_session_protocol(tmp_path, monkeypatch):
+    try:
+        session = _reference_helper_session(tmp_path, monkeypatch)
+        assert session.ping()
+        done = session.run(["vault=V", "read", "file=Note A"], timeout=10)
+        failed = session.run(["vault=V", "fail"], timeout=10)
+        assert (done.returncode, done.stdout) == (0, "vault=V read file=Note A")
+        assert (failed.returncode, failed.stderr) == (3, "no such note")
+        assert session.spawns == 1
+    finally:
+        obsidian_cli_session.close_cli_session()
+
+
+def test_slow_command_does_not_block_other_session_requests(tmp_path, monkeypatch):
+    try:
+        session = _reference_helper_session(tmp_path, monkeypatch)
+        assert session.ping()
+        slow: list[subprocess.CompletedProcess] = []
+        worker = threading.Thread(
+            target=lambda: slow.append(session.run(["vault=V", "slow"], timeout=10))
+        )
+        worker.start()
+        time.sleep(0.2)
+        started = time.perf_counter()
+        fast = session.run(["vault=V", "read", "file=Note B"], timeout=10)
+        elapsed = time.perf_counter() - started
+        worker.join(timeout=10)
+
+        assert fast.stdout == "vault=V read file=Note B"
+        assert elapsed < 1.0
+        assert slow[0].stdout == "vault=V slow"
+        assert session.spawns == 1
+    finally:
+        obsidian_cli_session.close_cli_session()
+
+
+def test_vault_is_unavailable_when_the_helper_is_up_but_obsidian_is_not(tmp_path, monkeypatch):
+    try:
+        session = _reference_helper_session(tmp_path, monkeypatch, version_code=1)
+        assert session.ping() is False
+        with patch("obsidian_vault.subprocess.run", side_effect=AssertionError("spawned")):
+            assert ObsidianVault().is_available() is False
+    finally:
+        obsidian_cli_session.close_cli_session()
@@ -1,6 +1,6 @@
 """Tests for unified ObsidianClient."""
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 
 def _make_client(**kw):
@@ -89,18 +89,16 @@ def test_obsidian_client_defaults_from_env(monkeypatch):
 
 def test_obsidian_client_request_builds_correct_url():
     client = _make_client()
-    with patch("obsidian_client.urllib.request.urlopen") as mock_urlopen:
-        mock_resp = MagicMock()
-        mock_resp.read.return_value = b'{"ok": true}'
-        mock_resp.headers = {"Content-Type": "application/json"}
-        mock_resp.__enter__ = lambda s: s
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_resp
-        client._request("GET", "/vault/test.md")
-    call_args = mock_urlopen.call_args
-    req_obj = call_args[0][0]
-    assert req_obj.full_url == "http://127.0.0.1:27123/vault/test.md"
-    assert req_obj.get_header("Authorization") == "Bearer test-key"
+    from obsidian_http import HttpResponse
+
+    with patch("obsidian_client.obsidian_http.request") as mock_request:
+        mock_request.return_value = HttpResponse(
+            200, {"content-type": "application/json"}, b'{"ok": true}'
+        )
+        assert client._request("GET", "/vault/test.md") == {"ok": True}
+    method, url = mock_request.call_args.args
+    assert (method, url) == ("GET", "http://127.0.0.1:27123/vault/test.md")
+    assert mock_request.call_args.kwargs["headers"]["Authorization"] == "Bearer test-key"
 
 
 def test_obsidian_client_search_uses_query_parameter():
@@ -0,0 +1,76 @@
+"""Tests for the pooled Obsidian REST transport."""
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import obsidian_http
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/missing":
+            body = b'{"error": "not found"}'
+            self.send_response(404)
+        else:
+            body = json.dumps({"path": self.path, "port": self.client_address[1]}).encode()
+            self.send_response(200)
+            # Drop the connection without "Connection: close", as an idle
+            # keep-alive timeout on the server would.
+            self.close_connection = self.path == "/drop"
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    obsidian_http.close_idle_connections()
+    obsidian_http.reset_http_stats()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    obsidian_http.close_idle_connections()
+
+
+def test_requests_reuse_one_keep_alive_connection(server):
+    ports = {
+        json.loads(obsidian_http.request("GET", f"{server}/vault/{n}.md").text())["port"]
+        for n in range(5)
+    }
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        obsidian_http.request("GET", f"{server}/missing")
+
+    stats = obsidian_http.http_stats()
+    assert len(ports) == 1
+    assert excinfo.value.code == 404
+    assert stats["requests"] == 6
+    assert stats["errors"] == 1
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 5
+    assert stats["p95_ms"] >= stats["p50_ms"] > 0
+
+
+def test_stale_pooled_connection_is_retried_for_gets(server):
+    obsidian_http.request("GET", f"{server}/drop")
+    resp = obsidian_http.request("GET", f"{server}/b")
+    assert json.loads(resp.text())["path"] == "/b"
+    assert obsidian_http.http_stats()["retried"] == 1
+
+
+def test_connection_failure_raises_url_error():
+    with pytest.raises(urllib.error.URLError):
+        obsidian_http.request("GET", "http://127.0.0.1:9/vault/", timeout=1)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import threading
+
+import pytest
+
+import obsidian_index
+
+
+@pytest.fixture
+def fresh_graph(monkeypatch):
+    monkeypatch.setenv("PT_VAULT_WATCHER", "0")
+    obsidian_index.clear_vault_cache()
+    yield
+    obsidian_index.clear_vault_cache()
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls: list[str] = []
+    original = obsidian_index._parse_wikilinks
+
+    def _counting(content):
+        calls.append(content)
+        return original(content)
+
+    monkeypatch.setattr(obsidian_index, "_parse_wikilinks", _counting)
+    return calls
+
+
+def _links(graph: dict) -> set[tuple[str, str]]:
+    return {(link["source"], link["target"]) for link in graph["links"]}
+
+
+def test_disk_rebuild_reparses_only_changed_notes(tmp_path, monkeypatch, fresh_graph, parse_calls):
+    for i in range(6):
+        (tmp_path / f"Note {i}.md").write_text(f"See [[Note {(i + 1) % 6}]].\n", encoding="utf-8")
+    monkeypatch.setenv("OBSIDIAN_VAULT_FS_PATH", str(tmp_path))
+
+    graph = obsidian_index.get_vault_graph(force_refresh=True)
+    assert graph["nodeCount"] == 6 and graph["linkCount"] == 6
+    assert len(parse_calls) == 6
+
+    parse_calls.clear()
+    edited = tmp_path / "Note 2.md"
+    edited.write_text("---\naliases: [Two]\n---\nNow [[Note 0]] and [[Note 4]].\n", encoding="utf-8")
+    stat = edited.stat()
+    os.utime(edited, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    graph = obsidian_index.get_vault_graph(force_refresh=True)
+
+    assert len(parse_calls) == 1
+    assert ("Note 2.md", "Note 4.md") in _links(graph)
+    assert ("Note 2.md", "Note 3.md") not in _links(graph)
+
+
+def test_rest_graph_reads_notes_concurrently_and_reuses_stamped_parses(
+    monkeypatch, fresh_graph, parse_calls
+):
+    monkeypatch.delenv("OBSIDIAN_VAULT_FS_PATH", raising=False)
+    monkeypatch.setattr(obsidian_index, "vault_root_path", lambda: None)
+    monkeypatch.setattr(obsidian_index, "GRAPH_FETCH_WORKERS", 4)
+    notes = {
+        "Hub.md": ("[[Leaf A]] [[Alias B]]", 1, {}),
+        "Leaf A.md": ("back to [[Hub]]", 1, {}),
+        "Leaf B.md": ("plain", 1, {"aliases": ["Alias B"]}),
+    }
+    monkeypatch.setattr(obsidian_index, "_list_folder", lambda folder: list(notes) if not folder else [])
+    threads: set[str] = set()
+    barrier = threading.Barrier(2, timeout=2)
+
+    def _fetch(path):
+        threads.add(threading.current_thread().name)
+        if path in ("Hub.md", "Leaf A.md"):
+            barrier.wait()  # deadlocks unless two fetches run at once
+        content, mtime, frontmatter = notes[path]
+        return ("stat", mtime, len(content)), content, frontmatter
+
+    monkeypatch.setattr(obsidian_index, "_get_note_with_stat", _fetch)
+
+    graph = obsidian_index.get_vault_graph(force_refresh=True)
+    assert _links(graph) == {
+        ("Hub.md", "Leaf A.md"),
+        ("Hub.md", "Leaf B.md"),
+        ("Leaf A.md", "Hub.md"),
+    }
+    assert len(threads) > 1
+    assert len(parse_calls) == 3
+
+    parse_calls.clear()
+    notes["Leaf A.md"] = ("no links now", 2, {})
+    graph = obsidian_index.get_vault_graph(force_refresh=True)
+
+    assert parse_calls == ["no links now"]
+    assert ("Leaf A.md", "Hub.md") not in _links(graph)
+
+
+def test_graph_drops_notes_deleted_while_records_load(tmp_path, monkeypatch, fresh_graph):
+    for i in range(3):
+        (tmp_path / f"Note {i}.md").write_text(f"See [[Note {(i + 1) % 3}]].\n", encoding="utf-8")
+    monkeypatch.setenv("OBSIDIAN_VAULT_FS_PATH", str(tmp_path))
+    original = obsidian_index._load_note_records
+
+    def _load_then_delete(paths, root=None):
+        records = original(paths, root)
+        # A change-feed delete lands between the read and the resolve.
+        with obsidian_index._LIVE_LOCK:
+            files = obsidian_index._VAULT_INDEX_CACHE["data"]["files"]
+            obsidian_index._VAULT_INDEX_CACHE["data"] = obsidian_index._index_result(
+                [item for item in files if item["path"] != "Note 1.md"]
+            )
+        return records
+
+    monkeypatch.setattr(obsidian_index, "_load_note_records", _load_then_delete)
+
+    graph = obsidian_index.get_vault_graph(force_refresh=True)
+
+    assert {node["path"] for node in graph["nodes"]} == {"Note 0.md", "Note 2.md"}
+    assert _links(graph) == {("Note 2.md", "Note 0.md")}
+    assert "Note 1.md" not in obsidian_index._GRAPH_NOTES
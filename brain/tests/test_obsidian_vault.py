@@ -325,6 +325,20 @@ def test_replace_section_uses_eval_with_process():
         assert any("process" in str(a) for a in args)
 
 
+def test_write_note_if_unchanged_checks_hash_inside_process():
+    from obsidian_vault import ObsidianVault, note_content_hash
+
+    vault = ObsidianVault(vault_name="Test Vault")
+    expected = note_content_hash("# Note\r\nbody\n")
+    assert expected == note_content_hash("# Note\nbody")
+    with patch("obsidian_vault.subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(returncode=0, stdout="written", stderr="")
+        assert vault.write_note_if_unchanged("My Note", expected, "# Note\nnew\n") == "written"
+        code = " ".join(str(a) for a in mock_run.call_args[0][0])
+        assert "app.vault.process" in code
+        assert f'noteHash(data) !== "{expected}"' in code
+
+
 def test_run_retries_on_timeout():
     """Test that _run() retries on TimeoutExpired."""
     from obsidian_vault import ObsidianVault
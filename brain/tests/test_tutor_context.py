@@ -118,3 +118,176 @@ def test_build_context_includes_vault_state():
                 from tutor_context import build_context
                 result = build_context("test", depth="auto", course_id=1)
                 assert "vault_state" in result
+
+
+def test_build_context_fetches_sources_concurrently():
+    """Context latency tracks the slowest source, not the sum of all three."""
+    import time
+
+    def slow(value):
+        def _fetch(*_a, **_k):
+            time.sleep(0.2)
+            return value
+
+        return _fetch
+
+    with (
+        patch("tutor_context._fetch_materials", side_effect=slow("mats")),
+        patch("tutor_context._fetch_notes", side_effect=slow("notes")),
+        patch("tutor_context._fetch_vault_state", side_effect=slow("state")),
+        patch("tutor_context._vault_context_disabled", return_value=False),
+    ):
+        from tutor_context import build_context
+
+        started = time.perf_counter()
+        result = build_context("cardiac output", depth="auto")
+        elapsed = time.perf_counter() - started
+
+    assert (result["materials"], result["notes"], result["vault_state"]) == (
+        "mats",
+        "notes",
+        "state",
+    )
+    assert elapsed < 0.45
+    latencies = result["debug"]["source_latency_ms"]
+    assert set(latencies) == {"materials", "notes", "vault_state"}
+    assert all(ms >= 150 for ms in latencies.values())
+    assert "partial" not in result["debug"]
+
+
+def test_build_context_returns_partial_context_when_source_misses_deadline():
+    """A source still running at the deadline is dropped and flagged in debug."""
+    import threading
+
+    release = threading.Event()
+
+    def stuck_notes(*_a, debug, **_k):
+        release.wait(2)
+        debug["notes_hits"] = 99
+        return "late notes"
+
+    def fast_materials(*_a, debug, **_k):
+        debug["materials"] = {"mode": "vector_search"}
+        return "mats"
+
+    try:
+        with (
+            patch("tutor_context._fetch_materials", side_effect=fast_materials),
+            patch("tutor_context._fetch_notes", side_effect=stuck_notes),
+            patch("tutor_context._fetch_vault_state", return_value="state"),
+            patch("tutor_context._vault_context_disabled", return_value=False),
+        ):
+            from tutor_context import build_context
+
+            result = build_context("q", depth="auto", deadline_seconds=0.1)
+    finally:
+        release.set()
+
+    debug = result["debug"]
+    assert result["materials"] == "mats"
+    assert result["vault_state"] == "state"
+    assert result["notes"] == ""
+    assert debug["partial"] is True
+    assert debug["timed_out_sources"] == ["notes"]
+    assert debug["source_latency_ms"]["notes"] is None
+    assert debug["materials"] == {"mode": "vector_search"}
+    # The late source must not leak its debug writes into the turn.
+    assert "notes_hits" not in debug
+
+
+@pytest.fixture
+def materials_db(tmp_path, monkeypatch):
+    import config as app_config
+    import db_setup
+    import tutor_context
+
+    db_file = tmp_path / "materials.db"
+    monkeypatch.setenv("PT_STUDY_DB", str(db_file))
+    monkeypatch.setattr(app_config, "DB_PATH", str(db_file))
+    monkeypatch.setattr(db_setup, "DB_PATH", str(db_file))
+    db_setup.init_database()
+    tutor_context.clear_full_material_cache()
+    conn = db_setup.get_connection()
+    ids = []
+    for name, body in (("big.md", "a" * 30_000), ("small.md", "b" * 10_000)):
+        cur = conn.execute(
+            "INSERT INTO rag_docs (source_path, content, checksum, created_at) "
+            "VALUES (?, ?, ?, '2026-01-01')",
+            (f"/materials/{name}", body, f"sum-{name}"),
+        )
+        ids.append(cur.lastrowid)
+    conn.commit()
+    conn.close()
+    yield ids
+    tutor_context.clear_full_material_cache()
+
+
+def test_full_materials_read_only_budgeted_slices(materials_db):
+    """Over budget, each doc contributes its proportional prefix and no more."""
+    import tutor_context
+    from tutor_context import _load_full_materials
+
+    debug: dict = {}
+    text = _load_full_materials(materials_db, budget=4_000, debug=debug)
+
+    assert "### big.md\n\n" + "a" * 3_000 + "\n\n[... truncated — 27,000" in text
+    assert "### small.md\n\n" + "b" * 1_000 + "\n\n[... truncated" in text
+    assert debug["materials_truncated"] is True
+    assert debug["materials_total_chars"] == 40_000
+    # The first load measures both docs once; their sizes are then stored.
+    assert debug["materials_bytes_read"] == 40_000 + 4_000
+    assert debug["materials_cache_hit"] is False
+
+    tutor_context.clear_full_material_cache()
+    debug = {}
+    assert _load_full_materials(materials_db, budget=4_000, debug=debug) == text
+    assert debug["materials_bytes_read"] == 4_000
+
+
+def test_full_materials_read_whole_characters_of_utf8_docs(materials_db):
+    import db_setup
+    import tutor_context
+    from tutor_context import _load_full_materials
+
+    conn = db_setup.get_connection()
+    conn.execute(
+        "UPDATE rag_docs SET content = ?, checksum = 'utf8' WHERE id = ?",
+        ("é" * 30_000, materials_db[0]),
+    )
+    conn.commit()
+    conn.close()
+
+    debug: dict = {}
+    _load_full_materials(materials_db, budget=4_000, debug=debug)
+    tutor_context.clear_full_material_cache()
+    debug = {}
+    text = _load_full_materials(materials_db, budget=4_000, debug=debug)
+
+    assert "### big.md\n\n" + "é" * 3_000 + "\n\n[... truncated — 27,000" in text
+    assert debug["materials_total_chars"] == 40_000
+    assert debug["materials_bytes_read"] == 2 * 3_000 + 1_000
+
+
+def test_full_materials_cached_until_a_material_changes(materials_db):
+    import db_setup
+    from tutor_context import _load_full_materials
+
+    first = _load_full_materials(materials_db, budget=100_000)
+    debug: dict = {}
+    assert _load_full_materials(materials_db, budget=100_000, debug=debug) == first
+    assert debug["materials_cache_hit"] is True
+    assert debug["materials_bytes_read"] == 0
+    assert debug["sources"] == ["big.md", "small.md"]
+
+    conn = db_setup.get_connection()
+    conn.execute(
+        "UPDATE rag_docs SET content = 'rewritten', checksum = 'new' WHERE id = ?",
+        (materials_db[1],),
+    )
+    conn.commit()
+    conn.close()
+
+    debug = {}
+    refreshed = _load_full_materials(materials_db, budget=100_000, debug=debug)
+    assert debug["materials_cache_hit"] is False
+    assert "rewritten" in refreshed and "b" * 100 not in refreshed
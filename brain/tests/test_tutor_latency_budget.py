@@ -0,0 +1,450 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import config
+import db_setup
+from dashboard.app import create_app
+import dashboard.api_data as _api_data_mod
+import dashboard.api_tutor as _api_tutor_mod
+import adaptive.knowledge_graph as knowledge_graph
+import llm_provider
+import tutor_accuracy_profiles
+import tutor_context
+import tutor_tools
+from tutor_latency_budget import TurnBudget
+
+# Small enough that the injected stalls (seconds) are clearly cut off.
+FAST_BUDGET = {
+    "first_token_ms": 600,
+    "retrieval_ms": 400,
+    "notes_ms": 150,
+    "graph_ms": 150,
+    "vision_ms": 150,
+    "tools_ms": 200,
+    "artifacts_ms": 200,
+}
+STALL_SECONDS = 3.0
+
+
+@pytest.fixture(scope="module")
+def app():
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    tmp_path = tmp.name
+
+    orig_env = os.environ.get("PT_STUDY_DB")
+    orig_config = config.DB_PATH
+    orig_db_setup = db_setup.DB_PATH
+    orig_api_data = _api_data_mod.DB_PATH
+
+    os.environ["PT_STUDY_DB"] = tmp_path
+    config.DB_PATH = tmp_path
+    db_setup.DB_PATH = tmp_path
+    _api_data_mod.DB_PATH = tmp_path
+
+    db_setup.init_database()
+    db_setup._METHOD_LIBRARY_ENSURED = False
+    app_obj = create_app()
+    app_obj.config["TESTING"] = True
+    yield app_obj
+
+    config.DB_PATH = orig_config
+    db_setup.DB_PATH = orig_db_setup
+    _api_data_mod.DB_PATH = orig_api_data
+    if orig_env is None:
+        os.environ.pop("PT_STUDY_DB", None)
+    else:
+        os.environ["PT_STUDY_DB"] = orig_env
+
+    _api_tutor_mod._SELECTOR_COLS_ENSURED = False
+
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def release():
+    """Stalled fakes wait on this; set on teardown so pool threads exit."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def fast_budget(monkeypatch):
+    for profile in tutor_accuracy_profiles.ACCURACY_PROFILE_CONFIG.values():
+        monkeypatch.setitem(profile, "latency_budget", dict(FAST_BUDGET))
+    monkeypatch.delenv("PT_HARNESS_DISABLE_VAULT_CONTEXT", raising=False)
+
+
+def _create_tutor_session(client) -> str:
+    resp = client.post(
+        "/api/tutor/session",
+        json={"mode": "Core", "topic": "Tutor Latency Budget"},
+    )
+    assert resp.status_code == 201
+    return resp.get_json()["session_id"]
+
+
+def _parse_sse_events(raw: str) -> list[dict]:
+    events = []
+    for line in raw.splitlines():
+        if line.startswith("data: ") and line[6:] != "[DONE]":
+            events.append(json.loads(line[6:]))
+    return events
+
+
+def test_turn_budget_skips_and_abandons_overrunning_stages(release):
+    now = [0.0]
+    budget = TurnBudget(dict(FAST_BUDGET), profile="strict", clock=lambda: now[0])
+
+    assert budget.run("graph", lambda: "graph ok") == "graph ok"
+    assert budget.allot("notes") == pytest.approx(0.15)
+
+    # Context stages share the first-token allowance.
+    now[0] = 0.5
+    assert budget.allot("retrieval") == pytest.approx(0.1)
+    now[0] = 0.7
+    assert budget.allot("vision") == 0.0
+    assert budget.run("vision", lambda: "late", default="skipped") == "skipped"
+    # Tool allowances are not tied to time-to-first-token.
+    assert budget.allot("tools") == pytest.approx(0.2)
+
+    real = TurnBudget(dict(FAST_BUDGET))
+    started = time.perf_counter()
+    assert real.run("tools", lambda: release.wait(STALL_SECONDS)) is None
+    assert time.perf_counter() - started < 1.0
+    assert real.allot("tools") < 0.05
+
+    summary = budget.summary()
+    assert summary["stages"]["graph"]["status"] == "ok"
+    assert summary["stages"]["vision"]["status"] == "skipped"
+    assert summary["overruns"] == ["vision"]
+    assert real.summary()["stages"]["tools"]["status"] == "timeout"
+
+    # Writes are never abandoned; the overrun is only recorded.
+    writes = TurnBudget(dict(FAST_BUDGET))
+    assert writes.run("artifacts", lambda: time.sleep(0.3) or "saved", abandon=False) == "saved"
+    assert writes.summary()["stages"]["artifacts"]["status"] == "timeout"
+    # Waiting on a prefetch leaves part of the retrieval allowance for an inline build.
+    assert budget.prefetch_wait() == 0.0
+    fresh = TurnBudget(dict(FAST_BUDGET), clock=lambda: 0.0)
+    assert fresh.prefetch_wait() == pytest.approx(fresh.allot("retrieval") / 2)
+
+
+def test_build_context_cuts_off_slow_notes_without_waiting_for_them(
+    monkeypatch, release
+):
+    monkeypatch.delenv("PT_HARNESS_DISABLE_VAULT_CONTEXT", raising=False)
+    monkeypatch.setattr(tutor_context, "_load_course_map", lambda: "")
+    monkeypatch.setattr(
+        tutor_context, "_fetch_materials", lambda *_a, **_k: "Fast material"
+    )
+    monkeypatch.setattr(
+        tutor_context,
+        "_fetch_notes",
+        lambda *_a, **_k: release.wait(STALL_SECONDS) and "Late notes",
+    )
+    monkeypatch.setattr(tutor_context, "_fetch_vault_state", lambda **_k: "vault")
+
+    started = time.perf_counter()
+    ctx = tutor_context.build_context(
+        "hip flexors",
+        deadline_seconds=2.0,
+        source_deadlines={"notes": 0.1},
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert ctx["materials"] == "Fast material"
+    assert ctx["vault_state"] == "vault"
+    assert ctx["notes"] == ""
+    assert ctx["debug"]["timed_out_sources"] == ["notes"]
+
+
+def test_send_turn_streams_within_budget_when_context_stages_stall(
+    client, monkeypatch, release, fast_budget
+):
+    session_id = _create_tutor_session(client)
+    monkeypatch.setattr(
+        tutor_context, "_fetch_materials", lambda *_a, **_k: "Fast material"
+    )
+    monkeypatch.setattr(
+        tutor_context,
+        "_fetch_notes",
+        lambda *_a, **_k: release.wait(STALL_SECONDS) and "Late notes",
+    )
+    monkeypatch.setattr(tutor_context, "_fetch_vault_state", lambda **_k: "")
+    monkeypatch.setattr(
+        knowledge_graph,
+        "hybrid_retrieve",
+        lambda *_a, **_k: release.wait(STALL_SECONDS) and {"context_text": "late"},
+    )
+    monkeypatch.setattr(tutor_tools, "get_tool_schemas", lambda: [])
+
+    prompts: list[str] = []
+
+    def fake_stream(system_prompt, _user_prompt, **_kwargs):
+        prompts.append(system_prompt)
+        yield {"type": "delta", "text": "Answer from what finished"}
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-b1"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    started = time.perf_counter()
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/turn",
+        json={"message": "Explain the hip flexors"},
+    )
+    events = _parse_sse_events(resp.get_data(as_text=True))
+    elapsed = time.perf_counter() - started
+    assert resp.status_code == 200
+
+    done = next(event for event in events if event.get("type") == "done")
+    timing = done["timing"]
+    assert timing["first_token_budget_ms"] == FAST_BUDGET["first_token_ms"]
+    assert timing["first_chunk_ms"] < FAST_BUDGET["first_token_ms"] + 250
+    assert elapsed < STALL_SECONDS
+
+    assert "Fast material" in prompts[0]
+    assert "Late notes" not in prompts[0]
+    budget = done["retrieval_debug"]["latency_budget"]
+    assert budget["overruns"] == ["graph", "notes"]
+    assert budget["stages"]["retrieval"]["status"] == "ok"
+
+
+def test_send_turn_abandons_stalled_tool_and_finishes_the_answer(
+    client, monkeypatch, release, fast_budget
+):
+    session_id = _create_tutor_session(client)
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {
+            "materials": "",
+            "notes": "",
+            "vault_state": "",
+            "course_map": "",
+            "debug": {},
+        },
+    )
+    monkeypatch.setattr(
+        tutor_tools,
+        "get_tool_schemas",
+        lambda: [
+            {
+                "name": "search_obsidian_notes",
+                "description": "Mock note search",
+                "parameters": {"type": "object", "properties": {}},
+            }
+        ],
+    )
+    monkeypatch.setattr(
+        tutor_tools,
+        "execute_tool",
+        lambda *_a, **_k: release.wait(STALL_SECONDS) and {"success": True},
+    )
+    tool_outputs: list[dict] = []
+
+    def fake_stream(_system_prompt, _user_prompt, **kwargs):
+        if kwargs.get("input_override"):
+            tool_outputs.extend(
+                json.loads(item["output"]) for item in kwargs["input_override"]
+            )
+            yield {"type": "delta", "text": "Answered without the search"}
+            yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-b3"}
+            return
+        yield {
+            "type": "tool_call",
+            "name": "search_obsidian_notes",
+            "call_id": "call-1",
+            "arguments": "{}",
+        }
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-b2"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    started = time.perf_counter()
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/turn",
+        json={"message": "Search my notes"},
+    )
+    events = _parse_sse_events(resp.get_data(as_text=True))
+    assert time.perf_counter() - started < STALL_SECONDS
+
+    tool_result = next(event for event in events if event.get("type") == "tool_result")
+    assert json.loads(tool_result["content"])["success"] is False
+    assert tool_outputs and tool_outputs[0]["budget_exceeded"] is True
+    done = next(event for event in events if event.get("type") == "done")
+    budget = done["retrieval_debug"]["latency_budget"]
+    assert budget["stages"]["tools"]["status"] == "timeout"
+    assert "artifacts" not in budget["stages"]
+
+
+def test_send_turn_lets_slow_artifact_write_finish(
+    client, monkeypatch, fast_budget
+):
+    session_id = _create_tutor_session(client)
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {
+            "materials": "",
+            "notes": "",
+            "vault_state": "",
+            "course_map": "",
+            "debug": {},
+        },
+    )
+    monkeypatch.setattr(
+        tutor_tools,
+        "get_tool_schemas",
+        lambda: [
+            {
+                "name": "create_anki_card",
+                "description": "Mock card writer",
+                "parameters": {"type": "object", "properties": {}},
+            }
+        ],
+    )
+    writes: list[str] = []
+
+    def slow_write(tool_name, *_a, **_k):
+        time.sleep(FAST_BUDGET["artifacts_ms"] / 1000 * 2)
+        writes.append(tool_name)
+        return {"success": True, "message": "Card saved"}
+
+    monkeypatch.setattr(tutor_tools, "execute_tool", slow_write)
+    tool_outputs: list[dict] = []
+
+    def fake_stream(_system_prompt, _user_prompt, **kwargs):
+        if kwargs.get("input_override"):
+            tool_outputs.extend(
+                json.loads(item["output"]) for item in kwargs["input_override"]
+            )
+            yield {"type": "delta", "text": "Card saved"}
+            yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-b5"}
+            return
+        yield {
+            "type": "tool_call",
+            "name": "create_anki_card",
+            "call_id": "call-1",
+            "arguments": "{}",
+        }
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-b4"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/turn",
+        json={"message": "Make me a card"},
+    )
+    events = _parse_sse_events(resp.get_data(as_text=True))
+
+    assert writes == ["create_anki_card"]
+    tool_result = next(event for event in events if event.get("type") == "tool_result")
+    assert json.loads(tool_result["content"])["success"] is True
+    assert tool_outputs == [{"success": True, "message": "Card saved"}]
+    done = next(event for event in events if event.get("type") == "done")
+    budget = done["retrieval_debug"]["latency_budget"]
+    assert budget["stages"]["artifacts"]["status"] == "timeout"
+
+
+def test_send_turn_lets_stalled_objective_save_finish(
+    client, monkeypatch, fast_budget
+):
+    session_id = _create_tutor_session(client)
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {
+            "materials": "",
+            "notes": "",
+            "vault_state": "",
+            "course_map": "",
+            "debug": {},
+        },
+    )
+    monkeypatch.setattr(
+        tutor_tools,
+        "get_tool_schemas",
+        lambda: [
+            {
+                "name": "save_learning_objectives",
+                "description": "Mock objective saver",
+                "parameters": {"type": "object", "properties": {}},
+            }
+        ],
+    )
+    saved: list[str] = []
+
+    def stalled_save(tool_name, *_a, session_id=None, **_k):
+        time.sleep(FAST_BUDGET["tools_ms"] / 1000 * 2)
+        conn = db_setup.get_connection()
+        try:
+            conn.execute(
+                "UPDATE tutor_sessions SET content_filter_json = ? WHERE session_id = ?",
+                (json.dumps({"saved_objectives": ["OBJ-1"]}), session_id),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        saved.append(tool_name)
+        return {"success": True, "message": "Saved 1 objective"}
+
+    monkeypatch.setattr(tutor_tools, "execute_tool", stalled_save)
+
+    def fake_stream(_system_prompt, _user_prompt, **kwargs):
+        if kwargs.get("input_override"):
+            yield {"type": "delta", "text": "Objectives saved"}
+            yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-b7"}
+            return
+        yield {
+            "type": "tool_call",
+            "name": "save_learning_objectives",
+            "call_id": "call-1",
+            "arguments": "{}",
+        }
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-b6"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/turn",
+        json={"message": "Save my objectives"},
+    )
+    events = _parse_sse_events(resp.get_data(as_text=True))
+
+    assert saved == ["save_learning_objectives"]
+    tool_result = next(event for event in events if event.get("type") == "tool_result")
+    assert json.loads(tool_result["content"])["success"] is True
+    done = next(event for event in events if event.get("type") == "done")
+    budget = done["retrieval_debug"]["latency_budget"]
+    assert budget["stages"]["tools"]["status"] == "timeout"
+    # The turn-end session update kept the objectives the tool wrote.
+    conn = db_setup.get_connection()
+    try:
+        row = conn.execute(
+            "SELECT content_filter_json FROM tutor_sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+    assert json.loads(row[0])["saved_objectives"] == ["OBJ-1"]
@@ -303,3 +303,232 @@ def test_polish_drafts_checkpoint_and_final(client):
     )
     assert approve_resp.status_code == 200
     assert approve_resp.get_json()["status"] == "approved"
+
+
+def test_recent_turns_tail_and_ring_buffer(client):
+    """History reads come from an SQL tail and a ring keyed by turn_count."""
+    from dashboard import api_tutor_memory as mem
+
+    chain_id = _get_template_chain_id(client)
+    wf_id = _create_workflow(client)
+    sid = _create_teach_session(client, workflow_id=wf_id, label="Ring", chain_id=chain_id)
+    conn = _db_connect()
+    try:
+        for n in range(1, 41):
+            _insert_turn(
+                conn,
+                sid,
+                turn_number=n,
+                question=f"q{n}",
+                answer=f"a{n}",
+                interaction_mode="general" if n % 4 == 0 else "tutor",
+            )
+
+        tail = mem.load_recent_turns(conn, sid, limit=5, mode="general")
+        assert [t["turn_number"] for t in tail] == [24, 28, 32, 36, 40]
+
+        before = mem.turn_ring_stats()
+        first = mem.load_recent_turns(conn, sid, limit=8, mode="tutor", turn_count=40)
+        second = mem.load_recent_turns(conn, sid, limit=8, mode="tutor", turn_count=40)
+        assert first == second
+        assert [t["turn_number"] for t in first] == [30, 31, 33, 34, 35, 37, 38, 39]
+        after = mem.turn_ring_stats()
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+
+        # Write-through keeps the ring warm for the next turn.
+        mem.remember_turn(
+            sid,
+            {"id": 999_999, "turn_number": 41, "question": "q41", "answer": "a41",
+             "interaction_mode": "tutor", "created_at": "now"},
+            turn_count=41,
+        )
+        warm = mem.load_recent_turns(conn, sid, limit=1, turn_count=41)
+        assert warm[0]["turn_number"] == 41
+        assert mem.turn_ring_stats()["hits"] == after["hits"] + 1
+
+        # A count the ring has not seen (another writer) forces a reload.
+        _insert_turn(conn, sid, turn_number=42, question="q42", answer="a42",
+                     interaction_mode="tutor")
+        fresh = mem.load_recent_turns(conn, sid, limit=2, turn_count=42)
+        assert [t["turn_number"] for t in fresh] == [40, 42]
+        assert mem.turn_ring_stats()["misses"] == after["misses"] + 1
+
+        mem.forget_session_turns(sid)
+        history, summary = mem.build_prompt_turn_history(conn, sid, turn_count=42)
+        assert summary is None
+        assert len(history) == 40
+        assert history[-1] == {"role": "assistant", "content": "a42"}
+    finally:
+        conn.close()
+
+
+def test_uncovered_turns_come_from_the_ring_when_it_holds_them(client):
+    """A short uncovered range is read from the ring even past its capacity."""
+    from dashboard import api_tutor_memory as mem
+
+    chain_id = _get_template_chain_id(client)
+    wf_id = _create_workflow(client)
+    sid = _create_teach_session(client, workflow_id=wf_id, label="After", chain_id=chain_id)
+    conn = _db_connect()
+    try:
+        for n in range(1, 41):
+            _insert_turn(
+                conn,
+                sid,
+                turn_number=n,
+                question=f"q{n}",
+                answer=f"a{n}",
+                interaction_mode="general" if n % 4 == 0 else "tutor",
+            )
+
+        first = mem.load_turns_after(conn, sid, after=34, mode="tutor", turn_count=40)
+        before = mem.turn_ring_stats()
+        second = mem.load_turns_after(conn, sid, after=34, mode="tutor", turn_count=40)
+        assert first == second
+        assert [t["turn_number"] for t in second] == [35, 37, 38, 39]
+        after = mem.turn_ring_stats()
+        assert after["hits"] == before["hits"] + 1
+        assert after["misses"] == before["misses"]
+
+        # Older than the ring: answered from SQL, in full.
+        older = mem.load_turns_after(conn, sid, after=2, mode="tutor", turn_count=40)
+        assert [t["turn_number"] for t in older][:3] == [3, 5, 6]
+        assert len(older) == 28
+    finally:
+        conn.close()
+
+
+def test_compaction_folds_new_turns_into_previous_summary(client, monkeypatch):
+    """Repeated compaction covers only new turns and resets the token estimate."""
+    import llm_provider
+    from dashboard import api_tutor_memory as mem
+
+    prompts: list[str] = []
+
+    def fake_summary(system_prompt, user_prompt, **_kwargs):
+        prompts.append(user_prompt)
+        return {"success": True, "content": f"SUMMARY v{len(prompts)}"}
+
+    monkeypatch.setattr(llm_provider, "call_llm", fake_summary)
+
+    chain_id = _get_template_chain_id(client)
+    wf_id = _create_workflow(client)
+    sid = _create_teach_session(client, workflow_id=wf_id, label="Roll", chain_id=chain_id)
+    conn = _db_connect()
+    try:
+        for n in range(1, 4):
+            _insert_turn(conn, sid, turn_number=n, question=f"q{n}", answer=f"a{n}",
+                         interaction_mode="tutor")
+        first = mem.compact_tutor_session(conn, sid)
+        assert first["working_summary"]["covered_turn_number"] == 3
+        assert first["summarized_turn_count"] == 3
+
+        _insert_turn(conn, sid, turn_number=4, question="q4", answer="a4",
+                     interaction_mode="tutor")
+        conn.execute(
+            "UPDATE tutor_sessions SET history_token_estimate = 999 WHERE session_id = ?",
+            (sid,),
+        )
+        conn.commit()
+        second = mem.compact_tutor_session(conn, sid, trigger_source="token_threshold")
+        assert second["summarized_turn_count"] == 1
+        assert "Previous working summary:\nSUMMARY v1" in prompts[-1]
+        assert "q1" not in prompts[-1] and "q4" in prompts[-1]
+        estimate = conn.execute(
+            "SELECT history_token_estimate FROM tutor_sessions WHERE session_id = ?",
+            (sid,),
+        ).fetchone()[0]
+        assert estimate == 0
+
+        history, summary = mem.build_prompt_turn_history(conn, sid)
+        assert summary["summary_text"] == "SUMMARY v2"
+        assert summary["covered_turn_number"] == 4
+        assert [m["role"] for m in history] == ["system"]
+
+        # Every turn after the covered one is in the tail, past the old
+        # 8-turn cap, until the token budget runs out.
+        for n in range(5, 17):
+            _insert_turn(conn, sid, turn_number=n, question=f"q{n}", answer=f"a{n}",
+                         interaction_mode="tutor")
+        history, _summary = mem.build_prompt_turn_history(conn, sid, turn_count=16)
+        questions = [m["content"] for m in history if m["role"] == "user"]
+        assert questions == [f"q{n}" for n in range(5, 17)]
+
+        monkeypatch.setattr(
+            mem, "HISTORY_TAIL_TOKEN_BUDGET", 3 * mem.estimate_turn_tokens("q16", "a16")
+        )
+        history, _summary = mem.build_prompt_turn_history(conn, sid, turn_count=16)
+        assert [m["content"] for m in history if m["role"] == "user"] == ["q14", "q15", "q16"]
+    finally:
+        conn.close()
+
+
+def test_token_threshold_compaction_runs_as_post_turn_job(client, monkeypatch):
+    """The compaction job only runs while the estimate is over the threshold."""
+    import llm_provider
+    import tutor_post_turn
+    from dashboard import api_tutor_memory as mem
+
+    monkeypatch.setattr(
+        llm_provider,
+        "call_llm",
+        lambda *_a, **_k: {"success": True, "content": "BACKGROUND SUMMARY"},
+    )
+    monkeypatch.setattr(mem, "COMPACTION_TOKEN_THRESHOLD", 10)
+
+    chain_id = _get_template_chain_id(client)
+    wf_id = _create_workflow(client)
+    sid = _create_teach_session(client, workflow_id=wf_id, label="Bg", chain_id=chain_id)
+    conn = _db_connect()
+    try:
+        _insert_turn(conn, sid, turn_number=1, question="q" * 40, answer="a" * 40,
+                     interaction_mode="tutor")
+        tokens = mem.estimate_turn_tokens("q" * 40, "a" * 40)
+        assert tokens == 20
+        assert mem.should_compact({"method_chain_id": chain_id}, tokens)
+        assert not mem.should_compact({"method_chain_id": None}, tokens)
+
+        conn.execute(
+            "UPDATE tutor_sessions SET history_token_estimate = ? WHERE session_id = ?",
+            (tokens, sid),
+        )
+        conn.commit()
+        tutor_post_turn.submit_post_turn_job(
+            "compact_session", {"session_id": sid}, ordering_key=f"{sid}:compact",
+            wake=False,
+        )
+        # A second job queued while the first is pending is deduplicated.
+        dup_conn = db_setup.get_connection()
+        try:
+            first_id = tutor_post_turn.enqueue_post_turn_job(
+                dup_conn, "compact_session", {"session_id": sid},
+                ordering_key=f"{sid}:compact", dedupe=True,
+            )
+            dup_conn.commit()
+        finally:
+            dup_conn.close()
+        tutor_post_turn.run_pending_post_turn_jobs()
+
+        history, summary = mem.build_prompt_turn_history(conn, sid)
+        assert summary["summary_text"] == "BACKGROUND SUMMARY"
+        assert summary["trigger_source"] == "token_threshold"
+        result = conn.execute(
+            "SELECT status, result_json FROM tutor_post_turn_jobs WHERE id = ?",
+            (first_id,),
+        ).fetchone()
+        assert result[0] == "done"
+        assert json.loads(result[1])["version"] == 1
+
+        # Below the threshold a queued job is a no-op.
+        tutor_post_turn.submit_post_turn_job(
+            "compact_session", {"session_id": sid}, wake=False
+        )
+        tutor_post_turn.run_pending_post_turn_jobs()
+        versions = conn.execute(
+            "SELECT COUNT(*) FROM tutor_working_summaries WHERE tutor_session_id = ?",
+            (sid,),
+        ).fetchone()[0]
+        assert versions == 1
+    finally:
+        conn.close()
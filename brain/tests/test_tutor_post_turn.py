@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+import config as app_config
+import db_setup
+import tutor_post_turn
+from tutor_post_turn import (
+    post_turn_handler,
+    post_turn_stats,
+    run_pending_post_turn_jobs,
+    submit_post_turn_job,
+)
+
+
+@pytest.fixture
+def job_db(tmp_path, monkeypatch):
+    db_file = tmp_path / "post_turn.db"
+    monkeypatch.setenv("PT_STUDY_DB", str(db_file))
+    monkeypatch.setattr(app_config, "DB_PATH", str(db_file))
+    monkeypatch.setattr(db_setup, "DB_PATH", str(db_file))
+    db_setup.init_database()
+    # Drive the queue from the test thread; never start the workers.
+    monkeypatch.setattr(tutor_post_turn, "notify_post_turn_workers", lambda: None)
+    monkeypatch.setattr(tutor_post_turn, "_HANDLERS", dict(tutor_post_turn._HANDLERS))
+    return str(db_file)
+
+
+def _job(job_id: int) -> dict:
+    conn = db_setup.get_connection()
+    try:
+        row = conn.execute(
+            "SELECT status, attempts, next_attempt_at, last_error, result_json "
+            "FROM tutor_post_turn_jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+    return dict(
+        zip(("status", "attempts", "next_attempt_at", "last_error", "result_json"), row)
+    )
+
+
+def test_failing_job_backs_off_then_fails_after_max_attempts(job_db, monkeypatch):
+    monkeypatch.setattr(tutor_post_turn, "RETRY_BASE_SECONDS", 0.0)
+    calls: list[dict] = []
+
+    @post_turn_handler("flaky")
+    def _flaky(payload):
+        calls.append(payload)
+        raise RuntimeError("vault offline")
+
+    job_id = submit_post_turn_job("flaky", {"n": 1})
+    for _ in range(tutor_post_turn.MAX_ATTEMPTS + 2):
+        run_pending_post_turn_jobs()
+
+    job = _job(job_id)
+    assert len(calls) == tutor_post_turn.MAX_ATTEMPTS
+    assert job["status"] == "failed"
+    assert job["attempts"] == tutor_post_turn.MAX_ATTEMPTS
+    assert job["last_error"] == "vault offline"
+    assert post_turn_stats()["jobs"] == {"failed": 1}
+
+
+def test_retry_is_delayed_by_backoff(job_db):
+    attempts = {"n": 0}
+
+    @post_turn_handler("once_flaky")
+    def _once_flaky(_payload):
+        attempts["n"] += 1
+        if attempts["n"] == 1:
+            raise RuntimeError("busy")
+        return {"ok": True}
+
+    job_id = submit_post_turn_job("once_flaky", {})
+    assert run_pending_post_turn_jobs() == 1
+    pending = _job(job_id)
+    assert pending["status"] == "pending"
+    assert pending["next_attempt_at"] >= time.time() + 1
+    # Not due yet, so a second pass does nothing.
+    assert run_pending_post_turn_jobs() == 0
+
+
+def test_jobs_with_same_ordering_key_run_in_enqueue_order(job_db, monkeypatch):
+    monkeypatch.setattr(tutor_post_turn, "RETRY_BASE_SECONDS", 0.05)
+    ran: list[str] = []
+    fail_first = {"left": 1}
+
+    @post_turn_handler("ordered")
+    def _ordered(payload):
+        if payload["name"] == "create" and fail_first["left"]:
+            fail_first["left"] -= 1
+            raise RuntimeError("not yet")
+        ran.append(payload["name"])
+
+    create_id = submit_post_turn_job("ordered", {"name": "create"}, ordering_key="s1")
+    submit_post_turn_job("ordered", {"name": "append"}, ordering_key="s1")
+    submit_post_turn_job("ordered", {"name": "other"}, ordering_key="s2")
+
+    run_pending_post_turn_jobs()
+    # The append waits behind the failed create; the other session proceeds.
+    assert ran == ["other"]
+    assert _job(create_id)["status"] == "pending"
+
+    time.sleep(0.1)
+    run_pending_post_turn_jobs()
+    assert ran == ["other", "create", "append"]
+
+
+def test_expired_running_job_is_requeued(job_db):
+    @post_turn_handler("recover")
+    def _recover(_payload):
+        return "recovered"
+
+    job_id = submit_post_turn_job("recover", {})
+    conn = db_setup.get_connection()
+    try:
+        conn.execute(
+            "UPDATE tutor_post_turn_jobs SET status = 'running', attempts = 1, "
+            "updated_at = ? WHERE id = ?",
+            (time.time() - tutor_post_turn.LEASE_SECONDS - 1, job_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert run_pending_post_turn_jobs() == 1
+    job = _job(job_id)
+    assert job["status"] == "done"
+    assert job["result_json"] == '"recovered"'
+
+
+def test_lease_expiry_counts_as_an_attempt(job_db):
+    @post_turn_handler("crashes_worker")
+    def _crashes_worker(_payload):
+        return "never reached"
+
+    job_id = submit_post_turn_job("crashes_worker", {})
+    conn = db_setup.get_connection()
+    try:
+        conn.execute(
+            "UPDATE tutor_post_turn_jobs SET status = 'running', attempts = ?, "
+            "updated_at = ? WHERE id = ?",
+            (
+                tutor_post_turn.MAX_ATTEMPTS,
+                time.time() - tutor_post_turn.LEASE_SECONDS - 1,
+                job_id,
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert run_pending_post_turn_jobs() == 0
+    job = _job(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == tutor_post_turn.MAX_ATTEMPTS
+    assert job["last_error"].startswith("lease expired")
+
+
+def test_enqueue_rejects_unknown_kind(job_db):
+    with pytest.raises(ValueError):
+        submit_post_turn_job("no_such_kind", {})
+
+
+def test_vault_artifact_job_runs_the_turn_as_one_batch(job_db, monkeypatch):
+    import json
+
+    import obsidian_vault
+
+    monkeypatch.setattr(tutor_post_turn, "RETRY_BASE_SECONDS", 0.0)
+    notes = {"Notes/Shoulder.md": "# Shoulder\n"}
+    calls: list[str] = []
+    create_fails = {"left": 1}
+
+    class FakeVault:
+        def read_note(self, file: str) -> str:
+            calls.append(f"read {file}")
+            return notes.get(file, "")
+
+        def write_note(self, file: str, content: str) -> str:
+            calls.append(f"write {file}")
+            notes[file] = content
+            return f"Wrote {file}"
+
+        def write_note_if_unchanged(self, file: str, expected_hash: str, content: str) -> str:
+            if obsidian_vault.note_content_hash(notes.get(file, "")) != expected_hash:
+                return obsidian_vault.NOTE_CHANGED
+            return self.write_note(file, content)
+
+        def create_note(self, name: str, folder: str, template: str, content: str) -> str:
+            calls.append(f"create {folder}/{name}")
+            if create_fails["left"]:
+                create_fails["left"] -= 1
+                raise RuntimeError("vault busy")
+            notes[f"{folder}/{name}"] = content
+            return f"Created {folder}/{name}"
+
+    monkeypatch.setattr(obsidian_vault, "ObsidianVault", FakeVault)
+    job_id = submit_post_turn_job(
+        "vault_artifact",
+        {
+            "artifacts": [
+                {"operation": "append", "params": {"file": "Notes/Shoulder.md", "content": "Rotator cuff"}},
+                {"operation": "append", "params": {"file": "Notes/Shoulder.md", "content": "Deltoid"}},
+                {"operation": "create", "params": {"name": "Hip.md", "folder": "Notes", "content": "Hip"}},
+            ]
+        },
+        ordering_key="s1",
+    )
+
+    run_pending_post_turn_jobs()
+    # The two appends were coalesced into one read and one write, and only
+    # the failed create was retried, so the appends were not applied twice.
+    assert sorted(calls) == [
+        "create Notes/Hip.md",
+        "create Notes/Hip.md",
+        "read Notes/Shoulder.md",
+        "write Notes/Shoulder.md",
+    ]
+    job = _job(job_id)
+    assert job["attempts"] == 2
+    assert job["status"] == "done"
+    assert notes["Notes/Shoulder.md"].count("Deltoid") == 1
+    report = json.loads(job["result_json"])
+    assert [item["operation"] for item in report["results"]] == ["append", "append", "create"]
+    assert all(item["success"] for item in report["results"])
+    # Vault write calls across both attempts.
+    assert report["note_writes"] == {"Notes/Shoulder.md": 1, "Notes/Hip.md": 2}
+    assert report["elapsed_ms"] >= 0
+
+
+def test_vault_artifact_job_fails_on_unknown_operation(job_db, monkeypatch):
+    import obsidian_vault
+
+    notes: dict[str, str] = {}
+
+    class FakeVault:
+        def append_note(self, file: str, content: str) -> str:
+            notes[file] = notes.get(file, "") + content
+            return f"Appended to {file}"
+
+    monkeypatch.setattr(obsidian_vault, "ObsidianVault", FakeVault)
+    job_id = submit_post_turn_job(
+        "vault_artifact",
+        {
+            "artifacts": [
+                {"operation": "append", "params": {"file": "Notes/Knee.md", "content": "ACL"}},
+                {"operation": "teleport", "params": {"file": "Notes/Knee.md"}},
+            ]
+        },
+        ordering_key="s1",
+    )
+
+    assert run_pending_post_turn_jobs() == 1
+    job = _job(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 1
+    assert "Unknown operation: teleport" in job["last_error"]
+    assert notes["Notes/Knee.md"].count("ACL") == 1
@@ -0,0 +1,128 @@
+"""Tests for speculative Tutor context prefetch (tutor_prefetch.py)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import tutor_prefetch
+
+
+def _blocking_build(release: threading.Event, started: list[str]):
+    def _build(draft, _kwargs):
+        started.append(draft)
+        release.wait(5)
+        return {"materials": draft}, 1.0
+
+    return _build
+
+
+def test_take_prefetched_context_does_not_wait_on_queued_prefetch(monkeypatch):
+    tutor_prefetch.clear_prefetch_cache()
+    release = threading.Event()
+    started: list[str] = []
+    monkeypatch.setattr(tutor_prefetch, "_build", _blocking_build(release, started))
+    try:
+        # Two other sessions occupy both prefetch workers.
+        tutor_prefetch.schedule_prefetch("busy-1", "first busy draft text")
+        tutor_prefetch.schedule_prefetch("busy-2", "second busy draft text")
+        tutor_prefetch.schedule_prefetch("s1", "explain the sliding filament theory")
+        deadline = time.time() + 2
+        while len(started) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        began = time.perf_counter()
+        ctx, info = tutor_prefetch.take_prefetched_context(
+            "s1", "explain the sliding filament theory?", max_wait_seconds=5
+        )
+        assert time.perf_counter() - began < 0.1
+        assert ctx is None
+        assert info["reason"] == "not_started"
+    finally:
+        release.set()
+        tutor_prefetch.clear_prefetch_cache()
+
+
+def test_take_prefetched_context_caps_wait_on_running_prefetch(monkeypatch):
+    tutor_prefetch.clear_prefetch_cache()
+    release = threading.Event()
+    started: list[str] = []
+    monkeypatch.setattr(tutor_prefetch, "_build", _blocking_build(release, started))
+    monkeypatch.setattr(tutor_prefetch, "PREFETCH_MAX_WAIT_SECONDS", 0.1)
+    try:
+        tutor_prefetch.schedule_prefetch("s1", "explain the sliding filament theory")
+        deadline = time.time() + 2
+        while not started and time.time() < deadline:
+            time.sleep(0.01)
+
+        began = time.perf_counter()
+        ctx, info = tutor_prefetch.take_prefetched_context(
+            "s1", "explain the sliding filament theory", max_wait_seconds=5
+        )
+        assert time.perf_counter() - began < 0.5
+        assert ctx is None
+        assert info["reason"] == "still_running"
+    finally:
+        release.set()
+        tutor_prefetch.clear_prefetch_cache()
+
+
+def test_send_turn_reuses_prefetch_for_unchanged_draft(tmp_path, monkeypatch):
+    import config
+    import db_setup
+    import llm_provider
+    import tutor_context
+    import tutor_tools
+    import dashboard.api_data as api_data
+    from dashboard.app import create_app
+
+    db_path = str(tmp_path / "prefetch_route.db")
+    monkeypatch.setenv("PT_STUDY_DB", db_path)
+    for module in (config, db_setup, api_data):
+        monkeypatch.setattr(module, "DB_PATH", db_path)
+    db_setup.init_database()
+    monkeypatch.setattr(db_setup, "_METHOD_LIBRARY_ENSURED", False)
+    app = create_app()
+    app.config["TESTING"] = True
+    client = app.test_client()
+    tutor_prefetch.clear_prefetch_cache()
+
+    builds: list[tuple[str, dict]] = []
+
+    def fake_build_context(query, **kwargs):
+        builds.append((query, kwargs))
+        return {"materials": "", "notes": "", "vault_state": "", "course_map": "", "debug": {}}
+
+    monkeypatch.setattr(tutor_context, "build_context", fake_build_context)
+    monkeypatch.setattr(tutor_tools, "get_tool_schemas", lambda: [])
+
+    def fake_stream(_system_prompt, _user_prompt, **_kwargs):
+        yield {"type": "delta", "text": "Actin and myosin slide past each other."}
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-pf"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    session_id = client.post(
+        "/api/tutor/session", json={"mode": "Core", "topic": "Muscle"}
+    ).get_json()["session_id"]
+    request_body = {
+        "message": "Explain the sliding filament theory",
+        "content_filter": {"material_ids": [3, 7], "accuracy_profile": "strict"},
+        "mode": {"materials": True, "obsidian": False},
+    }
+    try:
+        assert client.post(f"/api/tutor/session/{session_id}/prefetch", json=request_body).status_code == 204
+        deadline = time.time() + 2
+        while not builds and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+        resp = client.post(f"/api/tutor/session/{session_id}/turn", json=request_body)
+        resp.get_data()
+
+        assert resp.status_code == 200
+        assert len(builds) == 1
+        assert builds[0][1]["material_ids"] == [3, 7]
+        assert tutor_prefetch.prefetch_stats()["hits"] == 1
+    finally:
+        tutor_prefetch.clear_prefetch_cache()
@@ -1659,6 +1659,12 @@ def test_material_context_expands_selected_mp4_to_linked_processed_docs():
             ),
         ],
     )
+    # The video pipeline records the linkage in rag_doc_links at ingest.
+    cur.execute(
+        """INSERT INTO rag_doc_links (parent_id, child_id, kind, created_at)
+           VALUES (?, ?, 'video', datetime('now'))""",
+        (mp4_id, transcript_id),
+    )
     conn.commit()
     conn.close()
     ctx = tutor_context.build_context(
@@ -1893,6 +1899,10 @@ def test_send_turn_done_payload_includes_retrieval_debug(client, monkeypatch):
     assert "material_dropped_by_cap" in debug
     assert 0.0 <= debug["retrieval_confidence"] <= 1.0
     assert debug["retrieval_confidence_tier"] in ("low", "medium", "high")
+    token_usage = debug["token_usage"]
+    assert token_usage["question"] > 0
+    assert token_usage["total"] == sum(token_usage["tiers"].values())
+    assert token_usage["total"] <= token_usage["budget"]
 
 
 def test_material_count_shortcut_done_payload_includes_retrieval_debug(
@@ -2391,3 +2401,25 @@ def test_testing_mode_blocks_map_of_contents_writes(app):
     writes = app.config.get("TEST_MAP_OF_CONTENTS_WRITES") or []
     normalized = [str(w).replace("\\", "/") for w in writes]
     assert all(not w.endswith("/Map of Contents.md") for w in normalized)
+
+
+def test_init_database_backfills_video_links_from_legacy_metadata(app):
+    conn = sqlite3.connect(config.DB_PATH)
+    mp4_id = 3101
+    legacy_doc_id = 3102
+    conn.execute(
+        """INSERT INTO rag_docs
+           (id, title, source_path, content, checksum, metadata_json, corpus, file_type, enabled, created_at, updated_at)
+           VALUES (?, 'Legacy Visual Notes', 'C:/materials/legacy_visual.md', 'Visual notes.',
+                   'checksum-legacy', ?, 'materials', 'md', 1, datetime('now'), datetime('now'))""",
+        (legacy_doc_id, json.dumps({"video_material_id": mp4_id})),
+    )
+    conn.commit()
+    conn.close()
+
+    assert tutor_context._expand_linked_material_ids([mp4_id]) == [mp4_id]
+    db_setup.init_database()
+    assert tutor_context._expand_linked_material_ids([mp4_id]) == [
+        mp4_id,
+        legacy_doc_id,
+    ]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+import tutor_tokens
+from tutor_tokens import (
+    BudgetedSection,
+    allocate_sections,
+    clear_token_cache,
+    count_tokens,
+    token_stats,
+    truncate_to_tokens,
+)
+
+
+class _WordEncoder:
+    """One token per whitespace-separated word; counts encode calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.calls += 1
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture
+def word_encoder(monkeypatch):
+    encoder = _WordEncoder()
+    monkeypatch.setattr(
+        tutor_tokens, "_ENCODERS", {tutor_tokens.DEFAULT_ENCODING: encoder}
+    )
+    clear_token_cache()
+    yield encoder
+    clear_token_cache()
+
+
+def test_long_strings_are_encoded_once(word_encoder):
+    material = "stroke volume " * 500
+    assert count_tokens(material) == 1000
+    assert count_tokens(material) == 1000
+    assert word_encoder.calls == 1
+    assert token_stats()["hits"] == 1
+    assert token_stats()["misses"] == 1
+
+
+def test_missing_encoder_falls_back_to_estimate(monkeypatch):
+    monkeypatch.setattr(tutor_tokens, "_ENCODERS", {"o200k_base": None})
+    assert count_tokens("x" * 400) == 100
+    assert count_tokens("") == 0
+
+
+def test_allocate_sections_truncates_then_drops(word_encoder):
+    sections = [
+        BudgetedSection("vault", "note " * 300, priority=2),
+        BudgetedSection("materials", "fact " * 600, priority=0),
+        BudgetedSection("graph", "edge " * 600, priority=1),
+    ]
+    kept, usage = allocate_sections(sections, 1000)
+
+    assert kept["materials"] == sections[1].text
+    assert usage["truncated"] == ["graph"]
+    assert usage["dropped"] == ["vault"]
+    assert usage["sections"]["graph"] <= 400
+    assert kept["graph"].endswith(tutor_tokens.TRUNCATION_MARKER)
+    assert truncate_to_tokens("a b c", 10) == "a b c"
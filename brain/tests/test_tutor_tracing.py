@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tutor_tracing
+from tutor_tracing import Trace, propagate, save_trace, slowest_traces, span
+
+
+def _schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """CREATE TABLE tutor_traces (
+            trace_id TEXT PRIMARY KEY, name TEXT, tutor_session_id TEXT,
+            turn_number INTEGER, status TEXT, duration_ms REAL,
+            attributes_json TEXT, started_at TEXT)"""
+    )
+    conn.execute(
+        """CREATE TABLE tutor_trace_spans (
+            trace_id TEXT, span_id INTEGER, parent_id INTEGER, name TEXT,
+            start_ms REAL, duration_ms REAL, status TEXT, attributes_json TEXT,
+            PRIMARY KEY (trace_id, span_id))"""
+    )
+
+
+def test_module_span_is_noop_without_active_trace():
+    with span("orphan") as current:
+        assert current is None
+    assert tutor_tracing.current_span() is None
+
+
+def test_iterate_and_propagate_nest_spans_across_threads():
+    trace = Trace("tutor.turn", session_id="s1")
+
+    def source(name: str) -> str:
+        with span(f"context.{name}"):
+            return name
+
+    def produce():
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(propagate(source), n) for n in ("notes", "rag")]
+            for future in futures:
+                yield future.result()
+
+    # Drive each next() from a fresh thread, like the ASGI adapter does.
+    iterator = trace.iterate("llm.stream", produce(), round=0)
+    results: list[str] = []
+    while True:
+        box: list = []
+        worker = threading.Thread(target=lambda: box.append(next(iterator, None)))
+        worker.start()
+        worker.join()
+        if box[0] is None:
+            break
+        results.append(box[0])
+    assert results == ["notes", "rag"]
+    assert tutor_tracing.current_span() is None
+
+    leftover = trace.start_span("turn.persist")
+    trace.finish(status="ok")
+
+    rows = {row["name"]: row for row in trace.span_rows()}
+    stream_id = rows["llm.stream"]["span_id"]
+    assert rows["llm.stream"]["parent_id"] == trace.root.span_id
+    assert rows["llm.stream"]["attributes"]["items"] == 2
+    assert rows["context.notes"]["parent_id"] == stream_id
+    assert rows["context.rag"]["parent_id"] == stream_id
+    assert rows["turn.persist"]["status"] == "incomplete"
+    assert leftover.end is not None
+
+
+def test_save_trace_prunes_and_orders_by_duration(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    _schema(conn)
+    monkeypatch.setattr(tutor_tracing, "TRACE_RETENTION", 2)
+
+    traces = []
+    for idx, duration in enumerate((5.0, 50.0, 20.0)):
+        trace = Trace("tutor.turn", session_id="s1", turn_number=idx + 1)
+        with trace.span("context.retrieve"):
+            pass
+        trace.finish()
+        trace.root.end = trace.root.start + duration / 1000
+        trace.started_at = f"2026-01-01T00:00:0{idx}"
+        save_trace(conn, trace)
+        traces.append(trace)
+
+    result = slowest_traces(conn, limit=10)
+    assert [t["turn_number"] for t in result] == [2, 3]
+    assert result[0]["spans"][0]["children"][0]["name"] == "context.retrieve"
+    remaining = conn.execute("SELECT COUNT(*) FROM tutor_trace_spans").fetchone()[0]
+    assert remaining == 4
@@ -4,6 +4,7 @@ import json
 import os
 import sys
 import tempfile
+import threading
 import time
 
 import pytest
@@ -17,6 +18,7 @@ import dashboard.api_data as _api_data_mod
 import dashboard.api_tutor as _api_tutor_mod
 import llm_provider
 import tutor_context
+import tutor_post_turn
 import tutor_tools
 
 
@@ -201,6 +203,215 @@ def test_send_turn_stream_emits_compaction_telemetry_from_usage(client, monkeypa
     }
 
 
+def test_send_turn_stream_emits_prompt_cache_telemetry_across_turns(
+    client, monkeypatch
+):
+    session_id = _create_tutor_session(client)
+    retrieved = iter(["First turn excerpt.", "Second turn excerpt, different."])
+
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {
+            "materials": next(retrieved),
+            "notes": "",
+            "course_map": "",
+            "debug": {},
+        },
+    )
+    monkeypatch.setattr(tutor_tools, "get_tool_schemas", lambda: [])
+    captured: list[tuple[str, dict]] = []
+
+    def fake_stream(system_prompt, _user_prompt, **kwargs):
+        captured.append((system_prompt, kwargs))
+        yield {"type": "delta", "text": "Cached answer"}
+        yield {
+            "type": "done",
+            "model": "gpt-5.3-codex",
+            "usage": {
+                "input_tokens": 4_000,
+                "input_tokens_details": {"cached_tokens": 3_000},
+                "output_tokens": 200,
+            },
+        }
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    # Per-turn content_filter overrides must not change the cacheable prefix.
+    second_turn_filter = {
+        "model": "gpt-5.4",
+        "enforce_reference_bounds": True,
+        "reference_targets": ["[[Afterload]]"],
+        "objective_scope": "single_focus",
+        "memory_capsule_context": "Student confuses preload with afterload.",
+    }
+    done_events = []
+    for message, content_filter in (
+        ("Explain preload", None),
+        ("Now afterload", second_turn_filter),
+    ):
+        body: dict = {"message": message}
+        if content_filter:
+            body["content_filter"] = content_filter
+        resp = client.post(f"/api/tutor/session/{session_id}/turn", json=body)
+        assert resp.status_code == 200
+        payloads = [
+            event
+            for event in _parse_sse_events(resp.get_data(as_text=True))
+            if isinstance(event, dict)
+        ]
+        done_events.append(
+            next(event for event in payloads if event.get("type") == "done")
+        )
+
+    first, second = (event["prompt_cache"] for event in done_events)
+    assert first["prefix_reused"] is None
+    assert second["prefix_reused"] is True
+    assert first["prefix_hash"] == second["prefix_hash"]
+    assert second["input_tokens"] == 4_000
+    assert second["cached_tokens"] == 3_000
+    assert second["cached_ratio"] == 0.75
+    assert captured[0][1]["prompt_cache_key"] == f"tutor-{session_id}"
+
+    # Per-turn retrieval and per-turn overrides land after every stable section.
+    prompt = captured[1][0]
+    assert prompt.index("## Tooling") < prompt.index("## Retrieved Study Materials")
+    assert prompt.index("## Tooling") < prompt.index("## Identity")
+    assert prompt.index("## Retrieval Tuning") > prompt.index("## Tooling")
+    assert "**gpt-5.4**" in prompt
+    assert prompt.index("## Tooling") < prompt.index("## Active Reference Bounds")
+    assert prompt.index("## Tooling") < prompt.index("## Active Memory Capsule")
+
+
+def test_send_turn_reuses_session_state_until_a_write_bumps_it(client, monkeypatch):
+    session_id = _create_tutor_session(client)
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {"materials": "", "notes": "", "course_map": "", "debug": {}},
+    )
+    monkeypatch.setattr(tutor_tools, "get_tool_schemas", lambda: [])
+
+    def fake_stream(_system_prompt, _user_prompt, **_kwargs):
+        yield {"type": "delta", "text": "Answer"}
+        yield {"type": "done", "model": "gpt-5.3-codex"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    def _turn_timing(message: str) -> dict:
+        resp = client.post(
+            f"/api/tutor/session/{session_id}/turn", json={"message": message}
+        )
+        assert resp.status_code == 200
+        done = next(
+            event
+            for event in _parse_sse_events(resp.get_data(as_text=True))
+            if isinstance(event, dict) and event.get("type") == "done"
+        )
+        return done["timing"]
+
+    first = _turn_timing("Explain preload")
+    second = _turn_timing("Now afterload")
+    assert first["state_cache_misses"] > 0
+    assert second["state_cache_misses"] == 0
+    assert second["state_cache_hits"] == first["state_cache_misses"]
+
+    # Any other write to the session bumps its revision.
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/strategy-feedback", json={"pacing": "slower"}
+    )
+    assert resp.status_code == 200
+    third = _turn_timing("And contractility?")
+    assert third["state_cache_hits"] == 0
+    assert third["state_cache_misses"] == first["state_cache_misses"]
+
+    # A write from another worker never bumps this process's revision; the
+    # session stamp read at the start of the turn catches it instead.
+    _turn_timing("And heart rate?")
+    conn = db_setup.get_connection()
+    conn.execute(
+        "UPDATE tutor_sessions SET turn_count = turn_count + 1 WHERE session_id = ?",
+        (session_id,),
+    )
+    conn.commit()
+    conn.close()
+    fifth = _turn_timing("And stroke volume?")
+    assert fifth["state_cache_hits"] == 0
+
+
+def test_send_turn_reuses_prefetched_context_for_close_draft(client, monkeypatch):
+    import tutor_prefetch
+
+    tutor_prefetch.clear_prefetch_cache()
+    session_id = _create_tutor_session(client)
+    built_for: list[str] = []
+
+    def fake_build_context(query, **_kwargs):
+        built_for.append(query)
+        time.sleep(0.05)
+        return {
+            "materials": f"Excerpt for {query}",
+            "notes": "",
+            "course_map": "",
+            "debug": {},
+        }
+
+    monkeypatch.setattr(tutor_context, "build_context", fake_build_context)
+    monkeypatch.setattr(tutor_tools, "get_tool_schemas", lambda: [])
+    captured_prompts: list[str] = []
+
+    def fake_stream(system_prompt, _user_prompt, **_kwargs):
+        captured_prompts.append(system_prompt)
+        yield {"type": "delta", "text": "Answer"}
+        yield {"type": "done", "model": "gpt-5.3-codex"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    def _turn(message: str) -> dict:
+        resp = client.post(
+            f"/api/tutor/session/{session_id}/turn", json={"message": message}
+        )
+        assert resp.status_code == 200
+        payloads = [
+            event
+            for event in _parse_sse_events(resp.get_data(as_text=True))
+            if isinstance(event, dict)
+        ]
+        return next(event for event in payloads if event.get("type") == "done")
+
+    draft = "Explain how the sliding filament theory works"
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/prefetch", json={"message": draft}
+    )
+    assert resp.status_code == 204
+    deadline = time.time() + 2
+    while not built_for and time.time() < deadline:
+        time.sleep(0.01)
+
+    done = _turn("Explain how the sliding filament theory works?")
+    assert built_for == [draft]
+    assert done["timing"]["prefetch_saved_ms"] >= 0
+    assert f"Excerpt for {draft}" in captured_prompts[-1]
+
+    # A final message unrelated to the draft rebuilds context inline.
+    client.post(
+        f"/api/tutor/session/{session_id}/prefetch",
+        json={"message": "Explain how the sliding filament theory works"},
+    )
+    deadline = time.time() + 2
+    while len(built_for) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    done = _turn("What is the Frank-Starling law?")
+    assert built_for[-1] == "What is the Frank-Starling law?"
+    assert "prefetch_saved_ms" not in done["timing"]
+
+    stats = client.get("/api/tutor/prefetch/stats").get_json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    tutor_prefetch.clear_prefetch_cache()
+
+
 def test_send_turn_stream_emits_tool_round_frames_before_done(client, monkeypatch):
     session_id = _create_tutor_session(client)
     execute_calls: list[tuple[str, dict]] = []
@@ -289,6 +500,158 @@ def test_send_turn_stream_emits_tool_round_frames_before_done(client, monkeypatc
     assert done_event["timing"]["total_ms"] >= done_event["timing"]["first_chunk_ms"]
 
 
+def test_send_turn_records_span_tree_for_slowest_traces(client, monkeypatch):
+    import tutor_tracing
+
+    session_id = _create_tutor_session(client)
+
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {
+            "materials": "",
+            "instructions": "",
+            "notes": "",
+            "course_map": "",
+            "debug": {},
+        },
+    )
+    monkeypatch.setattr(
+        tutor_tools,
+        "get_tool_schemas",
+        lambda: [
+            {
+                "name": "mock_lookup",
+                "description": "Mock tool",
+                "parameters": {"type": "object", "properties": {}},
+            }
+        ],
+    )
+
+    def fake_execute_tool(name, args, **_kwargs):
+        with tutor_tracing.span("tool.execute", tool=name):
+            time.sleep(0.01)
+        return {"success": True, "message": "tool ok"}
+
+    monkeypatch.setattr(tutor_tools, "execute_tool", fake_execute_tool)
+
+    def fake_stream(_system_prompt, _user_prompt, **kwargs):
+        if kwargs.get("input_override"):
+            yield {"type": "delta", "text": "Traced answer"}
+            yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-t2"}
+            return
+        yield {
+            "type": "tool_call",
+            "name": "mock_lookup",
+            "call_id": "call-1",
+            "arguments": json.dumps({"topic": "hip"}),
+        }
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-t1"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/turn",
+        json={"message": "Trace this turn"},
+    )
+    assert resp.status_code == 200
+    resp.get_data(as_text=True)
+    # Traces are saved by the post-turn workers after the stream closes.
+    assert tutor_post_turn.wait_for_post_turn_idle()
+
+    traces_resp = client.get(f"/api/tutor/traces/slowest?session_id={session_id}")
+    assert traces_resp.status_code == 200
+    traces = traces_resp.get_json()["traces"]
+    assert len(traces) == 1
+    trace = traces[0]
+    assert trace["name"] == "tutor.turn"
+    assert trace["status"] == "ok"
+    assert trace["turn_number"] == 1
+    assert trace["duration_ms"] >= 10
+
+    [root] = trace["spans"]
+    stage_names = [child["name"] for child in root["children"]]
+    for name in ("turn.prepare", "context.retrieve", "prompt.assemble", "turn.persist"):
+        assert name in stage_names
+    llm_rounds = [child for child in root["children"] if child["name"] == "llm.stream"]
+    assert [span["attributes"]["round"] for span in llm_rounds] == [0, 1]
+    assert all(span["attributes"]["items"] == 2 for span in llm_rounds)
+    tool_spans = [child for child in root["children"] if child["name"] == "tool.execute"]
+    assert len(tool_spans) == 1
+    assert tool_spans[0]["attributes"]["tool"] == "mock_lookup"
+    assert tool_spans[0]["duration_ms"] >= 10
+
+
+def test_send_turn_closes_stream_before_deferred_vault_writes(
+    app, client, monkeypatch
+):
+    import obsidian_vault
+
+    session_id = _create_tutor_session(client)
+
+    monkeypatch.setattr(
+        tutor_context,
+        "build_context",
+        lambda *_a, **_k: {
+            "materials": "",
+            "instructions": "",
+            "notes": "",
+            "course_map": "",
+            "debug": {},
+        },
+    )
+    monkeypatch.setattr(tutor_tools, "get_tool_schemas", lambda: [])
+
+    release = threading.Event()
+    writes: list[tuple[str, str]] = []
+
+    class SlowVault:
+        def append_note(self, file: str, content: str) -> str:
+            release.wait(5)
+            writes.append((file, content))
+            return f"Appended to {file}"
+
+    monkeypatch.setattr(obsidian_vault, "ObsidianVault", SlowVault)
+
+    artifact_text = (
+        "Here is the summary.\n"
+        ":::vault:append\nfile: Notes/Shoulder.md\ncontent: Rotator cuff recap\n:::"
+    )
+
+    def fake_stream(_system_prompt, _user_prompt, **_kwargs):
+        yield {"type": "delta", "text": artifact_text}
+        yield {"type": "done", "model": "gpt-5.3-codex", "response_id": "resp-v"}
+
+    monkeypatch.setattr(llm_provider, "stream_chatgpt_responses", fake_stream)
+
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/turn",
+        json={"message": "Save this to my notes"},
+    )
+    events = _parse_sse_events(resp.get_data(as_text=True))
+    # The stream closed while the vault write is still blocked.
+    assert writes == []
+    done = next(e for e in events if isinstance(e, dict) and e.get("type") == "done")
+    vault_entry = next(a for a in done["artifacts"] if "vault_artifacts" in a)
+    assert vault_entry["vault_artifacts"] == [
+        {"operation": "append", "status": "queued"}
+    ]
+
+    conn = db_setup.get_connection()
+    try:
+        answer = conn.execute(
+            "SELECT answer FROM tutor_turns WHERE tutor_session_id = ?",
+            (session_id,),
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    assert ":::vault" not in answer
+
+    release.set()
+    assert tutor_post_turn.wait_for_post_turn_idle()
+    assert writes == [("Notes/Shoulder.md", "Rotator cuff recap")]
+
+
 def test_send_turn_stream_emits_error_frame_and_done_sentinel(client, monkeypatch):
     session_id = _create_tutor_session(client)
 
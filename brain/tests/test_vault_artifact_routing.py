@@ -151,3 +151,104 @@ def test_execute_all_artifacts_partial_failure():
     results = execute_all_artifacts(vault, artifacts)
     assert results[0]["success"] is True
     assert results[1]["success"] is False
+
+
+class _DictVault:
+    """In-memory vault that records every call."""
+
+    def __init__(self, notes):
+        self.notes = dict(notes)
+        self.calls = []
+
+    def read_note(self, file):
+        self.calls.append(("read", file))
+        return self.notes.get(file, "").strip()
+
+    def write_note(self, file, new_content):
+        self.calls.append(("write", file))
+        self.notes[file] = new_content
+        return ""
+
+    def write_note_if_unchanged(self, file, expected_hash, new_content):
+        from obsidian_vault import NOTE_CHANGED, note_content_hash
+
+        if note_content_hash(self.notes.get(file, "")) != expected_hash:
+            self.calls.append(("conflict", file))
+            return NOTE_CHANGED
+        return self.write_note(file, new_content)
+
+    def append_note(self, file, content):
+        self.calls.append(("append", file))
+        self.notes[file] = self.notes.get(file, "") + content + "\n"
+        return ""
+
+
+def test_batch_coalesces_edits_to_one_write_per_note():
+    from vault_artifact_router import execute_artifact_batch
+
+    vault = _DictVault(
+        {
+            "Note A": "---\nstatus: draft\n---\n# A\n\n## LOs\nold\n\n## Notes\nkeep\n",
+            "Note B": "# B\n",
+        }
+    )
+    artifacts = [
+        {"operation": "append", "params": {"file": "Note A", "content": "- appended"}},
+        {"operation": "property", "params": {"file": "Note A", "key": "status", "value": "done"}},
+        {"operation": "replace-section", "params": {"file": "Note A", "heading": "## LOs", "content": "new"}},
+        {"operation": "replace-section", "params": {"file": "Note A", "heading": "## Missing", "content": "x"}},
+        {"operation": "prepend", "params": {"file": "Note A", "content": "Top"}},
+        {"operation": "append", "params": {"file": "Note B", "content": "- only"}},
+    ]
+    batch = execute_artifact_batch(vault, artifacts)
+
+    assert [r["success"] for r in batch["results"]] == [True, True, True, False, True, True]
+    assert "Heading not found" in batch["results"][3]["result"]
+    assert batch["note_writes"] == {"Note A": 1, "Note B": 1}
+    assert sorted(c for c in vault.calls if c[1] == "Note A") == [("read", "Note A"), ("write", "Note A")]
+    assert vault.notes["Note A"] == (
+        "---\nstatus: done\n---\nTop\n# A\n\n## LOs\n\nnew\n## Notes\nkeep\n- appended\n"
+    )
+    assert vault.notes["Note B"] == "# B\n- only\n"
+
+
+def test_batch_writes_one_by_one_when_note_changes_after_read():
+    from vault_artifact_router import execute_artifact_batch
+
+    class _EditedVault(_DictVault):
+        def read_note(self, file):
+            text = super().read_note(file)
+            self.notes[file] = text + "\nstudent edit\n"
+            return text
+
+    vault = _EditedVault({"Note A": "# A\n"})
+    artifacts = [
+        {"operation": "append", "params": {"file": "Note A", "content": "- one"}},
+        {"operation": "append", "params": {"file": "Note A", "content": "- two"}},
+    ]
+    batch = execute_artifact_batch(vault, artifacts)
+
+    assert [r["success"] for r in batch["results"]] == [True, True]
+    assert not any(r.get("coalesced") for r in batch["results"])
+    assert vault.calls == [
+        ("read", "Note A"),
+        ("conflict", "Note A"),
+        ("append", "Note A"),
+        ("append", "Note A"),
+    ]
+    assert vault.notes["Note A"] == "# A\nstudent edit\n- one\n- two\n"
+    assert batch["note_writes"] == {"Note A": 2}
+
+
+def test_plan_keeps_per_note_order_and_moves_as_barriers():
+    from vault_artifact_router import plan_artifacts
+
+    artifacts = [
+        {"operation": "create", "params": {"name": "X", "folder": "Course"}},
+        {"operation": "append", "params": {"file": "Y", "content": "a"}},
+        {"operation": "append", "params": {"file": "Course/X.md", "content": "b"}},
+        {"operation": "search", "params": {"query": "q"}},
+        {"operation": "move", "params": {"path": "Y.md", "name": "Z"}},
+        {"operation": "append", "params": {"file": "Z", "content": "c"}},
+    ]
+    assert plan_artifacts(artifacts) == [[[0, 2], [1], [3]], [[4]], [[5]]]
@@ -0,0 +1,95 @@
+"""Tests for the persistent vault note fingerprint store."""
+
+from __future__ import annotations
+
+import os
+import random
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from vault_fingerprints import NoteFingerprintStore
+
+
+def _lecture(seed: int, words: int = 300) -> str:
+    rng = random.Random(seed)
+    vocab = [f"term{idx}" for idx in range(2000)]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+def _edited(body: str, edits: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = body.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = "edited"
+    return " ".join(words)
+
+
+def test_store_finds_exact_and_near_duplicates_incrementally() -> None:
+    store = NoteFingerprintStore()
+    lecture = _lecture(1)
+    store.update("A.md", lecture)
+    store.update("B.md", lecture)
+    store.update("C.md", _edited(lecture, 4))
+    store.update("D.md", _lecture(2))
+
+    assert store.exact_duplicates("A.md") == ["B.md"]
+    assert [path for path, _ in store.near_duplicates("C.md")] == ["A.md", "B.md"]
+    assert store.near_duplicates("D.md") == []
+    assert store.signatures_built == 3  # B.md reused A.md's signature
+
+    assert store.update("C.md", _edited(lecture, 4)) is False
+    store.update("C.md", _lecture(3))
+    assert store.near_duplicates("A.md") == []
+
+    store.remove("B.md")
+    assert store.exact_duplicates("A.md") == []
+    assert "B.md" not in store
+
+
+def test_store_round_trips_through_sqlite() -> None:
+    conn = sqlite3.connect(":memory:")
+    lecture = _lecture(4)
+    store = NoteFingerprintStore()
+    store.update("A.md", lecture)
+    store.update("B.md", _edited(lecture, 3))
+    store.update("Gone.md", _lecture(5))
+    store.save(conn)
+    store.remove("Gone.md")
+    assert store.save(conn) == 1
+
+    reloaded = NoteFingerprintStore()
+    assert reloaded.load(conn) == 2
+    assert reloaded.near_duplicate_pairs() == store.near_duplicate_pairs()
+    assert reloaded.update("A.md", lecture) is False
+    assert reloaded.signatures_built == 0
+
+
+def test_scan_vault_reports_near_duplicates(tmp_path, monkeypatch) -> None:
+    import obsidian_index
+    import vault_janitor
+
+    lecture = _lecture(6)
+    notes = tmp_path / "Courses" / "Neuro"
+    notes.mkdir(parents=True)
+    (notes / "Lecture 1.md").write_text(f"# Lecture 1\n{lecture}\n", encoding="utf-8")
+    (notes / "Lecture 1 copy.md").write_text(f"# Lecture 1\n{_edited(lecture, 5)}\n", encoding="utf-8")
+    (notes / "Lecture 2.md").write_text(f"# Lecture 2\n{_lecture(7)}\n", encoding="utf-8")
+    monkeypatch.setenv("OBSIDIAN_VAULT_FS_PATH", str(tmp_path))
+    monkeypatch.setenv("PT_VAULT_WATCHER", "0")
+    monkeypatch.setattr(vault_janitor, "_FINGERPRINTS", NoteFingerprintStore())
+    monkeypatch.setattr(vault_janitor, "_save_fingerprints", lambda: None)
+    obsidian_index.clear_vault_cache()
+    vault_janitor.clear_scan_cache()
+
+    result = vault_janitor.scan_vault(checks=["duplicate"])
+
+    details = sorted((issue.path, issue.detail, issue.confidence) for issue in result.issues)
+    assert len(details) == 1
+    path, detail, confidence = details[0]
+    assert path.endswith("Lecture 1 copy.md") or path.endswith("Lecture 1.md")
+    assert detail.startswith("Near-duplicate of Courses/Neuro/Lecture 1")
+    assert confidence == "medium"
+    obsidian_index.clear_vault_cache()
+    vault_janitor.clear_scan_cache()
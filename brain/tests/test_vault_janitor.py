@@ -243,3 +243,42 @@ def test_apply_fix_updates_yaml_frontmatter(mock_vault_cls) -> None:
     assert result["success"] is True
     saved_content = mock_vault.replace_content.call_args.kwargs["new_content"]
     assert "module_name: Week 9" in saved_content
+
+
+def test_scan_vault_rescans_only_changed_notes(tmp_path, monkeypatch) -> None:
+    import obsidian_index
+    import vault_janitor
+
+    concepts = tmp_path / "Concepts" / "Anatomy"
+    concepts.mkdir(parents=True)
+    (concepts / "Basal Ganglia.md").write_text(CONCEPT_NOTE, encoding="utf-8")
+    (concepts / "Thalamus.md").write_text(CONCEPT_NOTE_NO_ALIASES, encoding="utf-8")
+    (concepts / "Striatum.md").write_text("# Striatum\n", encoding="utf-8")
+    monkeypatch.setenv("OBSIDIAN_VAULT_FS_PATH", str(tmp_path))
+    monkeypatch.setenv("PT_VAULT_WATCHER", "0")
+    obsidian_index.clear_vault_cache()
+    vault_janitor.clear_scan_cache()
+
+    first = scan_vault()
+    again = scan_vault()
+
+    def _issues(result):
+        return sorted((issue.issue_type, issue.path, issue.field) for issue in result.issues)
+
+    assert first.notes_reparsed == 3
+    assert again.notes_reparsed == 0
+    assert _issues(again) == _issues(first)
+    assert ("orphan", "Concepts/Anatomy/Thalamus.md", "") in _issues(first)
+
+    edited = concepts / "Striatum.md"
+    edited.write_text("# Striatum\nProjects to [[Thalamus]] and [[Substantia Nigra]].\n", encoding="utf-8")
+    stat = edited.stat()
+    os.utime(edited, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    changed = scan_vault()
+
+    assert changed.notes_reparsed == 1
+    assert ("orphan", "Concepts/Anatomy/Thalamus.md", "") not in _issues(changed)
+    assert ("broken_link", "Concepts/Anatomy/Striatum.md", "Substantia Nigra") in _issues(changed)
+    obsidian_index.clear_vault_cache()
+    vault_janitor.clear_scan_cache()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import vault_search_index
+from vault_search_index import VaultSearchIndex
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / "Neuro").mkdir()
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / "Neuro" / "Brachial Plexus.md").write_text(
+        "---\naliases: [BP roots]\ntags: [anatomy]\n---\n"
+        "# Roots\nThe plexus arises from C5-T1 ventral rami.\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "Neuro" / "Dermatomes.md").write_text(
+        "## Upper limb\nC5 covers the lateral arm. #neuro\n", encoding="utf-8"
+    )
+    (tmp_path / ".obsidian" / "workspace.md").write_text("plexus", encoding="utf-8")
+    return tmp_path
+
+
+def test_search_ranks_titles_and_aliases_and_returns_snippets(vault):
+    index = VaultSearchIndex(vault)
+
+    hits = index.search("brachial plexus roots", limit=5)
+
+    assert [hit["path"] for hit in hits] == ["Neuro/Brachial Plexus.md"]
+    hit = hits[0]
+    assert hit["name"] == "Brachial Plexus"
+    assert hit["content"].startswith("# Roots")
+    assert "**plexus**" in hit["snippet"]
+    assert index.search("BP roots")[0]["path"] == "Neuro/Brachial Plexus.md"
+    assert index.search("neuro")[0]["path"] == "Neuro/Dermatomes.md"
+    assert index.search("?!") == []
+
+
+def test_refresh_reindexes_only_changed_and_drops_deleted_notes(vault):
+    index = VaultSearchIndex(vault)
+    assert index.refresh(force=True) == {"indexed": 2, "removed": 0}
+    assert index.refresh(force=True) == {"indexed": 0, "removed": 0}
+
+    note = vault / "Neuro" / "Dermatomes.md"
+    note.write_text("Myotomes replace this note.\n", encoding="utf-8")
+    os.utime(note, ns=(1, 10**18))
+    (vault / "Neuro" / "Brachial Plexus.md").unlink()
+
+    assert index.refresh(force=True) == {"indexed": 1, "removed": 1}
+    assert index.search("plexus") == []
+    assert index.search("myotomes")[0]["path"] == "Neuro/Dermatomes.md"
+
+
+def test_fetch_notes_prefers_local_index(vault, monkeypatch):
+    import obsidian_vault
+    import tutor_context
+
+    monkeypatch.setenv("OBSIDIAN_VAULT_FS_PATH", str(vault))
+    vault_search_index.clear_vault_search_indexes()
+
+    def _no_cli(*_a, **_k):
+        raise AssertionError("Obsidian CLI should not be called")
+
+    monkeypatch.setattr(obsidian_vault.ObsidianVault, "search", _no_cli)
+    debug: dict = {}
+    text = tutor_context._fetch_notes("ventral rami", debug=debug)
+    vault_search_index.clear_vault_search_indexes()
+
+    assert debug["notes_source"] == "local_index"
+    assert debug["notes_hits"] == 1
+    assert text.startswith("### Neuro/Brachial Plexus.md\n# Roots")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+import obsidian_index
+import vault_search_index
+import vault_watcher
+from vault_watcher import VaultChangeFeed, VaultEvent
+
+
+@pytest.fixture
+def live_vault(tmp_path, monkeypatch):
+    (tmp_path / "Neuro").mkdir()
+    (tmp_path / "Neuro" / "Plexus.md").write_text(
+        "Roots feed [[Dermatomes]] and [[Myotomes]].\n", encoding="utf-8"
+    )
+    (tmp_path / "Neuro" / "Dermatomes.md").write_text(
+        "Sensory map.\n", encoding="utf-8"
+    )
+    monkeypatch.setenv("OBSIDIAN_VAULT_FS_PATH", str(tmp_path))
+    monkeypatch.setattr(vault_watcher, "POLL_INTERVAL_SECONDS", 0.05)
+    vault_watcher.stop_vault_watchers()
+    obsidian_index.clear_vault_cache()
+    obsidian_index._LIVE_ROOTS.clear()
+    vault_search_index.clear_vault_search_indexes()
+    yield tmp_path
+    vault_watcher.stop_vault_watchers()
+    obsidian_index.clear_vault_cache()
+    obsidian_index._LIVE_ROOTS.clear()
+    vault_search_index.clear_vault_search_indexes()
+
+
+def _eventually(check, timeout: float = 3.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return check()
+        except AssertionError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.02)
+
+
+def _links(graph: dict) -> set[tuple[str, str]]:
+    return {(link["source"], link["target"]) for link in graph["links"]}
+
+
+def test_diff_snapshots_reports_moves_by_inode():
+    before = {"a.md": (1, 10, 7), "b.md": (1, 10, 8), "c.md": (1, 10, 9)}
+    after = {"moved/a.md": (1, 10, 7), "b.md": (2, 11, 8), "d.md": (1, 5, 10)}
+
+    events = vault_watcher.diff_snapshots(before, after)
+
+    assert set(events) == {
+        VaultEvent("moved", "a.md", "moved/a.md"),
+        VaultEvent("modified", "b.md"),
+        VaultEvent("deleted", "c.md"),
+        VaultEvent("created", "d.md"),
+    }
+
+
+def test_feed_dispatches_batches_to_subscribers(tmp_path):
+    feed = VaultChangeFeed(tmp_path, native=False)
+    feed.start()
+    batches: list[list[VaultEvent]] = []
+    feed.subscribe(batches.append)
+    try:
+        (tmp_path / "New.md").write_text("x", encoding="utf-8")
+        assert feed.poll_once() == [VaultEvent("created", "New.md")]
+        assert batches == [[VaultEvent("created", "New.md")]]
+        assert feed.poll_once() == []
+    finally:
+        feed.stop()
+
+
+def test_index_graph_and_search_follow_vault_edits(live_vault):
+    index = obsidian_index.get_vault_index()
+    graph = obsidian_index.get_vault_graph()
+    search = vault_search_index.get_vault_search_index()
+    assert search is not None and search.live
+    assert index["count"] == 2
+    assert _links(graph) == {("Neuro/Plexus.md", "Neuro/Dermatomes.md")}
+
+    (live_vault / "Neuro" / "Myotomes.md").write_text(
+        "---\naliases: [Motor map]\n---\nC5 abducts the shoulder.\n", encoding="utf-8"
+    )
+    plexus = live_vault / "Neuro" / "Plexus.md"
+    plexus.write_text("Roots feed [[Motor map]] only.\n", encoding="utf-8")
+    os.utime(plexus, ns=(1, 10**18))
+    (live_vault / "Neuro" / "Dermatomes.md").rename(live_vault / "Sensory.md")
+
+    def _consistent():
+        index = obsidian_index.get_vault_index()
+        graph = obsidian_index.get_vault_graph()
+        assert index["cached"] is True
+        assert [f["path"] for f in index["files"]] == [
+            "Neuro/Myotomes.md",
+            "Neuro/Plexus.md",
+            "Sensory.md",
+        ]
+        assert _links(graph) == {("Neuro/Plexus.md", "Neuro/Myotomes.md")}
+        assert graph["cached"] is True
+        assert search.search("abducts shoulder")[0]["path"] == "Neuro/Myotomes.md"
+        assert search.search("sensory map")[0]["path"] == "Sensory.md"
+
+    _eventually(_consistent)
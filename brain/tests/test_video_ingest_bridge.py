@@ -86,3 +86,52 @@ def test_ingest_video_artifacts_ingests_docs_and_embeds(
     assert "lecture.mp4" in linkage_calls[0]["source_video_path"]
     assert linkage_calls[1]["doc_id"] == 202
     assert linkage_calls[1]["doc_role"] == "visual_notes"
+
+
+def test_video_linkage_follows_reingest_and_doc_deletes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import config as app_config
+    import db_setup
+    from video_ingest_bridge import _persist_video_linkage
+
+    db_file = tmp_path / "links.db"
+    monkeypatch.setenv("PT_STUDY_DB", str(db_file))
+    monkeypatch.setattr(app_config, "DB_PATH", str(db_file))
+    monkeypatch.setattr(db_setup, "DB_PATH", str(db_file))
+    db_setup.init_database()
+
+    conn = db_setup.get_connection()
+    ids = [
+        conn.execute(
+            "INSERT INTO rag_docs (source_path, content, created_at) "
+            "VALUES (?, 'x', '2026-01-01')",
+            (name,),
+        ).lastrowid
+        for name in ("old.mp4", "new.mp4", "transcript.md")
+    ]
+    conn.commit()
+    conn.close()
+    old_video, new_video, transcript = ids
+
+    def links() -> list[tuple[int, int]]:
+        conn = db_setup.get_connection()
+        try:
+            return [
+                tuple(row)
+                for row in conn.execute(
+                    "SELECT parent_id, child_id FROM rag_doc_links ORDER BY parent_id"
+                )
+            ]
+        finally:
+            conn.close()
+
+    _persist_video_linkage(transcript, old_video, "old.mp4", "transcript")
+    _persist_video_linkage(transcript, new_video, "new.mp4", "transcript")
+    assert links() == [(new_video, transcript)]
+
+    conn = db_setup.get_connection()
+    conn.execute("DELETE FROM rag_docs WHERE id = ?", (new_video,))
+    conn.commit()
+    conn.close()
+    assert links() == []
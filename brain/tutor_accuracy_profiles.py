@@ -1,7 +1,11 @@
 """
 Tutor retrieval accuracy profile helpers.
 
-These profiles tune retrieval depth for live tutor turns and eval runs.
+These profiles tune retrieval depth for live tutor turns and eval runs, and
+the per-turn latency budget (milliseconds) that ``tutor_latency_budget``
+enforces: ``first_token_ms`` bounds the context work done before the model
+is called, the ``*_ms`` stage allowances split it, and ``tools_ms`` /
+``artifacts_ms`` cap tool calls made while the answer streams.
 """
 
 from __future__ import annotations
@@ -20,6 +24,15 @@ ACCURACY_PROFILE_CONFIG: dict[TutorAccuracyProfile, dict[str, Any]] = {
         "material_k_min": 6,
         "material_k_max": 60,
         "instruction_k": 2,
+        "latency_budget": {
+            "first_token_ms": 8000,
+            "retrieval_ms": 6000,
+            "notes_ms": 3000,
+            "graph_ms": 1000,
+            "vision_ms": 3000,
+            "tools_ms": 15000,
+            "artifacts_ms": 10000,
+        },
     },
     "strict": {
         "label": "Strict",
@@ -28,6 +41,15 @@ ACCURACY_PROFILE_CONFIG: dict[TutorAccuracyProfile, dict[str, Any]] = {
         "material_k_min": 8,
         "material_k_max": 72,
         "instruction_k": 3,
+        "latency_budget": {
+            "first_token_ms": 10000,
+            "retrieval_ms": 8000,
+            "notes_ms": 4000,
+            "graph_ms": 1500,
+            "vision_ms": 4000,
+            "tools_ms": 20000,
+            "artifacts_ms": 15000,
+        },
     },
     "coverage": {
         "label": "Coverage",
@@ -36,6 +58,15 @@ ACCURACY_PROFILE_CONFIG: dict[TutorAccuracyProfile, dict[str, Any]] = {
         "material_k_min": 12,
         "material_k_max": 84,
         "instruction_k": 4,
+        "latency_budget": {
+            "first_token_ms": 12000,
+            "retrieval_ms": 10000,
+            "notes_ms": 5000,
+            "graph_ms": 2000,
+            "vision_ms": 5000,
+            "tools_ms": 25000,
+            "artifacts_ms": 15000,
+        },
     },
 }
 
@@ -73,3 +104,8 @@ def resolve_material_retrieval_k(
 def resolve_instruction_retrieval_k(profile: Any = DEFAULT_ACCURACY_PROFILE) -> int:
     config = accuracy_profile_config(profile)
     return int(config["instruction_k"])
+
+
+def resolve_latency_budget(profile: Any = DEFAULT_ACCURACY_PROFILE) -> dict[str, int]:
+    config = accuracy_profile_config(profile)
+    return {key: int(value) for key, value in config["latency_budget"].items()}
@@ -4,13 +4,21 @@ Single entry point replacing scattered retrieval logic in api_tutor.py.
 """
 from __future__ import annotations
 
+import codecs
 import logging
 import json
 import os
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, Literal, Optional
 
+from tutor_tracing import propagate
+from tutor_tracing import span as trace_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +46,13 @@ ContextDepth = Literal["auto", "none", "notes", "materials"]
 
 FULL_CONTENT_BUDGET = 200_000  # ~50K tokens — safe for 128K+ context models
 
+# Shared per-turn deadline for the concurrent context sources. A source that
+# misses it is left out of the turn (see debug["partial"]).
+CONTEXT_DEADLINE_SECONDS = 8.0
+# Sources run on a shared pool so a slow source never blocks the others and
+# a late one keeps at most one thread busy until it returns.
+_CONTEXT_EXECUTOR = ThreadPoolExecutor(max_workers=12, thread_name_prefix="tutor-context")
+
 
 def _vault_context_disabled() -> bool:
     value = str(os.environ.get("PT_HARNESS_DISABLE_VAULT_CONTEXT") or "").strip().lower()
@@ -49,60 +64,60 @@ def _expand_linked_material_ids(material_ids: Optional[list[int]]) -> Optional[l
     if not material_ids:
         return material_ids
 
+    expanded: list[int] = []
+    seen: set[int] = set()
+    for mid in material_ids:
+        value = int(mid)
+        if value not in seen:
+            seen.add(value)
+            expanded.append(value)
+
     try:
         from db_setup import DB_PATH
 
         conn = sqlite3.connect(DB_PATH, timeout=30)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, metadata_json
-            FROM rag_docs
-            WHERE COALESCE(corpus, 'materials') = 'materials'
-            """
-        )
-        rows = cur.fetchall()
+        placeholders = ",".join("?" for _ in expanded)
+        rows = conn.execute(
+            f"""
+            SELECT l.child_id
+            FROM rag_doc_links l
+            JOIN rag_docs d ON d.id = l.child_id
+            WHERE l.kind = 'video'
+              AND l.parent_id IN ({placeholders})
+              AND COALESCE(d.corpus, 'materials') = 'materials'
+            ORDER BY l.child_id
+            """,
+            expanded,
+        ).fetchall()
         conn.close()
     except Exception as exc:
         logger.warning("Linked material expansion failed: %s", exc)
         return material_ids
 
-    selected = {int(mid) for mid in material_ids}
-    expanded: list[int] = []
-    seen: set[int] = set()
-
-    for mid in material_ids:
-        value = int(mid)
-        if value not in seen:
-            seen.add(value)
-            expanded.append(value)
-
-    for row in rows:
-        doc_id = int(row["id"])
-        if doc_id in seen:
-            continue
-        raw_meta = row["metadata_json"]
-        if not raw_meta:
-            continue
-        try:
-            meta = json.loads(raw_meta)
-        except (json.JSONDecodeError, TypeError):
-            continue
-        if not isinstance(meta, dict):
-            continue
-        linked_material_id = meta.get("video_material_id")
-        try:
-            linked_value = int(linked_material_id)
-        except (TypeError, ValueError):
-            continue
-        if linked_value in selected:
+    for (doc_id,) in rows:
+        doc_id = int(doc_id)
+        if doc_id not in seen:
             seen.add(doc_id)
             expanded.append(doc_id)
 
     return expanded
 
 
+# Assembled full-material blocks, keyed by (db, material set, budget, mode).
+# Each entry keeps the (id, source_path, checksum, updated_at) stamps it was
+# built from; a re-ingested or edited material changes its stamp and forces
+# a rebuild. Selections rarely change within a session, so later turns skip
+# SQLite content reads entirely.
+_FULL_MATERIAL_CACHE: "OrderedDict[tuple[Any, ...], tuple[tuple[Any, ...], str, dict[str, Any]]]" = OrderedDict()
+_FULL_MATERIAL_CACHE_MAX = 32
+_FULL_MATERIAL_LOCK = threading.Lock()
+
+
+def clear_full_material_cache() -> None:
+    with _FULL_MATERIAL_LOCK:
+        _FULL_MATERIAL_CACHE.clear()
+
+
 def _load_full_materials(
     material_ids: list[int],
     budget: int = FULL_CONTENT_BUDGET,
@@ -115,53 +130,167 @@ def _load_full_materials(
     and give the LLM the full text of every file.  If total content exceeds
     the budget, each doc is truncated proportionally so every file still
     gets fair representation.
+
+    Sizes come from ``rag_doc_sizes``, measured once per doc version, and
+    each document's prefix is read incrementally through ``blobopen``. A
+    selection of whole textbooks therefore reads about ``budget``
+    characters per turn rather than every blob.
     """
     import sqlite3
     from db_setup import DB_PATH
 
     conn = sqlite3.connect(DB_PATH)
-    placeholders = ",".join("?" * len(material_ids))
-    rows = conn.execute(
-        f"SELECT id, source_path, content FROM rag_docs WHERE id IN ({placeholders})",
-        list(material_ids),
-    ).fetchall()
-    conn.close()
-
-    if not rows:
-        return ""
+    try:
+        placeholders = ",".join("?" * len(material_ids))
+        stamp_rows = conn.execute(
+            f"SELECT id, source_path, checksum, updated_at FROM rag_docs "
+            f"WHERE id IN ({placeholders})",
+            list(material_ids),
+        ).fetchall()
+        if not stamp_rows:
+            return ""
 
-    total_chars = sum(len(r[2] or "") for r in rows)
+        cache_key = (
+            str(DB_PATH),
+            tuple(sorted({int(mid) for mid in material_ids})),
+            int(budget),
+            bool(force_full_docs),
+        )
+        stamp = tuple(stamp_rows)
+        with _FULL_MATERIAL_LOCK:
+            cached = _FULL_MATERIAL_CACHE.get(cache_key)
+            if cached is not None and cached[0] == stamp:
+                _FULL_MATERIAL_CACHE.move_to_end(cache_key)
+        if cached is not None and cached[0] == stamp:
+            if debug is not None:
+                debug.update(cached[2])
+                debug["materials_cache_hit"] = True
+                debug["materials_bytes_read"] = 0
+            return cached[1]
+
+        sizes, bytes_read = _rag_doc_sizes(conn, stamp_rows)
+        total_chars = sum(size for size, _byte_length in sizes.values())
+
+        sections: list[str] = []
+        source_labels: list[str] = []
+        for doc_id, source_path, _checksum, _updated_at in stamp_rows:
+            size, byte_length = sizes.get(int(doc_id), (0, 0))
+            if not size:
+                continue
+            if total_chars <= budget:
+                doc_budget = size
+            else:
+                doc_budget = max(int(budget * size / total_chars), 500)
+            text, read = _read_content_prefix(conn, int(doc_id), doc_budget, byte_length)
+            bytes_read += read
+            if not text:
+                continue
+            filename = _material_source_label(source_path) or f"Document {doc_id}"
+            source_labels.append(filename)
+            if len(text) < size:
+                text += (
+                    f"\n\n[... truncated — {size - len(text):,} chars remaining ...]"
+                )
+            sections.append(f"### {filename}\n\n{text}")
+    finally:
+        conn.close()
 
-    sections: list[str] = []
-    source_labels: list[str] = []
-    for doc_id, source_path, content in rows:
-        if not content:
-            continue
-        filename = _material_source_label(source_path) or f"Document {doc_id}"
-        source_labels.append(filename)
-        if total_chars <= budget:
-            text = content
-        else:
-            doc_budget = max(int(budget * len(content) / total_chars), 500)
-            text = content[:doc_budget] + (
-                f"\n\n[... truncated — {len(content) - doc_budget:,} chars remaining ...]"
-            )
-        sections.append(f"### {filename}\n\n{text}")
+    ordered_sources = _ordered_unique_sources(source_labels)
+    material_debug = {
+        "mode": "forced_full_content" if force_full_docs else "full_content",
+        "force_full_docs": bool(force_full_docs),
+        "materials_count": len(stamp_rows),
+        "materials_total_chars": total_chars,
+        "materials_truncated": total_chars > budget,
+        "retrieved_chunks": len(stamp_rows),
+        "retrieved_unique_sources": len(ordered_sources),
+        "sources": ordered_sources[:20],
+        "top_source": ordered_sources[0] if ordered_sources else None,
+        "top_source_share": round(1 / len(stamp_rows), 4) if stamp_rows else 0.0,
+    }
+    block = "\n\n---\n\n".join(sections)
+    with _FULL_MATERIAL_LOCK:
+        _FULL_MATERIAL_CACHE[cache_key] = (stamp, block, material_debug)
+        _FULL_MATERIAL_CACHE.move_to_end(cache_key)
+        while len(_FULL_MATERIAL_CACHE) > _FULL_MATERIAL_CACHE_MAX:
+            _FULL_MATERIAL_CACHE.popitem(last=False)
 
     if debug is not None:
-        ordered_sources = _ordered_unique_sources(source_labels)
-        debug["mode"] = "forced_full_content" if force_full_docs else "full_content"
-        debug["force_full_docs"] = bool(force_full_docs)
-        debug["materials_count"] = len(rows)
-        debug["materials_total_chars"] = total_chars
-        debug["materials_truncated"] = total_chars > budget
-        debug["retrieved_chunks"] = len(rows)
-        debug["retrieved_unique_sources"] = len(ordered_sources)
-        debug["sources"] = ordered_sources[:20]
-        debug["top_source"] = ordered_sources[0] if ordered_sources else None
-        debug["top_source_share"] = round(1 / len(rows), 4) if rows else 0.0
+        debug.update(material_debug)
+        debug["materials_cache_hit"] = False
+        debug["materials_bytes_read"] = bytes_read
+
+    return block
 
-    return "\n\n---\n\n".join(sections)
+
+def _rag_doc_sizes(
+    conn: sqlite3.Connection, stamp_rows: list[tuple[Any, ...]]
+) -> tuple[dict[int, tuple[int, int]], int]:
+    """(char_length, byte_length) per doc id, and the bytes read to measure.
+
+    Sizes stored in ``rag_doc_sizes`` under the doc's current checksum and
+    updated_at are reused; other docs are measured (a full read) and stored.
+    """
+    ids = [int(row[0]) for row in stamp_rows]
+    placeholders = ",".join("?" * len(ids))
+    stamps = {int(doc_id): (checksum, updated_at) for doc_id, _path, checksum, updated_at in stamp_rows}
+    sizes: dict[int, tuple[int, int]] = {}
+    try:
+        for doc_id, checksum, updated_at, char_length, byte_length in conn.execute(
+            f"SELECT doc_id, checksum, updated_at, char_length, byte_length "
+            f"FROM rag_doc_sizes WHERE doc_id IN ({placeholders})",
+            ids,
+        ):
+            if stamps.get(int(doc_id)) == (checksum, updated_at):
+                sizes[int(doc_id)] = (int(char_length), int(byte_length))
+        stored = True
+    except sqlite3.OperationalError:  # database predates rag_doc_sizes
+        stored = False
+
+    missing = [doc_id for doc_id in ids if doc_id not in sizes]
+    if not missing:
+        return sizes, 0
+    measured = conn.execute(
+        f"SELECT id, length(content), length(CAST(content AS BLOB)) FROM rag_docs "
+        f"WHERE id IN ({','.join('?' * len(missing))})",
+        missing,
+    ).fetchall()
+    bytes_read = 0
+    for doc_id, char_length, byte_length in measured:
+        sizes[int(doc_id)] = (int(char_length or 0), int(byte_length or 0))
+        bytes_read += int(byte_length or 0)
+    if stored:
+        conn.executemany(
+            "INSERT OR REPLACE INTO rag_doc_sizes "
+            "(doc_id, checksum, updated_at, char_length, byte_length) VALUES (?, ?, ?, ?, ?)",
+            [(doc_id, *stamps[doc_id], *sizes[doc_id]) for doc_id in missing if doc_id in sizes],
+        )
+        conn.commit()
+    return sizes, bytes_read
+
+
+def _read_content_prefix(
+    conn: sqlite3.Connection, doc_id: int, chars: int, byte_length: int
+) -> tuple[str, int]:
+    """First ``chars`` characters of a doc's content, and the bytes read for them.
+
+    Reads the stored UTF-8 through an incremental blob handle. Every
+    character is at least one byte, so asking for the characters still
+    missing never reads past the prefix.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts: list[str] = []
+    got = read = 0
+    with conn.blobopen("rag_docs", "content", doc_id, readonly=True) as blob:
+        while got < chars and read < byte_length:
+            data = blob.read(min(chars - got, byte_length - read))
+            if not data:
+                break
+            read += len(data)
+            piece = decoder.decode(data)
+            parts.append(piece)
+            got += len(piece)
+    return "".join(parts), read
 
 
 def _load_course_map() -> str:
@@ -187,6 +316,8 @@ def build_context(
     module_prefix: Optional[str] = None,
     k_materials: int = 6,
     force_full_docs: bool = False,
+    deadline_seconds: Optional[float] = None,
+    source_deadlines: Optional[dict[str, float]] = None,
 ) -> dict[str, Any]:
     """Build all context for a tutor turn in one call.
 
@@ -202,6 +333,15 @@ def build_context(
         module_prefix: Obsidian folder prefix for note scoping.
         k_materials: Number of material chunks to retrieve.
         force_full_docs: Force selected materials to inject as full documents.
+        deadline_seconds: Shared budget for all sources, which run
+            concurrently (default ``CONTEXT_DEADLINE_SECONDS``). Sources
+            still running at the deadline contribute nothing; they are
+            listed in ``debug["timed_out_sources"]`` with
+            ``debug["partial"] = True``. Per-source wall time lands in
+            ``debug["source_latency_ms"]``.
+        source_deadlines: Tighter cutoffs for individual sources (e.g.
+            ``{"notes": 3.0}``), capped by ``deadline_seconds``. The turn
+            latency budget uses this so slow notes cannot hold up materials.
 
     Returns:
         dict with keys: materials, notes, vault_state, course_map, debug
@@ -220,14 +360,21 @@ def build_context(
     if depth == "none":
         return result
 
+    # Each source gets its own debug dict, merged only once it finishes, so
+    # a source that overruns the deadline cannot mutate the returned debug.
+    sources: dict[str, tuple[Any, dict[str, Any]]] = {}
     if depth in ("auto", "materials"):
-        result["materials"] = _fetch_materials(
-            query,
-            course_id=course_id,
-            material_ids=material_ids,
-            k=k_materials,
-            force_full_docs=force_full_docs,
-            debug=debug,
+        source_debug: dict[str, Any] = {}
+        sources["materials"] = (
+            lambda d=source_debug: _fetch_materials(
+                query,
+                course_id=course_id,
+                material_ids=material_ids,
+                k=k_materials,
+                force_full_docs=force_full_docs,
+                debug=d,
+            ),
+            source_debug,
         )
 
     if depth in ("auto", "notes"):
@@ -235,19 +382,118 @@ def build_context(
             debug["notes_skipped"] = "PT_HARNESS_DISABLE_VAULT_CONTEXT"
             debug["vault_state_skipped"] = "PT_HARNESS_DISABLE_VAULT_CONTEXT"
         else:
-            result["notes"] = _fetch_notes(
-                query,
-                module_prefix=module_prefix,
-                debug=debug,
+            source_debug = {}
+            sources["notes"] = (
+                lambda d=source_debug: _fetch_notes(
+                    query,
+                    module_prefix=module_prefix,
+                    debug=d,
+                ),
+                source_debug,
             )
-            result["vault_state"] = _fetch_vault_state(
-                course_id=course_id,
-                topic=module_prefix or "",
+            sources["vault_state"] = (
+                lambda: _fetch_vault_state(
+                    course_id=course_id,
+                    topic=module_prefix or "",
+                ),
+                {},
             )
 
+    with trace_span("context.build", depth=depth, sources=sorted(sources)) as span:
+        _gather_sources(
+            sources,
+            result,
+            debug,
+            deadline_seconds=(
+                CONTEXT_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+            ),
+            source_deadlines=source_deadlines,
+        )
+        if span is not None and debug.get("partial"):
+            span.set(timed_out_sources=debug.get("timed_out_sources"))
     return result
 
 
+def _timed_source(name: str, fetch: Any) -> tuple[Any, float]:
+    started = time.perf_counter()
+    with trace_span(f"context.{name}"):
+        value = fetch()
+    return value, (time.perf_counter() - started) * 1000
+
+
+def _gather_sources(
+    sources: dict[str, tuple[Any, dict[str, Any]]],
+    result: dict[str, Any],
+    debug: dict[str, Any],
+    *,
+    deadline_seconds: float,
+    source_deadlines: Optional[dict[str, float]] = None,
+) -> None:
+    """Run context sources concurrently and fold finished ones into ``result``."""
+    if not sources:
+        return
+    started = time.perf_counter()
+    futures = {
+        _CONTEXT_EXECUTOR.submit(propagate(_timed_source), name, fetch): name
+        for name, (fetch, _source_debug) in sources.items()
+    }
+    cutoffs = {
+        future: max(
+            0.0,
+            min(deadline_seconds, (source_deadlines or {}).get(name, deadline_seconds)),
+        )
+        for future, name in futures.items()
+    }
+    done: set[Any] = set()
+    not_done: set[Any] = set()
+    pending = set(futures)
+    while pending:
+        elapsed = time.perf_counter() - started
+        expired = {future for future in pending if cutoffs[future] <= elapsed}
+        not_done |= {future for future in expired if not future.done()}
+        done |= {future for future in expired if future.done()}
+        pending -= expired
+        if not pending:
+            break
+        finished, pending = wait(
+            pending,
+            timeout=min(cutoffs[future] for future in pending) - elapsed,
+            return_when=FIRST_COMPLETED,
+        )
+        done |= finished
+
+    latencies: dict[str, Optional[int]] = {}
+    for future in done:
+        name = futures[future]
+        try:
+            value, elapsed_ms = future.result()
+        except Exception as e:
+            # The fetchers swallow their own errors; this is a safety net.
+            logger.warning("Context source %s failed: %s", name, e)
+            debug[f"{name}_error"] = str(e)
+            latencies[name] = None
+            continue
+        result[name] = value or ""
+        latencies[name] = int(round(elapsed_ms))
+        debug.update(sources[name][1])
+
+    timed_out = sorted(futures[future] for future in not_done)
+    for future in not_done:
+        future.cancel()
+        latencies[futures[future]] = None
+    debug["source_latency_ms"] = latencies
+    debug["context_ms"] = int(round((time.perf_counter() - started) * 1000))
+    if timed_out:
+        debug["partial"] = True
+        debug["timed_out_sources"] = timed_out
+        debug["deadline_ms"] = int(round(deadline_seconds * 1000))
+        logger.warning(
+            "Tutor context deadline (%.1fs) missed by: %s",
+            deadline_seconds,
+            ", ".join(timed_out),
+        )
+
+
 def _fetch_materials(
     query: str,
     *,
@@ -343,12 +589,24 @@ def _fetch_notes(
     module_prefix: Optional[str] = None,
     debug: dict[str, Any],
 ) -> str:
-    """Search Obsidian vault via CLI wrapper."""
+    """Search the Obsidian vault: local FTS index when the vault is on disk, else the CLI wrapper."""
     try:
-        from obsidian_vault import ObsidianVault
-
-        vault = ObsidianVault()
-        hits = vault.search(query, limit=5)
+        hits = None
+        try:
+            from vault_search_index import get_vault_search_index
+
+            index = get_vault_search_index()
+            if index is not None:
+                hits = index.search(query, limit=5)
+                debug["notes_source"] = "local_index"
+        except Exception as exc:
+            logger.warning("Local vault search failed, using Obsidian CLI: %s", exc)
+        if hits is None:
+            from obsidian_vault import ObsidianVault
+
+            vault = ObsidianVault()
+            hits = vault.search(query, limit=5)
+            debug["notes_source"] = "obsidian_cli"
         debug["notes_hits"] = len(hits)
 
         if module_prefix:
@@ -0,0 +1,183 @@
+"""
+Per-turn latency budget for Tutor turns.
+
+A single slow dependency can stall a turn for tens of seconds. Examples
+are Obsidian CLI retries, a stuck embedding call, or Gemini video context.
+``send_turn`` therefore opens a ``TurnBudget`` from the session's accuracy
+profile (``tutor_accuracy_profiles.resolve_latency_budget``) and routes
+each stage through it.
+
+Context stages run before the model is called:
+- ``retrieval``: the ``build_context`` deadline, including a prefetch wait
+  (at most ``PREFETCH_WAIT_SHARE`` of it, so an inline build after a
+  prefetch miss still gets time)
+- ``notes``: the per-source cutoff for the Obsidian notes and vault state
+- ``graph``: the concept-graph lookup
+- ``vision``: Gemini video context
+
+Each of these gets the smaller of its own allowance and whatever is left of
+``first_token_ms``. Work that overruns is dropped, and the answer streams
+with the context that finished in time.
+
+``tools`` and ``artifacts`` are per-turn totals for tool calls made while
+the answer streams. ``artifacts`` covers the tools that write notes, cards
+or diagrams. A tool call that overruns returns a budget error to the
+model instead of its result. Tools that write (``tutor_tools.WRITE_TOOLS``,
+artifacts included) are never abandoned: they run to completion and the
+overrun is only recorded, because a write reported as failed but landing
+later gets retried by the model and duplicated.
+
+Python threads cannot be killed. An abandoned call keeps one pool thread
+busy until it returns.
+``summary()`` reports allowance, spend and outcome per stage for the turn's
+debug payload.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+from tutor_tracing import propagate
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_STAGES = ("retrieval", "notes", "graph", "vision")
+STREAM_STAGES = ("tools", "artifacts")
+STAGES = CONTEXT_STAGES + STREAM_STAGES
+
+# Share of the retrieval allowance a turn may spend waiting on a prefetch;
+# the rest is kept for building context inline if the prefetch misses.
+PREFETCH_WAIT_SHARE = 0.5
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tutor-budget")
+
+
+class TurnBudget:
+    """Latency allowances for one turn, measured from construction."""
+
+    def __init__(
+        self,
+        config: dict[str, Any],
+        *,
+        profile: Optional[str] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.profile = profile
+        self.first_token_ms = int(config["first_token_ms"])
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._limits = {stage: int(config[f"{stage}_ms"]) / 1000 for stage in STAGES}
+        self._spent = {stage: 0.0 for stage in STAGES}
+        self._status: dict[str, str] = {}
+        self._calls = {stage: 0 for stage in STAGES}
+
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    def allot(self, stage: str) -> float:
+        """Seconds ``stage`` may still use; 0 when its allowance is gone."""
+        with self._lock:
+            remaining = self._limits[stage] - self._spent[stage]
+        if stage in CONTEXT_STAGES:
+            remaining = min(remaining, self.first_token_ms / 1000 - self.elapsed())
+        return max(0.0, remaining)
+
+    def spend(self, stage: str, seconds: float, *, status: str = "ok") -> None:
+        """Record time used by ``stage``; a worse status sticks for the turn."""
+        with self._lock:
+            self._spent[stage] += max(0.0, seconds)
+            self._calls[stage] += 1
+            if self._status.get(stage, "ok") == "ok":
+                self._status[stage] = status
+
+    def prefetch_wait(self) -> float:
+        """Seconds the turn may wait on a prefetch before building inline."""
+        return self.allot("retrieval") * PREFETCH_WAIT_SHARE
+
+    def context_deadlines(self) -> tuple[float, dict[str, float]]:
+        """``build_context`` deadline and per-source cutoffs for this turn."""
+        notes = self.allot("notes")
+        return self.allot("retrieval"), {"notes": notes, "vault_state": notes}
+
+    def run(
+        self,
+        stage: str,
+        fn: Callable[[], Any],
+        *,
+        default: Any = None,
+        abandon: bool = True,
+    ) -> Any:
+        """Call ``fn`` within the stage's allowance, or return ``default``.
+
+        ``fn`` runs on the budget pool under the caller's tracing context.
+        If the allowance is already used up, ``fn`` is skipped. If it
+        overruns, it is abandoned and ``default`` is returned. Exceptions
+        raised by ``fn`` reach the caller.
+
+        With ``abandon=False`` (writes), ``fn`` always runs to completion on
+        the caller's thread and an overrun is only recorded.
+        """
+        allowance = self.allot(stage)
+        if not abandon:
+            started = self._clock()
+            try:
+                value = fn()
+            except Exception:
+                self.spend(stage, self._clock() - started, status="error")
+                raise
+            elapsed = self._clock() - started
+            if elapsed > allowance:
+                logger.warning(
+                    "Turn budget: %s overran its %.0fms allowance (ran to completion)",
+                    stage,
+                    allowance * 1000,
+                )
+            self.spend(stage, elapsed, status="timeout" if elapsed > allowance else "ok")
+            return value
+        if allowance <= 0:
+            self.spend(stage, 0.0, status="skipped")
+            logger.info("Turn budget: skipped %s (allowance used up)", stage)
+            return default
+        started = self._clock()
+        future = _EXECUTOR.submit(propagate(fn))
+        try:
+            value = future.result(timeout=allowance)
+        except FutureTimeoutError:
+            future.cancel()
+            self.spend(stage, self._clock() - started, status="timeout")
+            logger.warning(
+                "Turn budget: %s overran its %.0fms allowance", stage, allowance * 1000
+            )
+            return default
+        except Exception:
+            self.spend(stage, self._clock() - started, status="error")
+            raise
+        self.spend(stage, self._clock() - started)
+        return value
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            stages = {
+                stage: {
+                    "budget_ms": int(round(self._limits[stage] * 1000)),
+                    "spent_ms": int(round(self._spent[stage] * 1000)),
+                    "calls": self._calls[stage],
+                    "status": self._status[stage],
+                }
+                for stage in STAGES
+                if stage in self._status
+            }
+        return {
+            "profile": self.profile,
+            "first_token_budget_ms": self.first_token_ms,
+            "stages": stages,
+            "overruns": sorted(
+                stage for stage, info in stages.items() if info["status"] != "ok"
+            ),
+        }
@@ -0,0 +1,481 @@
+"""
+Post-turn work for Tutor turns, run off the streaming path.
+
+``send_turn`` persists the turn and sends its ``done`` event first.
+Anything the final SSE event does not depend on becomes a job in
+``tutor_post_turn_jobs``:
+- a turn's vault artifact writes, one job per turn run through
+  ``vault_artifact_router.execute_artifact_batch``
+- saving the turn trace
+- working-summary compaction once a teach session's history estimate
+  crosses ``COMPACTION_TOKEN_THRESHOLD`` (``dashboard.api_tutor_memory``)
+
+Jobs are usually enqueued in the same transaction that saves the turn, so
+a crash cannot drop them.
+
+Background workers run the jobs. Each kind has a handler registered with
+``post_turn_handler``. A handler that raises is retried with exponential
+backoff, up to ``MAX_ATTEMPTS``, and is then marked ``failed`` with its
+last error. A handler that finished part of its payload raises
+``PartialJobFailure`` with what is left, and only that is retried.
+
+Jobs that share an ``ordering_key`` (the tutor session) run strictly in
+enqueue order. A session's "create note" therefore lands before its
+"append". Jobs left ``running`` by a dead process are requeued once their
+lease expires; the lost run counts toward ``MAX_ATTEMPTS``.
+
+With ``TUTOR_POST_TURN_INLINE`` set on the Flask app, ``send_turn`` runs
+the jobs itself before closing the stream. That mode is the synchronous
+baseline in ``scripts/bench_post_turn_latency.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 300.0
+# A job still "running" after this long is assumed to belong to a dead worker.
+LEASE_SECONDS = 300.0
+WORKER_COUNT = 2
+# Finished jobs kept for inspection; older ones are pruned.
+DONE_RETENTION = 1000
+
+_HANDLERS: dict[str, Callable[[dict[str, Any]], Any]] = {}
+
+_LOCK = threading.Lock()
+_WAKE = threading.Condition(_LOCK)
+_WORKERS: list[threading.Thread] = []
+_STATE = {"pending_signal": False, "busy": 0, "next_due": None}
+_STATS = {"enqueued": 0, "succeeded": 0, "retried": 0, "failed": 0}
+
+
+class PartialJobFailure(Exception):
+    """Raised by a handler that finished part of its work; ``remaining`` is retried."""
+
+    def __init__(self, message: str, remaining: dict[str, Any]) -> None:
+        super().__init__(message)
+        self.remaining = remaining
+
+
+def post_turn_handler(kind: str) -> Callable[[Callable], Callable]:
+    """Register the handler for jobs of ``kind``; it receives the payload dict."""
+
+    def _register(fn: Callable[[dict[str, Any]], Any]) -> Callable:
+        _HANDLERS[kind] = fn
+        return fn
+
+    return _register
+
+
+def _connect() -> sqlite3.Connection:
+    from db_setup import get_connection
+
+    conn = get_connection()
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def enqueue_post_turn_job(
+    conn: sqlite3.Connection,
+    kind: str,
+    payload: dict[str, Any],
+    *,
+    ordering_key: Optional[str] = None,
+    turn_number: Optional[int] = None,
+    dedupe: bool = False,
+) -> int:
+    """Insert a job using the caller's connection; it runs once committed.
+
+    With ``dedupe`` an unfinished job of the same kind and ordering key is
+    reused instead. Call ``notify_post_turn_workers`` after the commit.
+    """
+    if kind not in _HANDLERS:
+        raise ValueError(f"No post-turn handler registered for {kind!r}")
+    if dedupe:
+        existing = conn.execute(
+            """SELECT id FROM tutor_post_turn_jobs
+               WHERE kind = ? AND ordering_key IS ?
+                 AND status IN ('pending', 'running')
+               ORDER BY id LIMIT 1""",
+            (kind, ordering_key),
+        ).fetchone()
+        if existing is not None:
+            return int(existing[0])
+    now = time.time()
+    cur = conn.execute(
+        """INSERT INTO tutor_post_turn_jobs
+           (kind, ordering_key, turn_number, payload_json, status, attempts,
+            next_attempt_at, created_at, updated_at)
+           VALUES (?, ?, ?, ?, 'pending', 0, ?, ?, ?)""",
+        (
+            kind,
+            ordering_key,
+            turn_number,
+            json.dumps(payload, default=str),
+            now,
+            datetime.now().isoformat(),
+            now,
+        ),
+    )
+    with _LOCK:
+        _STATS["enqueued"] += 1
+    return int(cur.lastrowid)
+
+
+def submit_post_turn_job(
+    kind: str,
+    payload: dict[str, Any],
+    *,
+    ordering_key: Optional[str] = None,
+    turn_number: Optional[int] = None,
+    wake: bool = True,
+) -> int:
+    """Enqueue a job in its own transaction and (unless ``wake=False``) wake the workers."""
+    conn = _connect()
+    try:
+        job_id = enqueue_post_turn_job(
+            conn, kind, payload, ordering_key=ordering_key, turn_number=turn_number
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    if wake:
+        notify_post_turn_workers()
+    return job_id
+
+
+def _claim_next(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+    now = time.time()
+    while True:
+        row = conn.execute(
+            """SELECT j.* FROM tutor_post_turn_jobs j
+               WHERE j.status = 'pending' AND j.next_attempt_at <= ?
+                 AND NOT EXISTS (
+                     SELECT 1 FROM tutor_post_turn_jobs p
+                     WHERE p.ordering_key = j.ordering_key AND p.id < j.id
+                       AND p.status IN ('pending', 'running'))
+               ORDER BY j.id
+               LIMIT 1""",
+            (now,),
+        ).fetchone()
+        if row is None:
+            return None
+        claimed = conn.execute(
+            """UPDATE tutor_post_turn_jobs
+               SET status = 'running', attempts = attempts + 1, updated_at = ?
+               WHERE id = ? AND status = 'pending'""",
+            (now, row["id"]),
+        ).rowcount
+        conn.commit()
+        if claimed:
+            return row
+
+
+def _run_job(conn: sqlite3.Connection, row: sqlite3.Row) -> None:
+    attempts = int(row["attempts"]) + 1
+    handler = _HANDLERS.get(row["kind"])
+    try:
+        if handler is None:
+            raise LookupError(f"No post-turn handler registered for {row['kind']!r}")
+        result = handler(json.loads(row["payload_json"] or "{}"))
+    except Exception as exc:
+        if attempts >= MAX_ATTEMPTS or isinstance(exc, LookupError):
+            status, next_attempt = "failed", None
+            logger.warning(
+                "Post-turn job %s (%s) failed after %d attempts: %s",
+                row["id"],
+                row["kind"],
+                attempts,
+                exc,
+            )
+        else:
+            delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+            status, next_attempt = "pending", time.time() + delay
+            logger.info(
+                "Post-turn job %s (%s) attempt %d failed, retrying in %.0fs: %s",
+                row["id"],
+                row["kind"],
+                attempts,
+                delay,
+                exc,
+            )
+        payload_json = (
+            json.dumps(exc.remaining, default=str)
+            if isinstance(exc, PartialJobFailure)
+            else row["payload_json"]
+        )
+        conn.execute(
+            """UPDATE tutor_post_turn_jobs
+               SET status = ?, next_attempt_at = COALESCE(?, next_attempt_at),
+                   last_error = ?, payload_json = ?, updated_at = ?
+               WHERE id = ?""",
+            (
+                status,
+                next_attempt,
+                str(exc)[:2000],
+                payload_json,
+                time.time(),
+                row["id"],
+            ),
+        )
+        conn.commit()
+        with _LOCK:
+            _STATS["failed" if status == "failed" else "retried"] += 1
+        return
+
+    conn.execute(
+        """UPDATE tutor_post_turn_jobs
+           SET status = 'done', result_json = ?, last_error = NULL, updated_at = ?
+           WHERE id = ?""",
+        (
+            json.dumps(result, default=str) if result is not None else None,
+            time.time(),
+            row["id"],
+        ),
+    )
+    conn.execute(
+        """DELETE FROM tutor_post_turn_jobs
+           WHERE status = 'done' AND id <= (
+               SELECT id FROM tutor_post_turn_jobs WHERE status = 'done'
+               ORDER BY id DESC LIMIT 1 OFFSET ?)""",
+        (DONE_RETENTION,),
+    )
+    conn.commit()
+    with _LOCK:
+        _STATS["succeeded"] += 1
+
+
+def _requeue_expired_leases(conn: sqlite3.Connection) -> int:
+    """Requeue jobs whose worker died; the lost run counted as an attempt.
+
+    A job that has used up ``MAX_ATTEMPTS`` this way is marked ``failed``
+    so a handler that kills its worker cannot be retried forever.
+    """
+    now = time.time()
+    expired = now - LEASE_SECONDS
+    failed = conn.execute(
+        """UPDATE tutor_post_turn_jobs
+           SET status = 'failed', last_error = ?, updated_at = ?
+           WHERE status = 'running' AND updated_at < ? AND attempts >= ?""",
+        (f"lease expired after {MAX_ATTEMPTS} attempts", now, expired, MAX_ATTEMPTS),
+    ).rowcount
+    requeued = conn.execute(
+        """UPDATE tutor_post_turn_jobs
+           SET status = 'pending', next_attempt_at = ?, last_error = 'lease expired'
+           WHERE status = 'running' AND updated_at < ?""",
+        (now, expired),
+    ).rowcount
+    conn.commit()
+    if failed:
+        logger.warning("%d post-turn job(s) failed after their lease expired", failed)
+        with _LOCK:
+            _STATS["failed"] += failed
+    return requeued
+
+
+def _next_due(conn: sqlite3.Connection) -> Optional[float]:
+    row = conn.execute(
+        "SELECT MIN(next_attempt_at) FROM tutor_post_turn_jobs WHERE status = 'pending'"
+    ).fetchone()
+    return float(row[0]) if row and row[0] is not None else None
+
+
+def run_pending_post_turn_jobs(limit: Optional[int] = None) -> int:
+    """Run due jobs in the calling thread; returns how many were attempted."""
+    conn = _connect()
+    ran = 0
+    try:
+        _requeue_expired_leases(conn)
+        while limit is None or ran < limit:
+            row = _claim_next(conn)
+            if row is None:
+                break
+            _run_job(conn, row)
+            ran += 1
+        next_due = _next_due(conn)
+    finally:
+        conn.close()
+    with _LOCK:
+        _STATE["next_due"] = next_due
+    return ran
+
+
+def _worker_loop() -> None:
+    while True:
+        with _WAKE:
+            while not _STATE["pending_signal"]:
+                next_due = _STATE["next_due"]
+                timeout = None if next_due is None else max(0.0, next_due - time.time())
+                if timeout == 0.0:
+                    break
+                _WAKE.wait(timeout)
+                if timeout is not None and not _STATE["pending_signal"]:
+                    break
+            _STATE["pending_signal"] = False
+            _STATE["next_due"] = None
+            _STATE["busy"] += 1
+        try:
+            run_pending_post_turn_jobs()
+        except Exception as exc:  # the DB itself failed; try again on the next signal
+            logger.warning("Post-turn worker pass failed: %s", exc)
+        finally:
+            with _WAKE:
+                _STATE["busy"] -= 1
+                _WAKE.notify_all()
+
+
+def notify_post_turn_workers() -> None:
+    """Wake the workers (starting them on first use) to drain due jobs."""
+    with _WAKE:
+        while len(_WORKERS) < WORKER_COUNT:
+            worker = threading.Thread(
+                target=_worker_loop,
+                name=f"tutor-post-turn-{len(_WORKERS)}",
+                daemon=True,
+            )
+            _WORKERS.append(worker)
+            worker.start()
+        _STATE["pending_signal"] = True
+        _WAKE.notify_all()
+
+
+def wait_for_post_turn_idle(timeout: float = 5.0) -> bool:
+    """Block until no worker is busy and no wake-up is pending (tests, scripts)."""
+    deadline = time.monotonic() + timeout
+    with _WAKE:
+        while _STATE["pending_signal"] or _STATE["busy"]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _WAKE.wait(remaining)
+    return True
+
+
+def post_turn_stats(conn: Optional[sqlite3.Connection] = None) -> dict[str, Any]:
+    """Process counters plus job counts by status from the table."""
+    own = conn is None
+    conn = conn or _connect()
+    try:
+        counts = {
+            row[0]: row[1]
+            for row in conn.execute(
+                "SELECT status, COUNT(*) FROM tutor_post_turn_jobs GROUP BY status"
+            ).fetchall()
+        }
+    finally:
+        if own:
+            conn.close()
+    with _LOCK:
+        stats = dict(_STATS)
+    return {**stats, "jobs": counts}
+
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+
+
+@post_turn_handler("vault_artifact")
+def _write_vault_artifacts(payload: dict[str, Any]) -> dict[str, Any]:
+    """Write a turn's vault artifacts as one planned batch.
+
+    Artifacts that errored are retried on their own; results from earlier
+    attempts ride along in ``payload["done"]`` so the final job result
+    covers the whole turn. An unknown operation fails the job once nothing
+    is left to retry.
+    """
+    from obsidian_vault import ObsidianVault
+    from vault_artifact_router import execute_artifact_batch
+
+    # Jobs queued before batching carry a single "artifact".
+    artifacts = payload.get("artifacts") or [payload["artifact"]]
+    batch = execute_artifact_batch(ObsidianVault(), artifacts)
+    done = list(payload.get("done") or [])
+    unknown = list(payload.get("unknown") or [])
+    failed = []
+    for artifact, result in zip(artifacts, batch["results"]):
+        if result["result"].startswith("Error:"):
+            failed.append((artifact, result))
+        elif result["result"].startswith("Unknown"):
+            # Never succeeds, so it is not retried; it fails the job instead.
+            unknown.append(result)
+        else:
+            done.append(result)
+    note_writes = dict(payload.get("note_writes") or {})
+    for note, writes in batch["note_writes"].items():
+        note_writes[note] = note_writes.get(note, 0) + writes
+    elapsed_ms = round(float(payload.get("elapsed_ms") or 0.0) + batch["elapsed_ms"], 2)
+    if failed:
+        message = f"{len(failed)} of {len(artifacts)} vault writes failed: {failed[0][1]['result']}"
+        if not done and not unknown:
+            raise RuntimeError(message)
+        raise PartialJobFailure(
+            message,
+            {
+                "artifacts": [artifact for artifact, _result in failed],
+                "done": done,
+                "unknown": unknown,
+                "note_writes": note_writes,
+                "elapsed_ms": elapsed_ms,
+            },
+        )
+    if unknown:
+        # LookupError marks the job failed without further retries.
+        raise LookupError(
+            f"{len(unknown)} vault artifact(s) had an unknown operation: "
+            + ", ".join(item["result"] for item in unknown)
+        )
+    return {"results": done, "note_writes": note_writes, "elapsed_ms": elapsed_ms}
+
+
+@post_turn_handler("trace")
+def _save_trace_record(payload: dict[str, Any]) -> None:
+    from tutor_tracing import save_trace_record
+
+    conn = _connect()
+    try:
+        save_trace_record(conn, payload)
+    finally:
+        conn.close()
+
+
+@post_turn_handler("compact_session")
+def _compact_session(payload: dict[str, Any]) -> dict[str, Any]:
+    from dashboard.api_tutor_memory import (
+        COMPACTION_TOKEN_THRESHOLD,
+        compact_tutor_session,
+    )
+
+    session_id = payload["session_id"]
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT history_token_estimate FROM tutor_sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        if row is None:
+            return {"skipped": "session not found"}
+        # A manual compaction may have got there first.
+        if int(row[0] or 0) < COMPACTION_TOKEN_THRESHOLD:
+            return {"skipped": "below threshold", "history_tokens": int(row[0] or 0)}
+        result = compact_tutor_session(
+            conn, session_id, trigger_source="token_threshold"
+        )
+    finally:
+        conn.close()
+    summary = result["working_summary"]
+    return {
+        "version": summary["version"],
+        "covered_turn_number": summary["covered_turn_number"],
+        "summarized_turn_count": result["summarized_turn_count"],
+    }
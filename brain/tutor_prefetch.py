@@ -0,0 +1,239 @@
+"""
+Speculative context prefetch for Tutor turns.
+
+While the learner is still typing, the chat UI posts the (debounced) draft
+to ``/api/tutor/session/<id>/prefetch``. That schedules
+``tutor_context.build_context`` for the draft on a small background pool,
+which also pays for the query embedding and vector search. When the real
+turn arrives, ``send_turn`` calls ``take_prefetched_context``. If the final
+message is close enough to the draft and the retrieval parameters are
+identical, the prefetched context is reused instead of being rebuilt.
+
+A prefetch still queued behind other sessions' work is not waited on: the
+turn cancels it and builds inline. One already running is waited on for at
+most ``PREFETCH_MAX_WAIT_SECONDS``.
+
+One entry per session, single use, expires after ``PREFETCH_TTL_SECONDS``.
+Hit rate and saved latency are kept in-process (``prefetch_stats``).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_TTL_SECONDS = 90.0
+# Token-set Jaccard between draft and final message needed to reuse context.
+PREFETCH_MIN_SIMILARITY = 0.6
+# How long send_turn waits on a prefetch that is still running. Past this
+# an inline build is likely no slower, so the turn stops waiting.
+PREFETCH_MAX_WAIT_SECONDS = 0.5
+PREFETCH_MIN_DRAFT_CHARS = 8
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tutor-prefetch")
+_LOCK = threading.Lock()
+
+
+@dataclass
+class _PrefetchEntry:
+    draft: str
+    tokens: frozenset[str]
+    params: tuple
+    started_at: float
+    future: Future
+
+
+_ENTRIES: dict[str, _PrefetchEntry] = {}
+_STATS: dict[str, float] = {
+    "scheduled": 0,
+    "coalesced": 0,
+    "hits": 0,
+    "misses": 0,
+    "saved_ms": 0.0,
+}
+
+
+def _tokens(text: str) -> frozenset[str]:
+    return frozenset(_TOKEN_RE.findall((text or "").lower()))
+
+
+def message_similarity(draft: str, final: str) -> float:
+    """Jaccard similarity of the two messages' lowercase word sets."""
+    a, b = _tokens(draft), _tokens(final)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _params_key(context_kwargs: dict[str, Any]) -> tuple:
+    items = []
+    for key in sorted(context_kwargs):
+        value = context_kwargs[key]
+        if isinstance(value, list):
+            value = tuple(value)
+        items.append((key, value))
+    return tuple(items)
+
+
+def _build(draft: str, context_kwargs: dict[str, Any]) -> tuple[dict[str, Any], float]:
+    from tutor_context import build_context
+
+    started = time.perf_counter()
+    ctx = build_context(draft, **context_kwargs)
+    return ctx, (time.perf_counter() - started) * 1000
+
+
+def _evict_expired(now: float) -> None:
+    expired = [
+        sid
+        for sid, entry in _ENTRIES.items()
+        if now - entry.started_at > PREFETCH_TTL_SECONDS
+    ]
+    for sid in expired:
+        _ENTRIES.pop(sid, None).future.cancel()
+
+
+def schedule_prefetch(session_id: str, draft: str, **context_kwargs: Any) -> bool:
+    """Start building context for ``draft`` in the background.
+
+    ``context_kwargs`` are the ``build_context`` keyword arguments the turn
+    will use. Returns False when the draft is too short or an identical
+    prefetch is already pending for the session.
+    """
+    draft = (draft or "").strip()
+    if len(draft) < PREFETCH_MIN_DRAFT_CHARS:
+        return False
+    params = _params_key(context_kwargs)
+    tokens = _tokens(draft)
+    now = time.monotonic()
+    with _LOCK:
+        _evict_expired(now)
+        current = _ENTRIES.get(session_id)
+        if current is not None and current.params == params and current.tokens == tokens:
+            _STATS["coalesced"] += 1
+            return False
+        if current is not None:
+            # Superseded drafts that have not started yet are dropped.
+            current.future.cancel()
+        _ENTRIES[session_id] = _PrefetchEntry(
+            draft=draft,
+            tokens=tokens,
+            params=params,
+            started_at=now,
+            future=_EXECUTOR.submit(_build, draft, dict(context_kwargs)),
+        )
+        _STATS["scheduled"] += 1
+    return True
+
+
+def take_prefetched_context(
+    session_id: str,
+    message: str,
+    *,
+    max_wait_seconds: Optional[float] = None,
+    **context_kwargs: Any,
+) -> tuple[Optional[dict[str, Any]], dict[str, Any]]:
+    """Claim the session's prefetched context for ``message`` if it still fits.
+
+    A prefetch still running is waited on for at most ``max_wait_seconds``
+    (capped at ``PREFETCH_MAX_WAIT_SECONDS``); one that has not started yet
+    is cancelled right away. Returns ``(ctx, info)``. ``ctx`` is None on a
+    miss, and the caller builds context as usual. ``info`` says what
+    happened and is meant for the turn's debug payload.
+    """
+    with _LOCK:
+        entry = _ENTRIES.pop(session_id, None)
+    if entry is None:
+        return None, {"status": "none"}
+
+    info: dict[str, Any] = {"status": "miss", "draft_chars": len(entry.draft)}
+
+    def _miss(reason: str) -> tuple[None, dict[str, Any]]:
+        entry.future.cancel()
+        info["reason"] = reason
+        with _LOCK:
+            _STATS["misses"] += 1
+        return None, info
+
+    age = time.monotonic() - entry.started_at
+    if age > PREFETCH_TTL_SECONDS:
+        return _miss("expired")
+    if entry.params != _params_key(context_kwargs):
+        return _miss("params_changed")
+    similarity = message_similarity(entry.draft, message)
+    info["similarity"] = round(similarity, 3)
+    if similarity < PREFETCH_MIN_SIMILARITY:
+        return _miss("message_diverged")
+    if not entry.future.running() and not entry.future.done():
+        # Queued behind other sessions on the small pool: it could take
+        # longer to start than an inline build takes to finish.
+        return _miss("not_started")
+
+    wait_started = time.perf_counter()
+    try:
+        ctx, build_ms = entry.future.result(
+            timeout=(
+                PREFETCH_MAX_WAIT_SECONDS
+                if max_wait_seconds is None
+                else max(0.0, min(max_wait_seconds, PREFETCH_MAX_WAIT_SECONDS))
+            )
+        )
+    except FutureTimeoutError:
+        return _miss("still_running")
+    except Exception as exc:  # build_context failed; rebuild inline
+        logger.debug("Prefetch for session %s failed: %s", session_id, exc)
+        return _miss("prefetch_failed")
+    waited_ms = (time.perf_counter() - wait_started) * 1000
+    saved_ms = max(0.0, build_ms - waited_ms)
+
+    info.update(
+        {
+            "status": "hit",
+            "waited_ms": int(round(waited_ms)),
+            "saved_ms": int(round(saved_ms)),
+        }
+    )
+    with _LOCK:
+        _STATS["hits"] += 1
+        _STATS["saved_ms"] += saved_ms
+    return ctx, info
+
+
+def prefetch_stats() -> dict[str, Any]:
+    """Process-wide prefetch counters, hit rate and mean latency saved."""
+    with _LOCK:
+        stats = dict(_STATS)
+        pending = len(_ENTRIES)
+    consulted = stats["hits"] + stats["misses"]
+    return {
+        "scheduled": int(stats["scheduled"]),
+        "coalesced": int(stats["coalesced"]),
+        "hits": int(stats["hits"]),
+        "misses": int(stats["misses"]),
+        "pending": pending,
+        "hit_rate": round(stats["hits"] / consulted, 3) if consulted else None,
+        "saved_ms_total": int(round(stats["saved_ms"])),
+        "saved_ms_per_hit": (
+            int(round(stats["saved_ms"] / stats["hits"])) if stats["hits"] else None
+        ),
+    }
+
+
+def clear_prefetch_cache() -> None:
+    """Drop pending prefetches and reset counters (tests)."""
+    with _LOCK:
+        for entry in _ENTRIES.values():
+            entry.future.cancel()
+        _ENTRIES.clear()
+        for key in _STATS:
+            _STATS[key] = 0.0 if key == "saved_ms" else 0
@@ -6,18 +6,44 @@ Architecture:
   - Block-level: facilitation_prompt from method blocks (injected per chain step)
   - Chain-level: progress context showing current position in study chain
   - Context layers: tutor instructions/config + material_context (study materials)
+
+Layout:
+  Sections are grouped into stability tiers and always emitted stable ->
+  volatile (static -> session -> block -> turn). Everything before the turn
+  tier is the cacheable prefix: it stays byte-identical across the turns of a
+  block, so the provider can reuse those prompt tokens. ``prefix_hash`` lets
+  callers confirm that from one turn to the next.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+from tutor_tokens import (
+    DEFAULT_ENCODING,
+    BudgetedSection,
+    allocate_sections,
+    count_tokens,
+    get_encoder,
+)
 
 _LOG = logging.getLogger(__name__)
 
 _TUTOR_INSTRUCTIONS_PATH = Path(__file__).parent / "tutor_instructions.md"
 
+# Rendered base-rules block, keyed on the (mtime_ns, size) stamps of the
+# files it is derived from so edits are picked up without a restart.
+_PROMPT_ASSET_CACHE: dict[str, Any] = {"stamp": None, "base_rules": None}
+_PROMPT_ASSET_LOCK = threading.Lock()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # BASE PROMPT — role + session context (always-on, every session)
@@ -25,14 +51,15 @@ _TUTOR_INSTRUCTIONS_PATH = Path(__file__).parent / "tutor_instructions.md"
 
 _BASE_TEMPLATE = """You are the PT Study Tutor, a study partner for physical therapy education.
 
-Current session context:
-- Course: {course_id}
-- Topic: {topic}
-
 ## Rules
 {rules}
 """
 
+_SESSION_TEMPLATE = """Current session context:
+- Course: {course_id}
+- Topic: {topic}
+"""
+
 # Default rules — used when no custom instructions are configured
 DEFAULT_RULES = (
     '1. **Hybrid Teaching Mode**: Prefer selected study materials and mapped notes for factual claims. '
@@ -57,13 +84,212 @@ DEFAULT_RULES = (
 )
 
 # Backwards-compatible alias — old callers that reference TIER1_BASE_PROMPT
-TIER1_BASE_PROMPT = _BASE_TEMPLATE.replace("{rules}", DEFAULT_RULES)
+TIER1_BASE_PROMPT = _BASE_TEMPLATE.replace("{rules}", DEFAULT_RULES) + "\n" + _SESSION_TEMPLATE
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PROMPT LAYOUT — stability tiers, ordered stable -> volatile
+# ═══════════════════════════════════════════════════════════════════════════
+
+PROMPT_TIER_STATIC = "static"  # identical for every session (rules, tooling)
+PROMPT_TIER_SESSION = "session"  # fixed for a session (course, chain, session rules)
+PROMPT_TIER_BLOCK = "block"  # fixed while the active chain block is unchanged
+PROMPT_TIER_TURN = "turn"  # rebuilt every turn (retrieval, notes, vault state)
+
+PROMPT_TIERS = (
+    PROMPT_TIER_STATIC,
+    PROMPT_TIER_SESSION,
+    PROMPT_TIER_BLOCK,
+    PROMPT_TIER_TURN,
+)
+CACHEABLE_PROMPT_TIERS = (PROMPT_TIER_STATIC, PROMPT_TIER_SESSION, PROMPT_TIER_BLOCK)
+
+
+# Whole system prompt, in tokens. Fixed sections are counted first; the
+# budgeted turn-tier context (materials, graph, vault state) fills what is
+# left in priority order. Callers subtract history and question tokens.
+PROMPT_TOKEN_BUDGET = 96_000
+
+
+def _section_name(text: str, tier: str, index: int) -> str:
+    first_line = text.lstrip().split("\n", 1)[0]
+    if first_line.startswith("#"):
+        slug = re.sub(r"[^a-z0-9]+", "_", first_line.lstrip("#").strip().lower())
+        if slug.strip("_"):
+            return slug.strip("_")
+    return f"{tier}_{index}"
+
+
+@dataclass
+class PromptAssembly:
+    """System prompt sections bucketed by stability tier.
+
+    Sections may be added in any order; ``render`` always emits them
+    stable -> volatile so the cacheable prefix is never interrupted by
+    per-turn content.
+
+    Turn-tier sections added with a ``priority`` are budgeted: when
+    ``token_budget`` is set, they share whatever the fixed sections leave,
+    lowest priority value first, and are truncated or dropped to fit.
+    """
+
+    sections: dict[str, list[str]] = field(
+        default_factory=lambda: {tier: [] for tier in PROMPT_TIERS}
+    )
+    section_names: dict[str, list[str]] = field(
+        default_factory=lambda: {tier: [] for tier in PROMPT_TIERS}
+    )
+    token_budget: Optional[int] = None
+    _priorities: dict[str, int] = field(default_factory=dict, repr=False)
+    _allocation: Optional[tuple[Any, dict[str, str], Optional[dict]]] = field(
+        default=None, repr=False
+    )
+
+    def add(
+        self,
+        tier: str,
+        text: Optional[str],
+        *,
+        name: Optional[str] = None,
+        priority: Optional[int] = None,
+    ) -> None:
+        if tier not in self.sections:
+            raise ValueError(f"Unknown prompt tier: {tier}")
+        if priority is not None and tier != PROMPT_TIER_TURN:
+            raise ValueError("Only turn-tier sections can be budgeted")
+        if not text or not text.strip():
+            return
+        section = text.strip("\n")
+        base = name or _section_name(section, tier, len(self.sections[tier]))
+        used = {n for names in self.section_names.values() for n in names}
+        name, suffix = base, 2
+        while name in used:
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        self.sections[tier].append(section)
+        self.section_names[tier].append(name)
+        if priority is not None:
+            self._priorities[name] = priority
+
+    def _allocate(self) -> tuple[dict[str, str], Optional[dict]]:
+        key = (self.token_budget, tuple(len(self.sections[t]) for t in PROMPT_TIERS))
+        if self._allocation is not None and self._allocation[0] == key:
+            return self._allocation[1], self._allocation[2]
+        budgeted = [
+            BudgetedSection(name, text, self._priorities[name])
+            for tier in PROMPT_TIERS
+            for name, text in zip(self.section_names[tier], self.sections[tier])
+            if name in self._priorities
+        ]
+        if self.token_budget is None or not budgeted:
+            kept, usage = {s.name: s.text for s in budgeted}, None
+        else:
+            fixed_tokens = sum(
+                count_tokens(text)
+                for tier in PROMPT_TIERS
+                for name, text in zip(self.section_names[tier], self.sections[tier])
+                if name not in self._priorities
+            )
+            kept, usage = allocate_sections(budgeted, self.token_budget - fixed_tokens)
+        self._allocation = (key, kept, usage)
+        return kept, usage
+
+    def _effective(self, tier: str) -> list[tuple[str, str]]:
+        kept, _usage = self._allocate()
+        effective = []
+        for name, text in zip(self.section_names[tier], self.sections[tier]):
+            if name in self._priorities:
+                if name not in kept:
+                    continue
+                text = kept[name]
+            effective.append((name, text))
+        return effective
+
+    def _join(self, tiers: tuple[str, ...]) -> str:
+        return "\n\n".join(
+            text for tier in tiers for _name, text in self._effective(tier)
+        )
+
+    def render(self) -> str:
+        return self._join(PROMPT_TIERS)
+
+    def prefix_text(self) -> str:
+        return self._join(CACHEABLE_PROMPT_TIERS)
+
+    def prefix_hash(self) -> str:
+        digest = hashlib.sha256(self.prefix_text().encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def layout(self) -> dict[str, Any]:
+        """Summarize the assembled prompt for per-turn telemetry."""
+        prefix = self.prefix_text()
+        return {
+            "prefix_hash": self.prefix_hash(),
+            "prefix_chars": len(prefix),
+            "total_chars": len(self.render()),
+            "tier_chars": {
+                tier: len(self._join((tier,))) for tier in PROMPT_TIERS
+            },
+        }
+
+    def token_usage(self) -> dict[str, Any]:
+        """Tokens per rendered section and tier, plus what the budget cut."""
+        _kept, allocation = self._allocate()
+        sections: dict[str, int] = {}
+        tiers: dict[str, int] = {}
+        for tier in PROMPT_TIERS:
+            tiers[tier] = 0
+            for name, text in self._effective(tier):
+                sections[name] = count_tokens(text)
+                tiers[tier] += sections[name]
+        return {
+            "encoding": DEFAULT_ENCODING if get_encoder() is not None else "estimate",
+            "budget": self.token_budget,
+            "total": sum(tiers.values()),
+            "tiers": tiers,
+            "sections": sections,
+            "truncated": list(allocation["truncated"]) if allocation else [],
+            "dropped": list(allocation["dropped"]) if allocation else [],
+        }
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+def _file_stamp(path: Any) -> Optional[tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _prompt_asset_stamp() -> tuple[Any, ...]:
+    try:
+        from config import API_CONFIG_PATH
+        from dashboard import utils as dashboard_utils
+
+        loader = dashboard_utils.load_api_config
+    except Exception:
+        API_CONFIG_PATH = None
+        loader = None
+    # The loader is part of the key so a swapped config source (tests,
+    # alternate dashboards) never sees fragments cached from another one.
+    return (
+        loader,
+        _file_stamp(API_CONFIG_PATH),
+        _file_stamp(_TUTOR_INSTRUCTIONS_PATH),
+    )
+
+
+def clear_prompt_asset_cache() -> None:
+    """Drop cached prompt fragments; the next build re-reads config and files."""
+    with _PROMPT_ASSET_LOCK:
+        _PROMPT_ASSET_CACHE["stamp"] = None
+        _PROMPT_ASSET_CACHE["base_rules"] = None
+    _format_session_context.cache_clear()
+
+
 def _load_custom_instructions() -> str:
     """Read custom instructions from api_config.json, then tutor_instructions.md, then defaults."""
     try:
@@ -87,12 +313,27 @@ def _load_custom_instructions() -> str:
     return DEFAULT_RULES
 
 
-def _format_tier1(course_id: Optional[int], topic: Optional[str]) -> str:
-    rules = _load_custom_instructions()
-    return _BASE_TEMPLATE.format(
+def _format_base_rules() -> str:
+    """Return the rendered role + rules block, re-rendering only on file changes."""
+    stamp = _prompt_asset_stamp()
+    with _PROMPT_ASSET_LOCK:
+        if (
+            _PROMPT_ASSET_CACHE["stamp"] == stamp
+            and _PROMPT_ASSET_CACHE["base_rules"] is not None
+        ):
+            return _PROMPT_ASSET_CACHE["base_rules"]
+    base_rules = _BASE_TEMPLATE.format(rules=_load_custom_instructions())
+    with _PROMPT_ASSET_LOCK:
+        _PROMPT_ASSET_CACHE["stamp"] = stamp
+        _PROMPT_ASSET_CACHE["base_rules"] = base_rules
+    return base_rules
+
+
+@lru_cache(maxsize=256)
+def _format_session_context(course_id: Optional[int], topic: Optional[str]) -> str:
+    return _SESSION_TEMPLATE.format(
         course_id=course_id or "Not specified",
         topic=topic or "Not specified",
-        rules=rules,
     )
 
 
@@ -344,7 +585,7 @@ def _build_chain_section(chain_info: Optional[dict]) -> Optional[str]:
     )
 
 
-def build_prompt_with_contexts(
+def build_prompt_assembly(
     current_block: Optional[dict] = None,
     chain_info: Optional[dict] = None,
     course_id: Optional[int] = None,
@@ -354,54 +595,81 @@ def build_prompt_with_contexts(
     course_map: str = "",
     vault_state: str = "",
     teach_context: Optional[dict] = None,
-) -> str:
-    parts: list[str] = [_format_tier1(course_id, topic)]
-
-    block_section = _build_block_section(current_block)
-    if block_section:
-        parts.append(block_section)
+    token_budget: Optional[int] = None,
+) -> PromptAssembly:
+    """Build the tiered system prompt; callers may keep adding sections.
 
-    chain_section = _build_chain_section(chain_info)
-    if chain_section:
-        parts.append(chain_section)
+    Materials, graph context and vault state are budgeted turn sections, in
+    that priority order, so a ``token_budget`` trims vault state first.
+    """
+    prompt = PromptAssembly(token_budget=token_budget)
+    prompt.add(PROMPT_TIER_STATIC, _format_base_rules())
 
-    chain_runtime_section = _build_chain_runtime_section(chain_info)
-    if chain_runtime_section:
-        parts.append(chain_runtime_section)
+    if course_map and course_map.strip():
+        prompt.add(
+            PROMPT_TIER_STATIC,
+            "## Course Structure\n"
+            "Use this to orient the student within their program:\n\n"
+            + course_map,
+        )
 
-    chain_guardrails_section = _build_chain_guardrails_section(chain_info)
-    if chain_guardrails_section:
-        parts.append(chain_guardrails_section)
+    prompt.add(PROMPT_TIER_SESSION, _format_session_context(course_id, topic))
+    prompt.add(PROMPT_TIER_SESSION, _build_chain_runtime_section(chain_info))
+    prompt.add(PROMPT_TIER_SESSION, _build_chain_guardrails_section(chain_info))
 
-    teach_context_section = _build_teach_context_section(teach_context)
-    if teach_context_section:
-        parts.append(teach_context_section)
+    prompt.add(PROMPT_TIER_BLOCK, _build_block_section(current_block))
+    prompt.add(PROMPT_TIER_BLOCK, _build_chain_section(chain_info))
+    prompt.add(PROMPT_TIER_BLOCK, _build_teach_context_section(teach_context))
 
     if material_context and material_context.strip():
-        parts.append(
+        prompt.add(
+            PROMPT_TIER_TURN,
             "## Retrieved Study Materials\n"
-            + material_context
+            + material_context,
+            name="materials",
+            priority=0,
         )
 
-    if graph_context and graph_context.strip():
-        parts.append(graph_context)
-
-    if course_map and course_map.strip():
-        parts.append(
-            "## Course Structure\n"
-            "Use this to orient the student within their program:\n\n"
-            + course_map
-        )
+    prompt.add(PROMPT_TIER_TURN, graph_context, name="graph", priority=1)
 
     if vault_state and vault_state.strip():
-        parts.append(
+        prompt.add(
+            PROMPT_TIER_TURN,
             "## Vault State (Existing Notes for This Topic)\n"
             "Use this to avoid re-creating notes that already exist. "
             "Build on or reference these when creating new study materials.\n\n"
-            + vault_state
+            + vault_state,
+            name="vault_state",
+            priority=2,
         )
 
-    return "\n\n".join(parts)
+    return prompt
+
+
+def build_prompt_with_contexts(
+    current_block: Optional[dict] = None,
+    chain_info: Optional[dict] = None,
+    course_id: Optional[int] = None,
+    topic: Optional[str] = None,
+    material_context: Optional[str] = None,
+    graph_context: Optional[str] = None,
+    course_map: str = "",
+    vault_state: str = "",
+    teach_context: Optional[dict] = None,
+    token_budget: Optional[int] = None,
+) -> str:
+    return build_prompt_assembly(
+        current_block=current_block,
+        chain_info=chain_info,
+        course_id=course_id,
+        topic=topic,
+        material_context=material_context,
+        graph_context=graph_context,
+        course_map=course_map,
+        vault_state=vault_state,
+        teach_context=teach_context,
+        token_budget=token_budget,
+    ).render()
 
 
 # Backwards-compatible alias — old callers that pass mode= will still work
@@ -20,6 +20,7 @@ from pathlib import Path
 from typing import Any, Callable, Optional
 
 from config import DB_PATH, load_env
+from tutor_tracing import span as trace_span
 
 logger = logging.getLogger(__name__)
 
@@ -708,13 +709,10 @@ def _build_rag_embedding_insert_sql(columns: set[str]) -> tuple[str, list[str]]:
 
 def _count_tokens_for_embedding(text: str, model: str) -> int:
     if model.lower().startswith("text-embedding-3-"):
-        try:
-            import tiktoken
+        # Cached encoder + memoized counts; estimates when tiktoken is missing.
+        from tutor_tokens import count_tokens, encoding_for_model
 
-            enc = tiktoken.encoding_for_model(model)
-            return len(enc.encode(text))
-        except Exception:
-            return max(1, len(text) // 4)
+        return max(1, count_tokens(text, encoding=encoding_for_model(model)))
 
     # Fallback for non-OpenAI models.
     return max(1, len(text) // 4)
@@ -1106,6 +1104,34 @@ def search_with_embeddings(
     Fetches a widened candidate pool, then returns top k chunks.
     Falls back to keyword search if vectorstore is empty.
     """
+    with trace_span(
+        "rag.search_with_embeddings", collection=collection_name, k=k
+    ) as span:
+        docs = _search_with_embeddings(
+            query,
+            course_id=course_id,
+            folder_paths=folder_paths,
+            material_ids=material_ids,
+            collection_name=collection_name,
+            k=k,
+            debug=debug,
+        )
+        if span is not None:
+            span.set(chunks=len(docs) if isinstance(docs, list) else None)
+            if debug:
+                span.set(keyword_fallback=bool(debug.get("used_keyword_fallback")))
+        return docs
+
+
+def _search_with_embeddings(
+    query: str,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[list[str]] = None,
+    material_ids: Optional[list[int]] = None,
+    collection_name: str = COLLECTION_MATERIALS,
+    k: int = 6,
+    debug: Optional[dict[str, Any]] = None,
+):
     with _chroma_lock:
         if debug is not None:
             debug.clear()
@@ -24,6 +24,7 @@ def format_sse_done(
     model: Optional[str] = None,
     retrieval_debug: Optional[dict] = None,
     compaction_telemetry: Optional[dict] = None,
+    prompt_cache: Optional[dict] = None,
     timing: Optional[dict] = None,
     behavior_override: Optional[str] = None,
     verdict: Optional[dict] = None,
@@ -45,6 +46,8 @@ def format_sse_done(
         payload["retrieval_debug"] = retrieval_debug
     if compaction_telemetry:
         payload["compaction_telemetry"] = compaction_telemetry
+    if prompt_cache:
+        payload["prompt_cache"] = prompt_cache
     if timing:
         payload["timing"] = timing
     if behavior_override:
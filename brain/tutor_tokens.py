@@ -0,0 +1,202 @@
+"""
+Token accounting for Tutor prompt assembly.
+
+Prompt sections, retrieved materials, notes and history turns are counted in
+model tokens rather than characters:
+
+- one tiktoken encoder per encoding, loaded once and cached (a failed load is
+  cached too, so an offline machine falls back to the ~4 chars/token estimate
+  without retrying the download every turn)
+- per-string counts memoized by a BLAKE2 digest of the text, so a material or
+  history turn that recurs across turns is encoded once
+- ``allocate_sections`` fills budgeted sections in priority order, truncating
+  the first one that no longer fits and dropping the rest
+
+``count_tokens`` is the only entry point callers need; ``token_stats`` reports
+memo hits/misses for debug output and benchmarks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# gpt-5 / gpt-4o family encoding; embeddings use cl100k_base.
+DEFAULT_ENCODING = "o200k_base"
+_CHARS_PER_TOKEN = 4
+# Strings shorter than this are counted directly; hashing them costs about
+# as much as encoding them.
+_MEMO_MIN_CHARS = 256
+_MEMO_MAX_ENTRIES = 8192
+# Truncated copies are large, so only the most recent few are kept.
+_TRUNCATED_MAX_ENTRIES = 32
+# A budgeted section is dropped rather than cut below this many tokens.
+MIN_SECTION_TOKENS = 200
+TRUNCATION_MARKER = "\n\n[... truncated to fit the prompt token budget ...]"
+
+_LOCK = threading.Lock()
+_ENCODERS: dict[str, Any] = {}
+_MEMO: "OrderedDict[tuple[str, bytes], int]" = OrderedDict()
+_TRUNCATED: "OrderedDict[tuple[str, bytes, int], str]" = OrderedDict()
+_STATS = {"hits": 0, "misses": 0, "estimated": 0}
+
+
+def encoding_for_model(model: Optional[str]) -> str:
+    """Encoding name for a model id (unknown models use ``DEFAULT_ENCODING``)."""
+    name = str(model or "").lower()
+    if name.startswith(("text-embedding-", "gpt-4-", "gpt-3.5")) or name == "gpt-4":
+        return "cl100k_base"
+    return DEFAULT_ENCODING
+
+
+def get_encoder(encoding: str = DEFAULT_ENCODING) -> Any:
+    """Cached tiktoken encoder, or None when tiktoken or its BPE file is unavailable."""
+    with _LOCK:
+        if encoding in _ENCODERS:
+            return _ENCODERS[encoding]
+    try:
+        import tiktoken
+
+        encoder = tiktoken.get_encoding(encoding)
+    except Exception as exc:
+        logger.info("Token encoder %s unavailable, estimating: %s", encoding, exc)
+        encoder = None
+    with _LOCK:
+        _ENCODERS.setdefault(encoding, encoder)
+        return _ENCODERS[encoding]
+
+
+def estimate_tokens(text: str) -> int:
+    """Character-based estimate used when no encoder is available."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def count_tokens(text: Optional[str], *, encoding: str = DEFAULT_ENCODING) -> int:
+    """Token count of ``text``; long strings are memoized by content digest."""
+    if not text:
+        return 0
+    encoder = get_encoder(encoding)
+    if encoder is None:
+        with _LOCK:
+            _STATS["estimated"] += 1
+        return estimate_tokens(text)
+    if len(text) < _MEMO_MIN_CHARS:
+        return len(encoder.encode(text, disallowed_special=()))
+
+    key = (encoding, _digest(text))
+    with _LOCK:
+        cached = _MEMO.get(key)
+        if cached is not None:
+            _MEMO.move_to_end(key)
+            _STATS["hits"] += 1
+            return cached
+        _STATS["misses"] += 1
+    count = len(encoder.encode(text, disallowed_special=()))
+    with _LOCK:
+        _MEMO[key] = count
+        while len(_MEMO) > _MEMO_MAX_ENTRIES:
+            _MEMO.popitem(last=False)
+    return count
+
+
+def truncate_to_tokens(
+    text: str, max_tokens: int, *, encoding: str = DEFAULT_ENCODING
+) -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens (marker included).
+
+    The same text cut to the same size (a fixed material set under a steady
+    budget) is served from a small cache instead of being re-encoded.
+    """
+    if count_tokens(text, encoding=encoding) <= max_tokens:
+        return text
+    keep = max(0, max_tokens - count_tokens(TRUNCATION_MARKER, encoding=encoding))
+    encoder = get_encoder(encoding)
+    if encoder is None:
+        return text[: keep * _CHARS_PER_TOKEN].rstrip() + TRUNCATION_MARKER
+
+    key = (encoding, _digest(text), keep)
+    with _LOCK:
+        cached = _TRUNCATED.get(key)
+        if cached is not None:
+            _TRUNCATED.move_to_end(key)
+            return cached
+    head = encoder.decode(encoder.encode(text, disallowed_special=())[:keep])
+    truncated = head.rstrip() + TRUNCATION_MARKER
+    with _LOCK:
+        _TRUNCATED[key] = truncated
+        while len(_TRUNCATED) > _TRUNCATED_MAX_ENTRIES:
+            _TRUNCATED.popitem(last=False)
+    return truncated
+
+
+@dataclass
+class BudgetedSection:
+    """A prompt section the allocator may truncate or drop (lower priority first)."""
+
+    name: str
+    text: str
+    priority: int
+
+
+def allocate_sections(
+    sections: Iterable[BudgetedSection],
+    budget: int,
+    *,
+    encoding: str = DEFAULT_ENCODING,
+) -> tuple[dict[str, str], dict[str, Any]]:
+    """Fit sections into ``budget`` tokens by priority.
+
+    Returns the kept text per section name and a usage report with the
+    tokens each kept section uses and which were truncated or dropped.
+    """
+    kept: dict[str, str] = {}
+    usage: dict[str, Any] = {"budget": max(0, int(budget)), "sections": {}, "truncated": [], "dropped": []}
+    remaining = usage["budget"]
+    for section in sorted(sections, key=lambda s: s.priority):
+        tokens = count_tokens(section.text, encoding=encoding)
+        if tokens <= remaining:
+            kept[section.name] = section.text
+        elif remaining >= MIN_SECTION_TOKENS:
+            kept[section.name] = truncate_to_tokens(
+                section.text, remaining, encoding=encoding
+            )
+            usage["truncated"].append(section.name)
+            tokens = count_tokens(kept[section.name], encoding=encoding)
+        else:
+            usage["dropped"].append(section.name)
+            continue
+        usage["sections"][section.name] = tokens
+        remaining -= tokens
+    usage["remaining"] = remaining
+    return kept, usage
+
+
+def token_stats() -> dict[str, Any]:
+    """Memo hit/miss counters, memo size and which encoders loaded."""
+    with _LOCK:
+        return {
+            **_STATS,
+            "memo_entries": len(_MEMO),
+            "encoders": {name: enc is not None for name, enc in _ENCODERS.items()},
+        }
+
+
+def clear_token_cache(*, encoders: bool = False) -> None:
+    """Drop memoized counts (and optionally the cached encoders); resets stats."""
+    with _LOCK:
+        _MEMO.clear()
+        _TRUNCATED.clear()
+        if encoders:
+            _ENCODERS.clear()
+        for key in _STATS:
+            _STATS[key] = 0
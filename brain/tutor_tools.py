@@ -24,6 +24,8 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from tutor_tracing import span as trace_span
+
 log = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -842,6 +844,27 @@ TOOL_REGISTRY: dict[str, Any] = {
     "rate_method_block": execute_rate_method_block,
 }
 
+# Tools that write notes, cards or diagrams; they draw on the turn's
+# "artifacts" latency allowance instead of "tools".
+ARTIFACT_WRITE_TOOLS = frozenset(
+    {
+        "save_to_obsidian",
+        "apply_obsidian_write_preview",
+        "create_note",
+        "create_anki_card",
+        "create_figma_diagram",
+    }
+)
+# Tools that change state. They are never abandoned on a budget overrun: a
+# write that lands after the model was told it failed gets retried, or is
+# clobbered by the turn-end session update.
+WRITE_TOOLS = ARTIFACT_WRITE_TOOLS | frozenset(
+    {
+        "save_learning_objectives",
+        "rate_method_block",
+    }
+)
+
 _OBSIDIAN_READ_TOOLS = {
     "list_obsidian_paths",
     "read_obsidian_note",
@@ -857,6 +880,25 @@ def execute_tool(
     allow_obsidian_read: bool = False,
 ) -> dict[str, Any]:
     """Look up and execute a tool by name. Returns a result dict."""
+    with trace_span("tool.execute", tool=tool_name) as span:
+        result = _execute_tool(
+            tool_name,
+            arguments,
+            session_id=session_id,
+            allow_obsidian_read=allow_obsidian_read,
+        )
+        if span is not None and isinstance(result, dict):
+            span.set(success=bool(result.get("success")))
+        return result
+
+
+def _execute_tool(
+    tool_name: str,
+    arguments: dict[str, Any],
+    *,
+    session_id: str | int | None,
+    allow_obsidian_read: bool,
+) -> dict[str, Any]:
     handler = TOOL_REGISTRY.get(tool_name)
     if not handler:
         return {"success": False, "error": f"Unknown tool: {tool_name}"}
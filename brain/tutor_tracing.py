@@ -0,0 +1,402 @@
+"""
+In-process tracing for the Tutor turn pipeline.
+
+A turn opens a ``Trace`` with ``start_trace`` and wraps its stages in spans.
+Library code calls the module-level ``span``:
+- ``build_context`` and its sources
+- ``search_with_embeddings``
+- ``execute_tool``
+- the ``llm_provider`` calls
+- vault artifact writes
+
+``span`` nests under whatever span is active in the current context. It is
+a no-op when nothing is being traced.
+
+``send_turn`` streams from a generator. Under the ASGI pool each ``next()``
+may run on a different thread, so a span that stays open across a
+``yield`` is opened with ``Trace.start_span`` and is never left active.
+Only synchronous regions make a span current (``Trace.span`` /
+``Trace.activate``). ``Trace.iterate`` re-activates its span around every
+``next()`` of the wrapped iterator. Work handed to a thread pool keeps its
+parent through ``propagate``.
+
+Finished traces go to ``tutor_traces`` / ``tutor_trace_spans``
+(``save_trace``, or ``save_trace_record`` for a ``trace_record`` snapshot
+handed to the post-turn queue), and ``slowest_traces`` returns the slowest N turns with
+their span trees. No external collector is involved.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Traces kept in the local table; older ones are pruned on save.
+TRACE_RETENTION = 2000
+
+_CURRENT: contextvars.ContextVar[Optional[tuple["Trace", "Span"]]] = (
+    contextvars.ContextVar("tutor_trace_span", default=None)
+)
+
+
+@dataclass
+class Span:
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    start: float
+    end: Optional[float] = None
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+class Trace:
+    """Spans for one unit of work (a tutor turn), rooted at ``root``."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        session_id: Optional[str] = None,
+        turn_number: Optional[int] = None,
+        **attributes: Any,
+    ) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.session_id = session_id
+        self.turn_number = turn_number
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: list[Span] = []
+        self.root = self._new_span(name, None, attributes)
+
+    def _new_span(
+        self, name: str, parent_id: Optional[int], attributes: dict[str, Any]
+    ) -> Span:
+        with self._lock:
+            span = Span(
+                span_id=len(self.spans) + 1,
+                parent_id=parent_id,
+                name=name,
+                start=time.perf_counter(),
+                attributes=dict(attributes),
+            )
+            self.spans.append(span)
+        return span
+
+    def start_span(
+        self, name: str, *, parent: Optional[Span] = None, **attributes: Any
+    ) -> Span:
+        """Open a span under ``parent`` (default: the root) without activating it."""
+        return self._new_span(name, (parent or self.root).span_id, attributes)
+
+    def end_span(
+        self, span: Span, *, status: Optional[str] = None, **attributes: Any
+    ) -> None:
+        span.attributes.update(attributes)
+        if status:
+            span.status = status
+        if span.end is None:
+            span.end = time.perf_counter()
+
+    @contextmanager
+    def activate(self, span: Optional[Span] = None) -> Iterator[Span]:
+        """Make ``span`` (default: the root) current for a synchronous region."""
+        target = span or self.root
+        token = _CURRENT.set((self, target))
+        try:
+            yield target
+        finally:
+            _CURRENT.reset(token)
+
+    @contextmanager
+    def span(
+        self, name: str, *, parent: Optional[Span] = None, **attributes: Any
+    ) -> Iterator[Span]:
+        """Open, activate and close a span around a synchronous region."""
+        current = self.start_span(name, parent=parent, **attributes)
+        token = _CURRENT.set((self, current))
+        try:
+            yield current
+        except BaseException as exc:
+            current.status = "error"
+            current.attributes.setdefault("error", type(exc).__name__)
+            raise
+        finally:
+            _CURRENT.reset(token)
+            self.end_span(current)
+
+    def iterate(
+        self,
+        name: str,
+        iterable: Iterable[Any],
+        *,
+        parent: Optional[Span] = None,
+        **attributes: Any,
+    ) -> Iterator[Any]:
+        """Yield from ``iterable`` inside one span that stays open until it ends.
+
+        The span is active only while the wrapped iterator runs, so nested
+        spans attach to it whichever thread calls ``next()``. Records
+        ``items`` and ``first_item_ms``.
+        """
+        current = self.start_span(name, parent=parent, **attributes)
+        iterator = iter(iterable)
+        items = 0
+        try:
+            while True:
+                token = _CURRENT.set((self, current))
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    _CURRENT.reset(token)
+                if items == 0:
+                    current.attributes["first_item_ms"] = _ms(
+                        time.perf_counter() - current.start
+                    )
+                items += 1
+                yield item
+        except GeneratorExit:
+            current.status = "cancelled"
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            raise
+        except BaseException as exc:
+            current.status = "error"
+            current.attributes.setdefault("error", type(exc).__name__)
+            raise
+        finally:
+            self.end_span(current, items=items)
+
+    def finish(self, *, status: Optional[str] = None, **attributes: Any) -> None:
+        """Close the root; spans still open are closed now and marked incomplete."""
+        now = time.perf_counter()
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            if span is not self.root and span.end is None:
+                span.end = now
+                span.status = "incomplete"
+        self.end_span(self.root, status=status, **attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.root.end if self.root.end is not None else time.perf_counter()
+        return _ms(end - self.root.start)
+
+    def span_rows(self) -> list[dict[str, Any]]:
+        with self._lock:
+            spans = list(self.spans)
+        return [
+            {
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "name": span.name,
+                "start_ms": _ms(span.start - self._origin),
+                "duration_ms": (
+                    _ms(span.end - span.start) if span.end is not None else None
+                ),
+                "status": span.status,
+                "attributes": dict(span.attributes),
+            }
+            for span in spans
+        ]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def start_trace(
+    name: str,
+    *,
+    session_id: Optional[str] = None,
+    turn_number: Optional[int] = None,
+    **attributes: Any,
+) -> Trace:
+    return Trace(name, session_id=session_id, turn_number=turn_number, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    current = _CURRENT.get()
+    return current[1] if current else None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Child span of the active span; yields None when nothing is traced."""
+    current = _CURRENT.get()
+    if current is None:
+        yield None
+        return
+    trace, parent = current
+    with trace.span(name, parent=parent, **attributes) as child:
+        yield child
+
+
+def propagate(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Bind ``fn`` to the caller's context so pool threads trace under it."""
+    context = contextvars.copy_context()
+
+    def _run(*args: Any, **kwargs: Any) -> Any:
+        return context.run(fn, *args, **kwargs)
+
+    return _run
+
+
+def _dumps(attributes: dict[str, Any]) -> Optional[str]:
+    return json.dumps(attributes, default=str) if attributes else None
+
+
+def trace_record(trace: Trace) -> dict[str, Any]:
+    """JSON-serialisable snapshot of a trace, as stored by ``save_trace_record``."""
+    return {
+        "trace_id": trace.trace_id,
+        "name": trace.name,
+        "session_id": trace.session_id,
+        "turn_number": trace.turn_number,
+        "status": trace.root.status,
+        "duration_ms": trace.duration_ms,
+        "attributes": dict(trace.root.attributes),
+        "started_at": trace.started_at,
+        "spans": trace.span_rows(),
+    }
+
+
+def save_trace(conn: sqlite3.Connection, trace: Trace) -> None:
+    """Persist a finished trace and prune beyond ``TRACE_RETENTION``."""
+    save_trace_record(conn, trace_record(trace))
+
+
+def save_trace_record(conn: sqlite3.Connection, record: dict[str, Any]) -> None:
+    """Persist a ``trace_record`` snapshot (e.g. from the post-turn queue)."""
+    conn.execute(
+        """INSERT OR REPLACE INTO tutor_traces
+           (trace_id, name, tutor_session_id, turn_number, status, duration_ms,
+            attributes_json, started_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            record["trace_id"],
+            record["name"],
+            record.get("session_id"),
+            record.get("turn_number"),
+            record.get("status") or "ok",
+            record["duration_ms"],
+            _dumps(record.get("attributes") or {}),
+            record["started_at"],
+        ),
+    )
+    conn.executemany(
+        """INSERT OR REPLACE INTO tutor_trace_spans
+           (trace_id, span_id, parent_id, name, start_ms, duration_ms, status,
+            attributes_json)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        [
+            (
+                record["trace_id"],
+                row["span_id"],
+                row["parent_id"],
+                row["name"],
+                row["start_ms"],
+                row["duration_ms"],
+                row["status"],
+                _dumps(row["attributes"]),
+            )
+            for row in record.get("spans") or []
+        ],
+    )
+    stale = conn.execute(
+        "SELECT trace_id FROM tutor_traces ORDER BY started_at DESC LIMIT -1 OFFSET ?",
+        (TRACE_RETENTION,),
+    ).fetchall()
+    if stale:
+        ids = [(row[0],) for row in stale]
+        conn.executemany("DELETE FROM tutor_trace_spans WHERE trace_id = ?", ids)
+        conn.executemany("DELETE FROM tutor_traces WHERE trace_id = ?", ids)
+    conn.commit()
+
+
+def _loads(raw: Optional[str]) -> dict[str, Any]:
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def slowest_traces(
+    conn: sqlite3.Connection,
+    *,
+    limit: int = 10,
+    session_id: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """Slowest persisted traces, each with its nested span tree under ``spans``."""
+    conn.row_factory = sqlite3.Row
+    sql = """SELECT trace_id, name, tutor_session_id, turn_number, status,
+                    duration_ms, attributes_json, started_at
+             FROM tutor_traces"""
+    params: list[Any] = []
+    if session_id:
+        sql += " WHERE tutor_session_id = ?"
+        params.append(session_id)
+    sql += " ORDER BY duration_ms DESC LIMIT ?"
+    params.append(int(limit))
+    traces = []
+    for row in conn.execute(sql, params).fetchall():
+        span_rows = conn.execute(
+            """SELECT span_id, parent_id, name, start_ms, duration_ms, status,
+                      attributes_json
+               FROM tutor_trace_spans
+               WHERE trace_id = ?
+               ORDER BY span_id""",
+            (row["trace_id"],),
+        ).fetchall()
+        nodes: dict[int, dict[str, Any]] = {}
+        roots: list[dict[str, Any]] = []
+        for span_row in span_rows:
+            node = {
+                "span_id": span_row["span_id"],
+                "name": span_row["name"],
+                "start_ms": span_row["start_ms"],
+                "duration_ms": span_row["duration_ms"],
+                "status": span_row["status"],
+                "attributes": _loads(span_row["attributes_json"]),
+                "children": [],
+            }
+            nodes[node["span_id"]] = node
+            parent = nodes.get(span_row["parent_id"])
+            (parent["children"] if parent else roots).append(node)
+        traces.append(
+            {
+                "trace_id": row["trace_id"],
+                "name": row["name"],
+                "session_id": row["tutor_session_id"],
+                "turn_number": row["turn_number"],
+                "status": row["status"],
+                "duration_ms": row["duration_ms"],
+                "started_at": row["started_at"],
+                "attributes": _loads(row["attributes_json"]),
+                "spans": roots,
+            }
+        )
+    return traces
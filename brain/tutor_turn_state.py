@@ -0,0 +1,250 @@
+"""
+Per-session turn-state cache for Tutor turns.
+
+``send_turn`` re-derives the same session state on every message:
+- the session row
+- the active block and chain overview, plus the method contract checks
+- whether this is the first turn in the block
+- the previous prompt-prefix hash
+- the teach context
+
+That state only changes when something writes to the session. So it is cached
+per session and versioned by a revision counter:
+
+- ``bump_session_revision`` drops a session's state. Call it when a block is
+  advanced or the session is edited, ended, resumed or deleted.
+- ``bump_chain_revision`` drops every session's state. Call it when method
+  chain or block definitions are edited. Bulk writes to tutor_sessions use
+  ``invalidate_all_session_state``.
+- ``TurnStateLookup.record_turn_saved`` is the turn-save path. It bumps the
+  revision too, but carries the chain-derived entries forward and writes the
+  saved values through, so the next turn starts warm.
+
+Revisions are per process. Writes made by another process (a second
+server worker, a CLI script) are caught by the session stamp:
+``read_session_stamp`` reads ``STAMP_COLUMNS`` from the session row, which
+is one indexed lookup. ``session_state(..., stamp=...)`` starts fresh when
+the stamp differs from the one the state was built under. Bumps must come
+after the write is committed, or a concurrent turn can re-cache the old
+row.
+
+Entries expire after ``TURN_STATE_TTL_SECONDS``. That is a backstop for
+other-process writes the stamp does not cover (strategy feedback, chain
+edits).
+"""
+
+from __future__ import annotations
+
+import copy
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+TURN_STATE_TTL_SECONDS = 300.0
+_MAX_SESSIONS = 128
+# Session columns every turn or block change moves; see read_session_stamp.
+STAMP_COLUMNS = ("turn_count", "current_block_index", "status", "method_chain_id")
+
+_LOCK = threading.Lock()
+_REVISIONS: dict[str, int] = {}
+_CHAIN_REVISION = 0
+_STATS = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+@dataclass
+class _SessionState:
+    revision: int
+    chain_revision: int
+    created_at: float
+    stamp: Optional[tuple] = None
+    values: dict[str, Any] = field(default_factory=dict)
+
+
+_STATES: "OrderedDict[str, _SessionState]" = OrderedDict()
+
+
+def _is_current(session_id: str, state: _SessionState) -> bool:
+    return (
+        _STATES.get(session_id) is state
+        and state.revision == _REVISIONS.get(session_id, 0)
+        and state.chain_revision == _CHAIN_REVISION
+    )
+
+
+class TurnStateLookup:
+    """One request's view of a session's cached state, with hit/miss counts."""
+
+    def __init__(self, session_id: str, state: _SessionState) -> None:
+        self.session_id = session_id
+        self._state = state
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def revision(self) -> int:
+        return self._state.revision
+
+    def get(
+        self,
+        key: str,
+        build: Callable[[], Any],
+        *,
+        fingerprint: Hashable = None,
+        cache_none: bool = True,
+    ) -> Any:
+        """Return the cached value for ``key`` or build and cache it.
+
+        ``fingerprint`` identifies the inputs the value was built from. A
+        stored value with a different fingerprint counts as a miss and is
+        replaced. Values are deep-copied in and out, so callers may mutate
+        what they get back.
+        """
+        with _LOCK:
+            stored = self._state.values.get(key)
+            hit = stored is not None and stored[0] == fingerprint
+            if hit:
+                _STATS["hits"] += 1
+            else:
+                _STATS["misses"] += 1
+        if hit:
+            self.hits += 1
+            return copy.deepcopy(stored[1])
+
+        self.misses += 1
+        value = build()
+        if value is None and not cache_none:
+            return value
+        with _LOCK:
+            if _is_current(self.session_id, self._state):
+                self._state.values[key] = (fingerprint, copy.deepcopy(value))
+        return value
+
+    def record_turn_saved(
+        self,
+        *,
+        session_updates: dict[str, Any],
+        values: Optional[dict[str, Any]] = None,
+        drop: Iterable[str] = (),
+    ) -> None:
+        """Advance the revision after a committed turn and write it through.
+
+        ``session_updates`` are the columns the turn wrote to the cached
+        session row. ``values`` replace the named entries, and ``drop``
+        removes entries that depended on the previous turn. When someone
+        else has bumped the session since this lookup, the state is dropped
+        instead.
+        """
+        with _LOCK:
+            if not _is_current(self.session_id, self._state):
+                _STATES.pop(self.session_id, None)
+                return
+            revision = self._state.revision + 1
+            _REVISIONS[self.session_id] = revision
+            self._state.revision = revision
+            stored_session = self._state.values.get("session")
+            if stored_session is not None and isinstance(stored_session[1], dict):
+                stored_session[1].update(copy.deepcopy(session_updates))
+            for key in drop:
+                self._state.values.pop(key, None)
+            for key, value in (values or {}).items():
+                self._state.values[key] = (None, copy.deepcopy(value))
+            # The stamp follows the write-through; without a cached row the
+            # next stamped lookup starts fresh.
+            self._state.stamp = (
+                _stamp_of(stored_session[1])
+                if stored_session is not None and isinstance(stored_session[1], dict)
+                else None
+            )
+
+
+def _stamp_of(row: dict[str, Any]) -> tuple:
+    return tuple(row.get(column) for column in STAMP_COLUMNS)
+
+
+def read_session_stamp(conn: sqlite3.Connection, session_id: str) -> Optional[tuple]:
+    """The session's ``STAMP_COLUMNS`` as stored; None when there is no such session."""
+    try:
+        row = conn.execute(
+            f"SELECT {', '.join(STAMP_COLUMNS)} FROM tutor_sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return tuple(row) if row is not None else None
+
+
+def session_state(session_id: str, *, stamp: Optional[tuple] = None) -> TurnStateLookup:
+    """Return a lookup on the session's current state, starting a new one if stale.
+
+    ``stamp`` is the session's ``read_session_stamp``. When given, cached
+    state built under a different stamp (or none) is discarded, so writes
+    from other processes are seen. Lookups made later in the same request
+    can leave it out.
+    """
+    now = time.monotonic()
+    with _LOCK:
+        revision = _REVISIONS.get(session_id, 0)
+        state = _STATES.get(session_id)
+        if (
+            state is None
+            or state.revision != revision
+            or state.chain_revision != _CHAIN_REVISION
+            or now - state.created_at > TURN_STATE_TTL_SECONDS
+            or (stamp is not None and state.stamp != stamp)
+        ):
+            state = _SessionState(
+                revision=revision,
+                chain_revision=_CHAIN_REVISION,
+                created_at=now,
+                stamp=stamp,
+            )
+            _STATES[session_id] = state
+        _STATES.move_to_end(session_id)
+        while len(_STATES) > _MAX_SESSIONS:
+            _STATES.popitem(last=False)
+    return TurnStateLookup(session_id, state)
+
+
+def bump_session_revision(session_id: str) -> int:
+    """Invalidate a session's cached state after a write; returns the new revision."""
+    with _LOCK:
+        revision = _REVISIONS.get(session_id, 0) + 1
+        _REVISIONS[session_id] = revision
+        if _STATES.pop(session_id, None) is not None:
+            _STATS["invalidations"] += 1
+        return revision
+
+
+def bump_chain_revision() -> int:
+    """Invalidate every session's cached state after a chain or block edit."""
+    global _CHAIN_REVISION
+    with _LOCK:
+        _CHAIN_REVISION += 1
+        _STATS["invalidations"] += len(_STATES)
+        _STATES.clear()
+        return _CHAIN_REVISION
+
+
+def invalidate_all_session_state() -> None:
+    """Drop every session's cached state after a bulk write to tutor_sessions."""
+    with _LOCK:
+        _STATS["invalidations"] += len(_STATES)
+        _STATES.clear()
+
+
+def turn_state_stats() -> dict[str, int]:
+    """Process-wide hit/miss counters and the number of cached sessions."""
+    with _LOCK:
+        return {**_STATS, "sessions": len(_STATES)}
+
+
+def clear_turn_state_cache() -> None:
+    """Drop all cached state and reset counters (tests)."""
+    with _LOCK:
+        _STATES.clear()
+        _REVISIONS.clear()
+        for key in _STATS:
+            _STATS[key] = 0
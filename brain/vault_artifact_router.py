@@ -1,13 +1,41 @@
 # brain/vault_artifact_router.py
-"""Route parsed vault artifact commands to ObsidianVault methods."""
+"""Route parsed vault artifact commands to ObsidianVault methods.
+
+``execute_artifact_batch`` plans a turn's artifacts before running them.
+Artifacts are grouped by target note. Each note's group runs in order, and
+groups for different notes run concurrently on ``ARTIFACT_WRITE_WORKERS``
+threads. A ``move`` is a barrier: everything before it finishes first.
+Consecutive edits (append, prepend, property, replace-section) to the same
+note are applied in memory to one read of the note with the
+``obsidian_merge`` edit helpers, then written back once with
+``write_note_if_unchanged``. If the note changed in between (the student
+edited it in Obsidian), nothing is written and the edits run one by one.
+"""
 
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from tutor_tracing import span as trace_span
 
 log = logging.getLogger(__name__)
 
+ARTIFACT_WRITE_WORKERS = 4
+
+# Operations that only edit an existing note, keyed by their in-memory
+# equivalent in obsidian_merge.
+_NOTE_EDITS = {
+    "append": "append_to_note",
+    "prepend": "prepend_to_note",
+    "property": "set_note_property",
+    "replace-section": "replace_note_section",
+}
+_READ_ONLY_OPS = {"search"}
+
 
 def execute_vault_artifact(vault: Any, artifact: dict) -> str:
     """Execute a single vault artifact command.
@@ -19,6 +47,11 @@ def execute_vault_artifact(vault: Any, artifact: dict) -> str:
     Returns:
         Result string from vault operation, or error message.
     """
+    with trace_span("artifact.vault_write", operation=artifact.get("operation")):
+        return _execute_vault_artifact(vault, artifact)
+
+
+def _execute_vault_artifact(vault: Any, artifact: dict) -> str:
     op = artifact["operation"]
     p = artifact["params"]
 
@@ -77,20 +110,189 @@ def execute_vault_artifact(vault: Any, artifact: dict) -> str:
         return f"Error: {exc}"
 
 
+def _artifact_note(artifact: dict) -> Optional[str]:
+    """The note an artifact writes to, as the vault call names it."""
+    op = artifact.get("operation")
+    p = artifact.get("params") or {}
+    if op in _NOTE_EDITS:
+        return p.get("file", "")
+    if op == "create":
+        name = p.get("name", "")
+        return f"{p['folder']}/{name}" if p.get("folder") else name
+    if op == "move":
+        return p.get("path", "")
+    if op == "write-block-note":
+        return f"{p.get('course_folder', '')}/Blocks/{p.get('block_name', '')}.md"
+    return None
+
+
+def _note_key(note: str) -> str:
+    # Notes are named by wikilink or by path, so group on the basename; a
+    # false match only serializes two notes, it never merges their edits.
+    base = note.replace("\\", "/").rsplit("/", 1)[-1].strip().lower()
+    return base[:-3] if base.endswith(".md") else base
+
+
+def plan_artifacts(artifacts: list[dict]) -> list[list[list[int]]]:
+    """Plan execution as stages of per-note groups of artifact indices.
+
+    Stages run one after another; the groups in a stage run concurrently
+    and the indices in a group run in order.
+    """
+    stages: list[list[list[int]]] = []
+    groups: dict[str, list[int]] = {}
+    loose: list[list[int]] = []
+
+    def close_stage() -> None:
+        if groups or loose:
+            stages.append([*groups.values(), *loose])
+            groups.clear()
+            loose.clear()
+
+    for idx, artifact in enumerate(artifacts):
+        note = _artifact_note(artifact)
+        if artifact.get("operation") == "move":
+            close_stage()
+            stages.append([[idx]])
+        elif note:
+            groups.setdefault(_note_key(note), []).append(idx)
+        else:
+            loose.append([idx])
+    close_stage()
+    return stages
+
+
+def _artifact_result(artifact: dict, result: str, *, coalesced: bool = False) -> dict:
+    return {
+        "operation": artifact["operation"],
+        "result": result,
+        "success": not result.startswith("Error:") and not result.startswith("Unknown"),
+        "note": _artifact_note(artifact),
+        "coalesced": coalesced,
+    }
+
+
+def _apply_coalesced(vault: Any, note: str, items: list[tuple[int, dict]]) -> Optional[dict[int, dict]]:
+    """Apply several edits to ``note`` with one read and one write.
+
+    Returns None when the note cannot be read as text (missing, empty, or a
+    vault without ``write_note_if_unchanged``) or changed before the write;
+    the caller then runs the edits one by one.
+    """
+    if not callable(getattr(vault, "write_note_if_unchanged", None)):
+        return None
+    import obsidian_merge
+    from obsidian_vault import NOTE_CHANGED, note_content_hash
+
+    try:
+        text = vault.read_note(note)
+    except Exception as exc:
+        log.debug("Coalesced read of %s failed, writing one by one: %s", note, exc)
+        return None
+    if not isinstance(text, str) or not text.strip():
+        return None
+    read_hash = note_content_hash(text)
+
+    results: dict[int, dict] = {}
+    applied: list[tuple[int, dict]] = []
+    for idx, artifact in items:
+        p = artifact["params"]
+        edit = getattr(obsidian_merge, _NOTE_EDITS[artifact["operation"]])
+        try:
+            if artifact["operation"] == "property":
+                text = edit(text, p.get("key", ""), p.get("value", ""))
+            elif artifact["operation"] == "replace-section":
+                text = edit(text, p.get("heading", ""), p.get("content", ""))
+            else:
+                text = edit(text, p.get("content", ""))
+        except ValueError as exc:
+            results[idx] = _artifact_result(artifact, f"Error: {exc}", coalesced=True)
+            continue
+        applied.append((idx, artifact))
+    if not applied:
+        return results
+
+    with trace_span("artifact.vault_write", operation="coalesced", edits=len(applied)):
+        try:
+            written = vault.write_note_if_unchanged(
+                note, read_hash, text if text.endswith("\n") else text + "\n"
+            )
+        except Exception as exc:
+            log.error("Coalesced vault write to %s failed: %s", note, exc)
+            written = f"Error: {exc}"
+    if NOTE_CHANGED in str(written or ""):
+        log.info("%s changed since it was read, writing edits one by one", note)
+        return None
+    for idx, artifact in applied:
+        results[idx] = _artifact_result(artifact, str(written or ""), coalesced=True)
+    return results
+
+
+def _run_group(vault: Any, artifacts: list[dict], indices: list[int]) -> tuple[dict[int, dict], Counter]:
+    results: dict[int, dict] = {}
+    writes: Counter = Counter()
+    pos = 0
+    while pos < len(indices):
+        artifact = artifacts[indices[pos]]
+        op = artifact["operation"]
+        note = _artifact_note(artifact)
+        run = [indices[pos]]
+        if op in _NOTE_EDITS:
+            while (
+                pos + len(run) < len(indices)
+                and artifacts[indices[pos + len(run)]]["operation"] in _NOTE_EDITS
+                and _artifact_note(artifacts[indices[pos + len(run)]]) == note
+            ):
+                run.append(indices[pos + len(run)])
+        pos += len(run)
+
+        if len(run) > 1:
+            coalesced = _apply_coalesced(vault, note, [(idx, artifacts[idx]) for idx in run])
+            if coalesced is not None:
+                results.update(coalesced)
+                if any(item["success"] for item in coalesced.values()):
+                    writes[note] += 1
+                continue
+        for idx in run:
+            results[idx] = _artifact_result(artifacts[idx], execute_vault_artifact(vault, artifacts[idx]))
+            if note and artifacts[idx]["operation"] not in _READ_ONLY_OPS:
+                writes[note] += 1
+    return results, writes
+
+
+def execute_artifact_batch(vault: Any, artifacts: list[dict]) -> dict:
+    """Execute a batch of artifacts as planned by ``plan_artifacts``.
+
+    Returns {"results": [...], "note_writes": {note: writes}, "elapsed_ms": float};
+    results are in input order, as from ``execute_all_artifacts``.
+    """
+    started = time.perf_counter()
+    results: dict[int, dict] = {}
+    writes: Counter = Counter()
+    for stage in plan_artifacts(artifacts):
+        if len(stage) == 1:
+            outcomes = [_run_group(vault, artifacts, stage[0])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(ARTIFACT_WRITE_WORKERS, len(stage)),
+                thread_name_prefix="vault-artifacts",
+            ) as pool:
+                outcomes = list(pool.map(lambda group: _run_group(vault, artifacts, group), stage))
+        for group_results, group_writes in outcomes:
+            results.update(group_results)
+            writes.update(group_writes)
+    return {
+        "results": [results[idx] for idx in range(len(artifacts))],
+        "note_writes": dict(writes),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
 def execute_all_artifacts(vault: Any, artifacts: list[dict]) -> list[dict]:
     """Execute all artifacts and return results.
 
-    Returns list of {"operation": str, "result": str, "success": bool}.
+    Returns list of {"operation": str, "result": str, "success": bool,
+    "note": str | None, "coalesced": bool}. See ``execute_artifact_batch``
+    for per-note write counts and wall time.
     """
-    results = []
-    for artifact in artifacts:
-        result = execute_vault_artifact(vault, artifact)
-        success = not result.startswith("Error:") and not result.startswith("Unknown")
-        results.append(
-            {
-                "operation": artifact["operation"],
-                "result": result,
-                "success": success,
-            }
-        )
-    return results
+    return execute_artifact_batch(vault, artifacts)["results"]
@@ -5,9 +5,13 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
 import re
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass, field as dc_field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field as dc_field, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -15,6 +19,7 @@ from typing import Any, Optional
 import yaml
 
 from obsidian_vault import ObsidianVault
+from vault_fingerprints import NoteFingerprintStore, body_hash
 
 _LOG = logging.getLogger(__name__)
 
@@ -94,6 +99,7 @@ class ScanResult:
     counts: dict[str, int] = dc_field(default_factory=dict)
     issue_class_counts: dict[str, int] = dc_field(default_factory=dict)
     family_counts: dict[str, int] = dc_field(default_factory=dict)
+    notes_reparsed: int = 0
 
 
 @dataclass
@@ -106,6 +112,49 @@ class _FileContext:
     counts_toward_health: bool
 
 
+@dataclass
+class _NoteScan:
+    """Everything ``scan_vault`` needs from one note, kept between scans.
+
+    Built once per content digest; the note text itself is not retained
+    (``ctx.content`` is empty). Per-note issue lists are filled lazily
+    (None until a scan asks for that check).
+    """
+
+    digest: bytes
+    stamp: Optional[tuple[int, int]]
+    ctx: _FileContext
+    aliases: list[str]
+    targets: list[str]
+    body_digest: str
+    frontmatter_issues: Optional[list[JanitorIssue]] = None
+    routing_issues: Optional[list[JanitorIssue]] = None
+    link_key: Optional[tuple[int, int]] = None
+    link_issues: list[JanitorIssue] = dc_field(default_factory=list)
+    link_targets: list[str] = dc_field(default_factory=list)
+
+
+# Incremental scan state (see scan_vault): per-note results by path, and the
+# resolver / attachment lookup of the previous scan with a version that bumps
+# whenever they change, so cached link results know when to re-resolve.
+SCAN_FETCH_WORKERS = 8
+_SCAN_LOCK = threading.Lock()
+_NOTE_SCANS: dict[str, _NoteScan] = {}
+_SCAN_STATE: dict[str, Any] = {
+    "resolver": None,
+    "resolver_version": 0,
+    "attachment": None,
+    "attachment_version": 0,
+    "course_map_stamp": None,
+}
+# Body hashes and MinHash signatures for the duplicate check, persisted to
+# the study DB so a restart only re-hashes note bodies (loaded on first use).
+_FINGERPRINTS: Optional[NoteFingerprintStore] = None
+# Attachment listing per vault folder, reused while the folder's mtime is
+# unchanged (adding, removing or renaming an entry bumps it).
+_ATTACHMENT_DIRS: dict[str, tuple[int, list[str], list[str]]] = {}
+
+
 def _normalize_path(path: str) -> str:
     return str(path or "").replace("\\", "/").strip("/")
 
@@ -486,20 +535,54 @@ def _build_attachment_lookup() -> dict[str, Any]:
     if root is None:
         return {"exact": exact, "by_name": by_name}
 
-    for file_path in root.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if file_path.suffix.lower() == ".md":
-            continue
-        try:
-            rel_path = file_path.relative_to(root).as_posix()
-        except ValueError:
-            continue
+    for rel_path in _attachment_paths(root):
         exact.add(rel_path.lower())
-        by_name.setdefault(file_path.name.lower(), []).append(rel_path)
+        by_name.setdefault(_basename(rel_path).lower(), []).append(rel_path)
     return {"exact": exact, "by_name": by_name}
 
 
+def _attachment_paths(root: Path) -> list[str]:
+    """Vault-relative paths of every non-markdown file under ``root``.
+
+    Only folders whose mtime changed since the last call are listed again;
+    the rest cost one ``stat``.
+    """
+    found: list[str] = []
+    seen: dict[str, tuple[int, list[str], list[str]]] = {}
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        folder = os.path.join(str(root), rel_dir) if rel_dir else str(root)
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            continue
+        cached = _ATTACHMENT_DIRS.get(rel_dir)
+        if cached is None or cached[0] != mtime:
+            files: list[str] = []
+            subdirs: list[str] = []
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                entries = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(prefix + entry.name)
+                    elif entry.is_file() and not entry.name.lower().endswith(".md"):
+                        files.append(prefix + entry.name)
+                except OSError:
+                    continue
+            cached = (mtime, files, subdirs)
+        seen[rel_dir] = cached
+        found.extend(cached[1])
+        stack.extend(cached[2])
+    _ATTACHMENT_DIRS.clear()
+    _ATTACHMENT_DIRS.update(seen)
+    return found
+
+
 def _resolve_attachment_target(target: str, attachment_lookup: Optional[dict[str, Any]]) -> tuple[str, Any]:
     if not attachment_lookup:
         return "missing", None
@@ -705,57 +788,78 @@ def _check_broken_links(
     issues: list[JanitorIssue] = []
     incoming_targets: dict[str, int] = {}
     for path, ctx in file_contexts.items():
-        for raw_target in _parse_wikilinks(ctx.content):
-            note_target, _anchor = _split_wikilink_target(raw_target)
-            if not note_target:
-                continue
-            resolved = resolver.get(note_target.lower())
-            if resolved:
-                if resolved != path:
-                    incoming_targets[resolved] = incoming_targets.get(resolved, 0) + 1
-                continue
+        note_issues, resolved_targets = _check_note_links(
+            path, ctx, _parse_wikilinks(ctx.content), resolver, attachment_lookup
+        )
+        issues.extend(note_issues)
+        for resolved in resolved_targets:
+            incoming_targets[resolved] = incoming_targets.get(resolved, 0) + 1
+    return issues, incoming_targets
 
-            attachment_state, attachment_match = _resolve_attachment_target(
-                note_target,
-                attachment_lookup,
-            )
-            if attachment_state == "resolved":
-                continue
-            if attachment_state == "ambiguous":
-                issues.append(
-                    _make_issue(
-                        issue_type="broken_link",
-                        path=path,
-                        family=ctx.family,
-                        field=raw_target,
-                        detail=(
-                            f"Link [[{raw_target}]] matches multiple vault attachments: "
-                            + ", ".join(str(item) for item in attachment_match)
-                        ),
-                        issue_class="advisory/system",
-                        severity="low",
-                        confidence="medium",
-                        explanation="The link target matches multiple non-markdown vault files by basename, so it needs a more specific path to resolve safely.",
-                        counts_toward_health=False,
-                    )
-                )
-                continue
 
+def _check_note_links(
+    path: str,
+    ctx: _FileContext,
+    raw_targets: list[str],
+    resolver: dict[str, str],
+    attachment_lookup: Optional[dict[str, Any]],
+) -> tuple[list[JanitorIssue], list[str]]:
+    """Broken-link issues for one note plus the other notes it links to."""
+    from obsidian_index import _split_wikilink_target
+
+    issues: list[JanitorIssue] = []
+    resolved_targets: list[str] = []
+    for raw_target in raw_targets:
+        note_target, _anchor = _split_wikilink_target(raw_target)
+        if not note_target:
+            continue
+        resolved = resolver.get(note_target.lower())
+        if resolved:
+            if resolved != path:
+                resolved_targets.append(resolved)
+            continue
+
+        attachment_state, attachment_match = _resolve_attachment_target(
+            note_target,
+            attachment_lookup,
+        )
+        if attachment_state == "resolved":
+            continue
+        if attachment_state == "ambiguous":
             issues.append(
                 _make_issue(
                     issue_type="broken_link",
                     path=path,
                     family=ctx.family,
                     field=raw_target,
-                    detail=f"Link [[{raw_target}]] does not resolve to any note or alias.",
-                    issue_class="content_gap" if ctx.counts_toward_health else "advisory/system",
-                    severity="medium" if ctx.counts_toward_health else "low",
-                    confidence="high",
-                    explanation="The wikilink target is missing from the vault index after stripping any heading or block anchor.",
-                    counts_toward_health=ctx.counts_toward_health,
+                    detail=(
+                        f"Link [[{raw_target}]] matches multiple vault attachments: "
+                        + ", ".join(str(item) for item in attachment_match)
+                    ),
+                    issue_class="advisory/system",
+                    severity="low",
+                    confidence="medium",
+                    explanation="The link target matches multiple non-markdown vault files by basename, so it needs a more specific path to resolve safely.",
+                    counts_toward_health=False,
                 )
             )
-    return issues, incoming_targets
+            continue
+
+        issues.append(
+            _make_issue(
+                issue_type="broken_link",
+                path=path,
+                family=ctx.family,
+                field=raw_target,
+                detail=f"Link [[{raw_target}]] does not resolve to any note or alias.",
+                issue_class="content_gap" if ctx.counts_toward_health else "advisory/system",
+                severity="medium" if ctx.counts_toward_health else "low",
+                confidence="high",
+                explanation="The wikilink target is missing from the vault index after stripping any heading or block anchor.",
+                counts_toward_health=ctx.counts_toward_health,
+            )
+        )
+    return issues, resolved_targets
 
 
 def _check_casing(paths: list[str]) -> list[JanitorIssue]:
@@ -786,17 +890,32 @@ def _check_casing(paths: list[str]) -> list[JanitorIssue]:
     return issues
 
 
+def _note_body(content: str) -> str:
+    match = _FM_RE.match(content or "")
+    body = content[match.end() :] if match else content
+    return (body or "").strip()
+
+
+def _body_digest(content: str) -> str:
+    """Digest of the note body without frontmatter ("" for an empty body)."""
+    return body_hash(_note_body(content))
+
+
 def _check_duplicates(file_contexts: dict[str, _FileContext]) -> list[JanitorIssue]:
     file_contexts = _coerce_file_contexts(file_contexts)
     hash_map: dict[str, list[str]] = {}
+    store = NoteFingerprintStore()
     for path, ctx in file_contexts.items():
-        _frontmatter, body = _split_frontmatter(ctx.content)
-        stripped = body.strip()
-        if not stripped:
-            continue
-        digest = hashlib.md5(stripped.encode("utf-8")).hexdigest()
-        hash_map.setdefault(digest, []).append(path)
+        body = _note_body(ctx.content)
+        digest = body_hash(body)
+        if digest:
+            hash_map.setdefault(digest, []).append(path)
+        store.update(path, body, digest)
+    exact_copies = {path for paths in hash_map.values() for path in paths[1:]}
+    return _duplicate_issues(hash_map) + _near_duplicate_issues(store, list(file_contexts), exact_copies)
 
+
+def _duplicate_issues(hash_map: dict[str, list[str]]) -> list[JanitorIssue]:
     issues: list[JanitorIssue] = []
     for paths in hash_map.values():
         if len(paths) <= 1:
@@ -818,6 +937,39 @@ def _check_duplicates(file_contexts: dict[str, _FileContext]) -> list[JanitorIss
     return issues
 
 
+def _near_duplicate_issues(
+    store: NoteFingerprintStore, paths: list[str], skip: set[str]
+) -> list[JanitorIssue]:
+    """One issue per note that nearly matches an earlier note in ``paths``."""
+    order = {path: idx for idx, path in enumerate(paths)}
+    issues: list[JanitorIssue] = []
+    for path in paths:
+        if path in skip:
+            continue
+        earlier = [
+            (other, similarity)
+            for other, similarity in store.near_duplicates(path)
+            if order.get(other, len(paths)) < order[path]
+        ]
+        if not earlier:
+            continue
+        other, similarity = earlier[0]
+        issues.append(
+            _make_issue(
+                issue_type="duplicate",
+                path=path,
+                family=_classify_note_family(path),
+                detail=f"Near-duplicate of {other} ({similarity:.0%} similar)",
+                issue_class="advisory/system",
+                severity="low",
+                confidence="medium",
+                explanation="Most of the note body's word sequences also appear in another note.",
+                counts_toward_health=False,
+            )
+        )
+    return issues
+
+
 def _build_note_summaries(
     issues: list[JanitorIssue],
     file_contexts: dict[str, _FileContext],
@@ -833,7 +985,7 @@ def _build_note_summaries(
         summaries.append(
             ScanNoteSummary(
                 path=path,
-                family=file_contexts.get(path, _build_file_context(path, "")).family,
+                family=(file_contexts.get(path) or _build_file_context(path, "")).family,
                 issue_count=len(note_issues),
                 issue_classes=classes,
                 severity=severity,
@@ -848,11 +1000,193 @@ def _dump_frontmatter(frontmatter: dict[str, Any]) -> str:
     return f"---\n{dumped}\n---"
 
 
+def _course_map_stamp() -> Optional[tuple[int, int]]:
+    try:
+        import course_map
+
+        stat = course_map._DEFAULT_CONFIG.stat()
+    except (ImportError, OSError, AttributeError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_note_contents(paths: list[str], root: Optional[Path]) -> list[str]:
+    """Note texts from disk when the vault root is known, else the REST API."""
+    if root is not None:
+        contents = []
+        for path in paths:
+            try:
+                contents.append((root / path).read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError):
+                contents.append("")
+        return contents
+
+    from obsidian_index import _get_note_content
+
+    if len(paths) <= 1:
+        return [_get_note_content(path) or "" for path in paths]
+    with ThreadPoolExecutor(
+        max_workers=min(SCAN_FETCH_WORKERS, len(paths)),
+        thread_name_prefix="vault-janitor",
+    ) as pool:
+        return [content or "" for content in pool.map(_get_note_content, paths)]
+
+
+def _new_note_scan(
+    path: str, content: str, digest: bytes, stamp: Optional[tuple[int, int]]
+) -> _NoteScan:
+    from obsidian_index import _aliases_from_frontmatter, _parse_wikilinks
+
+    ctx = _build_file_context(path, content)
+    body = _note_body(content)
+    body_digest = body_hash(body)
+    _fingerprint_store().update(path, body, body_digest)
+    return _NoteScan(
+        digest=digest,
+        stamp=stamp,
+        ctx=replace(ctx, content=""),
+        aliases=_aliases_from_frontmatter(ctx.frontmatter),
+        targets=_parse_wikilinks(content),
+        body_digest=body_digest,
+    )
+
+
+def _fingerprint_store() -> NoteFingerprintStore:
+    """The shared fingerprint store, loaded from the study DB on first use."""
+    global _FINGERPRINTS
+    if _FINGERPRINTS is None:
+        store = NoteFingerprintStore()
+        try:
+            from db_setup import get_connection
+
+            conn = get_connection()
+            try:
+                store.load(conn)
+            finally:
+                conn.close()
+        except (ImportError, OSError, sqlite3.Error) as exc:
+            _LOG.warning("Vault fingerprints not loaded: %s", exc)
+        _FINGERPRINTS = store
+    return _FINGERPRINTS
+
+
+def _save_fingerprints() -> None:
+    store = _FINGERPRINTS
+    if store is None:
+        return
+    try:
+        from db_setup import get_connection
+
+        conn = get_connection()
+        try:
+            store.save(conn)
+        finally:
+            conn.close()
+    except (ImportError, OSError, sqlite3.Error) as exc:
+        _LOG.warning("Vault fingerprints not saved: %s", exc)
+
+
+def _refresh_note_scans(paths: list[str]) -> tuple[dict[str, _NoteScan], int]:
+    """Bring ``_NOTE_SCANS`` up to date for ``paths``; returns it and the reparse count.
+
+    With the vault on disk, notes whose (mtime, size) is unchanged are not
+    read. Otherwise every note is fetched (concurrently) and only notes whose
+    content digest changed are parsed again.
+    """
+    root = _obsidian_vault_root_path()
+    root_prefix = f"{root}{os.sep}" if root is not None else ""
+    stamps: dict[str, Optional[tuple[int, int]]] = {}
+    to_read: list[str] = []
+    for path in paths:
+        stamp = None
+        if root is not None:
+            try:
+                stat = os.stat(root_prefix + path)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamp = None
+        stamps[path] = stamp
+        cached = _NOTE_SCANS.get(path)
+        if stamp is None or cached is None or cached.stamp != stamp:
+            to_read.append(path)
+
+    reparsed = 0
+    for path, content in zip(to_read, _read_note_contents(to_read, root)):
+        digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+        cached = _NOTE_SCANS.get(path)
+        if cached is not None and cached.digest == digest:
+            cached.stamp = stamps[path]
+            continue
+        _NOTE_SCANS[path] = _new_note_scan(path, content, digest, stamps[path])
+        reparsed += 1
+
+    wanted = set(paths)
+    for path in [path for path in _NOTE_SCANS if path not in wanted]:
+        del _NOTE_SCANS[path]
+    _fingerprint_store().prune(wanted)
+    return _NOTE_SCANS, reparsed
+
+
+def _cached_note_issues(
+    scans: dict[str, _NoteScan], attr: str, check
+) -> list[JanitorIssue]:
+    """Per-note check results, running ``check`` only for notes without one."""
+    stale = {path: scan.ctx for path, scan in scans.items() if getattr(scan, attr) is None}
+    if stale:
+        grouped: dict[str, list[JanitorIssue]] = {path: [] for path in stale}
+        for issue in check(stale):
+            grouped.setdefault(issue.path, []).append(issue)
+        for path, issues in grouped.items():
+            if path in scans:
+                setattr(scans[path], attr, issues)
+    return [issue for scan in scans.values() for issue in getattr(scan, attr) or []]
+
+
+def _restamp_updated_at(issues: list[JanitorIssue]) -> list[JanitorIssue]:
+    """Cached ``updated_at`` fixes carry the time of the scan that built them."""
+    now = _iso_timestamp()
+    restamped = []
+    for issue in issues:
+        if issue.field == "updated_at" and issue.fix_data.get("updated_at") not in (None, now):
+            fix_data = {**issue.fix_data, "updated_at": now}
+            issue = replace(
+                issue,
+                fix_data=fix_data,
+                fix_preview=f"Set updated_at to {json.dumps(now, ensure_ascii=True)}",
+            )
+        restamped.append(issue)
+    return restamped
+
+
+def _versioned(key: str, value: Any) -> int:
+    """Store ``value`` under ``key`` in the scan state; bump its version on change."""
+    if _SCAN_STATE[key] != value:
+        _SCAN_STATE[key] = value
+        _SCAN_STATE[f"{key}_version"] += 1
+    return _SCAN_STATE[f"{key}_version"]
+
+
+def clear_scan_cache() -> None:
+    """Forget cached per-note scan results (the next scan re-reads every note)."""
+    with _SCAN_LOCK:
+        _NOTE_SCANS.clear()
+        _ATTACHMENT_DIRS.clear()
+        _SCAN_STATE.update(resolver=None, attachment=None, course_map_stamp=None)
+
+
 def scan_vault(
     folder: Optional[str] = None,
     checks: Optional[list[str]] = None,
 ) -> ScanResult:
-    from obsidian_index import _extract_aliases, _get_note_content, get_vault_index
+    """Run the janitor checks over the vault (or one folder of it).
+
+    Scans are incremental: per-note parses and check results are cached by
+    content digest, and the vault-wide checks (broken links, orphans,
+    duplicates, casing) are recomputed from those cached records, re-resolving
+    a note's links only when it changed or the resolver/attachments did.
+    Duplicates include near-duplicates from the persistent fingerprint store.
+    """
+    from obsidian_index import _VAULT_INDEX_CACHE, get_vault_index
 
     t0 = time.time()
     aliases = {
@@ -863,7 +1197,8 @@ def scan_vault(
     }
     checks_to_run = {aliases.get(item, item) for item in checks} if checks else set(ALL_CHECKS)
 
-    index = get_vault_index(force_refresh=True)
+    # A live index is kept current by the vault change feed.
+    index = get_vault_index(force_refresh=not _VAULT_INDEX_CACHE.get("live"))
     if not index.get("success"):
         return ScanResult(
             issues=[],
@@ -885,45 +1220,78 @@ def scan_vault(
         if not folder_norm or _normalize_path(str(item.get("path") or "")).startswith(folder_norm)
     ]
 
-    file_contexts: dict[str, _FileContext] = {}
-    resolver: dict[str, str] = {}
-    attachment_lookup = _build_attachment_lookup()
+    named_paths: list[tuple[str, str]] = []
     for item in all_files:
         path = _normalize_path(str(item.get("path") or ""))
         name = str(item.get("name") or "")
-        if not path or not name:
-            continue
-        content = _get_note_content(path) or ""
-        resolver.setdefault(name.lower(), path)
-        for alias in _extract_aliases(content):
-            resolver.setdefault(alias.lower(), path)
-        if folder_norm and not path.startswith(folder_norm):
-            continue
-        file_contexts[path] = _build_file_context(path, content)
-
-    issues: list[JanitorIssue] = []
-    scoped_paths = list(file_contexts.keys())
-    if "missing_frontmatter" in checks_to_run:
-        issues.extend(_check_frontmatter(file_contexts))
-    if "routing_drift" in checks_to_run:
-        issues.extend(_check_routing(file_contexts))
-
-    incoming_targets: dict[str, int] = {}
-    if "broken_link" in checks_to_run or "orphan" in checks_to_run:
-        broken_link_issues, incoming_targets = _check_broken_links(
-            file_contexts,
-            resolver,
-            attachment_lookup=attachment_lookup,
-        )
-        if "broken_link" in checks_to_run:
-            issues.extend(broken_link_issues)
-
-    if "orphan" in checks_to_run:
-        issues.extend(_check_orphans(file_contexts, incoming_targets))
-    if "casing_mismatch" in checks_to_run:
-        issues.extend(_check_casing(scoped_paths))
-    if "duplicate" in checks_to_run:
-        issues.extend(_check_duplicates(file_contexts))
+        if path and name:
+            named_paths.append((path, name))
+
+    ordered_paths = list(dict.fromkeys(path for path, _name in named_paths))
+    with _SCAN_LOCK:
+        scans, reparsed = _refresh_note_scans(ordered_paths)
+
+        resolver: dict[str, str] = {}
+        for path, name in named_paths:
+            resolver.setdefault(name.lower(), path)
+            for alias in scans[path].aliases:
+                resolver.setdefault(alias.lower(), path)
+        scoped = {
+            path: scans[path]
+            for path in ordered_paths
+            if not folder_norm or path.startswith(folder_norm)
+        }
+        file_contexts = {path: scan.ctx for path, scan in scoped.items()}
+
+        course_map_stamp = _course_map_stamp()
+        if course_map_stamp != _SCAN_STATE["course_map_stamp"]:
+            _SCAN_STATE["course_map_stamp"] = course_map_stamp
+            for scan in scans.values():
+                scan.frontmatter_issues = None
+                scan.routing_issues = None
+
+        issues: list[JanitorIssue] = []
+        scoped_paths = list(file_contexts.keys())
+        if "missing_frontmatter" in checks_to_run:
+            issues.extend(
+                _restamp_updated_at(
+                    _cached_note_issues(scoped, "frontmatter_issues", _check_frontmatter)
+                )
+            )
+        if "routing_drift" in checks_to_run:
+            issues.extend(_cached_note_issues(scoped, "routing_issues", _check_routing))
+
+        incoming_targets: dict[str, int] = {}
+        if "broken_link" in checks_to_run or "orphan" in checks_to_run:
+            attachment_lookup = _build_attachment_lookup()
+            link_key = (
+                _versioned("resolver", resolver),
+                _versioned("attachment", attachment_lookup),
+            )
+            for path, scan in scoped.items():
+                if scan.link_key != link_key:
+                    scan.link_issues, scan.link_targets = _check_note_links(
+                        path, scan.ctx, scan.targets, resolver, attachment_lookup
+                    )
+                    scan.link_key = link_key
+                if "broken_link" in checks_to_run:
+                    issues.extend(scan.link_issues)
+                for target in scan.link_targets:
+                    incoming_targets[target] = incoming_targets.get(target, 0) + 1
+
+        if "orphan" in checks_to_run:
+            issues.extend(_check_orphans(file_contexts, incoming_targets))
+        if "casing_mismatch" in checks_to_run:
+            issues.extend(_check_casing(scoped_paths))
+        if "duplicate" in checks_to_run:
+            hash_map: dict[str, list[str]] = {}
+            for path, scan in scoped.items():
+                if scan.body_digest:
+                    hash_map.setdefault(scan.body_digest, []).append(path)
+            issues.extend(_duplicate_issues(hash_map))
+            exact_copies = {path for paths in hash_map.values() for path in paths[1:]}
+            issues.extend(_near_duplicate_issues(_fingerprint_store(), list(scoped), exact_copies))
+        _save_fingerprints()
 
     note_summaries = _build_note_summaries(issues, file_contexts)
     counts: dict[str, int] = {}
@@ -955,6 +1323,7 @@ def scan_vault(
         counts=counts,
         issue_class_counts=issue_class_counts,
         family_counts=family_counts,
+        notes_reparsed=reparsed,
     )
 
 
@@ -1190,7 +1559,7 @@ def ai_apply(path: str, apply_action: str, suggestion: dict) -> dict:
 
 
 def enrich_links(path: str) -> dict:
-    from obsidian_index import _parse_wikilinks, get_vault_index
+    from obsidian_index import _parse_wikilinks, get_note_aliases, get_vault_index
     from obsidian_merge import add_concept_links
 
     vault = ObsidianVault()
@@ -1199,7 +1568,9 @@ def enrich_links(path: str) -> dict:
         return {"success": False, "links_added": 0, "error": "Cannot read note"}
 
     index = get_vault_index()
-    enriched = add_concept_links(content, vault_index=index.get("notes") or [])
+    enriched = add_concept_links(
+        content, vault_index=index.get("notes") or [], aliases=get_note_aliases()
+    )
     if enriched == content:
         return {"success": True, "links_added": 0}
 
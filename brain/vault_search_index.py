@@ -0,0 +1,328 @@
+"""In-process full-text search over the Obsidian vault on disk.
+
+Replaces the per-turn ``obsidian search`` CLI subprocess for tutor notes
+retrieval. Notes are indexed into an in-memory SQLite FTS5 table (title,
+aliases, tags, headings, body) and kept current by comparing each file's
+(mtime_ns, size) stamp; only new or changed notes are re-read.
+
+The shared index subscribes to the vault change feed (``vault_watcher``)
+and is patched per event. Without a feed, stamp scans run at most every
+``REFRESH_INTERVAL_SECONDS`` on a background thread. Either way a turn costs
+one FTS query (only the very first query builds the index inline). Results use the ``ObsidianVault.search`` shape
+(``path``, ``score``, ``content``) plus ``name`` and a highlighted
+``snippet``.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import yaml
+
+from vault_watcher import (
+    EVENT_DELETED,
+    EVENT_MOVED,
+    VaultEvent,
+    ensure_vault_watcher,
+    scan_markdown_files,
+    vault_root_path,
+)
+
+# libyaml's loader when available: frontmatter parsing dominates a cold build.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+log = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_SECONDS = 5.0
+# Excerpt of the note body returned as ``content`` (what the tutor prompt sees).
+CONTENT_CHARS = 2000
+# bm25 column weights: title, aliases, tags, headings, body.
+_BM25_WEIGHTS = (10.0, 8.0, 4.0, 4.0, 1.0)
+
+# Question words that would otherwise match nearly every note.
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i in is it "
+    "its me my of on or so than that the their then there these this to was "
+    "what when where which who why will with would you your".split()
+)
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+_HEADING_RE = re.compile(r"#{1,6}\s+(.+?)\s*#*\s*$")
+# Literal-prefixed so the scan is a fast '#' search; the preceding character
+# is checked in Python (a tag must not follow a word character, '/' or '&').
+_HASH_TAG_RE = re.compile(r"#([A-Za-z][\w/-]*)")
+_FRONTMATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*(?:\n|\Z)", re.DOTALL)
+
+
+def _as_list(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item or "").strip()]
+    if isinstance(value, str) and value.strip():
+        return [part.strip() for part in re.split(r"[,\s]+", value) if part.strip()]
+    return []
+
+
+def parse_note(text: str) -> dict[str, Any]:
+    """Split a note into the indexed fields (frontmatter parsed only if present)."""
+    frontmatter: dict[str, Any] = {}
+    body = text
+    match = _FRONTMATTER_RE.match(text)
+    if match:
+        body = text[match.end():]
+        try:
+            raw = yaml.load(match.group(1), Loader=_YAML_LOADER)
+            if isinstance(raw, dict):
+                frontmatter = raw
+        except Exception:
+            frontmatter = {}
+    aliases = _as_list(frontmatter.get("aliases"))
+    tags = [tag.lstrip("#") for tag in _as_list(frontmatter.get("tags"))]
+    for match in _HASH_TAG_RE.finditer(body):
+        start = match.start()
+        if start == 0 or not (body[start - 1].isalnum() or body[start - 1] in "_/&"):
+            tags.append(match.group(1))
+    headings = []
+    for line in body.splitlines():
+        if line.startswith("#"):
+            heading = _HEADING_RE.match(line)
+            if heading:
+                headings.append(heading.group(1))
+    return {
+        "aliases": aliases,
+        "tags": list(dict.fromkeys(tags)),
+        "headings": headings,
+        "body": body.strip(),
+    }
+
+
+def _fts_query(query: str) -> str:
+    """Free text -> an OR of quoted terms (bm25 ranks notes matching more)."""
+    terms = [
+        term
+        for term in _TERM_RE.findall(query.lower())
+        if len(term) > 1 and term not in _STOPWORDS
+    ]
+    return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+class VaultSearchIndex:
+    """FTS5 index over the markdown notes under ``root``."""
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE VIRTUAL TABLE notes_fts USING fts5(
+                path UNINDEXED, title, aliases, tags, headings, body,
+                tokenize = 'porter unicode61'
+            )
+            """
+        )
+        # rel path -> (rowid, mtime_ns, size)
+        self._stamps: dict[str, tuple[int, int, int]] = {}
+        self._next_rowid = 1
+        self._refreshed_at: Optional[float] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        # Set when a vault change feed keeps the index current; stamp scans
+        # are then skipped.
+        self.live = False
+
+    # -- Maintenance ------------------------------------------------------
+
+    def _walk(self) -> dict[str, tuple[int, int]]:
+        return {
+            path: stamp[:2] for path, stamp in scan_markdown_files(self.root).items()
+        }
+
+    def _load(self, rel_path: str) -> Optional[dict[str, Any]]:
+        try:
+            text = (self.root / rel_path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        return parse_note(text)
+
+    def _store_locked(
+        self, rel_path: str, stamp: tuple[int, int], fields: dict[str, Any]
+    ) -> None:
+        previous = self._stamps.get(rel_path)
+        if previous is not None:
+            rowid = previous[0]
+            self._conn.execute("DELETE FROM notes_fts WHERE rowid = ?", (rowid,))
+        else:
+            rowid = self._next_rowid
+            self._next_rowid += 1
+        self._conn.execute(
+            "INSERT INTO notes_fts (rowid, path, title, aliases, tags, headings, body) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                rowid,
+                rel_path,
+                Path(rel_path).stem,
+                "\n".join(fields["aliases"]),
+                " ".join(fields["tags"]),
+                "\n".join(fields["headings"]),
+                fields["body"],
+            ),
+        )
+        self._stamps[rel_path] = (rowid, *stamp)
+
+    def _remove_locked(self, rel_path: str) -> bool:
+        previous = self._stamps.pop(rel_path, None)
+        if previous is None:
+            return False
+        self._conn.execute("DELETE FROM notes_fts WHERE rowid = ?", (previous[0],))
+        return True
+
+    def refresh(self, *, force: bool = False) -> dict[str, int]:
+        """Re-index notes whose (mtime, size) changed; drop deleted ones.
+
+        Files are read and parsed before the lock is taken, so queries only
+        wait for the FTS writes.
+        """
+        if not force and not self._refresh_due():
+            return {"indexed": 0, "removed": 0}
+        found = self._walk()
+        parsed = []
+        for rel_path, stamp in found.items():
+            previous = self._stamps.get(rel_path)
+            if previous is not None and previous[1:] == stamp:
+                continue
+            fields = self._load(rel_path)
+            if fields is not None:
+                parsed.append((rel_path, stamp, fields))
+        with self._lock:
+            for rel_path, stamp, fields in parsed:
+                self._store_locked(rel_path, stamp, fields)
+            gone = [p for p in self._stamps if p not in found]
+            for rel_path in gone:
+                self._remove_locked(rel_path)
+            self._conn.commit()
+            self._refreshed_at = time.monotonic()
+        if parsed or gone:
+            log.debug("vault search index: %d indexed, %d removed", len(parsed), len(gone))
+        return {"indexed": len(parsed), "removed": len(gone)}
+
+    def _refresh_due(self) -> bool:
+        return (
+            self._refreshed_at is None
+            or time.monotonic() - self._refreshed_at >= REFRESH_INTERVAL_SECONDS
+        )
+
+    def _refresh_in_background(self) -> None:
+        """Start a stamp scan off the query path (one at a time)."""
+        with self._lock:
+            running = self._refresh_thread
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self.refresh, name="vault-search-refresh", daemon=True
+            )
+            self._refresh_thread = thread
+        thread.start()
+
+    def update_paths(
+        self, changed: Iterable[str] = (), removed: Iterable[str] = ()
+    ) -> None:
+        """Apply known changes (vault-relative paths) without a full stamp scan."""
+        parsed, gone = [], list(removed)
+        for rel_path in changed:
+            try:
+                stat = (self.root / rel_path).stat()
+            except OSError:
+                gone.append(rel_path)
+                continue
+            fields = self._load(rel_path)
+            if fields is not None:
+                parsed.append((rel_path, (stat.st_mtime_ns, stat.st_size), fields))
+        with self._lock:
+            for rel_path in gone:
+                self._remove_locked(rel_path)
+            for rel_path, stamp, fields in parsed:
+                self._store_locked(rel_path, stamp, fields)
+            self._conn.commit()
+
+    def apply_events(self, events: list[VaultEvent]) -> None:
+        """Change-feed listener (see ``vault_watcher``)."""
+        changed: list[str] = []
+        removed: list[str] = []
+        for event in events:
+            if event.kind == EVENT_MOVED:
+                removed.append(event.path)
+                changed.append(event.dest_path or "")
+            elif event.kind == EVENT_DELETED:
+                removed.append(event.path)
+            else:
+                changed.append(event.path)
+        self.update_paths([path for path in changed if path], removed)
+
+    def __len__(self) -> int:
+        return len(self._stamps)
+
+    # -- Query ------------------------------------------------------------
+
+    def search(self, query: str, *, limit: int = 10) -> list[dict]:
+        """Ranked note hits for free-text ``query`` (best first)."""
+        match = _fts_query(query or "")
+        if not match:
+            return []
+        if self._refreshed_at is None:
+            self.refresh()  # first query builds the index
+        elif not self.live and self._refresh_due():
+            self._refresh_in_background()
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT path, title, bm25(notes_fts, 0, {', '.join(map(str, _BM25_WEIGHTS))}) AS rank,
+                       snippet(notes_fts, 5, '**', '**', '…', 24),
+                       substr(body, 1, ?)
+                FROM notes_fts
+                WHERE notes_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (CONTENT_CHARS, match, int(limit)),
+            ).fetchall()
+        return [
+            {
+                "path": path,
+                "name": title,
+                "score": round(-rank, 4),
+                "snippet": snippet,
+                "content": content,
+            }
+            for path, title, rank, snippet, content in rows
+        ]
+
+
+_INDEXES: dict[str, VaultSearchIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_vault_search_index(root: Path | str | None = None) -> Optional[VaultSearchIndex]:
+    """Shared index for the configured vault root (None when it is not on disk)."""
+    resolved = Path(root) if root is not None else vault_root_path()
+    if resolved is None or not resolved.is_dir():
+        return None
+    key = str(resolved)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = VaultSearchIndex(resolved)
+            feed = ensure_vault_watcher(resolved)
+            if feed is not None:
+                feed.subscribe(index.apply_events)
+                index.live = True
+    return index
+
+
+def clear_vault_search_indexes() -> None:
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
@@ -0,0 +1,361 @@
+"""Change feed for the Obsidian vault on disk.
+
+Emits create/modify/delete/move events for markdown notes so the vault file
+index, link graph (``obsidian_index``) and search index
+(``vault_search_index``) can be patched in place instead of expiring on a
+TTL and being rebuilt wholesale.
+
+Backends:
+  - ``watchdog`` (inotify / FSEvents / ReadDirectoryChangesW) when the
+    optional package is installed; events are debounced into batches
+  - polling otherwise: a (mtime_ns, size, inode) snapshot diffed every
+    ``POLL_INTERVAL_SECONDS`` (a same-inode delete+create is a move)
+
+Subscribers receive ``list[VaultEvent]`` batches on the feed's thread and
+must not raise; failures are logged and the feed keeps running. Set
+``PT_VAULT_WATCHER=0`` to disable the feed (callers fall back to their TTLs).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+log = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 2.0
+DEBOUNCE_SECONDS = 0.2
+_SKIP_DIRS = {".obsidian", ".trash", ".git", "node_modules"}
+
+EVENT_CREATED = "created"
+EVENT_MODIFIED = "modified"
+EVENT_DELETED = "deleted"
+EVENT_MOVED = "moved"
+_RESCAN = "rescan"  # internal: a folder changed, diff the whole snapshot
+
+
+@dataclass(frozen=True)
+class VaultEvent:
+    kind: str
+    path: str  # vault-relative, forward slashes
+    dest_path: Optional[str] = None  # moves only
+
+
+VaultListener = Callable[[list[VaultEvent]], None]
+
+
+def scan_markdown_files(root: Path | str) -> dict[str, tuple[int, int, int]]:
+    """Vault-relative path -> (mtime_ns, size, inode) for every note under ``root``."""
+    found: dict[str, tuple[int, int, int]] = {}
+    stack = [(str(root), "")]
+    while stack:
+        folder, prefix = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if name not in _SKIP_DIRS and not name.startswith("."):
+                    stack.append((entry.path, f"{prefix}{name}/"))
+            elif name.endswith(".md"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found[prefix + name] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    return found
+
+
+def diff_snapshots(
+    before: dict[str, tuple[int, int, int]], after: dict[str, tuple[int, int, int]]
+) -> list[VaultEvent]:
+    """Events that turn ``before`` into ``after``."""
+    events: list[VaultEvent] = []
+    removed = {path: stamp for path, stamp in before.items() if path not in after}
+    added = {path: stamp for path, stamp in after.items() if path not in before}
+    removed_by_inode = {stamp[2]: path for path, stamp in removed.items() if stamp[2]}
+    for path, stamp in added.items():
+        source = removed_by_inode.pop(stamp[2], None) if stamp[2] else None
+        if source is not None:
+            del removed[source]
+            events.append(VaultEvent(EVENT_MOVED, source, path))
+        else:
+            events.append(VaultEvent(EVENT_CREATED, path))
+    for path in removed:
+        events.append(VaultEvent(EVENT_DELETED, path))
+    for path, stamp in after.items():
+        previous = before.get(path)
+        if previous is not None and previous[:2] != stamp[:2]:
+            events.append(VaultEvent(EVENT_MODIFIED, path))
+    return events
+
+
+class VaultChangeFeed:
+    """Watches one vault root and fans event batches out to subscribers."""
+
+    def __init__(
+        self,
+        root: Path | str,
+        *,
+        poll_interval: Optional[float] = None,
+        native: bool = True,
+    ) -> None:
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self._native = native
+        self._listeners: list[VaultListener] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+        self._pending: "queue.Queue[Optional[VaultEvent]]" = queue.Queue()
+        self._snapshot: dict[str, tuple[int, int, int]] = {}
+        self.backend = "stopped"
+
+    # -- Subscribers ------------------------------------------------------
+
+    def subscribe(self, listener: VaultListener) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def _dispatch(self, events: list[VaultEvent]) -> None:
+        if not events:
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(events)
+            except Exception:
+                log.exception("vault listener %r failed", listener)
+
+    # -- Lifecycle --------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "VaultChangeFeed":
+        if self.running:
+            return self
+        self._stop.clear()
+        self._pending = queue.Queue()
+        self._snapshot = scan_markdown_files(self.root)
+        if self._native and self._start_watchdog():
+            target = self._drain_native
+        else:
+            self.backend = "polling"
+            target = self._poll_loop
+        self._thread = threading.Thread(
+            target=target, name=f"vault-watcher-{self.root.name}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._pending.put(None)
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout)
+            except Exception:
+                pass
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.backend = "stopped"
+
+    # -- Polling backend --------------------------------------------------
+
+    def poll_once(self) -> list[VaultEvent]:
+        """Diff a fresh snapshot against the last one and dispatch the events."""
+        current = scan_markdown_files(self.root)
+        events = diff_snapshots(self._snapshot, current)
+        self._snapshot = current
+        self._dispatch(events)
+        return events
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval or POLL_INTERVAL_SECONDS):
+            try:
+                self.poll_once()
+            except Exception:
+                log.exception("vault poll failed for %s", self.root)
+
+    # -- watchdog backend -------------------------------------------------
+
+    def _start_watchdog(self) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        feed = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):  # type: ignore[override]
+                feed._on_native_event(event)
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), str(self.root), recursive=True)
+            observer.start()
+        except Exception as exc:
+            log.info("watchdog unavailable for %s, polling: %s", self.root, exc)
+            return False
+        self._observer = observer
+        self.backend = "watchdog"
+        return True
+
+    def _relative(self, raw: str) -> Optional[str]:
+        try:
+            rel = Path(raw).resolve().relative_to(self.root.resolve()).as_posix()
+        except (OSError, ValueError):
+            return None
+        parts = rel.split("/")
+        if any(part in _SKIP_DIRS or part.startswith(".") for part in parts[:-1]):
+            return None
+        return rel
+
+    def _on_native_event(self, event) -> None:
+        if event.is_directory:
+            # Folder creates/moves/deletes: let the snapshot diff work out
+            # which notes they touched.
+            self._pending.put(VaultEvent(_RESCAN, ""))
+            return
+        src = self._relative(event.src_path)
+        dest = self._relative(getattr(event, "dest_path", "") or "") if event.event_type == "moved" else None
+        kinds = {
+            "created": EVENT_CREATED,
+            "modified": EVENT_MODIFIED,
+            "deleted": EVENT_DELETED,
+            "moved": EVENT_MOVED,
+        }
+        kind = kinds.get(event.event_type)
+        if kind is None:
+            return
+        if kind == EVENT_MOVED:
+            src_md = bool(src and src.endswith(".md"))
+            dest_md = bool(dest and dest.endswith(".md"))
+            if src_md and dest_md:
+                self._pending.put(VaultEvent(EVENT_MOVED, src, dest))
+            elif src_md:
+                self._pending.put(VaultEvent(EVENT_DELETED, src))
+            elif dest_md:
+                self._pending.put(VaultEvent(EVENT_CREATED, dest))
+            return
+        if src and src.endswith(".md"):
+            self._pending.put(VaultEvent(kind, src))
+
+    def _update_snapshot(self, events: list[VaultEvent]) -> None:
+        for event in events:
+            for path in (event.path, event.dest_path):
+                if not path:
+                    continue
+                try:
+                    stat = (self.root / path).stat()
+                except OSError:
+                    self._snapshot.pop(path, None)
+                    continue
+                self._snapshot[path] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _drain_native(self) -> None:
+        while not self._stop.is_set():
+            first = self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + DEBOUNCE_SECONDS
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    item = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._stop.set()
+                    break
+                batch.append(item)
+            try:
+                if any(event.kind == _RESCAN for event in batch):
+                    self.poll_once()
+                    continue
+                events = _coalesce(batch)
+                self._update_snapshot(events)
+                self._dispatch(events)
+            except Exception:
+                log.exception("vault event dispatch failed for %s", self.root)
+
+
+def _coalesce(events: list[VaultEvent]) -> list[VaultEvent]:
+    """Collapse repeated modify events for a path within one batch."""
+    seen: set[tuple[str, str]] = set()
+    result = []
+    for event in events:
+        key = (event.kind, event.path)
+        if event.kind == EVENT_MODIFIED and key in seen:
+            continue
+        seen.add(key)
+        result.append(event)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Shared feeds
+# ---------------------------------------------------------------------------
+
+_FEEDS: dict[str, VaultChangeFeed] = {}
+_FEEDS_LOCK = threading.Lock()
+
+
+def watcher_enabled() -> bool:
+    value = str(os.environ.get("PT_VAULT_WATCHER") or "1").strip().lower()
+    return value not in {"0", "false", "no", "off"}
+
+
+def vault_root_path() -> Optional[Path]:
+    """The configured vault root when it exists on disk (see api_tutor_vault)."""
+    try:
+        from dashboard.api_tutor_vault import _obsidian_vault_root_path
+
+        return _obsidian_vault_root_path()
+    except Exception:
+        return None
+
+
+def ensure_vault_watcher(
+    root: Path | str | None = None, **feed_kwargs
+) -> Optional[VaultChangeFeed]:
+    """Start (once) and return the change feed for ``root`` (default: the vault root)."""
+    if not watcher_enabled():
+        return None
+    resolved = Path(root) if root is not None else vault_root_path()
+    if resolved is None or not resolved.is_dir():
+        return None
+    key = str(resolved.resolve())
+    with _FEEDS_LOCK:
+        feed = _FEEDS.get(key)
+        if feed is None:
+            feed = _FEEDS[key] = VaultChangeFeed(resolved, **feed_kwargs)
+        if not feed.running:
+            feed.start()
+    return feed
+
+
+def stop_vault_watchers() -> None:
+    with _FEEDS_LOCK:
+        feeds = list(_FEEDS.values())
+        _FEEDS.clear()
+    for feed in feeds:
+        feed.stop()
@@ -19,7 +19,7 @@ def _persist_video_linkage(
     source_video_path: str,
     doc_role: str,
 ) -> None:
-    """Update metadata_json on an ingested rag_doc with source MP4 linkage."""
+    """Record source MP4 linkage on an ingested rag_doc (metadata + rag_doc_links)."""
     import db_setup
 
     linkage = {
@@ -33,9 +33,9 @@ def _persist_video_linkage(
     cur.execute("SELECT metadata_json FROM rag_docs WHERE id = ?", (doc_id,))
     row = cur.fetchone()
     existing: dict = {}
-    if row and row["metadata_json"]:
+    if row and row[0]:
         try:
-            existing = json.loads(row["metadata_json"])
+            existing = json.loads(row[0])
         except (json.JSONDecodeError, TypeError):
             pass
     existing.update(linkage)
@@ -43,6 +43,19 @@ def _persist_video_linkage(
         "UPDATE rag_docs SET metadata_json = ? WHERE id = ?",
         (json.dumps(existing), doc_id),
     )
+    # Indexed copy of the linkage read by tutor_context._expand_linked_material_ids.
+    # A re-ingest under another material replaces the old parent.
+    cur.execute(
+        "DELETE FROM rag_doc_links WHERE child_id = ? AND kind = 'video'",
+        (doc_id,),
+    )
+    cur.execute(
+        """
+        INSERT INTO rag_doc_links (parent_id, child_id, kind, created_at)
+        VALUES (?, ?, 'video', ?)
+        """,
+        (material_id, doc_id, linkage["video_linked_at"]),
+    )
     conn.commit()
     conn.close()
 
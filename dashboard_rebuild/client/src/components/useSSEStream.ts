@@ -42,6 +42,11 @@ interface UseSSEStreamReturn {
   streamAbortRef: React.MutableRefObject<AbortController | null>;
 }
 
+// Draft prefetch: once typing pauses, the backend warms retrieval for the
+// draft so the real turn can reuse it (brain/tutor_prefetch.py).
+const PREFETCH_DEBOUNCE_MS = 600;
+const PREFETCH_MIN_DRAFT_CHARS = 8;
+
 function extractReferenceTargetsFromMessage(message: string): string[] {
   const matches = message.matchAll(/(^|\s)@([^\s@][^\s]*)/g);
   const targets = Array.from(
@@ -130,6 +135,26 @@ export function useSSEStream(options: UseSSEStreamOptions): UseSSEStreamReturn {
     };
   }, []);
 
+  useEffect(() => {
+    const draft = input.trim();
+    if (!sessionId || isStreaming || draft.length < PREFETCH_MIN_DRAFT_CHARS) return;
+    const timer = setTimeout(() => {
+      void fetch(`/api/tutor/session/${sessionId}/prefetch`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          message: draft,
+          content_filter: {
+            material_ids: selectedMaterialIds,
+            accuracy_profile: accuracyProfile,
+          },
+          mode: { materials: materialsOn, obsidian: obsidianOn },
+        }),
+      }).catch(() => undefined);
+    }, PREFETCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [input, sessionId, isStreaming, selectedMaterialIds, accuracyProfile, materialsOn, obsidianOn]);
+
   const sendMessage = useCallback(async (modeOverride?: "general" | "tutor") => {
     if (!input.trim() || !sessionId || isStreaming) return;
 
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Concept-linking benchmark for ``obsidian_merge.add_concept_links``.
+
+Generates ``--titles`` synthetic vault note titles (one to four words, some
+with aliases) and ``--notes`` study notes that mention some of them, then
+times:
+
+  - build:    compiling the ``concept_linker`` trie (once per title set)
+  - matcher:  ``add_concept_links`` per note with the cached matcher
+  - regex:    the old substitution step, one ``_link_term``-style regex per
+              title, without the LLM call that preceded it (up to 30s each)
+
+It reports totals, per-note means and the links added.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import concept_linker  # type: ignore  # noqa: E402
+from obsidian_merge import add_concept_links  # type: ignore  # noqa: E402
+
+_WORDS = [
+    "cardiac", "output", "renal", "clearance", "action", "potential", "myelin", "sheath",
+    "synaptic", "vesicle", "glomerular", "filtration", "beta", "receptor", "agonist",
+    "insulin", "signaling", "pathway", "lactate", "threshold", "stroke", "volume",
+    "motor", "unit", "recruitment", "bone", "remodeling", "ligament", "healing",
+    "gait", "cycle", "muscle", "spindle", "reflex", "arc", "tendon", "organ",
+]
+
+
+def _titles(count: int, rng: random.Random) -> tuple[list[str], dict[str, list[str]]]:
+    titles: set[str] = set()
+    while len(titles) < count:
+        words = rng.sample(_WORDS, rng.randint(1, 4))
+        suffix = f" {rng.randrange(1000)}" if len(titles) > len(_WORDS) * 4 else ""
+        titles.add(" ".join(words).title() + suffix)
+    ordered = sorted(titles)
+    aliases = {title: [f"{title} alias"] for title in ordered[::10]}
+    return ordered, aliases
+
+
+def _legacy_link(content: str, titles: list[str]) -> str:
+    for term in sorted(titles, key=len, reverse=True):
+        pattern = re.compile(rf"(?<!\[)\b{re.escape(term)}\b")
+        content = pattern.sub(lambda m: m.group(0) if f"[[{m.group(0)}]]" in content else f"[[{m.group(0)}]]", content)
+    return content
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--titles", type=int, default=10_000)
+    parser.add_argument("--notes", type=int, default=50)
+    parser.add_argument("--legacy-notes", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    titles, aliases = _titles(args.titles, rng)
+    notes = []
+    for _ in range(args.notes):
+        lines = []
+        for _ in range(40):
+            words = rng.choices(_WORDS + ["the", "and", "with", "during"], k=12)
+            if rng.random() < 0.3:
+                words.insert(rng.randrange(len(words)), rng.choice(titles))
+            lines.append(" ".join(words))
+        notes.append("\n".join(lines))
+    print(f"{len(titles)} titles, {sum(len(a) for a in aliases.values())} aliases, {len(notes)} notes")
+
+    started = time.perf_counter()
+    matcher = concept_linker.get_concept_matcher(titles, aliases)
+    print(f"build    {(time.perf_counter() - started) * 1000:9.1f}ms  terms={matcher.term_count}")
+
+    started = time.perf_counter()
+    links = sum(add_concept_links(note, vault_index=titles, aliases=aliases).count("[[") for note in notes)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"matcher  {elapsed:9.1f}ms  per note={elapsed / len(notes):7.2f}ms  links={links}")
+
+    sample = notes[: args.legacy_notes]
+    started = time.perf_counter()
+    links = sum(_legacy_link(note, titles).count("[[") for note in sample)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"regex    {elapsed:9.1f}ms  per note={elapsed / len(sample):7.2f}ms  links={links} ({len(sample)} notes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Full-material loading benchmark for Tutor turns.
+
+Seeds a throwaway database with ``--docs`` synthetic textbooks of
+``--doc-mb`` MB each. It then loads them as a selected-material turn
+would, ``--turns`` times, in three ways:
+
+  - legacy:  the previous loader (whole ``content`` blobs into Python,
+             trimmed afterwards)
+  - cold:    ``_load_full_materials`` with its block cache cleared every turn
+             (prefixes read through ``blobopen``; doc sizes are measured on
+             the first turn only and kept in ``rag_doc_sizes``)
+  - cached:  ``_load_full_materials`` as send_turn uses it (repeat turns hit
+             the per-selection block cache)
+
+For each it reports p50 turn time, the text pulled out of SQLite (bytes; characters for legacy, the same for ASCII), and
+the peak Python memory (tracemalloc).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import config  # type: ignore  # noqa: E402
+import db_setup  # type: ignore  # noqa: E402
+import tutor_context  # type: ignore  # noqa: E402
+
+
+def _legacy_load(material_ids: list[int], budget: int) -> tuple[str, int]:
+    conn = sqlite3.connect(db_setup.DB_PATH)
+    placeholders = ",".join("?" * len(material_ids))
+    rows = conn.execute(
+        f"SELECT id, source_path, content FROM rag_docs WHERE id IN ({placeholders})",
+        list(material_ids),
+    ).fetchall()
+    conn.close()
+    total_chars = sum(len(r[2] or "") for r in rows)
+    sections = []
+    for doc_id, source_path, content in rows:
+        doc_budget = max(int(budget * len(content) / total_chars), 500)
+        sections.append(f"### {source_path}\n\n{content[:doc_budget]}")
+    return "\n\n---\n\n".join(sections), total_chars
+
+
+def _seed(docs: int, doc_mb: float) -> list[int]:
+    paragraph = "The brachial plexus arises from C5-T1 ventral rami. " * 20 + "\n"
+    body = (paragraph * int(doc_mb * 1_000_000 / len(paragraph) + 1))
+    conn = db_setup.get_connection()
+    ids = []
+    for idx in range(docs):
+        cur = conn.execute(
+            "INSERT INTO rag_docs (source_path, content, checksum, created_at) "
+            "VALUES (?, ?, ?, '2026-01-01')",
+            (f"/materials/textbook_{idx}.pdf", body, f"bench-{idx}"),
+        )
+        ids.append(int(cur.lastrowid))
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def _measure(label: str, turns: int, fn) -> None:
+    times, read, peak = [], 0, 0
+    for _ in range(turns):
+        tracemalloc.start()
+        started = time.perf_counter()
+        read = fn()
+        times.append((time.perf_counter() - started) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    print(
+        f"{label:<7} p50={statistics.median(times):8.1f}ms "
+        f"first={times[0]:8.1f}ms read from SQLite/turn={read:>12,} "
+        f"peak py mem={peak / 1e6:8.1f}MB"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=5)
+    parser.add_argument("--doc-mb", type=float, default=20.0)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    os.environ["PT_STUDY_DB"] = tmp.name
+    config.DB_PATH = tmp.name
+    db_setup.DB_PATH = tmp.name
+    try:
+        db_setup.init_database()
+        ids = _seed(args.docs, args.doc_mb)
+        budget = tutor_context.FULL_CONTENT_BUDGET
+
+        def legacy() -> int:
+            return _legacy_load(ids, budget)[1]
+
+        def cold() -> int:
+            tutor_context.clear_full_material_cache()
+            debug: dict = {}
+            tutor_context._load_full_materials(ids, debug=debug)
+            return debug["materials_bytes_read"]
+
+        def cached() -> int:
+            debug: dict = {}
+            tutor_context._load_full_materials(ids, debug=debug)
+            return debug["materials_bytes_read"]
+
+        print(f"{args.docs} docs x {args.doc_mb} MB, budget {budget:,} chars")
+        _measure("legacy", args.turns, legacy)
+        _measure("cold", args.turns, cold)
+        tutor_context.clear_full_material_cache()
+        _measure("cached", args.turns, cached)
+    finally:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Linked-material expansion benchmark.
+
+Seeds a temporary DB with N materials rows in ``rag_docs`` (a share of them
+processed video docs linked to an MP4) and times a per-turn expansion of a
+material selection:
+
+  - legacy:  scan every materials row and json.loads its metadata_json
+  - indexed: ``tutor_context._expand_linked_material_ids`` (rag_doc_links)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+
+def _seed(db_path: str, rows: int, videos: int) -> list[int]:
+    conn = sqlite3.connect(db_path)
+    docs = []
+    video_ids = list(range(1, videos + 1))
+    for doc_id in range(1, rows + 1):
+        meta: dict[str, Any] = {"page_count": doc_id % 40, "section": f"s{doc_id % 17}"}
+        if doc_id > videos and doc_id <= videos * 3:
+            meta["video_material_id"] = video_ids[(doc_id - videos - 1) // 2]
+            meta["video_doc_role"] = "transcript" if doc_id % 2 else "visual_notes"
+        docs.append(
+            (
+                doc_id,
+                f"Doc {doc_id}",
+                f"C:/materials/doc_{doc_id}.md",
+                "content",
+                f"checksum-{doc_id}",
+                json.dumps(meta),
+            )
+        )
+    conn.executemany(
+        """INSERT INTO rag_docs
+           (id, title, source_path, content, checksum, metadata_json, corpus, enabled, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, 'materials', 1, datetime('now'))""",
+        docs,
+    )
+    conn.commit()
+    conn.close()
+    return video_ids
+
+
+def _legacy_expand(db_path: str, material_ids: list[int]) -> list[int]:
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(
+        """SELECT id, metadata_json FROM rag_docs
+           WHERE COALESCE(corpus, 'materials') = 'materials'"""
+    ).fetchall()
+    conn.close()
+    selected = set(material_ids)
+    expanded = list(dict.fromkeys(material_ids))
+    seen = set(expanded)
+    for row in rows:
+        doc_id = int(row["id"])
+        if doc_id in seen or not row["metadata_json"]:
+            continue
+        try:
+            meta = json.loads(row["metadata_json"])
+            linked = int(meta.get("video_material_id"))
+        except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+            continue
+        if linked in selected:
+            seen.add(doc_id)
+            expanded.append(doc_id)
+    return expanded
+
+
+def _time(fn: Callable[[], list[int]], turns: int) -> tuple[dict[str, Any], list[int]]:
+    samples = []
+    result: list[int] = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return (
+        {
+            "mean_ms": round(statistics.fmean(samples), 3),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        },
+        result,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark linked-material expansion.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Materials rows in rag_docs")
+    parser.add_argument("--videos", type=int, default=500, help="MP4 materials with 2 linked docs each")
+    parser.add_argument("--selected", type=int, default=5, help="Materials selected per turn")
+    parser.add_argument("--turns", type=int, default=50, help="Timed expansions per path")
+    args = parser.parse_args()
+
+    db_path = str(Path(tempfile.mkdtemp(prefix="pt-link-bench-")) / "bench.db")
+    os.environ["PT_STUDY_DB"] = db_path
+    import config
+    import db_setup
+
+    config.DB_PATH = db_path
+    db_setup.DB_PATH = db_path
+    db_setup.init_database()
+    video_ids = _seed(db_path, args.rows, args.videos)
+    # Existing installs get their links from the init-time backfill.
+    db_setup.init_database()
+
+    import tutor_context
+
+    selection = video_ids[: args.selected]
+    legacy, legacy_ids = _time(lambda: _legacy_expand(db_path, selection), args.turns)
+    indexed, indexed_ids = _time(
+        lambda: tutor_context._expand_linked_material_ids(selection) or [], args.turns
+    )
+    if legacy_ids != indexed_ids:
+        print("Expansion mismatch between legacy and indexed paths", file=sys.stderr)
+        return 1
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "linked_material_expansion",
+                "rows": args.rows,
+                "selected": len(selection),
+                "expanded_to": len(indexed_ids),
+                "legacy_scan": legacy,
+                "indexed_links": indexed,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
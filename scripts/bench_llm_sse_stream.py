@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Responses API SSE parsing benchmark.
+
+Serves a synthetic Responses API event stream (N ``output_text.delta``
+events + ``response.completed``) from a local chunked HTTP server and
+consumes it two ways:
+
+  - legacy:  ``resp.readline()`` + decode/strip per line (pre-change loop)
+  - current: ``llm_provider.stream_chatgpt_responses`` (block reads)
+
+Reports wall time, throughput and consumer-thread CPU per token.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "brain") not in sys.path:
+    sys.path.insert(0, str(ROOT / "brain"))
+
+import llm_provider  # type: ignore  # noqa: E402
+
+
+def _build_stream(deltas: int) -> bytes:
+    parts = []
+    for idx in range(deltas):
+        evt = {
+            "type": "response.output_text.delta",
+            "item_id": "msg_0",
+            "output_index": 0,
+            "content_index": 0,
+            "sequence_number": idx,
+            "delta": f" tok{idx % 97}",
+        }
+        parts.append(
+            b"event: response.output_text.delta\ndata: "
+            + json.dumps(evt).encode()
+            + b"\n\n"
+        )
+    completed = {
+        "type": "response.completed",
+        "response": {
+            "id": "resp_bench",
+            "model": "bench-model",
+            "output": [],
+            "usage": {"input_tokens": 10, "output_tokens": deltas},
+        },
+    }
+    parts.append(b"data: " + json.dumps(completed).encode() + b"\n\n")
+    parts.append(b"data: [DONE]\n\n")
+    return b"".join(parts)
+
+
+def _start_server(body: bytes, frame_bytes: int) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for offset in range(0, len(body), frame_bytes):
+                piece = body[offset : offset + frame_bytes]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *_args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _legacy_stream(port: int) -> Iterator[dict]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    conn.request("POST", "/backend-api/codex/responses", body="{}")
+    resp = conn.getresponse()
+    while True:
+        line = resp.readline()
+        if not line:
+            break
+        line = line.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data: "):
+            continue
+        data_str = line[6:]
+        if data_str == "[DONE]":
+            break
+        try:
+            evt = json.loads(data_str)
+        except json.JSONDecodeError:
+            continue
+        if evt.get("type", "") == "response.output_text.delta":
+            delta = evt.get("delta", "")
+            if delta:
+                yield {"type": "delta", "text": delta}
+    conn.close()
+    yield {"type": "done"}
+
+
+def _current_stream(port: int) -> Iterator[dict]:
+    original_conn = http.client.HTTPSConnection
+    original_auth = llm_provider._load_codex_auth
+    http.client.HTTPSConnection = lambda *_a, **_k: http.client.HTTPConnection(  # type: ignore[assignment]
+        "127.0.0.1", port, timeout=60
+    )
+    llm_provider._load_codex_auth = lambda: {"access_token": "bench"}
+    try:
+        yield from llm_provider.stream_chatgpt_responses("system", "user", timeout=60)
+    finally:
+        http.client.HTTPSConnection = original_conn  # type: ignore[assignment]
+        llm_provider._load_codex_auth = original_auth
+
+
+def _measure(name: str, stream: Callable[[int], Iterator[dict]], port: int, rounds: int) -> dict[str, Any]:
+    best: dict[str, Any] = {}
+    for _ in range(rounds):
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        tokens = 0
+        for chunk in stream(port):
+            if chunk["type"] == "delta":
+                tokens += 1
+            elif chunk["type"] == "error":
+                raise RuntimeError(chunk["error"])
+        cpu = time.thread_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        if not best or cpu < best["cpu_s"]:
+            best = {
+                "parser": name,
+                "tokens": tokens,
+                "wall_s": round(wall, 4),
+                "cpu_s": round(cpu, 4),
+                "tokens_per_s": round(tokens / wall) if wall else None,
+                "cpu_us_per_token": round(cpu / tokens * 1e6, 3) if tokens else None,
+            }
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Responses API SSE parsing.")
+    parser.add_argument("--deltas", type=int, default=50_000, help="Delta events in the stream")
+    parser.add_argument("--frame-bytes", type=int, default=4096, help="HTTP chunk size the server writes")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per parser (best CPU kept)")
+    args = parser.parse_args()
+
+    body = _build_stream(args.deltas)
+    server = _start_server(body, args.frame_bytes)
+    port = server.server_address[1]
+    try:
+        results = [
+            _measure("legacy_readline", _legacy_stream, port, args.rounds),
+            _measure("block_reads", _current_stream, port, args.rounds),
+        ]
+    finally:
+        server.shutdown()
+    print(
+        json.dumps(
+            {
+                "benchmark": "llm_sse_stream",
+                "stream_bytes": len(body),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
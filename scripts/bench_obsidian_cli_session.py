@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Obsidian CLI benchmark: one subprocess per command vs a persistent session.
+
+Runs ``--ops`` mixed ``ObsidianVault`` operations (read, append, set
+property, backlinks, search, create folder) against a fake ``obsidian`` CLI that keeps
+notes in a temp directory. The same script is the fake: invoked with
+``--fake-cli`` it handles one command from argv, and with ``--fake-session``
+it serves the line-delimited session protocol on stdin/stdout.
+``--startup-ms`` adds simulated CLI start-up cost on top of the Python
+interpreter's own.
+
+It reports total time, mean and p95 per operation, and processes spawned.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+_STORE_ENV = "FAKE_OBSIDIAN_STORE"
+_STARTUP_ENV = "FAKE_OBSIDIAN_STARTUP_MS"
+
+
+# -- Fake CLI ----------------------------------------------------------------
+
+
+def _fake_command(argv: list[str], store: Path) -> tuple[int, str]:
+    command, *rest = [arg for arg in argv if not arg.startswith("vault=")]
+    kv = dict(arg.split("=", 1) for arg in rest if "=" in arg)
+    note = store / f"{kv.get('file', 'untitled').replace('/', '_')}.md"
+    if command == "read":
+        return 0, note.read_text(encoding="utf-8") if note.exists() else ""
+    if command == "append":
+        with note.open("a", encoding="utf-8") as handle:
+            handle.write(kv.get("content", "") + "\n")
+        return 0, "Appended"
+    if command == "property:set":
+        return 0, f"Set {kv.get('name')}"
+    if command in ("backlinks", "search"):
+        hits = [{"path": path.name} for path in sorted(store.glob("*.md"))[:5]]
+        return 0, json.dumps(hits)
+    if command == "eval":
+        return 0, "=> undefined"
+    return 1, ""
+
+
+def _fake_main(session: bool) -> int:
+    store = Path(os.environ[_STORE_ENV])
+    time.sleep(float(os.environ.get(_STARTUP_ENV) or 0) / 1000)
+    if not session:
+        code, out = _fake_command(sys.argv[2:], store)
+        sys.stdout.write(out)
+        return code
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request.get("op") == "ping":
+            reply = {"id": request["id"], "ok": True}
+        else:
+            code, out = _fake_command(request["argv"], store)
+            reply = {"id": request["id"], "code": code, "stdout": out, "stderr": ""}
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+# -- Benchmark ---------------------------------------------------------------
+
+
+def _operations(vault, rng: random.Random, count: int) -> list:
+    notes = [f"Course/Week {n}/Concept {n}" for n in range(20)]
+    kinds = [
+        lambda n: vault.read_note(n),
+        lambda n: vault.append_note(n, f"- line {rng.random():.4f}"),
+        lambda n: vault.set_property(n, "status", "reviewed"),
+        lambda n: vault.get_backlinks(n),
+        lambda n: vault.search("cardiac output", limit=5),
+        lambda n: vault.create_folder("Course/Scratch"),
+    ]
+    return [(rng.choice(kinds), rng.choice(notes)) for _ in range(count)]
+
+
+def _run(label: str, ops: list) -> None:
+    samples = []
+    started = time.perf_counter()
+    for op, note in ops:
+        op_started = time.perf_counter()
+        op(note)
+        samples.append((time.perf_counter() - op_started) * 1000)
+    total = (time.perf_counter() - started) * 1000
+    samples.sort()
+    print(
+        f"{label:<8} total={total:8.0f}ms  mean={statistics.mean(samples):6.2f}ms  "
+        f"p95={samples[int(len(samples) * 0.95) - 1]:6.2f}ms"
+    )
+
+
+def main() -> int:
+    if len(sys.argv) > 1 and sys.argv[1] in ("--fake-cli", "--fake-session"):
+        return _fake_main(sys.argv[1] == "--fake-session")
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--startup-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    import obsidian_cli_session  # type: ignore
+    import obsidian_vault  # type: ignore
+
+    store = Path(tempfile.mkdtemp(prefix="bench-obsidian-cli-"))
+    os.environ[_STORE_ENV] = str(store)
+    os.environ[_STARTUP_ENV] = str(args.startup_ms)
+    script = str(Path(__file__).resolve())
+    spawned = [0]
+    real_run = subprocess.run
+
+    def one_shot(cmd, **kwargs):
+        spawned[0] += 1
+        return real_run([sys.executable, script, "--fake-cli", *cmd[1:]], **kwargs)
+
+    try:
+        vault = obsidian_vault.ObsidianVault()
+        ops = _operations(vault, random.Random(7), args.ops)
+        print(f"{args.ops} mixed operations, simulated start-up {args.startup_ms}ms")
+
+        os.environ.pop(obsidian_cli_session.SESSION_ENV, None)
+        obsidian_vault.subprocess.run = one_shot
+        _run("one-shot", ops)
+        print(f"{'':<8} processes spawned: {spawned[0]}")
+        obsidian_vault.subprocess.run = real_run
+
+        os.environ[obsidian_cli_session.SESSION_ENV] = (
+            f'"{sys.executable}" "{script}" --fake-session'
+        )
+        _run("session", ops)
+        session = obsidian_cli_session.get_cli_session()
+        print(f"{'':<8} processes spawned: {session.spawns if session else 0}")
+    finally:
+        obsidian_vault.subprocess.run = real_run
+        obsidian_cli_session.close_cli_session()
+        shutil.rmtree(store, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
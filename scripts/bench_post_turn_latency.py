@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Post-turn latency benchmark for ``send_turn``.
+
+Runs tutor turns against a throwaway database through the Flask test client.
+Each turn streams a synthetic answer that carries ``:::vault:*:::``
+artifacts. ``ObsidianVault`` is replaced by a stub that sleeps
+``--vault-ms`` per operation, standing in for the Obsidian CLI subprocess.
+Turns run in two modes:
+
+  - inline:   ``TUTOR_POST_TURN_INLINE`` (post-turn jobs run before close)
+  - deferred: the default (jobs go to the background workers)
+
+For each mode it reports the time from the last token frame to the ``done``
+frame and to stream close, as the client sees them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import config  # type: ignore  # noqa: E402
+import db_setup  # type: ignore  # noqa: E402
+
+
+def _answer(artifacts: int) -> str:
+    blocks = [
+        f":::vault:append\nfile: Bench/Note {idx}.md\ncontent: recap {idx}\n:::"
+        for idx in range(artifacts)
+    ]
+    return "Here is the recap.\n\n" + "\n\n".join(blocks)
+
+
+def _patch(vault_ms: float, artifacts: int) -> None:
+    import llm_provider  # type: ignore
+    import obsidian_vault  # type: ignore
+    import tutor_context  # type: ignore
+    import tutor_tools  # type: ignore
+
+    class SlowVault:
+        def _op(self, *_args: Any, **_kwargs: Any) -> str:
+            time.sleep(vault_ms / 1000.0)
+            return "ok"
+
+        append_note = create_note = prepend_note = _op
+        replace_section = set_property = move_note = _op
+
+    obsidian_vault.ObsidianVault = SlowVault
+    tutor_context.build_context = lambda *_a, **_k: {
+        "materials": "",
+        "instructions": "",
+        "notes": "",
+        "course_map": "",
+        "debug": {},
+    }
+    tutor_tools.get_tool_schemas = lambda: []
+    answer = _answer(artifacts)
+
+    def fake_stream(_system_prompt: str, _user_prompt: str, **_kwargs: Any):
+        yield {"type": "delta", "text": answer}
+        yield {"type": "done", "model": "bench-model", "response_id": "resp-bench"}
+
+    llm_provider.stream_chatgpt_responses = fake_stream
+
+
+def _run_turn(client: Any, session_id: str) -> tuple[float, float]:
+    resp = client.post(
+        f"/api/tutor/session/{session_id}/turn",
+        json={"message": "Summarise and save this"},
+        buffered=False,
+    )
+    last_delta = done_at = None
+    for chunk in resp.response:
+        now = time.perf_counter()
+        text = chunk.decode() if isinstance(chunk, bytes) else str(chunk)
+        for line in text.splitlines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            kind = json.loads(line[6:]).get("type")
+            if kind == "token":
+                last_delta = now
+            elif kind == "done":
+                done_at = now
+    closed = time.perf_counter()
+    resp.close()
+    if last_delta is None or done_at is None:
+        raise RuntimeError("turn stream had no token/done frames")
+    return (done_at - last_delta) * 1000, (closed - last_delta) * 1000
+
+
+def _summary(label: str, samples: list[tuple[float, float]]) -> str:
+    to_done = [s[0] for s in samples]
+    to_close = [s[1] for s in samples]
+    return (
+        f"{label:<9} last delta->done p50={statistics.median(to_done):8.1f}ms "
+        f"max={max(to_done):8.1f}ms | last delta->close "
+        f"p50={statistics.median(to_close):8.1f}ms max={max(to_close):8.1f}ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--artifacts", type=int, default=2)
+    parser.add_argument("--vault-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    from dashboard.app import create_app  # type: ignore
+    import tutor_post_turn  # type: ignore
+
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    os.environ["PT_STUDY_DB"] = tmp.name
+    config.DB_PATH = tmp.name
+    db_setup.DB_PATH = tmp.name
+    db_setup.init_database()
+
+    app = create_app()
+    app.config["TESTING"] = True
+    _patch(args.vault_ms, args.artifacts)
+    client = app.test_client()
+
+    try:
+        for label, inline in (("inline", True), ("deferred", False)):
+            app.config["TUTOR_POST_TURN_INLINE"] = inline
+            session = client.post(
+                "/api/tutor/session", json={"mode": "Core", "topic": "Bench"}
+            ).get_json()
+            samples = []
+            for _ in range(args.turns):
+                samples.append(_run_turn(client, session["session_id"]))
+                tutor_post_turn.wait_for_post_turn_idle(timeout=60.0)
+            print(_summary(label, samples))
+        print(f"jobs: {tutor_post_turn.post_turn_stats()}")
+    finally:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
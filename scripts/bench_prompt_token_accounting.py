@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Token accounting overhead benchmark for Tutor prompt assembly.
+
+Builds a system prompt around a ``--context-chars`` retrieved-materials
+context (plus graph and vault sections) and times ``--turns`` simulated
+turns in which the materials stay fixed and only the question changes:
+
+  - chars:    no token accounting (render only, the old behaviour)
+  - naive:    re-encode every section each turn, no memo
+  - memo:     ``PromptAssembly.token_usage`` with the memoized counter
+  - budget:   memo plus a token budget that truncates the turn sections
+
+When the real ``o200k_base`` BPE file cannot be loaded (offline machine),
+a byte-level tiktoken encoding stands in so the encode cost is still real;
+the output says which encoder ran.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import tutor_tokens  # type: ignore  # noqa: E402
+from tutor_prompt_builder import build_prompt_assembly  # type: ignore  # noqa: E402
+
+
+def _ensure_encoder() -> str:
+    if tutor_tokens.get_encoder() is not None:
+        return tutor_tokens.DEFAULT_ENCODING
+    import tiktoken
+
+    byte_level = tiktoken.Encoding(
+        name="bench-bytes",
+        pat_str=r"""'s|'t|'re|'ve|'m|'ll|'d| ?\w+| ?\d+| ?[^\s\w]+|\s+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+    tutor_tokens._ENCODERS[tutor_tokens.DEFAULT_ENCODING] = byte_level
+    return "bench-bytes (offline stand-in for o200k_base)"
+
+
+def _contexts(context_chars: int) -> dict[str, str]:
+    paragraph = (
+        "Stroke volume rises with preload until the sarcomeres pass optimal "
+        "overlap; afterload and contractility shift the Frank-Starling curve. "
+    )
+    return {
+        "material_context": (paragraph * (context_chars // len(paragraph) + 1))[
+            :context_chars
+        ],
+        "graph_context": "## Knowledge Graph\n" + "Preload -> stroke volume\n" * 400,
+        "vault_state": "- Cardio/Preload.md\n" * 300,
+    }
+
+
+def _timed(turns: int, fn) -> list[float]:
+    samples = []
+    for idx in range(turns):
+        started = time.perf_counter()
+        fn(idx)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--context-chars", type=int, default=200_000)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--budget", type=int, default=30_000)
+    args = parser.parse_args()
+
+    encoder_label = _ensure_encoder()
+    encoder = tutor_tokens.get_encoder()
+    contexts = _contexts(args.context_chars)
+    kwargs = dict(course_id=1, topic="Cardiac output", **contexts)
+
+    def chars(_idx: int) -> None:
+        build_prompt_assembly(**kwargs).render()
+
+    def naive(idx: int) -> None:
+        prompt = build_prompt_assembly(**kwargs)
+        prompt.render()
+        for tier in prompt.sections.values():
+            for text in tier:
+                len(encoder.encode(text, disallowed_special=()))
+        len(encoder.encode(f"Question {idx}", disallowed_special=()))
+
+    def memo(idx: int) -> None:
+        prompt = build_prompt_assembly(**kwargs)
+        prompt.render()
+        prompt.token_usage()
+        tutor_tokens.count_tokens(f"Question {idx}")
+
+    def budget(idx: int) -> None:
+        prompt = build_prompt_assembly(**kwargs, token_budget=args.budget)
+        prompt.render()
+        prompt.token_usage()
+        tutor_tokens.count_tokens(f"Question {idx}")
+
+    print(f"encoder: {encoder_label}; context: {args.context_chars} chars")
+    for label, fn in (("chars", chars), ("naive", naive), ("memo", memo), ("budget", budget)):
+        tutor_tokens.clear_token_cache()
+        samples = _timed(args.turns, fn)
+        print(
+            f"{label:<7} first turn={samples[0]:8.1f}ms "
+            f"later turns p50={statistics.median(samples[1:]):8.2f}ms "
+            f"max={max(samples[1:]):8.2f}ms"
+        )
+    usage = build_prompt_assembly(**kwargs, token_budget=args.budget).token_usage()
+    print(
+        f"budget={args.budget} total={usage['total']} "
+        f"truncated={usage['truncated']} dropped={usage['dropped']}"
+    )
+    print(f"memo: {tutor_tokens.token_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Session compaction benchmark for long Tutor teach sessions.
+
+Drives a simulated ``--turns``-turn teach session through ``send_turn``
+(Flask test client, throwaway database). The model is a fake. Each answer
+is ``--answer-chars`` long, and the working-summary call sleeps
+``--summary-ms``. Three modes run:
+
+  - off:        compaction never triggers (history is the last 20 turns)
+  - inline:     token-threshold compaction runs before the stream closes
+                (``TUTOR_POST_TURN_INLINE``)
+  - background: compaction runs on the post-turn workers
+
+For each mode it reports the estimated prompt tokens the model saw at
+sample turns, and the p50/p95/max turn latency (request to stream close).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import config  # type: ignore  # noqa: E402
+import db_setup  # type: ignore  # noqa: E402
+
+
+def _patch(answer_chars: int, summary_ms: float, prompt_tokens: list[int]) -> None:
+    import llm_provider  # type: ignore
+    import tutor_context  # type: ignore
+    import tutor_tools  # type: ignore
+    from dashboard.api_tutor_memory import estimate_tokens  # type: ignore
+
+    tutor_context.build_context = lambda *_a, **_k: {
+        "materials": "",
+        "instructions": "",
+        "notes": "",
+        "course_map": "",
+        "debug": {},
+    }
+    tutor_tools.get_tool_schemas = lambda: []
+    answer = ("Stroke volume rises with preload. " * 64)[:answer_chars]
+
+    def fake_stream(_system_prompt: str, user_prompt: str, **_kwargs: Any):
+        prompt_tokens.append(estimate_tokens(user_prompt))
+        yield {"type": "delta", "text": answer}
+        yield {"type": "done", "model": "bench-model", "response_id": "resp-bench"}
+
+    def fake_summary(_system_prompt: str, user_prompt: str, **_kwargs: Any):
+        time.sleep(summary_ms / 1000.0)
+        return {"success": True, "content": "Working summary. " * 60}
+
+    llm_provider.stream_chatgpt_responses = fake_stream
+    llm_provider.call_llm = fake_summary
+
+
+def _teach_session(client: Any) -> str:
+    chains = client.get("/api/chains").get_json()
+    template = next((c for c in chains if c.get("is_template")), chains[0])
+    resp = client.post(
+        "/api/tutor/session",
+        json={
+            "session_kind": "tutor",
+            "topic": "Cardiac output",
+            "method_chain_id": int(template["id"]),
+            "content_filter": {"session_kind": "tutor", "material_ids": [1]},
+        },
+    )
+    body = resp.get_json()
+    if resp.status_code != 201:
+        raise RuntimeError(f"could not create teach session: {body}")
+    return body["session_id"]
+
+
+def _run_mode(client: Any, turns: int) -> list[float]:
+    session_id = _teach_session(client)
+    latencies = []
+    for idx in range(turns):
+        started = time.perf_counter()
+        resp = client.post(
+            f"/api/tutor/session/{session_id}/turn",
+            json={
+                "message": f"Question {idx}: how does preload change stroke volume?",
+                "turn_mode": "tutor",
+            },
+        )
+        resp.get_data()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--answer-chars", type=int, default=1200)
+    parser.add_argument("--summary-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    from dashboard.app import create_app  # type: ignore
+    from dashboard import api_tutor_memory  # type: ignore
+    import tutor_post_turn  # type: ignore
+
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    os.environ["PT_STUDY_DB"] = tmp.name
+    config.DB_PATH = tmp.name
+    db_setup.DB_PATH = tmp.name
+    db_setup.init_database()
+    db_setup.ensure_method_library_seeded()
+
+    app = create_app()
+    app.config["TESTING"] = True
+    prompt_tokens: list[int] = []
+    _patch(args.answer_chars, args.summary_ms, prompt_tokens)
+    client = app.test_client()
+    threshold = api_tutor_memory.COMPACTION_TOKEN_THRESHOLD
+    samples = sorted({1, *range(50, args.turns + 1, 50), args.turns})
+
+    try:
+        for label, inline, compaction in (
+            ("off", False, False),
+            ("inline", True, True),
+            ("background", False, True),
+        ):
+            app.config["TUTOR_POST_TURN_INLINE"] = inline
+            api_tutor_memory.COMPACTION_TOKEN_THRESHOLD = (
+                threshold if compaction else sys.maxsize
+            )
+            prompt_tokens.clear()
+            latencies = _run_mode(client, args.turns)
+            tutor_post_turn.wait_for_post_turn_idle(timeout=120.0)
+            tokens = ", ".join(f"t{n}={prompt_tokens[n - 1]}" for n in samples)
+            print(
+                f"{label:<10} prompt tokens {tokens} max={max(prompt_tokens)} | "
+                f"latency p50={statistics.median(latencies):7.1f}ms "
+                f"p95={_p95(latencies):7.1f}ms max={max(latencies):7.1f}ms"
+            )
+        print(f"jobs: {tutor_post_turn.post_turn_stats()}")
+    finally:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tutor prompt assembly microbenchmark.
+
+Times ``build_prompt_assembly`` per simulated turn with a large chain/TEACH
+context, comparing a cold prompt-asset cache (config + tutor_instructions.md
+re-read every turn, the pre-cache behaviour) against the warm cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "brain") not in sys.path:
+    sys.path.insert(0, str(ROOT / "brain"))
+
+import tutor_prompt_builder  # type: ignore  # noqa: E402
+
+
+def _large_chain_info(block_count: int) -> dict[str, Any]:
+    blocks = [f"Block {idx:02d}" for idx in range(block_count)]
+    return {
+        "name": "Benchmark Chain",
+        "blocks": blocks,
+        "current_index": block_count // 2,
+        "total": block_count,
+        "runtime_profile": {
+            "provenance_mode": "strict",
+            "teaching_style": "explanation-first, big-picture narrative",
+            "analogy_policy": "analogies encouraged as teaching bridges",
+            "retrieval_timing": "after_encode",
+        },
+        "allowed_modes": ["tutor", "review", "quiz"],
+        "gates": [f"gate_{idx}" for idx in range(block_count)],
+        "failure_actions": [f"recovery_route_{idx}" for idx in range(block_count)],
+        "tier_exits": {
+            f"tier_{idx}": {
+                "after_block": blocks[idx],
+                "min_duration_min": 10 + idx,
+                "description": "Safe to stop.",
+            }
+            for idx in range(min(block_count, 6))
+        },
+        "requires_reference_targets": True,
+    }
+
+
+def _large_teach_context() -> dict[str, Any]:
+    return {
+        "objective": "Explain how the mechanism works at L2 before precision detail.",
+        "concept_type": "mechanism",
+        "depth_start": "L0",
+        "depth_ceiling": "L4",
+        "depth_path": ["L0", "L1", "L2", "L3", "L4"],
+        "fallback_depths": ["L1", "L2"],
+        "source_anchors": [f"Lecture PDF p.{page}" for page in range(1, 40)],
+        "prime_artifacts": [f"Artifact {idx}" for idx in range(20)],
+        "bridge_moves_allowed": ["analogy", "story", "comparison_table"],
+        "first_bridge": "analogy",
+        "required_close_artifact": "one_page_anchor",
+        "close_artifact_status": "pending",
+        "function_confirmation_gate": {
+            "mode": "low_friction_function_confirmation",
+            "state": "pending",
+            "prompt": "Have the learner confirm the core function before L4 precision.",
+            "unlocks": "L4_precision",
+        },
+        "mnemonic_slot_policy": {
+            "mode": "kwik_lite",
+            "position": "post_artifact_pre_full_calibrate",
+            "availability": "available_after_close_artifact",
+            "state": "locked_until_artifact",
+        },
+        "exemplar_refs": ["teach/example/mechanism-001", "teach/example/mechanism-002"],
+        "stop_conditions": [f"stop_condition_{idx}" for idx in range(10)],
+    }
+
+
+def _run(turns: int, *, cold: bool, material_chars: int, block_count: int) -> dict[str, Any]:
+    chain_info = _large_chain_info(block_count)
+    teach_context = _large_teach_context()
+    current_block = {
+        "name": "Block 10",
+        "facilitation_prompt": "## Current Activity Block\n" + "Follow the steps.\n" * 200,
+        "chain_override": {
+            "allowed_moves": [f"move {idx}" for idx in range(20)],
+            "forbidden_moves": [f"forbidden {idx}" for idx in range(20)],
+        },
+    }
+    material = "Retrieved excerpt text. " * (material_chars // 24)
+    tutor_prompt_builder.clear_prompt_asset_cache()
+
+    samples_ms: list[float] = []
+    prefix_hashes: set[str] = set()
+    for turn in range(turns):
+        if cold:
+            tutor_prompt_builder.clear_prompt_asset_cache()
+        started = time.perf_counter()
+        prompt = tutor_prompt_builder.build_prompt_assembly(
+            current_block=current_block,
+            chain_info=chain_info,
+            course_id=1,
+            topic="Cardiac Output",
+            material_context=f"{material}\nturn={turn}",
+            course_map="courses:\n" + "  - name: Course\n" * 200,
+            vault_state=f"- Note {turn}.md",
+            teach_context=teach_context,
+        )
+        prompt.render()
+        prefix_hashes.add(prompt.prefix_hash())
+        samples_ms.append((time.perf_counter() - started) * 1000)
+
+    ordered = sorted(samples_ms)
+    return {
+        "cache": "cold" if cold else "warm",
+        "turns": turns,
+        "mean_ms": round(statistics.fmean(samples_ms), 4),
+        "p50_ms": round(ordered[len(ordered) // 2], 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "distinct_prefix_hashes": len(prefix_hashes),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tutor prompt assembly per turn.")
+    parser.add_argument("--turns", type=int, default=500, help="Simulated turns per run")
+    parser.add_argument(
+        "--material-chars",
+        type=int,
+        default=200_000,
+        help="Size of the per-turn retrieved material block",
+    )
+    parser.add_argument("--blocks", type=int, default=40, help="Blocks in the synthetic chain")
+    args = parser.parse_args()
+
+    results = [
+        _run(args.turns, cold=True, material_chars=args.material_chars, block_count=args.blocks),
+        _run(args.turns, cold=False, material_chars=args.material_chars, block_count=args.blocks),
+    ]
+    print(json.dumps({"benchmark": "tutor_prompt_assembly", "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Vault artifact execution benchmark: one call per artifact vs the batch planner.
+
+Builds ``--artifacts`` tutor-style vault artifacts (append, property,
+prepend, replace-section) spread over ``--notes`` notes and runs them
+against an in-memory vault that sleeps ``--latency-ms`` per call, standing
+in for a CLI or REST round trip:
+
+  - sequential: ``execute_vault_artifact`` per artifact (the old
+                ``execute_all_artifacts``)
+  - batch:      ``execute_artifact_batch`` (per-note coalesced writes,
+                notes in parallel)
+
+It reports wall time, vault calls and note writes for each, and checks both
+leave the notes identical.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import obsidian_merge  # type: ignore  # noqa: E402
+from obsidian_vault import NOTE_CHANGED, note_content_hash  # type: ignore  # noqa: E402
+from vault_artifact_router import execute_artifact_batch, execute_vault_artifact  # type: ignore  # noqa: E402
+
+
+class _SlowVault:
+    """Dict-backed vault with a fixed per-call latency."""
+
+    def __init__(self, notes: dict[str, str], latency: float) -> None:
+        self.notes = dict(notes)
+        self.latency = latency
+        self.calls = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def _call(self, write: bool = False) -> None:
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            self.writes += int(write)
+
+    def read_note(self, file: str) -> str:
+        self._call()
+        return self.notes.get(file, "").strip()
+
+    def write_note(self, file: str, new_content: str) -> str:
+        self._call(write=True)
+        self.notes[file] = new_content
+        return ""
+
+    def write_note_if_unchanged(self, file: str, expected_hash: str, new_content: str) -> str:
+        if note_content_hash(self.notes.get(file, "")) != expected_hash:
+            self._call()
+            return NOTE_CHANGED
+        return self.write_note(file, new_content)
+
+    def _edit(self, file: str, fn, *args) -> str:
+        self._call(write=True)
+        self.notes[file] = fn(self.notes[file].strip(), *args).rstrip("\n") + "\n"
+        return ""
+
+    def append_note(self, file: str, content: str) -> str:
+        return self._edit(file, obsidian_merge.append_to_note, content)
+
+    def prepend_note(self, file: str, content: str) -> str:
+        return self._edit(file, obsidian_merge.prepend_to_note, content)
+
+    def set_property(self, file: str, key: str, value: str) -> str:
+        return self._edit(file, obsidian_merge.set_note_property, key, value)
+
+    def replace_section(self, file: str, heading: str, content: str) -> str:
+        return self._edit(file, obsidian_merge.replace_note_section, heading, content)
+
+
+def _artifacts(notes: list[str], count: int, rng: random.Random) -> list[dict]:
+    artifacts = []
+    for idx in range(count):
+        file = rng.choice(notes)
+        op = rng.choice(["append", "append", "property", "prepend", "replace-section"])
+        if op == "property":
+            params = {"file": file, "key": "status", "value": f"step {idx}"}
+        elif op == "replace-section":
+            params = {"file": file, "heading": "## Summary", "content": f"Summary {idx}"}
+        else:
+            params = {"file": file, "content": f"- item {idx}"}
+        artifacts.append({"operation": op, "params": params})
+    return artifacts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--artifacts", type=int, default=60)
+    parser.add_argument("--notes", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    names = [f"Course/Week {idx}/Session {idx}" for idx in range(args.notes)]
+    notes = {
+        name: f"---\nstatus: new\n---\n# {name}\n\n## Summary\nTBD\n\n## Log\nstart\n" for name in names
+    }
+    # Sort by note so consecutive edits share a note, as a turn's artifacts usually do.
+    artifacts = sorted(_artifacts(names, args.artifacts, rng), key=lambda a: a["params"]["file"])
+    latency = args.latency_ms / 1000
+    print(f"{args.artifacts} artifacts over {args.notes} notes, {args.latency_ms}ms per vault call")
+
+    sequential = _SlowVault(notes, latency)
+    started = time.perf_counter()
+    for artifact in artifacts:
+        execute_vault_artifact(sequential, artifact)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"sequential {elapsed:8.0f}ms  calls={sequential.calls:>4}  writes={sequential.writes:>4}")
+
+    batched = _SlowVault(notes, latency)
+    batch = execute_artifact_batch(batched, artifacts)
+    print(
+        f"batch      {batch['elapsed_ms']:8.0f}ms  calls={batched.calls:>4}  "
+        f"writes={batched.writes:>4}  per note={sorted(batch['note_writes'].values())}"
+    )
+    print(f"same notes: {sequential.notes == batched.notes}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
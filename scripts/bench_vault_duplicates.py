@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Vault duplicate detection benchmark for ``vault_fingerprints``.
+
+Generates ``--notes`` synthetic lecture notes (frontmatter plus 150-500
+words) of which ``--dupe-rate`` are planted near-duplicates: copies of
+another note with ``--edit-rate`` of their words replaced. It then times:
+
+  - md5:        the old check, an MD5 of every body on every scan
+                (byte-identical duplicates only)
+  - build:      fingerprinting every note into a ``NoteFingerprintStore``
+  - reload:     saving to SQLite, loading into a fresh store and re-feeding
+                every note (hash only, no signatures rebuilt)
+  - edit:       ``--edits`` changed notes updated incrementally
+  - query:      ``near_duplicates`` for every note
+  - all-pairs:  comparing signatures pairwise over ``--pairs-sample`` notes,
+                extrapolated to the whole vault
+
+It reports precision and recall of the near-duplicate pairs found against
+the planted ones (a note and its copies, pairwise).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import vault_fingerprints  # type: ignore  # noqa: E402
+from vault_fingerprints import NoteFingerprintStore  # type: ignore  # noqa: E402
+
+
+def _make_vault(
+    count: int, dupe_rate: float, edit_rate: float, rng: random.Random
+) -> tuple[dict[str, str], set[tuple[str, str]]]:
+    vocab = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(5000)]
+    dupes = int(count * dupe_rate)
+    bodies: dict[str, str] = {}
+    for idx in range(count - dupes):
+        bodies[f"Course {idx % 8}/Lecture {idx}.md"] = " ".join(rng.choices(vocab, k=rng.randint(150, 500)))
+    originals = list(bodies)
+    copies: dict[str, list[str]] = {}
+    for idx in range(dupes):
+        source = rng.choice(originals)
+        words = bodies[source].split()
+        for _ in range(max(1, int(len(words) * edit_rate))):
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        path = f"Inbox/Pasted {idx}.md"
+        bodies[path] = " ".join(words)
+        copies.setdefault(source, []).append(path)
+    # Two pastes of the same note are near-duplicates of each other too.
+    planted = {
+        tuple(sorted((left, right)))
+        for source, pasted in copies.items()
+        for idx, left in enumerate([source, *pasted])
+        for right in pasted[idx:]
+        if left != right
+    }
+    return bodies, planted
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=20_000)
+    parser.add_argument("--dupe-rate", type=float, default=0.05)
+    parser.add_argument("--edit-rate", type=float, default=0.02)
+    parser.add_argument("--edits", type=int, default=100)
+    parser.add_argument("--pairs-sample", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    bodies, planted = _make_vault(args.notes, args.dupe_rate, args.edit_rate, rng)
+    notes = {path: f"---\ncourse: {path.split('/')[0]}\n---\n{body}\n" for path, body in bodies.items()}
+    print(
+        f"{len(notes)} notes, {int(args.notes * args.dupe_rate)} planted near-duplicates "
+        f"({args.edit_rate:.0%} of words edited), threshold {vault_fingerprints.NEAR_DUPLICATE_THRESHOLD}"
+    )
+
+    started = time.perf_counter()
+    hash_map: dict[str, list[str]] = {}
+    for path, content in notes.items():
+        body = content.split("\n---\n", 1)[1].strip()
+        hash_map.setdefault(hashlib.md5(body.encode("utf-8")).hexdigest(), []).append(path)
+    exact = sum(len(paths) - 1 for paths in hash_map.values())
+    print(f"md5        {_ms(started):8.0f}ms  duplicates found={exact} (every scan)")
+
+    store = NoteFingerprintStore()
+    started = time.perf_counter()
+    for path, body in bodies.items():
+        store.update(path, body)
+    print(f"build      {_ms(started):8.0f}ms  signatures={store.signatures_built}")
+
+    with tempfile.TemporaryDirectory(prefix="bench-fingerprints-") as workdir:
+        conn = sqlite3.connect(str(Path(workdir) / "fingerprints.db"))
+        started = time.perf_counter()
+        rows = store.save(conn)
+        saved_ms = _ms(started)
+        reloaded = NoteFingerprintStore()
+        started = time.perf_counter()
+        reloaded.load(conn)
+        loaded_ms = _ms(started)
+        for path, body in bodies.items():
+            reloaded.update(path, body)
+        print(
+            f"reload     {_ms(started):8.0f}ms  load={loaded_ms:.0f}ms  signatures rebuilt={reloaded.signatures_built}"
+            f"  (save {rows} rows {saved_ms:.0f}ms)"
+        )
+        conn.close()
+
+    edited = rng.sample(sorted(bodies), args.edits)
+    started = time.perf_counter()
+    for path in edited:
+        store.update(path, bodies[path] + " appended revision notes for review")
+    elapsed = _ms(started)
+    print(f"edit       {elapsed:8.1f}ms  per note={elapsed / len(edited):6.3f}ms")
+    for path in edited:
+        store.update(path, bodies[path])
+
+    started = time.perf_counter()
+    for path in bodies:
+        store.near_duplicates(path)
+    elapsed = _ms(started)
+    print(f"query      {elapsed:8.1f}ms  per note={elapsed * 1000 / len(bodies):6.2f}us")
+
+    sample = [store._signatures[path] for path in list(bodies)[: args.pairs_sample]]
+    sample = [signature for signature in sample if signature is not None]
+    started = time.perf_counter()
+    for idx, left in enumerate(sample):
+        for right in sample[idx + 1 :]:
+            vault_fingerprints.signature_similarity(left, right)
+    scale = (len(bodies) / max(len(sample), 1)) ** 2
+    print(f"all-pairs  {_ms(started) * scale:8.0f}ms  (extrapolated from {len(sample)} notes)")
+
+    found = {(path, other) for path, other, _similarity in store.near_duplicate_pairs()}
+    hits = len(found & planted)
+    precision = hits / len(found) if found else 1.0
+    recall = hits / len(planted) if planted else 1.0
+    print(f"pairs found={len(found)}  precision={precision:.3f}  recall={recall:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
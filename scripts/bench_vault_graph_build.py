@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Vault link-graph build benchmark for ``obsidian_index.get_vault_graph``.
+
+Serves ``--notes`` synthetic notes (aliases frontmatter, wikilinks) from a
+local stub of the Obsidian Local REST API (``/vault/`` listings, notes as
+markdown or ``note+json`` with stat) with ``--latency-ms`` added per request.
+It then times:
+
+  - legacy:  one sequential markdown fetch + full parse per note (the
+             pre-pool ``get_vault_graph`` loop)
+  - pooled:  ``get_vault_graph(force_refresh=True)`` with the worker pool
+             and stamp-keyed parse cache, cold and after ``--edits`` notes
+             change (warm)
+  - disk:    the same cold/warm builds with the vault root on disk (stat
+             only for unchanged notes)
+
+It reports wall time and notes parsed for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+for _key in ("OBSIDIAN_VAULT_FS_PATH", "PT_OBSIDIAN_VAULT_PATH", "TREYS_SCHOOL_VAULT_PATH"):
+    os.environ.pop(_key, None)
+os.environ["PT_VAULT_WATCHER"] = "0"
+
+import obsidian_index  # type: ignore  # noqa: E402
+
+
+def _make_notes(count: int, rng: random.Random) -> dict[str, dict]:
+    notes = {}
+    for idx in range(count):
+        path = f"Course {idx % 8}/Week {idx % 12}/Concept {idx}.md"
+        links = " ".join(
+            f"[[Concept {rng.randrange(count)}]]" if n % 3 else f"[[C{rng.randrange(count)}#Overview]]"
+            for n in range(6)
+        )
+        body = " ".join(f"word{rng.randrange(3000)}" for _ in range(300))
+        content = f"---\naliases: [C{idx}]\ntags: [neuro]\n---\n# Concept {idx}\n\n{body}\n\n{links}\n"
+        notes[path] = {"content": content, "mtime": 1_700_000_000_000 + idx}
+    return notes
+
+
+def _run_server(notes: dict[str, dict], latency: float, ready) -> None:
+    folders: dict[str, set[str]] = {}
+    for path in notes:
+        parts = path.split("/")
+        for depth in range(len(parts)):
+            parent = "/".join(parts[:depth])
+            child = parts[depth] + ("/" if depth < len(parts) - 1 else "")
+            folders.setdefault(parent, set()).add(child)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_args) -> None:
+            pass
+
+        def _send(self, body: str, content_type: str, status: int = 200) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self) -> None:  # noqa: N802
+            # Bench-only hook: replace notes (``{path: {content, mtime}}``).
+            length = int(self.headers.get("Content-Length") or 0)
+            notes.update(json.loads(self.rfile.read(length).decode("utf-8")))
+            self._send("{}", "application/json")
+
+        def do_GET(self) -> None:  # noqa: N802
+            time.sleep(latency)
+            rel = urllib.parse.unquote(self.path[len("/vault/"):])
+            if rel == "" or rel.endswith("/"):
+                files = sorted(folders.get(rel.rstrip("/"), ()))
+                self._send(json.dumps({"files": files}), "application/json")
+                return
+            note = notes.get(rel)
+            if note is None:
+                self._send("{}", "application/json", 404)
+                return
+            if "note+json" in self.headers.get("Accept", ""):
+                payload = {
+                    "path": rel,
+                    "content": note["content"],
+                    "frontmatter": {"aliases": [f"C{rel.rsplit(' ', 1)[-1][:-3]}"]},
+                    "stat": {"mtime": note["mtime"], "size": len(note["content"])},
+                }
+                self._send(json.dumps(payload), "application/vnd.olrapi.note+json")
+            else:
+                self._send(note["content"], "text/markdown")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _serve(notes: dict[str, dict], latency: float) -> tuple[multiprocessing.Process, int]:
+    """Run the stub in its own process so it does not share the client's GIL."""
+    ready: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_run_server, args=(notes, latency, ready), daemon=True
+    )
+    process.start()
+    return process, ready.get(timeout=30)
+
+
+def _count_parses() -> list[int]:
+    counter = [0]
+    original = obsidian_index._parse_wikilinks
+
+    def _counting(content):
+        counter[0] += 1
+        return original(content)
+
+    obsidian_index._parse_wikilinks = _counting
+    return counter
+
+
+def _legacy_build() -> dict:
+    index = obsidian_index.get_vault_index(force_refresh=True)
+    files = index["files"]
+    obsidian_index._GRAPH_NOTES.clear()
+    for item in files:
+        content = obsidian_index._get_note_content(item["path"])
+        obsidian_index._GRAPH_NOTES[item["path"]] = obsidian_index._note_record(content)
+    return obsidian_index._resolve_graph(files)
+
+
+def _timed(label: str, fn, parses: list[int]) -> dict:
+    parses[0] = 0
+    started = time.perf_counter()
+    graph = fn()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<12} {elapsed * 1000:9.0f}ms  parsed={parses[0]:>5}  "
+        f"nodes={graph.get('nodeCount')} links={graph.get('linkCount')}"
+    )
+    return graph
+
+
+def _edit(
+    notes: dict[str, dict], rng: random.Random, edits: int, *, root: Path | None = None, port: int = 0
+) -> None:
+    changed = {}
+    for path in rng.sample(sorted(notes), edits):
+        note = notes[path]
+        note["content"] += "\nSee [[Concept 0]].\n"
+        note["mtime"] += 1000
+        changed[path] = note
+        if root is not None:
+            target = root / path
+            target.write_text(note["content"], encoding="utf-8")
+            stat = target.stat()
+            os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    if port:
+        req = urllib.request.Request(
+            f"http://127.0.0.1:{port}/_bench/edit", data=json.dumps(changed).encode("utf-8")
+        )
+        urllib.request.urlopen(req, timeout=10).read()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=5_000)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=obsidian_index.GRAPH_FETCH_WORKERS)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    notes = _make_notes(args.notes, rng)
+    server, port = _serve(notes, args.latency_ms / 1000)
+    os.environ["OBSIDIAN_API_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["OBSIDIAN_API_KEY"] = "bench"
+    obsidian_index.GRAPH_FETCH_WORKERS = args.workers
+    parses = _count_parses()
+    print(f"stub REST vault: {args.notes} notes, {args.latency_ms}ms/request, {args.workers} workers")
+
+    try:
+        obsidian_index.clear_vault_cache()
+        _timed("legacy", _legacy_build, parses)
+        obsidian_index.clear_vault_cache()
+        _timed("pooled cold", lambda: obsidian_index.get_vault_graph(force_refresh=True), parses)
+        _edit(notes, rng, args.edits, port=port)
+        _timed("pooled warm", lambda: obsidian_index.get_vault_graph(force_refresh=True), parses)
+    finally:
+        server.terminate()
+
+    root = Path(tempfile.mkdtemp(prefix="bench-graph-"))
+    try:
+        for path, note in notes.items():
+            target = root / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(note["content"], encoding="utf-8")
+        os.environ["OBSIDIAN_VAULT_FS_PATH"] = str(root)
+        obsidian_index.clear_vault_cache()
+        _timed("disk cold", lambda: obsidian_index.get_vault_graph(force_refresh=True), parses)
+        _edit(notes, rng, args.edits, root=root)
+        _timed("disk warm", lambda: obsidian_index.get_vault_graph(force_refresh=True), parses)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Adaptive vault ingest benchmark for ``adaptive.vault_ingest.ingest_vault``.
+
+Writes ``--notes`` synthetic notes (frontmatter with aliases, wikilinks and
+markdown links) into a temp-directory vault, backdates their mtimes, and
+times ingest into a temp SQLite DB:
+
+  - cold:      first ingest (every note inserted with links and aliases)
+  - checksum:  re-ingest with the stored stamps cleared, so every file is
+               read and checksummed (the pre-stamp behaviour)
+  - stamp:     re-ingest with no changes (stat only)
+  - edit:      re-ingest after ``--edits`` notes change
+
+It reports wall time and the inserted/updated/skipped counts for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from adaptive.vault_ingest import create_vault_tables, ingest_vault  # type: ignore  # noqa: E402
+
+
+def _write_vault(root: Path, notes: int, rng: random.Random) -> list[Path]:
+    paths = []
+    backdated = time.time_ns() - 3600 * 1_000_000_000
+    for idx in range(notes):
+        folder = root / f"Course {idx % 8}" / f"Week {idx % 12}"
+        folder.mkdir(parents=True, exist_ok=True)
+        body = " ".join(f"word{rng.randrange(3000)}" for _ in range(300))
+        links = " ".join(f"[[Concept {rng.randrange(notes)}]]" for _ in range(5))
+        path = folder / f"Concept {idx}.md"
+        path.write_text(
+            f"---\ntype: concept\naliases:\n  - C{idx}\n  - concept {idx}\n---\n"
+            f"# Concept {idx}\n\n{body}\n\n{links} [see](Concept%20{rng.randrange(notes)}.md)\n",
+            encoding="utf-8",
+        )
+        os.utime(path, ns=(backdated, backdated))
+        paths.append(path)
+    return paths
+
+
+def _timed(label: str, vault: Path, conn: sqlite3.Connection) -> None:
+    started = time.perf_counter()
+    result = ingest_vault(str(vault), conn)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(
+        f"{label:<9} {elapsed:9.0f}ms  inserted={result['inserted']:>6} "
+        f"updated={result['updated']:>4} skipped={result['skipped']:>6}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--edits", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    root = Path(tempfile.mkdtemp(prefix="bench-ingest-"))
+    try:
+        vault = root / "vault"
+        paths = _write_vault(vault, args.notes, rng)
+        conn = sqlite3.connect(str(root / "bench.db"))
+        create_vault_tables(conn)
+        print(f"vault: {args.notes} notes")
+
+        _timed("cold", vault, conn)
+        conn.execute("UPDATE vault_docs SET mtime_ns = NULL, size_bytes = NULL")
+        conn.commit()
+        _timed("checksum", vault, conn)
+        _timed("stamp", vault, conn)
+        backdated = time.time_ns() - 1800 * 1_000_000_000
+        for path in rng.sample(paths, args.edits):
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write("\nSee [[Concept 0]].\n")
+            os.utime(path, ns=(backdated, backdated))
+        _timed("edit", vault, conn)
+        conn.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
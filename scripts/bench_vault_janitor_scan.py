@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Vault janitor scan benchmark for ``vault_janitor.scan_vault``.
+
+Writes ``--notes`` synthetic notes (course notes, concepts with aliases,
+wikilinks, some broken links and duplicate bodies) plus a few attachments
+into a temp-directory vault and times full scans:
+
+  - cold:      first scan (every note read, parsed and checked)
+  - full:      a scan after ``clear_scan_cache`` (what every scan cost before
+               the incremental cache)
+  - rescan:    a scan with no changes
+  - edit:      a scan after ``--edits`` notes change
+
+It reports wall time, notes re-parsed and the issue count for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+os.environ["PT_VAULT_WATCHER"] = "0"
+
+import obsidian_index  # type: ignore  # noqa: E402
+import vault_janitor  # type: ignore  # noqa: E402
+
+
+def _write_vault(root: Path, notes: int, rng: random.Random) -> list[Path]:
+    paths = []
+    for idx in range(notes):
+        if idx % 3 == 0:
+            folder = root / "Concepts" / f"Topic {idx % 20}"
+            frontmatter = f"note_type: concept\naliases: [C{idx}]\ntags: [neuro]\ncourses: [Neuroscience]\n"
+        else:
+            folder = root / "Courses" / "Neuroscience" / f"Week {idx % 12}"
+            frontmatter = "note_type: study_session\n"
+        folder.mkdir(parents=True, exist_ok=True)
+        body = " ".join(f"word{rng.randrange(3000)}" for _ in range(200)) if idx % 50 else "Shared body."
+        links = " ".join(f"[[Concept {rng.randrange(notes)}]]" for _ in range(4))
+        broken = " [[Missing Note]]" if idx % 40 == 0 else ""
+        path = folder / f"Concept {idx}.md"
+        path.write_text(f"---\n{frontmatter}---\n# Concept {idx}\n\n{body}\n\n{links}{broken}\n", encoding="utf-8")
+        paths.append(path)
+    assets = root / "Assets"
+    assets.mkdir()
+    for idx in range(50):
+        (assets / f"diagram_{idx}.png").write_bytes(b"\x89PNG")
+    return paths
+
+
+def _timed(label: str, fn) -> None:
+    started = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(
+        f"{label:<7} {elapsed:9.1f}ms  reparsed={result.notes_reparsed:>6}  "
+        f"issues={result.issue_instances}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--edits", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    root = Path(tempfile.mkdtemp(prefix="bench-janitor-"))
+    try:
+        paths = _write_vault(root, args.notes, rng)
+        os.environ["OBSIDIAN_VAULT_FS_PATH"] = str(root)
+        obsidian_index.clear_vault_cache()
+        vault_janitor.clear_scan_cache()
+        print(f"vault: {args.notes} notes")
+
+        _timed("cold", vault_janitor.scan_vault)
+
+        def full():
+            vault_janitor.clear_scan_cache()
+            return vault_janitor.scan_vault()
+
+        _timed("full", full)
+        _timed("rescan", vault_janitor.scan_vault)
+        for path in rng.sample(paths, args.edits):
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write("\nSee [[Concept 0]] and [[Another Missing Note]].\n")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        _timed("edit", vault_janitor.scan_vault)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Vault index/graph build benchmark over the Obsidian Local REST API transport.
+
+Serves ``--notes`` synthetic notes in ``--folders`` nested folders from a
+local stub of the plugin's endpoints (``/vault/`` listings, notes as
+markdown or ``note+json``) over HTTPS with a throwaway self-signed
+certificate (``openssl`` on PATH; plain HTTP with ``--http``), with
+``--latency-ms`` added per request. It then times, cold each time:
+
+  - index:  ``get_vault_index(force_refresh=True)`` with the old transport
+            (``urlopen`` per request, folders listed one at a time) vs the
+            pooled keep-alive transport with concurrent folder listing
+  - graph:  ``get_vault_graph(force_refresh=True)`` note fetches on the old
+            vs the pooled transport
+
+It reports wall time, requests and connections opened for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+for _key in ("OBSIDIAN_VAULT_FS_PATH", "PT_OBSIDIAN_VAULT_PATH", "TREYS_SCHOOL_VAULT_PATH"):
+    os.environ.pop(_key, None)
+os.environ["PT_VAULT_WATCHER"] = "0"
+
+import obsidian_http  # type: ignore  # noqa: E402
+import obsidian_index  # type: ignore  # noqa: E402
+
+
+def _make_notes(count: int, folders: int) -> dict[str, str]:
+    notes = {}
+    for idx in range(count):
+        folder = f"Course {idx % 4}/Module {idx % folders}"
+        notes[f"{folder}/Concept {idx}.md"] = (
+            f"---\naliases: [C{idx}]\n---\n# Concept {idx}\n\nSee [[Concept {(idx * 7) % count}]].\n"
+        )
+    return notes
+
+
+def _run_server(notes: dict[str, str], latency: float, cert: Optional[str], ready) -> None:
+    folders: dict[str, set[str]] = {}
+    for path in notes:
+        parts = path.split("/")
+        for depth in range(len(parts)):
+            parent = "/".join(parts[:depth])
+            child = parts[depth] + ("/" if depth < len(parts) - 1 else "")
+            folders.setdefault(parent, set()).add(child)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Node's HTTP server (the plugin) sets TCP_NODELAY; without it the
+        # split header/body writes stall kept-alive connections on delayed ACKs.
+        disable_nagle_algorithm = True
+
+        def log_message(self, *_args) -> None:
+            pass
+
+        def _send(self, body: str, content_type: str, status: int = 200) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802
+            time.sleep(latency)
+            rel = urllib.parse.unquote(self.path[len("/vault/"):])
+            if rel == "" or rel.endswith("/"):
+                files = sorted(folders.get(rel.rstrip("/"), ()))
+                self._send(json.dumps({"files": files}), "application/json")
+            elif rel in notes:
+                self._send(notes[rel], "text/markdown")
+            else:
+                self._send("{}", "application/json", 404)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    if cert:
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(cert)
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _self_signed_cert(workdir: Path) -> Optional[str]:
+    if not shutil.which("openssl"):
+        return None
+    pem = workdir / "stub.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-keyout", str(pem), "-out", str(pem),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return str(pem)
+
+
+def _legacy_api_get(calls: list[int]):
+    """``_api_get`` as it was: a fresh ``urlopen`` connection per request."""
+    ctx = obsidian_http.ssl_context()
+
+    def _get(path: str, accept: str):
+        calls[0] += 1
+        base_url = obsidian_index._obsidian_api_urls()[0]
+        req = urllib.request.Request(
+            f"{base_url}{path}",
+            headers={"Authorization": "Bearer bench", "Accept": accept},
+        )
+        try:
+            with urllib.request.urlopen(req, context=ctx, timeout=10) as resp:
+                return obsidian_http.HttpResponse(
+                    resp.status,
+                    {name.lower(): value for name, value in resp.headers.items()},
+                    resp.read(),
+                )
+        except Exception:
+            return None
+
+    return _get
+
+
+def _timed(label: str, fn, legacy_calls: Optional[list[int]] = None) -> None:
+    obsidian_index.clear_vault_cache()
+    obsidian_http.close_idle_connections()
+    obsidian_http.reset_http_stats()
+    if legacy_calls is not None:
+        legacy_calls[0] = 0
+    started = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    if legacy_calls is not None:
+        requests = connections = legacy_calls[0]
+    else:
+        stats = obsidian_http.http_stats()
+        requests, connections = stats["requests"], stats["connections_opened"]
+    count = result.get("count", result.get("nodeCount", 0))
+    print(f"{label:<13} {elapsed:9.0f}ms  items={count:>6}  requests={requests:>6}  connections={connections:>6}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=2_000)
+    parser.add_argument("--folders", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--http", action="store_true", help="serve plain HTTP instead of HTTPS")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-rest-index-"))
+    server = None
+    try:
+        cert = None if args.http else _self_signed_cert(workdir)
+        ready: multiprocessing.Queue = multiprocessing.Queue()
+        server = multiprocessing.Process(
+            target=_run_server,
+            args=(_make_notes(args.notes, args.folders), args.latency_ms / 1000, cert, ready),
+            daemon=True,
+        )
+        server.start()
+        scheme = "https" if cert else "http"
+        os.environ["OBSIDIAN_API_URL"] = f"{scheme}://127.0.0.1:{ready.get(timeout=30)}"
+        os.environ["OBSIDIAN_API_KEY"] = "bench"
+        print(f"{args.notes} notes in {args.folders} folders over {scheme}, {args.latency_ms}ms per request")
+
+        pooled_get = obsidian_index._api_get
+        workers = obsidian_index.FOLDER_SCAN_WORKERS
+        calls = [0]
+        try:
+            obsidian_index._api_get = _legacy_api_get(calls)
+            obsidian_index.FOLDER_SCAN_WORKERS = 1
+            _timed("index legacy", lambda: obsidian_index.get_vault_index(force_refresh=True), calls)
+            _timed("graph legacy", lambda: obsidian_index.get_vault_graph(force_refresh=True), calls)
+        finally:
+            obsidian_index._api_get = pooled_get
+            obsidian_index.FOLDER_SCAN_WORKERS = workers
+        _timed("index pooled", lambda: obsidian_index.get_vault_index(force_refresh=True))
+        _timed("graph pooled", lambda: obsidian_index.get_vault_graph(force_refresh=True))
+    finally:
+        if server is not None:
+            server.terminate()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
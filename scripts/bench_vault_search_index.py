@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Vault notes-search benchmark for Tutor turns.
+
+Writes ``--notes`` synthetic markdown notes (frontmatter, headings, tags,
+wikilinks) into a temp-directory vault. It then times:
+
+  - build:     first ``VaultSearchIndex`` build (cold, every note read)
+  - query:     per-turn ``search`` inside the refresh interval (FTS only)
+  - rescan:    a forced stamp scan with no changes, plus a query (scans
+               normally run on a background thread every few seconds)
+  - edit:      stamp scan + re-index after ``--edits`` notes change
+  - spawn:     floor cost of one subprocess (``true``), the minimum the
+               Obsidian CLI path pays per query before any retries
+
+It reports p50 and max for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from vault_search_index import VaultSearchIndex  # type: ignore  # noqa: E402
+
+_TERMS = (
+    "plexus rami dermatome myotome preload afterload stroke volume gait stance "
+    "swing torque lever tendon ligament cartilage reflex spinal cortex motor "
+    "sensory ischemia perfusion ventilation compliance spasticity"
+).split()
+_FILLER = "the of and to in is that with for as how does when".split()
+# Topic terms are specific (a handful of notes each); prose words are generic.
+_WORDS = [f"{term}{n}" for n in range(200) for term in _TERMS]
+_PROSE = [f"word{n}" for n in range(3000)] + _FILLER
+
+
+def _text(rng: random.Random, count: int) -> str:
+    prose = rng.choices(_PROSE, k=count)
+    topics = rng.sample(_WORDS, 5)
+    return " ".join(prose) + "\n\n" + " ".join(topics)
+
+
+def _write_vault(root: Path, notes: int, rng: random.Random) -> list[Path]:
+    paths = []
+    for idx in range(notes):
+        folder = root / f"Course {idx % 8}" / f"Week {idx % 12}"
+        folder.mkdir(parents=True, exist_ok=True)
+        words = _text(rng, 300)
+        path = folder / f"Concept {idx}.md"
+        path.write_text(
+            f"---\naliases: [C{idx}]\ntags: [{rng.choice(_TERMS)}]\n---\n"
+            f"# Concept {idx}\n\n## Overview\n{words}\n\n"
+            f"See [[Concept {rng.randrange(notes)}]]. #{rng.choice(_TERMS)}\n",
+            encoding="utf-8",
+        )
+        paths.append(path)
+    return paths
+
+
+def _stats(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:<7} p50={statistics.median(samples):9.2f}ms "
+        f"max={max(samples):9.2f}ms (n={len(samples)})"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--edits", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    root = Path(tempfile.mkdtemp(prefix="bench-vault-"))
+    try:
+        paths = _write_vault(root, args.notes, rng)
+        questions = [
+            f"how does {rng.choice(_WORDS)} change {rng.choice(_WORDS)}?"
+            for _ in range(args.queries)
+        ]
+
+        started = time.perf_counter()
+        index = VaultSearchIndex(root)
+        index.refresh(force=True)
+        build_ms = (time.perf_counter() - started) * 1000
+        print(f"vault: {len(index)} notes; build={build_ms:.0f}ms")
+
+        def timed(fn) -> list[float]:
+            samples = []
+            for question in questions:
+                started = time.perf_counter()
+                fn(question)
+                samples.append((time.perf_counter() - started) * 1000)
+            return samples
+
+        _stats("query", timed(lambda q: index.search(q, limit=5)))
+        _stats(
+            "rescan",
+            timed(lambda q: (index.refresh(force=True), index.search(q, limit=5))),
+        )
+        edit_samples = []
+        for round_idx in range(5):
+            for path in rng.sample(paths, args.edits):
+                with path.open("a", encoding="utf-8") as handle:
+                    handle.write(f"\nedit {round_idx}\n")
+            started = time.perf_counter()
+            index.refresh(force=True)
+            edit_samples.append((time.perf_counter() - started) * 1000)
+        _stats("edit", edit_samples)
+        if shutil.which("true"):
+            _stats("spawn", timed(lambda _q: subprocess.run(["true"], check=False)))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Tutor SSE load test.
+
+Holds N concurrent ``/api/tutor/session/<id>/turn`` streams against a fake
+LLM (a long "thinking" pause, then a burst of deltas) and reports peak
+thread count, memory and heartbeat jitter for each serving mode:
+
+  - dev:  thread per request + a heartbeat producer thread per stream
+          (Flask development server behaviour)
+  - asgi: dashboard.asgi adapter, bounded worker pool + event-loop heartbeats
+
+Runs fully in-process against a temporary SQLite DB; no network, no provider.
+Each mode runs in its own subprocess so peak RSS is not shared between them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+for _path in (ROOT, ROOT / "brain"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+HEARTBEAT_FRAME = b":\n\n"
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _Sampler:
+    """Samples thread count and RSS while the streams are open."""
+
+    def __init__(self, interval: float = 0.02) -> None:
+        self.interval = interval
+        self.peak_threads = threading.active_count()
+        self.peak_rss_mb = _rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self.peak_rss_mb = max(self.peak_rss_mb, _rss_mb())
+            time.sleep(self.interval)
+
+    def __enter__(self) -> "_Sampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _prepare_app(args: argparse.Namespace):
+    db_path = Path(tempfile.mkdtemp(prefix="pt-sse-load-")) / "load.db"
+    os.environ["PT_STUDY_DB"] = str(db_path)
+    os.environ["PT_HARNESS_DISABLE_VAULT_CONTEXT"] = "1"
+
+    import config
+    import db_setup
+    import llm_provider
+    import tutor_context
+    import tutor_tools
+
+    config.DB_PATH = str(db_path)
+    db_setup.DB_PATH = str(db_path)
+    db_setup.init_database()
+
+    import dashboard.api_data as api_data
+
+    api_data.DB_PATH = str(db_path)
+
+    from dashboard.app import create_app
+
+    app = create_app()
+    app.config["TUTOR_SSE_HEARTBEAT_SECONDS"] = args.heartbeat
+
+    tutor_context.build_context = lambda *_a, **_k: {
+        "materials": "",
+        "notes": "",
+        "course_map": "",
+        "debug": {},
+    }
+    tutor_tools.get_tool_schemas = lambda: []
+
+    def fake_stream(_system_prompt, _user_prompt, **_kwargs):
+        time.sleep(args.think)
+        for idx in range(args.deltas):
+            time.sleep(args.delta_gap)
+            yield {"type": "delta", "text": f"token{idx} "}
+        yield {"type": "done", "model": "fake-llm", "usage": {"input_tokens": 10}}
+
+    llm_provider.stream_chatgpt_responses = fake_stream
+
+    client = app.test_client()
+    session_ids = []
+    for idx in range(args.streams):
+        resp = client.post("/api/tutor/session", json={"mode": "Core", "topic": f"Load {idx}"})
+        session_ids.append(resp.get_json()["session_id"])
+    return app, session_ids
+
+
+def _summarize(
+    mode: str,
+    args: argparse.Namespace,
+    heartbeat_times: list[list[float]],
+    completed: int,
+    elapsed: float,
+    sampler: _Sampler,
+    traced_peak: int,
+) -> dict[str, Any]:
+    expected_ms = args.heartbeat * 1000
+    deviations: list[float] = []
+    for times in heartbeat_times:
+        for earlier, later in zip(times, times[1:]):
+            deviations.append(abs((later - earlier) * 1000 - expected_ms))
+    deviations.sort()
+    return {
+        "mode": mode,
+        "streams": args.streams,
+        "completed_streams": completed,
+        "elapsed_s": round(elapsed, 3),
+        "peak_threads": sampler.peak_threads,
+        "peak_rss_mb": round(sampler.peak_rss_mb, 1),
+        "python_heap_peak_mb": round(traced_peak / (1024 * 1024), 1),
+        "heartbeats": sum(len(times) for times in heartbeat_times),
+        "heartbeat_interval_ms": expected_ms,
+        "heartbeat_jitter_mean_ms": round(statistics.fmean(deviations), 2) if deviations else None,
+        "heartbeat_jitter_p95_ms": (
+            round(deviations[min(len(deviations) - 1, int(len(deviations) * 0.95))], 2)
+            if deviations
+            else None
+        ),
+    }
+
+
+def _run_dev(args: argparse.Namespace) -> dict[str, Any]:
+    from werkzeug.test import EnvironBuilder
+
+    app, session_ids = _prepare_app(args)
+    heartbeat_times: list[list[float]] = [[] for _ in session_ids]
+    completed = [False] * len(session_ids)
+
+    def _stream(idx: int, session_id: str) -> None:
+        environ = EnvironBuilder(
+            path=f"/api/tutor/session/{session_id}/turn",
+            method="POST",
+            json={"message": "Explain preload"},
+        ).get_environ()
+        body = app(environ, lambda *_a, **_k: None)
+        try:
+            for chunk in body:
+                if chunk == HEARTBEAT_FRAME:
+                    heartbeat_times[idx].append(time.perf_counter())
+                elif b"[DONE]" in chunk:
+                    completed[idx] = True
+        finally:
+            getattr(body, "close", lambda: None)()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with _Sampler() as sampler:
+        workers = [
+            threading.Thread(target=_stream, args=(idx, sid), daemon=True)
+            for idx, sid in enumerate(session_ids)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    return _summarize("dev", args, heartbeat_times, sum(completed), elapsed, sampler, traced_peak)
+
+
+def _run_asgi(args: argparse.Namespace) -> dict[str, Any]:
+    from dashboard.asgi import FlaskASGIAdapter
+
+    app, session_ids = _prepare_app(args)
+    adapter = FlaskASGIAdapter(app, max_workers=args.pool)
+    heartbeat_times: list[list[float]] = [[] for _ in session_ids]
+    completed = [False] * len(session_ids)
+
+    async def _stream(idx: int, session_id: str) -> None:
+        body = json.dumps({"message": "Explain preload"}).encode("utf-8")
+        requests = [{"type": "http.request", "body": body, "more_body": False}]
+        finished = asyncio.Event()
+
+        async def receive():
+            if requests:
+                return requests.pop(0)
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            chunk = message.get("body", b"")
+            if chunk == HEARTBEAT_FRAME:
+                heartbeat_times[idx].append(time.perf_counter())
+            elif b"[DONE]" in chunk:
+                completed[idx] = True
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": f"/api/tutor/session/{session_id}/turn",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json")],
+            "server": ("127.0.0.1", 5000),
+            "client": ("127.0.0.1", 40000 + idx),
+        }
+        await adapter(scope, receive, send)
+        finished.set()
+
+    async def _all() -> None:
+        await asyncio.gather(*(_stream(idx, sid) for idx, sid in enumerate(session_ids)))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with _Sampler() as sampler:
+        asyncio.run(_all())
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    adapter.close()
+    return _summarize("asgi", args, heartbeat_times, sum(completed), elapsed, sampler, traced_peak)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test Tutor SSE streaming modes.")
+    parser.add_argument("--streams", type=int, default=200, help="Concurrent SSE streams")
+    parser.add_argument("--think", type=float, default=3.0, help="Fake LLM pause before the first delta (s)")
+    parser.add_argument("--deltas", type=int, default=20, help="Deltas per fake answer")
+    parser.add_argument("--delta-gap", type=float, default=0.02, help="Pause between deltas (s)")
+    parser.add_argument("--heartbeat", type=float, default=0.25, help="SSE heartbeat interval (s)")
+    parser.add_argument("--pool", type=int, default=256, help="ASGI worker pool size")
+    parser.add_argument("--mode", choices=("dev", "asgi", "both"), default="both")
+    args = parser.parse_args()
+
+    if args.mode == "dev":
+        print(json.dumps(_run_dev(args)))
+        return 0
+    if args.mode == "asgi":
+        print(json.dumps(_run_asgi(args)))
+        return 0
+
+    results = []
+    for mode in ("dev", "asgi"):
+        child_args = [arg for arg in sys.argv[1:] if not arg.startswith("--mode")]
+        proc = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, *child_args],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(proc.stderr[-2000:], file=sys.stderr)
+            return proc.returncode or 1
+        results.append(json.loads(lines[-1]))
+    print(json.dumps({"benchmark": "tutor_sse_load", "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Reference helper for ``PT_OBSIDIAN_CLI_SESSION``.
+
+Serves the line-delimited JSON protocol described in
+``brain/obsidian_cli_session.py`` on stdin/stdout:
+
+    -> {"id": 7, "argv": ["vault=Treys School", "read", "file=Note"]}
+    <- {"id": 7, "code": 0, "stdout": "...", "stderr": ""}
+    -> {"id": 8, "op": "ping"}
+    <- {"id": 8, "ok": true}
+
+Each ``argv`` request runs ``--cli`` (default ``obsidian``) with those
+arguments and replies with its exit code and output. Requests run on a pool
+of ``--workers`` threads and are answered as they finish, so one slow
+command does not hold up the others; the session matches replies by ``id``.
+It still starts one CLI process per request, so by itself it does not
+remove the CLI's start-up cost. A helper that keeps Obsidian's IPC channel
+open can replace it using the same protocol. A ping runs ``version``
+through the CLI, so it only succeeds while Obsidian answers. A malformed
+request gets a reply with code 2 instead of ending the session.
+
+Run it by pointing the dashboard at it:
+
+    PT_OBSIDIAN_CLI_SESSION="python scripts/obsidian_cli_session_helper.py"
+    PT_OBSIDIAN_CLI_SESSION="python scripts/obsidian_cli_session_helper.py --cli C:/Tools/obsidian.cmd"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_WORKERS = 4
+
+
+def handle(request: dict, cli: list[str], timeout: float) -> dict:
+    """Reply to one protocol request."""
+    request_id = request.get("id")
+    if request.get("op") == "ping":
+        reply = _run_cli(cli, ["version"], timeout)
+        if reply["code"] != 0:
+            return {"id": request_id, "ok": False, "error": reply["stderr"] or "obsidian version failed"}
+        return {"id": request_id, "ok": True}
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        return {"id": request_id, "code": 2, "stdout": "", "stderr": "argv must be a list of strings"}
+    requested = request.get("timeout")
+    if isinstance(requested, (int, float)) and requested > 0:
+        timeout = min(timeout, float(requested))
+    return {"id": request_id, **_run_cli(cli, argv, timeout)}
+
+
+def _run_cli(cli: list[str], argv: list[str], timeout: float) -> dict:
+    try:
+        proc = subprocess.run(
+            [*cli, *argv],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            timeout=timeout,
+        )
+    except OSError as exc:
+        return {"code": 127, "stdout": "", "stderr": str(exc)}
+    except subprocess.TimeoutExpired:
+        return {"code": 124, "stdout": "", "stderr": f"timed out after {timeout:.0f}s"}
+    return {"code": proc.returncode, "stdout": proc.stdout, "stderr": proc.stderr}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cli", default="obsidian", help="CLI command line (default: obsidian)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+    cli = shlex.split(args.cli, posix=os.name != "nt")
+    write_lock = threading.Lock()
+
+    def reply(request: dict) -> None:
+        line = json.dumps(handle(request, cli, args.timeout)) + "\n"
+        with write_lock:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as exc:
+                request = {"argv": None, "error": str(exc)}
+            if not isinstance(request, dict):
+                request = {"argv": None}
+            pool.submit(reply, request)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())